@@ -0,0 +1,159 @@
+"""
+과부하 시 대화형 요청의 응답 시간을 지키기 위한 단계별 동시 실행 제한과 우선순위 대기열
+
+요청은 FMP 조회(fmp), 지표 계산(compute), ChatGPT 요약(llm) 단계마다 슬롯을 얻어야 실행됩니다.
+슬롯이 없으면 우선순위(대화형 > 배치 > 백그라운드) 순서로 기다리고, 예상 대기 시간이 요청의
+마감 시간을 넘으면 기다리지 않고 바로 Overloaded를 발생시켜 업스트림 API에 요청이 가지 않게 합니다.
+"""
+
+import heapq
+import itertools
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Any, Optional
+
+# 요청 우선순위 (작을수록 먼저 처리)
+INTERACTIVE = 0
+BATCH = 1
+BACKGROUND = 2
+
+PRIORITY_NAMES = {INTERACTIVE: "interactive", BATCH: "batch", BACKGROUND: "background"}
+
+# 단계별 처리 시간 이동평균의 초기값 (초)과 갱신 비율
+INITIAL_SERVICE_SECONDS = 0.5
+SERVICE_TIME_ALPHA = 0.2
+
+
+class Overloaded(Exception):
+    """
+    마감 시간 안에 처리할 수 없어 요청을 거절할 때 발생하는 예외
+    """
+
+    def __init__(self, stage: str, retry_after: float):
+        self.stage = stage
+        self.retry_after = max(1, math.ceil(retry_after))
+        super().__init__(f"서버가 혼잡합니다 ({stage}). {self.retry_after}초 후 다시 시도해주세요.")
+
+
+class Ticket:
+    """
+    요청 하나의 우선순위와 마감 시각 (단계마다 같은 티켓을 사용)
+    """
+
+    def __init__(self, priority: int, timeout: float):
+        self.priority = priority
+        self.deadline = time.monotonic() + timeout
+
+    def remaining(self) -> float:
+        return self.deadline - time.monotonic()
+
+
+class StageLimiter:
+    """
+    한 단계의 동시 실행 수를 제한하고 빈 슬롯을 우선순위가 높은 대기 요청부터 넘겨주는 세마포어
+    """
+
+    def __init__(self, name: str, limit: int):
+        """
+        Args:
+            name (str): 단계 이름
+            limit (int): 동시에 실행할 수 있는 최대 요청 수
+        """
+        self.name = name
+        self.limit = limit
+        self.active = 0
+        self.service_time = INITIAL_SERVICE_SECONDS
+        self.rejected = 0
+        self._waiters = []
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+
+    def estimated_wait(self, priority: int) -> float:
+        """
+        지금 대기열에 들어가면 슬롯을 얻기까지 걸릴 것으로 예상되는 시간 (같거나 높은 우선순위 대기 요청 기준)
+        """
+        ahead = sum(1 for waiter in self._waiters if waiter[0] <= priority and not waiter[2].is_set())
+        return (ahead + 1) / self.limit * self.service_time
+
+    def acquire(self, ticket: Ticket):
+        """
+        슬롯 획득 (마감 시간 안에 얻을 수 없으면 Overloaded)
+        """
+        with self._lock:
+            if self.active < self.limit and not self._waiters:
+                self.active += 1
+                return
+            wait = self.estimated_wait(ticket.priority)
+            if wait > ticket.remaining():
+                self.rejected += 1
+                raise Overloaded(self.name, wait)
+            entry = (ticket.priority, next(self._sequence), threading.Event())
+            heapq.heappush(self._waiters, entry)
+
+        if entry[2].wait(max(ticket.remaining(), 0)):
+            return
+        with self._lock:
+            # 시간 초과와 슬롯 전달이 동시에 일어났으면 받은 슬롯을 사용
+            if entry[2].is_set():
+                return
+            self._waiters.remove(entry)
+            heapq.heapify(self._waiters)
+            self.rejected += 1
+            raise Overloaded(self.name, self.estimated_wait(ticket.priority))
+
+    def release(self, elapsed: float):
+        """
+        슬롯 반환 - 대기 요청이 있으면 슬롯을 그대로 가장 높은 우선순위 요청에 넘김
+        """
+        with self._lock:
+            self.service_time += SERVICE_TIME_ALPHA * (elapsed - self.service_time)
+            if self._waiters:
+                heapq.heappop(self._waiters)[2].set()
+            else:
+                self.active -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "limit": self.limit,
+                "active": self.active,
+                "waiting": len(self._waiters),
+                "avg_service_seconds": round(self.service_time, 3),
+                "rejected": self.rejected
+            }
+
+
+class AdmissionController:
+    """
+    단계별 StageLimiter 모음과 우선순위별 마감 시간
+    """
+
+    def __init__(self, limits: Dict[str, int], timeouts: Dict[int, float]):
+        """
+        Args:
+            limits (Dict[str, int]): 단계별 동시 실행 수 (예: {"fmp": 4, "compute": 2, "llm": 4})
+            timeouts (Dict[int, float]): 우선순위별 요청 마감 시간 (초)
+        """
+        self.stages = {name: StageLimiter(name, limit) for name, limit in limits.items()}
+        self.timeouts = timeouts
+
+    def ticket(self, priority: int) -> Ticket:
+        return Ticket(priority, self.timeouts[priority])
+
+    @contextmanager
+    def stage(self, name: str, ticket: Optional[Ticket]):
+        """
+        단계 슬롯을 얻은 상태로 블록 실행 (ticket이 없으면 백그라운드 우선순위로 처리)
+        """
+        limiter = self.stages[name]
+        limiter.acquire(ticket or self.ticket(BACKGROUND))
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            limiter.release(time.monotonic() - started)
+
+    def stats(self) -> Dict[str, Any]:
+        return {name: limiter.stats() for name, limiter in self.stages.items()}
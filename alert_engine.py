@@ -0,0 +1,281 @@
+import ipaddress
+import json
+import os
+import socket
+import threading
+import uuid
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, Any, List, Optional
+from urllib.parse import urlsplit
+
+import requests
+
+# 지표 신호 외에 규칙에 사용할 수 있는 필드
+RECOMMENDATION_FIELD = "RECOMMENDATION"
+TOTAL_SCORE_FIELD = "TOTAL_SCORE"
+
+
+def validate_webhook_url(url: str) -> Optional[str]:
+    """
+    웹훅 주소 검증 - https이고 호스트가 사설/루프백/링크 로컬 등 내부 주소로 해석되지 않아야 함
+    (서버가 대신 요청을 보내므로 Fly 내부망이나 메타데이터 주소로 보내지 않도록 막음)
+
+    Returns:
+        Optional[str]: 오류 메시지 (올바르면 None)
+    """
+    if not isinstance(url, str):
+        return "webhook_url은 문자열이어야 합니다."
+    parts = urlsplit(url)
+    if parts.scheme != "https" or not parts.hostname:
+        return "webhook_url은 https:// 주소여야 합니다."
+    try:
+        addresses = {info[4][0] for info in socket.getaddrinfo(parts.hostname, parts.port or 443, proto=socket.IPPROTO_TCP)}
+    except (socket.gaierror, UnicodeError, ValueError):
+        return f"webhook_url의 호스트({parts.hostname})를 찾을 수 없습니다."
+    for address in addresses:
+        ip = ipaddress.ip_address(address.split("%", 1)[0])
+        if ip.version == 6 and ip.ipv4_mapped:
+            ip = ip.ipv4_mapped
+        if not ip.is_global or ip.is_multicast:
+            return f"webhook_url은 내부 주소({ip})로 보낼 수 없습니다."
+    return None
+
+
+class LocalNotifier:
+    """
+    알림을 메모리에 모아두는 전달자 (테스트/로컬 실행용 웹훅 대체)
+    """
+
+    def __init__(self):
+        self.events: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def send(self, rule: Dict[str, Any], event: Dict[str, Any]):
+        with self._lock:
+            self.events.append({"rule_id": rule["id"], "webhook_url": rule.get("webhook_url"), **event})
+
+
+class WebhookNotifier:
+    """
+    규칙의 webhook_url로 알림을 POST하는 전달자 (요청 스레드를 막지 않도록 백그라운드에서 전송)
+    """
+
+    def __init__(self, timeout: float = 5.0, max_workers: int = 4):
+        """
+        Args:
+            timeout (float): 웹훅 요청 제한 시간 (초)
+            max_workers (int): 동시에 보낼 웹훅 요청 수
+        """
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="webhook")
+
+    def send(self, rule: Dict[str, Any], event: Dict[str, Any]):
+        self._executor.submit(self._post, rule, event)
+
+    def _post(self, rule: Dict[str, Any], event: Dict[str, Any]):
+        # 등록 후 DNS가 내부 주소로 바뀌었을 수 있으므로 보낼 때마다 다시 확인하고, 리다이렉트는 따라가지 않음
+        error = validate_webhook_url(rule["webhook_url"])
+        if error:
+            print(f"⚠️ 알림 웹훅 전송 거부 ({rule['id']}): {error}")
+            return
+        try:
+            response = requests.post(rule["webhook_url"], json={"rule_id": rule["id"], **event},
+                                     timeout=self.timeout, allow_redirects=False)
+            if response.status_code >= 400:
+                print(f"⚠️ 알림 웹훅 응답 오류 ({rule['id']}): HTTP {response.status_code}")
+        except Exception as e:
+            print(f"⚠️ 알림 웹훅 전송 실패 ({rule['id']}): {str(e)}")
+
+
+class AlertEngine:
+    """
+    종목별 직전 신호 상태와 새 분석 결과를 비교해 조건에 맞는 알림 규칙을 실행하는 클래스
+
+    신호 규칙은 (지표, 신호)로 색인해 두고 값이 바뀐 필드의 규칙만 확인하므로,
+    규칙 수가 많아도 분석 한 건당 비용은 바뀐 신호 수에 비례합니다.
+
+    규칙 형식:
+        {"indicator": "RSI", "signal": "STRONG_OVERSOLD"}                       - 신호로 바뀌면
+        {"indicator": "RECOMMENDATION", "signal": "BUY", "from_signal": "HOLD"}  - HOLD → BUY
+        {"indicator": "TOTAL_SCORE", "score_above": 8}                          - 총점이 8 이상으로 올라서면
+        선택 항목: "symbols" (대상 종목 목록, 없으면 전체), "webhook_url"
+    """
+
+    def __init__(self, notifier=None, rules_path: str = None):
+        """
+        Args:
+            notifier: send(rule, event)를 가진 전달자 (없으면 WebhookNotifier)
+            rules_path (str): 규칙을 저장할 JSON 파일 경로 (없으면 메모리에만 보관)
+        """
+        self.notifier = notifier or WebhookNotifier()
+        self.rules_path = rules_path
+        self._rules: Dict[str, Dict[str, Any]] = {}
+        self._signal_index: Dict[tuple, set] = defaultdict(set)
+        self._score_rules: set = set()
+        self._states: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+        if rules_path and os.path.exists(rules_path):
+            with open(rules_path, encoding="utf-8") as f:
+                for rule in json.load(f):
+                    self._index(rule)
+
+    @staticmethod
+    def validate_rule(rule: Dict[str, Any]) -> Optional[str]:
+        """
+        규칙 형식 검증
+
+        Returns:
+            Optional[str]: 오류 메시지 (올바르면 None)
+        """
+        indicator = rule.get("indicator")
+        if not indicator:
+            return "indicator를 입력해주세요."
+        if indicator == TOTAL_SCORE_FIELD:
+            if rule.get("score_above") is None and rule.get("score_below") is None:
+                return "TOTAL_SCORE 규칙에는 score_above 또는 score_below가 필요합니다."
+        elif not rule.get("signal"):
+            return "signal을 입력해주세요."
+        symbols = rule.get("symbols")
+        if symbols is not None and not isinstance(symbols, list):
+            return "symbols는 목록이어야 합니다."
+        if rule.get("webhook_url") is not None:
+            return validate_webhook_url(rule["webhook_url"])
+        return None
+
+    def add_rule(self, rule: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        알림 규칙 등록 (형식이 잘못되면 ValueError)
+
+        Returns:
+            Dict[str, Any]: id가 부여된 규칙
+        """
+        error = self.validate_rule(rule)
+        if error:
+            raise ValueError(error)
+
+        rule = {key: value for key, value in rule.items() if value is not None}
+        rule["id"] = uuid.uuid4().hex[:12]
+        rule["indicator"] = rule["indicator"].upper()
+        if rule.get("symbols"):
+            rule["symbols"] = [s.upper() for s in rule["symbols"]]
+        with self._lock:
+            self._index(rule)
+            self._save()
+        return rule
+
+    def remove_rule(self, rule_id: str) -> bool:
+        """
+        알림 규칙 삭제
+
+        Returns:
+            bool: 삭제 여부 (없는 규칙이면 False)
+        """
+        with self._lock:
+            rule = self._rules.pop(rule_id, None)
+            if rule is None:
+                return False
+            if rule["indicator"] == TOTAL_SCORE_FIELD:
+                self._score_rules.discard(rule_id)
+            else:
+                self._signal_index[(rule["indicator"], rule["signal"])].discard(rule_id)
+            self._save()
+        return True
+
+    def list_rules(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return list(self._rules.values())
+
+    def _index(self, rule: Dict[str, Any]):
+        self._rules[rule["id"]] = rule
+        if rule["indicator"] == TOTAL_SCORE_FIELD:
+            self._score_rules.add(rule["id"])
+        else:
+            self._signal_index[(rule["indicator"], rule["signal"])].add(rule["id"])
+
+    def _save(self):
+        if not self.rules_path:
+            return
+        directory = os.path.dirname(self.rules_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.rules_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(list(self._rules.values()), f, ensure_ascii=False)
+        os.replace(tmp_path, self.rules_path)
+
+    def update(self, result: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        새 분석 결과를 직전 상태와 비교해 조건에 맞는 규칙의 알림 전송
+
+        같은 종목의 더 이전 날짜 결과(as_of 분석 등)는 상태를 되돌리지 않도록 무시합니다.
+        종목의 첫 결과는 비교 대상이 없으므로 상태만 기록합니다.
+
+        Args:
+            result (Dict): build_analysis 결과 (symbol, signals, recommendation, total_score, stock_info)
+
+        Returns:
+            List[Dict]: 전송한 알림 목록
+        """
+        symbol = result["symbol"]
+        state = dict(result["signals"])
+        state[RECOMMENDATION_FIELD] = result["recommendation"]
+        state[TOTAL_SCORE_FIELD] = result["total_score"]
+        latest_date = result.get("stock_info", {}).get("latest_date", "")
+
+        with self._lock:
+            previous = self._states.get(symbol)
+            if previous is not None and latest_date < previous["date"]:
+                return []
+            self._states[symbol] = {"date": latest_date, "state": state}
+            if previous is None:
+                return []
+
+            previous_state = previous["state"]
+            matched = []
+            for field, value in state.items():
+                old_value = previous_state.get(field)
+                if old_value == value:
+                    continue
+                if field == TOTAL_SCORE_FIELD:
+                    candidates = self._score_rules
+                else:
+                    candidates = self._signal_index.get((field, value), ())
+                for rule_id in candidates:
+                    rule = self._rules[rule_id]
+                    if self._matches(rule, symbol, old_value, value):
+                        matched.append((rule, field, old_value, value))
+
+        events = []
+        for rule, field, old_value, value in matched:
+            event = {
+                "symbol": symbol,
+                "indicator": field,
+                "previous": old_value,
+                "current": value,
+                "date": latest_date,
+                "price": result.get("stock_info", {}).get("latest_price"),
+                "triggered_at": datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            }
+            self.notifier.send(rule, event)
+            events.append(event)
+            print(f"🔔 {symbol} {field}: {old_value} → {value} (규칙 {rule['id']})")
+        return events
+
+    @staticmethod
+    def _matches(rule: Dict[str, Any], symbol: str, old_value, value) -> bool:
+        """
+        값이 바뀐 필드에 대해 규칙의 나머지 조건 확인
+        """
+        if rule.get("symbols") and symbol not in rule["symbols"]:
+            return False
+        if rule["indicator"] == TOTAL_SCORE_FIELD:
+            above, below = rule.get("score_above"), rule.get("score_below")
+            if above is not None and value >= above > old_value:
+                return True
+            if below is not None and value <= below < old_value:
+                return True
+            return False
+        return rule.get("from_signal") is None or rule["from_signal"] == old_value
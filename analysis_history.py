@@ -0,0 +1,240 @@
+import hashlib
+import json
+import os
+import queue
+import sqlite3
+import threading
+from datetime import date, datetime, timedelta
+from typing import Dict, Any, Iterator, List
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS analysis_history (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    symbol TEXT NOT NULL,
+    date TEXT NOT NULL,
+    analyzed_at TEXT NOT NULL,
+    price REAL,
+    total_score INTEGER NOT NULL,
+    recommendation TEXT NOT NULL,
+    signals TEXT NOT NULL,
+    scores TEXT NOT NULL,
+    raw_values TEXT NOT NULL,
+    summary_hash TEXT,
+    summary_source TEXT,
+    version TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_history_symbol_date ON analysis_history (symbol, date, id);
+CREATE INDEX IF NOT EXISTS idx_history_date ON analysis_history (date, symbol, id);
+"""
+
+INSERT_SQL = """
+INSERT INTO analysis_history (symbol, date, analyzed_at, price, total_score, recommendation,
+                              signals, scores, raw_values, summary_hash, summary_source, version)
+VALUES (:symbol, :date, :analyzed_at, :price, :total_score, :recommendation,
+        :signals, :scores, :raw_values, :summary_hash, :summary_source, :version)
+"""
+
+# 종목의 날짜별 마지막 분석 결과
+SCORE_HISTORY_SQL = """
+SELECT h.date, h.analyzed_at, h.price, h.total_score, h.recommendation, h.signals, h.scores, h.raw_values
+FROM analysis_history h
+JOIN (SELECT MAX(id) AS id FROM analysis_history
+      WHERE symbol = ? AND date >= ? GROUP BY date) latest ON h.id = latest.id
+ORDER BY h.date
+"""
+
+# 해당 날짜의 마지막 분석과 그 이전 날짜의 마지막 분석의 추천 비교
+RECOMMENDATION_CHANGES_SQL = """
+SELECT t.symbol, t.price, t.total_score, t.recommendation,
+       (SELECT p.date FROM analysis_history p
+        WHERE p.symbol = t.symbol AND p.date < t.date ORDER BY p.date DESC, p.id DESC LIMIT 1) AS previous_date,
+       (SELECT p.recommendation FROM analysis_history p
+        WHERE p.symbol = t.symbol AND p.date < t.date ORDER BY p.date DESC, p.id DESC LIMIT 1) AS previous_recommendation
+FROM analysis_history t
+WHERE t.date = ?
+  AND t.id = (SELECT MAX(id) FROM analysis_history WHERE symbol = t.symbol AND date = t.date)
+ORDER BY t.symbol
+"""
+
+# 기간 내 종목/날짜별 마지막 분석 결과 (종목, 날짜 순) - 종목 필터는 JSON 배열 하나로 전달
+DAILY_RESULTS_SQL = """
+SELECT h.symbol, h.date, h.analyzed_at, h.price, h.total_score, h.recommendation,
+       h.signals, h.scores, h.raw_values, h.version
+FROM analysis_history h
+WHERE h.date BETWEEN ? AND ?
+  AND (? IS NULL OR h.symbol IN (SELECT value FROM json_each(?)))
+  AND h.id = (SELECT MAX(id) FROM analysis_history WHERE symbol = h.symbol AND date = h.date)
+ORDER BY h.symbol, h.date
+"""
+
+
+class AnalysisHistory:
+    """
+    분석 결과를 SQLite에 누적 저장하고 종목별 점수 이력, 추천 변경 종목을 조회하는 저장소
+
+    저장 요청은 큐에 넣기만 하고 반환하며, 별도 스레드가 모아서 한 트랜잭션으로 기록합니다.
+    """
+
+    def __init__(self, path: str = "data/history.db", batch_size: int = 200, flush_interval: float = 1.0):
+        """
+        Args:
+            path (str): SQLite 파일 경로
+            batch_size (int): 한 트랜잭션에 기록할 최대 행 수
+            flush_interval (float): 새 행을 모아 기다리는 최대 시간 (초)
+        """
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        connection = self._connect()
+        connection.executescript(SCHEMA)
+        connection.close()
+
+        self._queue: "queue.Queue[Dict[str, Any]]" = queue.Queue()
+        self._writer = threading.Thread(target=self._write_loop, name="history-writer", daemon=True)
+        self._writer.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.path, timeout=10)
+        # WAL 모드에서는 기록 중에도 조회가 막히지 않는다
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.row_factory = sqlite3.Row
+        return connection
+
+    def record(self, result: Dict[str, Any], version: str = None):
+        """
+        분석 결과 한 건을 기록 대기열에 추가 (요청 스레드에서는 기록을 기다리지 않음)
+
+        Args:
+            result (Dict): build_analysis 결과 (요약 포함 가능)
+            version (str): 신호 계산 방식 버전
+        """
+        stock_info = result.get('stock_info', {})
+        summary = result.get('expert_summary')
+        self._queue.put({
+            "symbol": result['symbol'],
+            "date": stock_info.get('latest_date'),
+            "analyzed_at": datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            "price": stock_info.get('latest_price'),
+            "total_score": int(result['total_score']),
+            "recommendation": result['recommendation'],
+            "signals": json.dumps(result['signals'], ensure_ascii=False),
+            "scores": json.dumps(result['scores']),
+            "raw_values": json.dumps(result.get('values', {})),
+            "summary_hash": hashlib.sha1(summary.encode('utf-8')).hexdigest() if summary else None,
+            "summary_source": result.get('summary_source'),
+            "version": version
+        })
+
+    def _write_loop(self):
+        """
+        대기열의 행을 batch_size개 또는 flush_interval초 단위로 모아 기록
+        """
+        connection = self._connect()
+        while True:
+            rows = [self._queue.get()]
+            try:
+                while len(rows) < self.batch_size:
+                    rows.append(self._queue.get(timeout=self.flush_interval))
+            except queue.Empty:
+                pass
+
+            try:
+                with connection:
+                    connection.executemany(INSERT_SQL, rows)
+            except Exception as e:
+                print(f"⚠️ 분석 이력 {len(rows)}건 기록 실패: {str(e)}")
+            finally:
+                for _ in rows:
+                    self._queue.task_done()
+
+    def flush(self):
+        """
+        대기 중인 행이 모두 기록될 때까지 대기
+        """
+        self._queue.join()
+
+    def score_history(self, symbol: str, days: int = 30, today: date = None) -> List[Dict[str, Any]]:
+        """
+        최근 days일 동안의 종목 점수 이력 (날짜별 마지막 분석 결과)
+
+        Returns:
+            List[Dict]: 날짜순 {date, analyzed_at, price, total_score, recommendation, signals, scores, raw_values}
+        """
+        since = ((today or date.today()) - timedelta(days=days)).isoformat()
+        connection = self._connect()
+        try:
+            rows = connection.execute(SCORE_HISTORY_SQL, (symbol.upper(), since)).fetchall()
+        finally:
+            connection.close()
+
+        history = []
+        for row in rows:
+            entry = dict(row)
+            for column in ("signals", "scores", "raw_values"):
+                entry[column] = json.loads(entry[column])
+            history.append(entry)
+        return history
+
+    def iter_daily_results(self, start: str = None, end: str = None, symbols: List[str] = None,
+                           chunk_rows: int = 5000) -> Iterator[List[Dict[str, Any]]]:
+        """
+        기간 내 종목/날짜별 마지막 분석 결과를 chunk_rows행씩 나눠 반환 (전체 결과를 메모리에 올리지 않음)
+
+        Args:
+            start (str): 시작 날짜 (YYYY-MM-DD, 없으면 처음부터)
+            end (str): 종료 날짜 (YYYY-MM-DD, 없으면 끝까지)
+            symbols (List[str]): 포함할 종목 (없으면 전체)
+            chunk_rows (int): 한 번에 반환할 행 수
+
+        Returns:
+            Iterator[List[Dict]]: 종목, 날짜 순 {symbol, date, analyzed_at, price, total_score, recommendation,
+                                  signals, scores, raw_values, version} 묶음
+        """
+        symbol_filter = json.dumps([s.upper() for s in symbols]) if symbols else None
+        connection = self._connect()
+        try:
+            cursor = connection.execute(DAILY_RESULTS_SQL, (start or "0000-01-01", end or "9999-12-31",
+                                                            symbol_filter, symbol_filter))
+            while True:
+                rows = cursor.fetchmany(chunk_rows)
+                if not rows:
+                    break
+                chunk = []
+                for row in rows:
+                    entry = dict(row)
+                    for column in ("signals", "scores", "raw_values"):
+                        entry[column] = json.loads(entry[column])
+                    chunk.append(entry)
+                yield chunk
+        finally:
+            connection.close()
+
+    def recommendation_changes(self, on_date: str = None) -> Dict[str, Any]:
+        """
+        on_date의 추천이 직전 기록 날짜의 추천과 달라진 종목
+
+        Args:
+            on_date (str): 기준 날짜 (YYYY-MM-DD, 없으면 기록된 가장 최근 날짜)
+
+        Returns:
+            Dict[str, Any]: {date, changes: [{symbol, price, total_score, recommendation,
+                             previous_date, previous_recommendation}]}
+        """
+        connection = self._connect()
+        try:
+            if on_date is None:
+                on_date = connection.execute("SELECT MAX(date) FROM analysis_history").fetchone()[0]
+            rows = connection.execute(RECOMMENDATION_CHANGES_SQL, (on_date,)).fetchall() if on_date else []
+        finally:
+            connection.close()
+
+        changes = [dict(row) for row in rows
+                   if row['previous_recommendation'] is not None
+                   and row['previous_recommendation'] != row['recommendation']]
+        return {"date": on_date, "changes": changes}
+
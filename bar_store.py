@@ -0,0 +1,172 @@
+import os
+import threading
+from datetime import date
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from cache_backend import CacheBackend, encode_bars, decode_bars
+from lru_cache import LRUCache
+from memory_governor import MemoryGovernor
+
+# 주말/공휴일 때문에 요청 경계와 실제 첫/마지막 봉 날짜가 벌어질 수 있는 최대 일수
+BOUNDARY_SLACK_DAYS = 4
+
+# 저장된 일봉 사이에 빠져 있어도 공휴일로 보고 허용하는 연속 평일 수 (넘으면 구간에 구멍이 있다고 보고 다시 조회)
+MAX_MISSING_WEEKDAYS = 2
+
+# 메모리에서 밀려난 일봉을 다시 만드는 상대 비용 (디스크 파일에서 바로 다시 읽으므로 낮음)
+MEMORY_CACHE_COST = 1.0
+
+
+class BarStore:
+    """
+    종목별 일봉 데이터를 로컬 디스크에 누적 보관하는 저장소
+
+    FMP에서 받은 데이터를 종목별 파일 하나에 날짜 기준으로 병합해 저장하고,
+    요청 구간을 이미 가지고 있으면 네트워크 없이 바로 돌려줍니다.
+    공유 캐시(shared)가 있으면 저장할 때 함께 올리고, 로컬에 없는 구간은 공유 캐시에서 먼저 찾습니다.
+    """
+
+    def __init__(self, directory: str = "data/bars", memory_entries: Optional[int] = 64,
+                 shared: Optional[CacheBackend] = None, governor: Optional[MemoryGovernor] = None):
+        """
+        Args:
+            directory (str): 일봉 파일을 저장할 디렉터리
+            memory_entries (int): 메모리에 올려둘 종목 수 (governor가 있으면 None으로 두어 메모리 예산만 적용 가능)
+            shared (CacheBackend): 다른 인스턴스와 함께 쓰는 캐시 백엔드 (예: RedisBackend)
+            governor (MemoryGovernor): 메모리 일봉 캐시의 바이트 크기를 관리할 메모리 관리자
+        """
+        self.directory = directory
+        self.shared = shared
+        if governor is not None:
+            self._memory = governor.cache("bars", MEMORY_CACHE_COST, max_entries=memory_entries)
+        else:
+            self._memory = LRUCache(max_entries=memory_entries)
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, symbol: str) -> str:
+        return os.path.join(self.directory, f"{symbol.upper()}.pkl")
+
+    def load(self, symbol: str) -> pd.DataFrame:
+        """
+        종목의 저장된 전체 일봉 (없으면 빈 DataFrame)
+        """
+        symbol = symbol.upper()
+        cached = self._memory.get(symbol)
+        if cached is not None:
+            return cached
+
+        path = self._path(symbol)
+        if not os.path.exists(path):
+            return pd.DataFrame()
+        try:
+            data = pd.read_pickle(path)
+        except Exception as e:
+            print(f"⚠️ {symbol} 로컬 일봉 파일을 읽을 수 없습니다: {str(e)}")
+            return pd.DataFrame()
+
+        self._memory.set(symbol, data)
+        return data
+
+    def save(self, symbol: str, data: pd.DataFrame, publish: bool = True):
+        """
+        새로 받은 일봉을 기존 데이터와 날짜 기준으로 병합해 저장 (같은 날짜는 새 데이터 우선)
+
+        공급자마다 수정주가 기준이 달라 섞으면 지표가 틀어지므로, 저장된 일봉과 공급자(attrs["source"])가
+        다르면 병합하지 않고 새 데이터로 교체합니다. 공급자는 저장된 일봉의 attrs["source"]에 함께 기록됩니다.
+
+        Args:
+            publish (bool): 병합 결과를 공유 캐시에도 저장할지 여부
+        """
+        if data.empty:
+            return
+        symbol = symbol.upper()
+        source = data.attrs.get("source")
+
+        with self._lock:
+            existing = self.load(symbol)
+            existing_source = existing.attrs.get("source")
+            if existing.empty:
+                pass
+            elif source is None or existing_source is None or source == existing_source:
+                data = pd.concat([existing, data])
+                data = data[~data.index.duplicated(keep="last")]
+            else:
+                print(f"⚠️ {symbol} 저장된 일봉({existing_source})과 공급자({source})가 달라 병합하지 않고 교체합니다.")
+            data = data.sort_index()
+            data.attrs["source"] = source or existing_source
+
+            # 쓰는 도중 실패해도 기존 파일이 깨지지 않도록 임시 파일에 쓴 뒤 교체
+            path = self._path(symbol)
+            tmp_path = f"{path}.tmp"
+            data.to_pickle(tmp_path)
+            os.replace(tmp_path, path)
+            self._memory.set(symbol, data)
+
+        if publish and self.shared is not None:
+            self.shared.set(self._shared_key(symbol), encode_bars(data))
+
+    @staticmethod
+    def _shared_key(symbol: str) -> str:
+        return f"bars:{symbol.upper()}"
+
+    def _pull_shared(self, symbol: str) -> bool:
+        """
+        공유 캐시의 일봉을 로컬 저장소에 병합 (가져온 데이터가 있으면 True)
+        """
+        payload = self.shared.get(self._shared_key(symbol))
+        if payload is None:
+            return False
+        try:
+            data = decode_bars(payload)
+        except ValueError as e:
+            print(f"⚠️ {symbol} 공유 일봉 캐시를 읽을 수 없습니다: {str(e)}")
+            return False
+        self.save(symbol, data, publish=False)
+        return True
+
+    def get_range(self, symbol: str, start: date, end: date, latest_required: date = None) -> Optional[pd.DataFrame]:
+        """
+        요청 구간 전체를 로컬에 가지고 있으면 해당 구간을 반환
+
+        Args:
+            symbol (str): 주식 심볼
+            start (date): 시작일
+            end (date): 종료일
+            latest_required (date): 반드시 포함되어야 하는 마지막 거래일 (없으면 종료일 기준으로 판단)
+
+        Returns:
+            Optional[pd.DataFrame]: 구간 데이터, 로컬 데이터가 구간을 다 덮지 못하거나 중간에 빠진 거래일이 있으면 None
+        """
+        sliced = self._local_range(symbol, start, end, latest_required)
+        if sliced is None and self.shared is not None and self._pull_shared(symbol):
+            sliced = self._local_range(symbol, start, end, latest_required)
+        return sliced
+
+    def _local_range(self, symbol: str, start: date, end: date, latest_required: date = None) -> Optional[pd.DataFrame]:
+        data = self.load(symbol)
+        if data.empty:
+            return None
+
+        first_date = data.index[0].date()
+        last_date = data.index[-1].date()
+        if (start - first_date).days < -BOUNDARY_SLACK_DAYS:
+            return None
+        if latest_required is not None:
+            if last_date < latest_required:
+                return None
+        elif (end - last_date).days > BOUNDARY_SLACK_DAYS:
+            return None
+
+        sliced = data.loc[pd.Timestamp(start):pd.Timestamp(end)]
+        if sliced.empty:
+            return None
+        # 떨어진 구간을 따로 저장했으면 처음/마지막 날짜는 맞아도 중간이 비어 있으므로 다시 조회
+        days = sliced.index.values.astype("datetime64[D]")
+        missing = np.busday_count(days[:-1], days[1:]) - 1
+        if len(missing) and missing.max() > MAX_MISSING_WEEKDAYS:
+            return None
+        return sliced
@@ -0,0 +1,281 @@
+"""
+대량 종목 배치 분석 CLI - 종목 파일을 스트림으로 읽어 동시에 분석하고 결과를 한 행씩 CSV/Parquet에 기록
+
+수천 개 종목의 야간 리포트용입니다. 이미 기록된 종목은 출력 파일에서 읽어 건너뛰므로(--resume),
+중간에 중단되어도 처음부터 다시 분석하지 않습니다.
+
+사용 예:
+    python batch_runner.py symbols.txt results.csv --period 1y --workers 8 --resume
+    python batch_runner.py symbols.txt results.parquet --format parquet --quiet
+"""
+
+import argparse
+import csv
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, ALL_COMPLETED, FIRST_COMPLETED
+from contextlib import redirect_stdout
+from typing import Any, Dict, Iterator, List, Set
+
+from stock_data_fetcher import StockDataFetcher
+from stock_trading_analyzer import StockTradingAnalyzer
+from vectorized_signals import INDICATORS
+
+# 결과 행 컬럼 (지표별 신호/점수 포함)
+RESULT_COLUMNS = (
+    ["symbol", "date", "price"]
+    + [f"{key}_{field}" for key in INDICATORS for field in ("signal", "score")]
+    + ["total_score", "recommendation", "data_source", "stale", "error"]
+)
+
+# Parquet 파트 파일 하나에 모아 쓰는 행 수 (중단되면 아직 쓰지 않은 행만 다시 분석)
+PARQUET_ROWS_PER_PART = 500
+
+
+def read_symbols(path: str) -> Iterator[str]:
+    """
+    종목 파일을 한 줄씩 읽어 종목 코드를 차례로 반환 (빈 줄, # 주석 무시, CSV면 첫 번째 컬럼 사용)
+    """
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            symbol = line.split("#", 1)[0].split(",", 1)[0].strip().upper()
+            if symbol and symbol != "SYMBOL":
+                yield symbol
+
+
+def result_row(symbol: str, result: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    analyze_stock 결과를 출력 파일의 한 행으로 변환
+    """
+    row = {column: None for column in RESULT_COLUMNS}
+    row["symbol"] = symbol
+    if "error" in result:
+        row["error"] = result["error"]
+        return row
+
+    stock_info = result["stock_info"]
+    row.update(
+        date=stock_info["latest_date"],
+        price=round(stock_info["latest_price"], 4),
+        total_score=result["total_score"],
+        recommendation=result["recommendation"],
+        data_source=stock_info.get("data_source"),
+        stale=stock_info.get("stale", False)
+    )
+    for key in INDICATORS:
+        row[f"{key}_signal"] = result["signals"].get(key)
+        row[f"{key}_score"] = result["scores"].get(key)
+    return row
+
+
+class CsvResultWriter:
+    """
+    결과를 CSV 파일에 한 행씩 추가하고 바로 flush하는 기록기
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = None
+        self._writer = None
+
+    def completed_symbols(self) -> Set[str]:
+        """
+        이미 성공적으로 기록된 종목 (중단 시 잘린 마지막 줄과 실패 행은 지우고 다시 분석)
+        """
+        if not os.path.exists(self.path):
+            return set()
+        with open(self.path, "rb+") as f:
+            content = f.read()
+            end = content.rfind(b"\n") + 1
+            if end < len(content):
+                f.truncate(end)
+        with open(self.path, encoding="utf-8", newline="") as f:
+            rows = [row for row in csv.DictReader(f) if row.get("symbol")]
+
+        # 일시적인 FMP/네트워크 오류로 실패한 종목을 다시 분석하도록 실패 행 제거
+        succeeded = [row for row in rows if not row.get("error")]
+        if len(succeeded) < len(rows):
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8", newline="") as f:
+                writer = csv.DictWriter(f, fieldnames=RESULT_COLUMNS)
+                writer.writeheader()
+                writer.writerows(succeeded)
+            os.replace(tmp_path, self.path)
+        return {row["symbol"] for row in succeeded}
+
+    def open(self):
+        is_new = not os.path.exists(self.path) or os.path.getsize(self.path) == 0
+        self._file = open(self.path, "a", encoding="utf-8", newline="")
+        self._writer = csv.DictWriter(self._file, fieldnames=RESULT_COLUMNS)
+        if is_new:
+            self._writer.writeheader()
+
+    def write(self, row: Dict[str, Any]):
+        self._writer.writerow(row)
+        self._file.flush()
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+
+
+class ParquetResultWriter:
+    """
+    결과를 디렉터리 안의 Parquet 파트 파일(part-00000.parquet, ...)로 나눠 기록하는 기록기
+
+    Parquet 파일은 끝까지 쓰기 전에는 읽을 수 없으므로, 행을 모았다가 파트 파일 단위로 임시 파일에 쓴 뒤 교체합니다.
+    디렉터리 전체는 pandas.read_parquet(path)로 한 번에 읽을 수 있습니다. pyarrow가 필요합니다.
+    """
+
+    def __init__(self, path: str, rows_per_part: int = PARQUET_ROWS_PER_PART):
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise RuntimeError("Parquet 출력에는 pyarrow가 필요합니다 (pip install pyarrow).")
+        self._pa = pyarrow
+        self._pq = pyarrow.parquet
+        self.path = path
+        self.rows_per_part = rows_per_part
+        self._rows: List[Dict[str, Any]] = []
+        self._next_part = 0
+
+    def _parts(self) -> List[str]:
+        if not os.path.isdir(self.path):
+            return []
+        return sorted(name for name in os.listdir(self.path) if name.startswith("part-") and name.endswith(".parquet"))
+
+    def completed_symbols(self) -> Set[str]:
+        """
+        이미 성공적으로 기록된 종목 (실패 행이 있는 파트 파일은 실패 행을 지우고 다시 기록)
+        """
+        symbols = set()
+        for name in self._parts():
+            path = os.path.join(self.path, name)
+            table = self._pq.read_table(path)
+            succeeded = table.filter(table.column("error").is_null())
+            if succeeded.num_rows < table.num_rows:
+                if succeeded.num_rows:
+                    self._pq.write_table(succeeded, f"{path}.tmp")
+                    os.replace(f"{path}.tmp", path)
+                else:
+                    os.remove(path)
+            symbols.update(succeeded.column("symbol").to_pylist())
+        return symbols
+
+    def open(self):
+        os.makedirs(self.path, exist_ok=True)
+        parts = self._parts()
+        self._next_part = int(parts[-1][5:10]) + 1 if parts else 0
+
+    def write(self, row: Dict[str, Any]):
+        self._rows.append(row)
+        if len(self._rows) >= self.rows_per_part:
+            self._flush()
+
+    def _flush(self):
+        if not self._rows:
+            return
+        table = self._pa.Table.from_pylist(self._rows, schema=self._schema())
+        path = os.path.join(self.path, f"part-{self._next_part:05d}.parquet")
+        self._pq.write_table(table, f"{path}.tmp")
+        os.replace(f"{path}.tmp", path)
+        self._next_part += 1
+        self._rows = []
+
+    def _schema(self):
+        pa = self._pa
+        types = {"price": pa.float64(), "total_score": pa.int64(), "stale": pa.bool_()}
+        types.update({f"{key}_score": pa.int64() for key in INDICATORS})
+        return pa.schema([(column, types.get(column, pa.string())) for column in RESULT_COLUMNS])
+
+    def close(self):
+        self._flush()
+
+
+def run_batch(symbols: Iterator[str], writer, analyzer: StockTradingAnalyzer, period: str = "1y",
+              as_of: str = None, workers: int = 8, resume: bool = False) -> Dict[str, int]:
+    """
+    종목을 동시에 분석하고 끝나는 순서대로 결과를 기록
+
+    동시에 진행 중인 분석은 workers * 2개로 제한되어, 종목 파일 크기와 관계없이 메모리 사용량이 일정합니다.
+
+    Returns:
+        Dict[str, int]: analyzed(성공), failed(실패), skipped(이미 기록되어 건너뜀) 종목 수
+    """
+    done = writer.completed_symbols() if resume else set()
+    counts = {"analyzed": 0, "failed": 0, "skipped": 0}
+    started = time.monotonic()
+
+    def analyze(symbol):
+        try:
+            return result_row(symbol, analyzer.analyze_stock(symbol, period=period, as_of=as_of))
+        except Exception as e:
+            return result_row(symbol, {"error": f"분석 중 오류 발생: {str(e)}"})
+
+    def collect(futures, return_when):
+        finished, pending = wait(futures, return_when=return_when)
+        for future in finished:
+            row = future.result()
+            writer.write(row)
+            counts["failed" if row["error"] else "analyzed"] += 1
+            total = counts["analyzed"] + counts["failed"]
+            if total % 100 == 0:
+                print(f"⏳ {total}개 종목 분석 ({time.monotonic() - started:.0f}초)", file=sys.stderr)
+        return pending
+
+    writer.open()
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            pending = set()
+            for symbol in symbols:
+                if symbol in done:
+                    counts["skipped"] += 1
+                    continue
+                done.add(symbol)
+                pending.add(executor.submit(analyze, symbol))
+                if len(pending) >= workers * 2:
+                    pending = collect(pending, FIRST_COMPLETED)
+            collect(pending, ALL_COMPLETED)
+    finally:
+        writer.close()
+    return counts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="종목 파일의 모든 종목을 분석해 CSV/Parquet으로 저장")
+    parser.add_argument("symbols_file", help="한 줄에 종목 하나 (CSV면 첫 번째 컬럼)")
+    parser.add_argument("output", help="결과 CSV 파일 또는 Parquet 디렉터리")
+    parser.add_argument("--format", choices=("csv", "parquet"), help="출력 형식 (기본: 확장자로 판단)")
+    parser.add_argument("--period", default="1y", help="데이터 기간 (기본 1y)")
+    parser.add_argument("--as-of", help="분석 기준일 (YYYY-MM-DD)")
+    parser.add_argument("--workers", type=int, default=8, help="동시 분석 수 (기본 8)")
+    parser.add_argument("--resume", action="store_true", help="출력에 이미 기록된 종목은 건너뛰고 이어서 분석 (실패한 종목은 다시 분석)")
+    parser.add_argument("--bar-store", help="로컬 일봉 저장소 디렉터리 (다시 실행할 때 네트워크 호출 절약)")
+    parser.add_argument("--quiet", action="store_true", help="종목별 분석 로그를 출력하지 않음 (진행 상황만 표시)")
+    args = parser.parse_args(argv)
+
+    output_format = args.format or ("parquet" if args.output.endswith(".parquet") else "csv")
+    if os.path.exists(args.output) and not args.resume:
+        parser.error(f"{args.output}이(가) 이미 있습니다. 이어서 분석하려면 --resume을 사용하세요.")
+
+    try:
+        writer = ParquetResultWriter(args.output) if output_format == "parquet" else CsvResultWriter(args.output)
+    except RuntimeError as e:
+        parser.error(str(e))
+    analyzer = StockTradingAnalyzer()
+    if args.bar_store:
+        from bar_store import BarStore
+        analyzer.data_fetcher = StockDataFetcher(bar_store=BarStore(args.bar_store))
+
+    print(f"🚀 배치 분석 시작 ({args.symbols_file} → {args.output}, {output_format})", file=sys.stderr)
+    with open(os.devnull, "w") as devnull, redirect_stdout(devnull if args.quiet else sys.stdout):
+        counts = run_batch(read_symbols(args.symbols_file), writer, analyzer, period=args.period,
+                           as_of=args.as_of, workers=args.workers, resume=args.resume)
+    print(f"✅ 배치 분석 완료 (성공 {counts['analyzed']}개, 실패 {counts['failed']}개, "
+          f"건너뜀 {counts['skipped']}개)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
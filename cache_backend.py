@@ -0,0 +1,304 @@
+"""
+여러 앱 인스턴스가 함께 쓰는 캐시 백엔드 - 프로세스 내 메모리 구현과 Redis 프로토콜(RESP) 구현
+
+일봉, 분석 응답, ChatGPT 요약 캐시는 모두 bytes 값을 저장하는 같은 인터페이스를 사용합니다.
+Redis를 설정하면 한 인스턴스가 채운 캐시를 다른 인스턴스도 그대로 사용합니다.
+"""
+
+import json
+import os
+import queue
+import socket
+import struct
+import threading
+import time
+import zlib
+from typing import Any, Optional
+from urllib.parse import urlparse
+
+import numpy as np
+import pandas as pd
+
+from lru_cache import LRUCache
+from memory_governor import MemoryGovernor
+
+# 일봉 바이너리 형식 식별자 (형식이 바뀌면 버전을 올림)
+BAR_FORMAT_MAGIC = b"STB1"
+
+# Redis 오류 로그를 다시 출력하기까지의 최소 간격 (초)
+ERROR_LOG_INTERVAL = 60.0
+
+# 연결 오류 후 Redis에 다시 연결을 시도하기까지 캐시 미스로 처리하는 시간 (초)
+RECONNECT_DELAY = 5.0
+
+# 메모리 관리자에 등록하는 키 접두사별 상대 재생성 비용 (분석 응답은 재계산, 요약은 ChatGPT 재요청)
+MEMORY_CACHE_COSTS = {"analysis": 5.0, "summary": 50.0}
+
+
+def encode_bars(data: pd.DataFrame) -> bytes:
+    """
+    일봉을 압축 바이너리로 변환 (날짜는 int64 나노초, 숫자 컬럼은 float64 배열, 문자열 컬럼은 제외, 공급자는 헤더에 기록)
+    """
+    columns = [column for column in data.columns if pd.api.types.is_numeric_dtype(data[column])]
+    header = json.dumps({"columns": columns, "rows": len(data),
+                         "source": data.attrs.get("source")}).encode("utf-8")
+    parts = [struct.pack("<I", len(header)), header,
+             data.index.values.astype("datetime64[ns]").view(np.int64).tobytes()]
+    parts.extend(data[column].to_numpy(dtype=np.float64).tobytes() for column in columns)
+    return BAR_FORMAT_MAGIC + zlib.compress(b"".join(parts), 1)
+
+
+def decode_bars(payload: bytes) -> pd.DataFrame:
+    """
+    encode_bars 결과를 일봉 DataFrame으로 복원 (형식이 다르면 ValueError)
+    """
+    if not payload.startswith(BAR_FORMAT_MAGIC):
+        raise ValueError("일봉 캐시 형식이 올바르지 않습니다.")
+    raw = zlib.decompress(payload[len(BAR_FORMAT_MAGIC):])
+    header_size = struct.unpack_from("<I", raw)[0]
+    header = json.loads(raw[4:4 + header_size])
+    rows, offset = header["rows"], 4 + header_size
+
+    dates = np.frombuffer(raw, dtype=np.int64, count=rows, offset=offset)
+    offset += rows * 8
+    values = {}
+    for column in header["columns"]:
+        values[column] = np.frombuffer(raw, dtype=np.float64, count=rows, offset=offset).copy()
+        offset += rows * 8
+    data = pd.DataFrame(values, index=pd.DatetimeIndex(dates.view("datetime64[ns]"), name="Date"))
+    if header.get("source"):
+        data.attrs["source"] = header["source"]
+    return data
+
+
+class CacheBackend:
+    """
+    캐시 백엔드 기본 클래스 (키는 문자열, 값은 bytes)
+    """
+
+    name = "base"
+    # 다른 인스턴스와 공유되는 저장소인지 여부
+    shared = False
+
+    def get(self, key: str) -> Optional[bytes]:
+        raise NotImplementedError
+
+    def set(self, key: str, value: bytes, ttl: Optional[float] = None):
+        raise NotImplementedError
+
+    def delete(self, key: str):
+        raise NotImplementedError
+
+    def get_json(self, key: str) -> Optional[Any]:
+        payload = self.get(key)
+        return json.loads(payload) if payload is not None else None
+
+    def set_json(self, key: str, value: Any, ttl: Optional[float] = None):
+        self.set(key, json.dumps(value, ensure_ascii=False).encode("utf-8"), ttl)
+
+
+class MemoryBackend(CacheBackend):
+    """
+    프로세스 내 LRU 캐시 백엔드 (인스턴스 하나만 실행할 때의 기본값)
+
+    governor가 있으면 키 접두사("analysis", "summary" 등)마다 별도 캐시로 메모리 관리자에 등록해
+    항목 수 대신 바이트 크기와 재생성 비용으로 제거 순서를 정합니다.
+    """
+
+    name = "memory"
+
+    def __init__(self, max_entries: Optional[int] = 1024, governor: Optional[MemoryGovernor] = None):
+        """
+        Args:
+            max_entries (int): 보관할 최대 항목 수 (governor가 있으면 접두사별 상한, None이면 메모리 예산만 적용)
+            governor (MemoryGovernor): 메모리 관리자
+        """
+        self.max_entries = max_entries
+        self.governor = governor
+        self._cache = LRUCache(max_entries=max_entries) if governor is None else None
+
+    def _cache_for(self, key: str) -> LRUCache:
+        if self.governor is None:
+            return self._cache
+        prefix = key.split(":", 1)[0]
+        return self.governor.cache(prefix, MEMORY_CACHE_COSTS.get(prefix, 1.0), max_entries=self.max_entries)
+
+    def get(self, key: str) -> Optional[bytes]:
+        entry = self._cache_for(key).get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            return None
+        return value
+
+    def set(self, key: str, value: bytes, ttl: Optional[float] = None):
+        self._cache_for(key).set(key, (time.monotonic() + ttl if ttl else None, value))
+
+    def delete(self, key: str):
+        self._cache_for(key).delete(key)
+
+
+class RedisError(Exception):
+    """
+    Redis 서버가 오류 응답(-ERR ...)을 보냈을 때 발생하는 예외
+    """
+
+
+class RedisBackend(CacheBackend):
+    """
+    GET/SET/DEL만 사용하는 최소 Redis 프로토콜(RESP) 클라이언트 백엔드
+
+    연결은 스레드 간에 풀로 재사용합니다. 서버에 연결할 수 없으면 캐시 미스로 처리하고
+    (일정 간격으로 경고만 출력) 요청은 원래 경로(FMP, ChatGPT)로 처리됩니다.
+    """
+
+    name = "redis"
+    shared = True
+
+    def __init__(self, url: str = "redis://localhost:6379/0", timeout: float = 1.0, pool_size: int = 8):
+        """
+        Args:
+            url (str): redis://[:password@]host:port/db 형식 주소
+            timeout (float): 연결/응답 제한 시간 (초)
+            pool_size (int): 보관할 최대 유휴 연결 수
+        """
+        parsed = urlparse(url)
+        self.host = parsed.hostname or "localhost"
+        self.port = parsed.port or 6379
+        self.password = parsed.password
+        self.db = int(parsed.path.lstrip("/") or 0)
+        self.timeout = timeout
+        self._pool: "queue.LifoQueue" = queue.LifoQueue(maxsize=pool_size)
+        self._last_error_logged = 0.0
+        self._unavailable_until = 0.0
+        self._error_lock = threading.Lock()
+
+    def _connect(self):
+        sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        connection = (sock, sock.makefile("rb"))
+        try:
+            if self.password:
+                self._send(connection, "AUTH", self.password)
+            if self.db:
+                self._send(connection, "SELECT", str(self.db))
+        except Exception:
+            sock.close()
+            raise
+        return connection
+
+    @staticmethod
+    def _encode(args) -> bytes:
+        parts = [b"*%d\r\n" % len(args)]
+        for arg in args:
+            value = arg if isinstance(arg, bytes) else str(arg).encode("utf-8")
+            parts.append(b"$%d\r\n%s\r\n" % (len(value), value))
+        return b"".join(parts)
+
+    @classmethod
+    def _read_reply(cls, reader):
+        line = reader.readline()
+        if not line:
+            raise ConnectionError("Redis 연결이 끊어졌습니다.")
+        kind, body = line[:1], line[1:-2]
+        if kind == b"+":
+            return body.decode("utf-8")
+        if kind == b"-":
+            raise RedisError(body.decode("utf-8"))
+        if kind == b":":
+            return int(body)
+        if kind == b"$":
+            size = int(body)
+            if size < 0:
+                return None
+            data = reader.read(size + 2)
+            return data[:-2]
+        if kind == b"*":
+            count = int(body)
+            return None if count < 0 else [cls._read_reply(reader) for _ in range(count)]
+        raise RedisError(f"알 수 없는 응답 형식입니다: {line!r}")
+
+    def _send(self, connection, *args):
+        sock, reader = connection
+        sock.sendall(self._encode(args))
+        return self._read_reply(reader)
+
+    def command(self, *args):
+        """
+        Redis 명령 실행 (연결 오류는 OSError, 서버 오류 응답은 RedisError)
+        
+        연결 오류가 나면 RECONNECT_DELAY 동안은 연결을 시도하지 않고 바로 ConnectionError를 발생시킵니다.
+        """
+        if time.monotonic() < self._unavailable_until:
+            raise ConnectionError("최근 연결 오류로 잠시 사용하지 않습니다.")
+        try:
+            connection = self._pool.get_nowait()
+        except queue.Empty:
+            try:
+                connection = self._connect()
+            except OSError:
+                self._unavailable_until = time.monotonic() + RECONNECT_DELAY
+                raise
+        try:
+            reply = self._send(connection, *args)
+        except RedisError:
+            self._release(connection)
+            raise
+        except Exception:
+            connection[0].close()
+            self._unavailable_until = time.monotonic() + RECONNECT_DELAY
+            raise
+        self._release(connection)
+        return reply
+
+    def _release(self, connection):
+        try:
+            self._pool.put_nowait(connection)
+        except queue.Full:
+            connection[0].close()
+
+    def _log_error(self, error: Exception):
+        with self._error_lock:
+            now = time.monotonic()
+            if now - self._last_error_logged < ERROR_LOG_INTERVAL:
+                return
+            self._last_error_logged = now
+        print(f"⚠️ Redis 캐시를 사용할 수 없습니다 ({self.host}:{self.port}): {str(error)}")
+
+    def get(self, key: str) -> Optional[bytes]:
+        try:
+            return self.command("GET", key)
+        except (OSError, RedisError) as e:
+            self._log_error(e)
+            return None
+
+    def set(self, key: str, value: bytes, ttl: Optional[float] = None):
+        args = ["SET", key, value]
+        if ttl:
+            args += ["PX", int(ttl * 1000)]
+        try:
+            self.command(*args)
+        except (OSError, RedisError) as e:
+            self._log_error(e)
+
+    def delete(self, key: str):
+        try:
+            self.command("DEL", key)
+        except (OSError, RedisError) as e:
+            self._log_error(e)
+
+
+def create_cache_backend(governor: Optional[MemoryGovernor] = None) -> CacheBackend:
+    """
+    환경변수 설정으로 캐시 백엔드 생성 (CACHE_BACKEND=memory 기본값 / redis - REDIS_URL 사용)
+
+    memory 백엔드는 governor가 있으면 CACHE_MEMORY_ENTRIES를 지정하지 않는 한 메모리 예산만 적용합니다.
+    """
+    backend = os.environ.get("CACHE_BACKEND", "memory").lower()
+    if backend == "redis":
+        return RedisBackend(os.environ.get("REDIS_URL", "redis://localhost:6379/0"))
+    if backend == "memory":
+        entries = os.environ.get("CACHE_MEMORY_ENTRIES")
+        return MemoryBackend(int(entries) if entries else (None if governor else 1024), governor)
+    raise ValueError(f"지원하지 않는 캐시 백엔드입니다: {backend} (memory, redis 중 선택)")
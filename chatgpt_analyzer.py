@@ -1,48 +1,272 @@
 import openai
-from typing import Dict, Any
+from typing import Dict, Any, List, Tuple
 import json
+import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+SYSTEM_PROMPT = "당신은 20년 경력의 주식 투자 전문가입니다. 일반 투자자들이 쉽게 이해할 수 있도록 친근하고 정성적으로 설명해주세요."
+
+# 압축 프롬프트의 응답 형식 지시 (페르소나는 system 메시지에만 둔다)
+COMPACT_FORMAT_INSTRUCTION = """형식:
+🧠 전문가 종합평가:
+(수치 나열 없이 쉬운 말로 현재 상황 종합)
+📈 투자자별 전략 제안:
+👤 주식 미보유자:
+(한 문단)
+💼 주식 보유자:
+(한 문단)
+큰따옴표 금지, 자연스러운 한국어."""
+
+PROMPT_FORMATS = ("compact", "full")
+
+# 응답 길이 단계별 max_tokens (종목 하나 기준)
+OUTPUT_LENGTH_TIERS = {
+    "short": 350,
+    "standard": 650,
+    "detailed": 1000
+}
+
+# 배치 응답에서 심볼별 섹션을 구분하는 헤더 (예: "=== AAPL ===")
+BATCH_SECTION_PATTERN = re.compile(r"^===\s*([A-Za-z0-9.\-^]+)\s*===\s*$", re.MULTILINE)
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    토큰 수 대략 추정 (한국어 위주 텍스트는 글자 2개당 약 1토큰)
+    """
+    return len(text) // 2 + 1
+
+
+class RateLimiter:
+    """
+    분당 요청 수(RPM)와 분당 토큰 수(TPM) 한도를 지키도록 호출을 지연시키는 클래스
+    """
+
+    def __init__(self, rpm_limit: int = 60, tpm_limit: int = 30000, window: float = 60.0):
+        """
+        Args:
+            rpm_limit (int): 분당 최대 요청 수
+            tpm_limit (int): 분당 최대 토큰 수
+            window (float): 한도 계산 구간 (초)
+        """
+        self.rpm_limit = rpm_limit
+        self.tpm_limit = tpm_limit
+        self.window = window
+        self._events = deque()  # (timestamp, tokens)
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: int):
+        """
+        요청 한 건(tokens 토큰)을 보낼 수 있을 때까지 대기
+        """
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                while self._events and now - self._events[0][0] >= self.window:
+                    self._events.popleft()
+
+                used_tokens = sum(t for _, t in self._events)
+                # 단일 요청이 TPM 한도보다 커도 빈 구간에서는 통과시킨다
+                fits_tokens = not self._events or used_tokens + tokens <= self.tpm_limit
+                if len(self._events) < self.rpm_limit and fits_tokens:
+                    self._events.append((now, tokens))
+                    return
+                wait = self.window - (now - self._events[0][0])
+            time.sleep(max(wait, 0.01))
+
 
 class ChatGPTAnalyzer:
     """
     ChatGPT API를 사용하여 주식 기술적 분석 결과를 전문가적으로 요약하는 클래스
     """
     
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, rpm_limit: int = 60, tpm_limit: int = 30000,
+                 prompt_format: str = "compact", length_tier: str = "standard"):
         """
         ChatGPT 분석기 초기화
         
         Args:
             api_key (str): OpenAI API 키
+            rpm_limit (int): 분당 최대 요청 수 (배치 요약용)
+            tpm_limit (int): 분당 최대 토큰 수 (배치 요약용)
+            prompt_format (str): 프롬프트 형식 ("compact" 또는 기존 형식 "full")
+            length_tier (str): 기본 응답 길이 단계 ("short", "standard", "detailed")
         """
+        if prompt_format not in PROMPT_FORMATS:
+            raise ValueError(f"지원하지 않는 프롬프트 형식입니다: {prompt_format}")
+        if length_tier not in OUTPUT_LENGTH_TIERS:
+            raise ValueError(f"지원하지 않는 응답 길이 단계입니다: {length_tier}")
+
         self.client = openai.OpenAI(api_key=api_key)
+        self.rate_limiter = RateLimiter(rpm_limit=rpm_limit, tpm_limit=tpm_limit)
+        self.prompt_format = prompt_format
+        self.length_tier = length_tier
+
+        # 누적 토큰 사용량
+        self.usage_totals = {"requests": 0, "prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
+        self._usage_lock = threading.Lock()
         
-    def generate_expert_summary(self, stock_data: Dict[str, Any]) -> str:
+    def generate_expert_summary(self, stock_data: Dict[str, Any], length_tier: str = None) -> str:
         """
         주식 데이터를 바탕으로 ChatGPT 전문가 분석 생성
         
         Args:
             stock_data (Dict): 주식 분석 데이터
+            length_tier (str): 응답 길이 단계 (없으면 기본값 사용)
             
         Returns:
             str: 전문가 분석 결과
         """
         try:
+            summary, _ = self.request_expert_summary(stock_data, length_tier)
+            return summary
+        except Exception as e:
+            return f"ChatGPT 분석 중 오류 발생: {str(e)}"
+
+    def request_expert_summary(self, stock_data: Dict[str, Any], length_tier: str = None) -> Tuple[str, Dict[str, int]]:
+        """
+        ChatGPT 전문가 분석 요청 (오류를 문자열로 바꾸지 않고 예외로 전달)
+        
+        Args:
+            stock_data (Dict): 주식 분석 데이터
+            length_tier (str): 응답 길이 단계 (없으면 기본값 사용)
+            
+        Returns:
+            Tuple[str, Dict[str, int]]: (전문가 분석 결과, 토큰 사용량)
+        """
+        if self.prompt_format == "compact":
+            prompt = self._create_compact_prompt(stock_data)
+        else:
             prompt = self._create_analysis_prompt(stock_data)
+        
+        response = self.client.chat.completions.create(
+            model="gpt-4o",
+            messages=[
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": prompt}
+            ],
+            max_tokens=self._max_tokens(length_tier),
+            temperature=0.7
+        )
+        
+        usage = self._record_usage(response, stock_data['symbol'])
+        return response.choices[0].message.content.strip(), usage
+
+    def get_usage_totals(self) -> Dict[str, int]:
+        """
+        지금까지의 누적 토큰 사용량 반환
+        """
+        with self._usage_lock:
+            return dict(self.usage_totals)
+
+    def _max_tokens(self, length_tier: str = None) -> int:
+        """
+        응답 길이 단계에 해당하는 종목당 max_tokens
+        """
+        tier = length_tier or self.length_tier
+        if tier not in OUTPUT_LENGTH_TIERS:
+            raise ValueError(f"지원하지 않는 응답 길이 단계입니다: {tier}")
+        return OUTPUT_LENGTH_TIERS[tier]
+
+    def _record_usage(self, response, label: str) -> Dict[str, int]:
+        """
+        응답의 토큰 사용량을 기록하고 로그로 출력
+        """
+        usage = {
+            "prompt_tokens": getattr(response.usage, "prompt_tokens", 0) if response.usage else 0,
+            "completion_tokens": getattr(response.usage, "completion_tokens", 0) if response.usage else 0
+        }
+        usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+
+        with self._usage_lock:
+            self.usage_totals["requests"] += 1
+            for key, value in usage.items():
+                self.usage_totals[key] += value
+
+        print(f"🧾 {label} ChatGPT 토큰 사용량: prompt={usage['prompt_tokens']}, completion={usage['completion_tokens']}")
+        return usage
+
+    def generate_batch_summaries(self, stock_data_list: List[Dict[str, Any]], batch_size: int = 4,
+                                 max_workers: int = 4, length_tier: str = None) -> Dict[str, str]:
+        """
+        여러 종목의 분석 데이터를 묶어서 ChatGPT 전문가 분석을 한 번에 생성
+        
+        batch_size개 종목을 하나의 요청으로 묶고, 요청들은 RPM/TPM 한도 안에서 동시에 전송합니다.
+        응답에서 빠진 종목은 단일 요청(generate_expert_summary)으로 다시 생성합니다.
+        
+        Args:
+            stock_data_list (List[Dict]): 종목별 주식 분석 데이터
+            batch_size (int): 요청 하나에 묶을 종목 수
+            max_workers (int): 동시 요청 수
+            length_tier (str): 응답 길이 단계 (없으면 기본값 사용)
             
+        Returns:
+            Dict[str, str]: 심볼별 전문가 분석 결과
+        """
+        batches = [stock_data_list[i:i + batch_size] for i in range(0, len(stock_data_list), batch_size)]
+        summaries = {}
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for batch_result in executor.map(lambda b: self._summarize_batch(b, length_tier), batches):
+                summaries.update(batch_result)
+
+        return summaries
+
+    def _summarize_batch(self, batch: List[Dict[str, Any]], length_tier: str = None) -> Dict[str, str]:
+        """
+        종목 묶음 하나를 요청하고 심볼별 섹션으로 나눠서 반환
+        """
+        tokens_per_symbol = self._max_tokens(length_tier)
+        if len(batch) == 1:
+            self.rate_limiter.acquire(estimate_tokens(SYSTEM_PROMPT) + tokens_per_symbol)
+            return {batch[0]['symbol']: self.generate_expert_summary(batch[0], length_tier)}
+
+        prompt = self._create_batch_prompt(batch)
+        max_tokens = min(tokens_per_symbol * len(batch), 4096)
+        self.rate_limiter.acquire(estimate_tokens(SYSTEM_PROMPT + prompt) + max_tokens)
+
+        try:
             response = self.client.chat.completions.create(
                 model="gpt-4o",
                 messages=[
-                    {"role": "system", "content": "당신은 20년 경력의 주식 투자 전문가입니다. 일반 투자자들이 쉽게 이해할 수 있도록 친근하고 정성적으로 설명해주세요."},
+                    {"role": "system", "content": SYSTEM_PROMPT},
                     {"role": "user", "content": prompt}
                 ],
-                max_tokens=1000,
+                max_tokens=max_tokens,
                 temperature=0.7
             )
-            
-            return response.choices[0].message.content.strip()
-            
+            self._record_usage(response, f"배치({len(batch)}개 종목)")
+            sections = self._parse_batch_response(response.choices[0].message.content)
         except Exception as e:
-            return f"ChatGPT 분석 중 오류 발생: {str(e)}"
+            print(f"❌ 배치 요약 요청 실패 ({', '.join(d['symbol'] for d in batch)}): {str(e)}")
+            sections = {}
+
+        results = {}
+        for stock_data in batch:
+            symbol = stock_data['symbol']
+            if symbol in sections:
+                results[symbol] = sections[symbol]
+            else:
+                # 응답에서 빠진 종목은 단일 요청으로 보완
+                self.rate_limiter.acquire(estimate_tokens(SYSTEM_PROMPT) + tokens_per_symbol)
+                results[symbol] = self.generate_expert_summary(stock_data, length_tier)
+        return results
+
+    def _parse_batch_response(self, content: str) -> Dict[str, str]:
+        """
+        "=== SYMBOL ===" 헤더를 기준으로 배치 응답을 심볼별 텍스트로 분리
+        """
+        sections = {}
+        matches = list(BATCH_SECTION_PATTERN.finditer(content))
+        for i, match in enumerate(matches):
+            end = matches[i + 1].start() if i + 1 < len(matches) else len(content)
+            text = content[match.end():end].strip()
+            if text:
+                sections[match.group(1).upper()] = text
+        return sections
     
     def _create_analysis_prompt(self, stock_data: Dict[str, Any]) -> str:
         """
@@ -85,4 +309,63 @@ class ChatGPTAnalyzer:
 주의사항: 답변에서 큰따옴표를 사용하지 마시고, 자연스러운 한국어로 작성해주세요.
 """
         
-        return prompt 
\ No newline at end of file
+        return prompt 
+
+    def _create_compact_prompt(self, stock_data: Dict[str, Any]) -> str:
+        """
+        압축 프롬프트 생성 (지표는 "키=신호(점수)" 형태로 인코딩, 페르소나 지시는 system 메시지에만 포함)
+        """
+        return f"{self._encode_stock(stock_data)}\n{COMPACT_FORMAT_INSTRUCTION}"
+
+    def _encode_stock(self, stock_data: Dict[str, Any]) -> str:
+        """
+        종목 하나의 분석 결과를 구조화된 짧은 텍스트로 인코딩
+
+        예: [AAPL] $190.5 2025-06-30 총점=3 추천=BUY
+            RSI=WEAK_OVERSOLD(+1) MACD=NEUTRAL(0) ...
+        """
+        encoded_signals = []
+        for indicator, data in stock_data['interpreted_signals'].items():
+            score = data.get('score') or 0
+            encoded_signals.append(f"{indicator}={data['signal']}({score:+d})" if score else f"{indicator}={data['signal']}(0)")
+        return (
+            f"[{stock_data['symbol']}] ${stock_data['current_price']:.2f} {stock_data['analysis_date']} "
+            f"총점={stock_data['total_score']} 추천={stock_data['recommendation']}\n"
+            f"{' '.join(encoded_signals)}"
+        )
+
+    def _create_batch_prompt(self, batch: List[Dict[str, Any]]) -> str:
+        """
+        여러 종목을 하나의 요청으로 묶기 위한 프롬프트 생성
+        """
+        if self.prompt_format == "compact":
+            stocks = "\n".join(self._encode_stock(stock_data) for stock_data in batch)
+            return f"{stocks}\n종목마다 === 심볼 === 한 줄로 섹션을 시작하고 섹션 안에서 아래 형식을 따르세요.\n{COMPACT_FORMAT_INSTRUCTION}"
+
+        prompt = "다음은 여러 주식의 기술적 분석 결과입니다.\n"
+
+        for stock_data in batch:
+            prompt += f"\n[{stock_data['symbol']}] 현재가: ${stock_data['current_price']} / 분석일: {stock_data['analysis_date']}\n"
+            for indicator, data in stock_data['interpreted_signals'].items():
+                prompt += f"- {data['indicator_name']}: {data['signal']} ({data['description']})\n"
+            prompt += f"종합 점수: {stock_data['total_score']}점 / 전체 추천: {stock_data['recommendation']}\n"
+
+        prompt += """
+각 종목마다 반드시 "=== 심볼 ===" 한 줄(예: === AAPL ===)로 시작하는 섹션을 만들고, 섹션 안에는 다음 형식으로 답변해주세요:
+
+🧠 전문가 종합평가:
+
+(수치 나열 대신 친한 투자 상담사처럼 현재 상황을 종합적으로 설명)
+
+📈 투자자별 전략 제안:
+
+👤 주식 미보유자:
+(매수 시점과 확인할 조건)
+
+💼 주식 보유자:
+(보유 유지, 추가 매수, 매도 시점)
+
+주의사항: 답변에서 큰따옴표를 사용하지 마시고, 자연스러운 한국어로 작성해주세요.
+"""
+
+        return prompt
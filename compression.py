@@ -0,0 +1,95 @@
+import gzip
+from typing import Optional
+from flask import Flask, request, Response
+
+try:
+    import brotli
+except ImportError:  # brotli는 선택 의존성 - 없으면 gzip만 사용
+    brotli = None
+
+# 이보다 작은 응답은 압축 효과보다 비용이 커서 그대로 보낸다
+MIN_COMPRESS_BYTES = 1024
+
+COMPRESSIBLE_MIMETYPES = ("application/json", "text/html", "text/plain", "text/csv")
+
+
+def choose_encoding(accept_encoding) -> str:
+    """
+    Accept-Encoding 헤더에서 사용할 압축 방식 선택 (br 우선, 없으면 gzip)
+
+    Returns:
+        str: "br", "gzip" 또는 None
+    """
+    if brotli is not None and accept_encoding["br"] > 0:
+        return "br"
+    if accept_encoding["gzip"] > 0:
+        return "gzip"
+    return None
+
+
+def compress_response(response: Response) -> Response:
+    """
+    클라이언트가 지원하면 응답 본문을 br/gzip으로 압축
+
+    강한 ETag는 압축 방식별로 본문이 달라지므로 "-br" / "-gzip" 접미사를 붙입니다.
+    """
+    if (response.status_code < 200 or response.status_code in (204, 304)
+            or response.direct_passthrough or response.is_streamed
+            or "Content-Encoding" in response.headers
+            or response.mimetype not in COMPRESSIBLE_MIMETYPES):
+        return response
+
+    response.vary.add("Accept-Encoding")
+
+    data = response.get_data()
+    if len(data) < MIN_COMPRESS_BYTES:
+        return response
+
+    encoding = choose_encoding(request.accept_encodings)
+    if encoding is None:
+        return response
+
+    if encoding == "br":
+        compressed = brotli.compress(data, quality=5)
+    else:
+        compressed = gzip.compress(data, compresslevel=6)
+
+    response.set_data(compressed)
+    response.headers["Content-Encoding"] = encoding
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(f"{etag}-{encoding}")
+    return response
+
+
+def strip_encoding_suffix(etag: str) -> str:
+    """
+    compress_response가 붙인 압축 방식 접미사를 제거한 원래 ETag
+    """
+    for encoding in ("br", "gzip"):
+        suffix = f"-{encoding}"
+        if etag.endswith(suffix):
+            return etag[:-len(suffix)]
+    return etag
+
+
+def matching_etag(etag: str) -> Optional[str]:
+    """
+    요청의 If-None-Match 중 etag와 일치하는 태그 (압축 방식 접미사 포함) 반환
+
+    Returns:
+        Optional[str]: 클라이언트가 보낸 일치 태그 (304 응답에 그대로 돌려준다), 없으면 None
+    """
+    if request.if_none_match.star_tag:
+        return etag
+    for tag in request.if_none_match:
+        if strip_encoding_suffix(tag) == etag:
+            return tag
+    return None
+
+
+def init_compression(app: Flask):
+    """
+    Flask 앱의 모든 응답에 압축 협상 적용
+    """
+    app.after_request(compress_response)
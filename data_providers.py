@@ -0,0 +1,281 @@
+"""
+일봉 데이터 공급자(provider) 모듈 - FMP, 보조 공급자(Stooq), 오프라인 재생 공급자와 헤지 요청
+
+한 공급자의 느린 응답이 전체 응답 시간을 좌우하지 않도록, 주 공급자가 일정 시간 안에
+응답하지 않거나 실패하면 다음 공급자에게 같은 요청을 동시에 보내고 먼저 도착한 결과를 사용합니다.
+"""
+
+import io
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from datetime import date
+from typing import List, Optional
+
+import pandas as pd
+import requests
+
+# 기본 공급자 순서 (앞쪽이 주 공급자)
+DEFAULT_PROVIDERS = "fmp,stooq"
+
+# 주 공급자가 이 시간(ms) 안에 응답하지 않으면 다음 공급자에게 동시에 요청
+DEFAULT_HEDGE_DELAY_MS = 800
+
+# 모든 공급자를 기다리는 최대 시간 (초) - 넘으면 로컬 저장소의 이전 데이터로 응답
+DEFAULT_DEADLINE_SECONDS = 5.0
+
+# 공급자 데이터를 맞추는 공통 컬럼 이름
+COLUMN_NAMES = {
+    'date': 'Date', 'adjClose': 'Adj Close', 'open': 'Open', 'high': 'High',
+    'low': 'Low', 'close': 'Close', 'volume': 'Volume'
+}
+
+
+class ProviderError(Exception):
+    """
+    공급자에서 데이터를 가져오지 못했을 때 발생하는 예외
+    """
+
+
+class DataProvider:
+    """
+    일봉 데이터 공급자 기본 클래스
+    """
+
+    name = "base"
+
+    @property
+    def primary_name(self) -> str:
+        """
+        로컬 저장소에 기록할 일봉을 주는 공급자 이름 (헤지 공급자는 첫 번째 공급자)
+        """
+        return self.name
+
+    def fetch(self, symbol: str, start: date, end: date) -> pd.DataFrame:
+        """
+        구간 일봉 조회
+
+        Args:
+            symbol (str): 주식 심볼
+            start (date): 시작일
+            end (date): 종료일
+
+        Returns:
+            pd.DataFrame: 날짜 오름차순 일봉 (Open/High/Low/Close/Volume), 실패하면 ProviderError
+        """
+        raise NotImplementedError
+
+    @staticmethod
+    def _normalize(df: pd.DataFrame) -> pd.DataFrame:
+        """
+        공급자별 컬럼 이름/날짜 형식을 공통 형식으로 변환
+        """
+        df = df.rename(columns=COLUMN_NAMES)
+        df['Date'] = pd.to_datetime(df['Date'])
+        return df.set_index('Date').sort_index()
+
+
+class FMPProvider(DataProvider):
+    """
+    Financial Modeling Prep API 공급자
+    """
+
+    name = "fmp"
+
+    def __init__(self, api_key: str, timeout: float = DEFAULT_DEADLINE_SECONDS):
+        """
+        Args:
+            api_key (str): FMP API 키
+            timeout (float): HTTP 요청 제한 시간 (초)
+        """
+        self.api_key = api_key
+        self.timeout = timeout
+
+    def fetch(self, symbol: str, start: date, end: date) -> pd.DataFrame:
+        url = (f"https://financialmodelingprep.com/api/v3/historical-price-full/{symbol}"
+               f"?from={start:%Y-%m-%d}&to={end:%Y-%m-%d}&apikey={self.api_key}")
+        try:
+            response = requests.get(url, timeout=self.timeout)
+            response.raise_for_status()
+        except requests.exceptions.HTTPError as http_err:
+            raise ProviderError(f"HTTP 오류 발생: {http_err} - API 키가 유효한지, 요청 제한을 초과하지 않았는지 확인하세요.")
+        except requests.exceptions.RequestException as e:
+            raise ProviderError(f"FMP API 요청 실패: {str(e)}")
+
+        data = response.json()
+        if not data or 'historical' not in data:
+            raise ProviderError("API 응답이 비어있습니다.")
+        df = pd.DataFrame(data['historical'])
+        if df.empty:
+            raise ProviderError("데이터가 비어 있습니다.")
+        return self._normalize(df)
+
+
+class StooqProvider(DataProvider):
+    """
+    Stooq 일봉 CSV 공급자 (API 키 불필요, 미국 종목은 ".us" 접미사 사용)
+    """
+
+    name = "stooq"
+
+    def __init__(self, market_suffix: str = ".us", timeout: float = DEFAULT_DEADLINE_SECONDS):
+        """
+        Args:
+            market_suffix (str): 심볼에 거래소 접미사가 없을 때 붙일 접미사
+            timeout (float): HTTP 요청 제한 시간 (초)
+        """
+        self.market_suffix = market_suffix
+        self.timeout = timeout
+
+    def fetch(self, symbol: str, start: date, end: date) -> pd.DataFrame:
+        ticker = symbol.lower() if "." in symbol else f"{symbol.lower()}{self.market_suffix}"
+        url = f"https://stooq.com/q/d/l/?s={ticker}&d1={start:%Y%m%d}&d2={end:%Y%m%d}&i=d"
+        try:
+            response = requests.get(url, timeout=self.timeout)
+            response.raise_for_status()
+        except requests.exceptions.RequestException as e:
+            raise ProviderError(f"Stooq 요청 실패: {str(e)}")
+
+        if not response.text.startswith("Date"):
+            raise ProviderError(f"Stooq 응답에 {symbol} 데이터가 없습니다.")
+        df = pd.read_csv(io.StringIO(response.text))
+        if df.empty:
+            raise ProviderError("데이터가 비어 있습니다.")
+        return self._normalize(df)
+
+
+class ReplayProvider(DataProvider):
+    """
+    디렉터리의 종목별 파일(<SYMBOL>.csv 또는 BarStore 형식의 <SYMBOL>.pkl)에서 일봉을 읽는 오프라인 공급자
+
+    네트워크 없이 테스트하거나 저장해 둔 데이터로 분석을 재현할 때 사용합니다.
+    """
+
+    name = "replay"
+
+    def __init__(self, directory: str = "data/replay", delay: float = 0.0):
+        """
+        Args:
+            directory (str): 종목별 일봉 파일 디렉터리
+            delay (float): 응답 전 대기 시간 (초, 느린 공급자 재현용)
+        """
+        self.directory = directory
+        self.delay = delay
+
+    def fetch(self, symbol: str, start: date, end: date) -> pd.DataFrame:
+        if self.delay:
+            time.sleep(self.delay)
+
+        base = os.path.join(self.directory, symbol.upper())
+        if os.path.exists(f"{base}.csv"):
+            df = self._normalize(pd.read_csv(f"{base}.csv"))
+        elif os.path.exists(f"{base}.pkl"):
+            df = pd.read_pickle(f"{base}.pkl").sort_index()
+        else:
+            raise ProviderError(f"{symbol} 재생 데이터 파일이 없습니다 ({self.directory}).")
+
+        df = df.loc[pd.Timestamp(start):pd.Timestamp(end)]
+        if df.empty:
+            raise ProviderError(f"{symbol} 재생 데이터에 요청 구간이 없습니다.")
+        return df
+
+
+class HedgedProvider(DataProvider):
+    """
+    여러 공급자에 헤지 요청을 보내고 먼저 도착한 정상 응답을 사용하는 공급자
+
+    첫 번째 공급자에게 먼저 요청하고, hedge_delay 안에 응답이 없거나 실패하면 다음 공급자에게도
+    요청합니다. 응답이 늦은 요청은 취소하지 않고 백그라운드에서 끝나도록 둡니다.
+    """
+
+    name = "hedged"
+
+    def __init__(self, providers: List[DataProvider], hedge_delay: float = DEFAULT_HEDGE_DELAY_MS / 1000,
+                 deadline: float = DEFAULT_DEADLINE_SECONDS, max_workers: int = 16):
+        """
+        Args:
+            providers (List[DataProvider]): 우선순위 순서의 공급자 목록
+            hedge_delay (float): 다음 공급자에게 요청하기 전 기다리는 시간 (초)
+            deadline (float): 모든 공급자를 기다리는 최대 시간 (초)
+            max_workers (int): 동시에 실행할 최대 요청 수
+        """
+        if not providers:
+            raise ValueError("공급자를 하나 이상 지정해야 합니다.")
+        self.providers = providers
+        self.hedge_delay = hedge_delay
+        self.deadline = deadline
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="provider")
+
+    @property
+    def primary_name(self) -> str:
+        return self.providers[0].name
+
+    def fetch(self, symbol: str, start: date, end: date) -> pd.DataFrame:
+        waiting = list(self.providers)
+        pending = {}
+        errors = []
+        deadline = time.monotonic() + self.deadline
+
+        def launch():
+            provider = waiting.pop(0)
+            pending[self._executor.submit(provider.fetch, symbol, start, end)] = provider
+
+        launch()
+        while pending or waiting:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            timeout = min(remaining, self.hedge_delay) if waiting else remaining
+            done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                provider = pending.pop(future)
+                try:
+                    data = future.result()
+                except Exception as e:
+                    errors.append(f"{provider.name}: {str(e)}")
+                    continue
+                data.attrs["source"] = provider.name
+                return data
+
+            # 주 공급자가 늦거나 실패하면 다음 공급자에게도 요청
+            if waiting:
+                if not done:
+                    print(f"⏱️ {symbol} {', '.join(p.name for p in pending.values())} 응답 지연 - {waiting[0].name}에도 요청")
+                launch()
+
+        if pending:
+            errors.append(f"{', '.join(p.name for p in pending.values())}: {self.deadline}초 안에 응답 없음")
+        raise ProviderError("; ".join(errors))
+
+
+def create_provider(api_key: Optional[str] = None) -> DataProvider:
+    """
+    환경변수 설정으로 공급자 생성
+
+    DATA_PROVIDERS (기본 "fmp,stooq", "replay"는 REPLAY_DATA_DIR 사용), HEDGE_DELAY_MS,
+    PROVIDER_DEADLINE_SECONDS를 읽습니다. 공급자가 하나면 헤지 없이 그 공급자를 그대로 사용합니다.
+    """
+    names = [name.strip().lower() for name in os.environ.get("DATA_PROVIDERS", DEFAULT_PROVIDERS).split(",") if name.strip()]
+    deadline = float(os.environ.get("PROVIDER_DEADLINE_SECONDS", DEFAULT_DEADLINE_SECONDS))
+
+    providers = []
+    for name in names:
+        if name == "fmp":
+            if not api_key:
+                raise ValueError("FMP_API_KEY 환경변수가 설정되지 않았습니다.")
+            providers.append(FMPProvider(api_key, timeout=deadline))
+        elif name == "stooq":
+            providers.append(StooqProvider(timeout=deadline))
+        elif name == "replay":
+            providers.append(ReplayProvider(os.environ.get("REPLAY_DATA_DIR", "data/replay")))
+        else:
+            raise ValueError(f"지원하지 않는 데이터 공급자입니다: {name} (fmp, stooq, replay 중 선택)")
+
+    if len(providers) == 1:
+        return providers[0]
+    return HedgedProvider(
+        providers,
+        hedge_delay=float(os.environ.get("HEDGE_DELAY_MS", DEFAULT_HEDGE_DELAY_MS)) / 1000,
+        deadline=deadline
+    )
@@ -0,0 +1,283 @@
+"""
+지표 계산 정답값(golden) 검증과 성능 측정 - 저장된 일봉 픽스처(fixtures/ohlcv)로 실행
+
+지표 계산 방식을 바꾸거나 최적화할 때 결과가 그대로인지(정답값 비교), 느려지지 않았는지(기준 시간 비교)
+확인하는 용도입니다. 측정 시간은 같은 머신에서 잰 기준 작업(rolling 평균 + EWM) 시간에 대한 배수로 저장하므로
+기준값을 기록한 머신과 다른 머신에서도 비교할 수 있습니다.
+
+사용 예:
+    python indicator_benchmark.py                    # 측정 후 기준값과 비교 (느려진 항목이 있으면 종료 코드 1)
+    python indicator_benchmark.py record             # 정답값과 기준 시간 다시 기록 (계산 방식을 의도적으로 바꾼 경우)
+    python indicator_benchmark.py fixture AAPL --bars 5040   # 실제 일봉을 픽스처로 저장 (FMP_API_KEY 필요)
+"""
+
+import argparse
+import io
+import json
+import os
+import sys
+import time
+from contextlib import redirect_stdout
+from typing import Any, Callable, Dict, List
+
+import numpy as np
+import pandas as pd
+
+from data_providers import ReplayProvider
+from stock_data_fetcher import StockDataFetcher
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+OHLCV_DIR = os.path.join(FIXTURE_DIR, "ohlcv")
+GOLDEN_PATH = os.path.join(FIXTURE_DIR, "indicator_golden.json")
+BASELINE_PATH = os.path.join(FIXTURE_DIR, "indicator_baseline.json")
+
+# 시계열마다 정답값으로 저장하는 표본 위치 수 (처음/끝 포함 균등 간격)
+GOLDEN_SAMPLES = 16
+
+# 기준 시간 대비 이 배수를 넘으면 성능 저하로 판단 (INDICATOR_BENCHMARK_TOLERANCE로 변경)
+DEFAULT_TOLERANCE = 2.5
+
+# 측정 반복 설정 - 한 번의 측정이 최소 MIN_MEASURE_SECONDS가 되도록 반복하고, ROUNDS번 중 가장 빠른 값을 사용
+MIN_MEASURE_SECONDS = 0.02
+ROUNDS = 5
+
+# 측정 대상 지표 (이름 → 출력 시계열 이름별 결과)
+INDICATORS: Dict[str, Callable[[StockDataFetcher, pd.DataFrame], Dict[str, pd.Series]]] = {
+    "rsi": lambda fetcher, data: {"rsi": fetcher.calculate_rsi(data)},
+    "macd": lambda fetcher, data: dict(zip(("macd", "signal", "histogram"), fetcher.calculate_macd(data))),
+    "bollinger_bands": lambda fetcher, data: dict(zip(("upper", "middle", "lower"),
+                                                      fetcher.calculate_bollinger_bands(data))),
+    "adx": lambda fetcher, data: {"adx": fetcher.calculate_adx(data)},
+    "atr": lambda fetcher, data: {"atr": fetcher.calculate_atr(data)},
+    "vwap": lambda fetcher, data: {"vwap": fetcher.calculate_vwap(data)},
+    "moving_averages": lambda fetcher, data: dict(zip(("short", "long"), fetcher.calculate_moving_averages(data)))
+}
+
+
+def indicator_fetcher() -> StockDataFetcher:
+    """
+    지표 계산용 StockDataFetcher (일봉 조회를 하지 않으므로 API 키 없이 생성)
+    """
+    return StockDataFetcher(provider=ReplayProvider(OHLCV_DIR))
+
+
+def load_fixtures(directory: str = OHLCV_DIR) -> Dict[str, pd.DataFrame]:
+    """
+    픽스처 디렉터리의 <이름>.csv.gz 파일을 모두 읽어 반환 (이름순)
+    """
+    fixtures = {}
+    for filename in sorted(os.listdir(directory)):
+        if filename.endswith(".csv.gz"):
+            data = pd.read_csv(os.path.join(directory, filename), index_col="Date", parse_dates=True)
+            fixtures[filename[:-len(".csv.gz")]] = data
+    return fixtures
+
+
+def save_fixture(name: str, data: pd.DataFrame, directory: str = OHLCV_DIR) -> str:
+    """
+    일봉을 픽스처 파일로 저장 (값을 그대로 복원할 수 있도록 float 전체 자릿수로 기록)
+    """
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"{name}.csv.gz")
+    data = data[["Open", "High", "Low", "Close", "Volume"]].copy()
+    data.index.name = "Date"
+    data.to_csv(path, float_format="%.17g", compression={"method": "gzip", "mtime": 0})
+    return path
+
+
+def make_synthetic(bars: int, seed: int, volatility: float = 0.015, drift: float = 0.0,
+                   flat_days: int = 0, zero_volume_days: int = 0) -> pd.DataFrame:
+    """
+    재현 가능한 합성 일봉 생성 (변동성 국면 전환, 갭, 가격 변화 없는 구간, 거래량 0인 날 포함 가능)
+
+    Args:
+        bars (int): 봉 수
+        seed (int): 난수 시드
+        volatility (float): 기본 일간 변동성
+        drift (float): 일간 평균 수익률
+        flat_days (int): 가격이 변하지 않는 연속 구간 길이 (RSI 0/0 같은 경계 사례)
+        zero_volume_days (int): 거래량이 0인 날 수
+    """
+    rng = np.random.default_rng(seed)
+    regime = np.where(rng.random(bars) < 0.15, 2.5, 1.0)
+    returns = rng.normal(drift, volatility, bars) * regime
+    gaps = rng.random(bars) < 0.02
+    returns[gaps] += rng.normal(0, volatility * 4, gaps.sum())
+    if flat_days:
+        start = bars // 2
+        returns[start:start + flat_days] = 0.0
+
+    close = 50 * np.exp(np.cumsum(returns))
+    spread = np.abs(rng.normal(0, volatility / 2, bars))
+    open_ = close * (1 + rng.normal(0, volatility / 4, bars))
+    high = np.maximum(open_, close) * (1 + spread)
+    low = np.minimum(open_, close) * (1 - spread)
+    volume = rng.lognormal(14, 0.5, bars).round()
+    if flat_days:
+        open_[start:start + flat_days] = high[start:start + flat_days] = low[start:start + flat_days] = close[start]
+    if zero_volume_days:
+        volume[rng.choice(bars, zero_volume_days, replace=False)] = 0.0
+
+    index = pd.bdate_range(end="2025-06-30", periods=bars, name="Date")
+    return pd.DataFrame({"Open": open_, "High": high, "Low": low, "Close": close, "Volume": volume}, index=index)
+
+
+def summarize_series(series: pd.Series) -> Dict[str, Any]:
+    """
+    시계열 정답값 - NaN 개수, NaN 제외 합계, 균등 간격 표본 위치의 값 (NaN은 None)
+    """
+    values = series.to_numpy(dtype=float)
+    positions = sorted(set(np.linspace(0, len(values) - 1, GOLDEN_SAMPLES).round().astype(int).tolist()))
+    return {
+        "nan": int(np.isnan(values).sum()),
+        "sum": float(np.nansum(values)),
+        "samples": [[position, None if np.isnan(values[position]) else float(values[position])]
+                    for position in positions]
+    }
+
+
+def golden_values(fixtures: Dict[str, pd.DataFrame]) -> Dict[str, Any]:
+    """
+    픽스처별 지표 시계열 요약과 generate_signals 결과 (signals, scores, values)
+    """
+    fetcher = indicator_fetcher()
+    golden = {}
+    for name, data in fixtures.items():
+        entry = {indicator: {output: summarize_series(series) for output, series in calculate(fetcher, data).items()}
+                 for indicator, calculate in INDICATORS.items()}
+        with redirect_stdout(io.StringIO()):
+            result = fetcher.generate_signals(data)
+        entry["generate_signals"] = {key: result.get(key, {}) for key in ("signals", "scores", "values")}
+        golden[name] = entry
+    return golden
+
+
+def measure(function: Callable[[], Any]) -> float:
+    """
+    함수 한 번 실행 시간 (초) - 반복 측정 중 가장 빠른 값
+    """
+    repeat = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(repeat):
+            function()
+        elapsed = time.perf_counter() - started
+        if elapsed >= MIN_MEASURE_SECONDS:
+            break
+        repeat *= 2
+
+    best = elapsed / repeat
+    for _ in range(ROUNDS - 1):
+        started = time.perf_counter()
+        for _ in range(repeat):
+            function()
+        best = min(best, (time.perf_counter() - started) / repeat)
+    return best
+
+
+def reference_seconds(data: pd.DataFrame) -> float:
+    """
+    기준 작업 시간 (초) - 지표 시간을 머신 성능과 무관한 배수로 바꾸는 데 사용
+    """
+    close = data["Close"]
+    return measure(lambda: (close.rolling(window=20).mean(), close.ewm(span=12).mean()))
+
+
+def run_benchmark(fixtures: Dict[str, pd.DataFrame]) -> Dict[str, Dict[str, Dict[str, float]]]:
+    """
+    픽스처별로 지표 계산과 generate_signals 전체 실행 시간 측정
+
+    Returns:
+        Dict: {픽스처: {지표: {"seconds": 실행 시간, "relative": 기준 작업 대비 배수}}}
+    """
+    fetcher = indicator_fetcher()
+    results = {}
+    for name, data in fixtures.items():
+        reference = reference_seconds(data)
+        timings = {indicator: measure(lambda calculate=calculate: calculate(fetcher, data))
+                   for indicator, calculate in INDICATORS.items()}
+        with redirect_stdout(io.StringIO()):
+            timings["generate_signals"] = measure(lambda: fetcher.generate_signals(data))
+        results[name] = {indicator: {"seconds": seconds, "relative": seconds / reference}
+                         for indicator, seconds in timings.items()}
+    return results
+
+
+def find_regressions(results: Dict[str, Dict[str, Dict[str, float]]], baseline: Dict[str, Dict[str, float]],
+                     tolerance: float = DEFAULT_TOLERANCE) -> List[str]:
+    """
+    기준 배수보다 tolerance배 이상 느려진 (픽스처, 지표) 목록 (기준값이 없는 항목은 건너뜀)
+    """
+    regressions = []
+    for name, timings in results.items():
+        for indicator, timing in timings.items():
+            expected = baseline.get(name, {}).get(indicator)
+            if expected and timing["relative"] > expected * tolerance:
+                regressions.append(f"{name}/{indicator}: 기준 작업 대비 {timing['relative']:.2f}배 "
+                                   f"(기준값 {expected:.2f}배, 허용 {tolerance}배)")
+    return regressions
+
+
+def print_results(results: Dict[str, Dict[str, Dict[str, float]]], fixtures: Dict[str, pd.DataFrame]):
+    indicators = list(INDICATORS) + ["generate_signals"]
+    print(f"{'fixture':<22}{'bars':>6}  " + "".join(f"{indicator[:12]:>13}" for indicator in indicators))
+    for name, timings in results.items():
+        cells = "".join(f"{timings[indicator]['seconds'] * 1000:>11.3f}ms" for indicator in indicators)
+        print(f"{name:<22}{len(fixtures[name]):>6}  {cells}")
+
+
+def record(fixtures: Dict[str, pd.DataFrame]):
+    """
+    현재 계산 결과를 정답값으로, 현재 측정 시간을 기준값으로 저장
+    """
+    with open(GOLDEN_PATH, "w", encoding="utf-8") as f:
+        json.dump(golden_values(fixtures), f, indent=1, sort_keys=True)
+        f.write("\n")
+    results = run_benchmark(fixtures)
+    baseline = {name: {indicator: round(timing["relative"], 3) for indicator, timing in timings.items()}
+                for name, timings in results.items()}
+    with open(BASELINE_PATH, "w", encoding="utf-8") as f:
+        json.dump(baseline, f, indent=1, sort_keys=True)
+        f.write("\n")
+    print_results(results, fixtures)
+    print(f"✅ 정답값과 기준 시간을 기록했습니다 ({GOLDEN_PATH}, {BASELINE_PATH})")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="지표 계산 정답값 기록과 성능 측정")
+    subparsers = parser.add_subparsers(dest="command")
+    subparsers.add_parser("record", help="정답값과 기준 시간 다시 기록")
+    fixture_parser = subparsers.add_parser("fixture", help="FMP 일봉을 픽스처로 저장")
+    fixture_parser.add_argument("symbol")
+    fixture_parser.add_argument("--bars", type=int, default=250, help="저장할 최근 봉 수 (기본 250)")
+    parser.add_argument("--tolerance", type=float,
+                        default=float(os.environ.get("INDICATOR_BENCHMARK_TOLERANCE", DEFAULT_TOLERANCE)),
+                        help=f"기준 시간 대비 허용 배수 (기본 {DEFAULT_TOLERANCE})")
+    args = parser.parse_args(argv)
+
+    if args.command == "fixture":
+        period = f"{max(1, -(-args.bars // 250))}y"
+        data = StockDataFetcher().fetch_stock_data(args.symbol.upper(), period).tail(args.bars)
+        if data.empty:
+            parser.error(f"{args.symbol} 일봉을 가져올 수 없습니다.")
+        print(f"✅ {save_fixture(f'{args.symbol.upper()}_{len(data)}', data)} 저장 ({len(data)}봉)")
+        return
+
+    fixtures = load_fixtures()
+    if args.command == "record":
+        record(fixtures)
+        return
+
+    results = run_benchmark(fixtures)
+    print_results(results, fixtures)
+    with open(BASELINE_PATH, encoding="utf-8") as f:
+        regressions = find_regressions(results, json.load(f), args.tolerance)
+    for regression in regressions:
+        print(f"❌ {regression}")
+    if regressions:
+        sys.exit(1)
+    print("✅ 기준 시간 대비 성능 저하 없음")
+
+
+if __name__ == "__main__":
+    main()
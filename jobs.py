@@ -0,0 +1,355 @@
+"""
+요청 시간 제한을 넘는 긴 분석(대량 배치, 스캔, 백테스트)을 백그라운드에서 실행하는 작업(job) 관리
+
+작업은 제출 즉시 id를 돌려주고 동시 실행 수가 제한된 스레드 풀에서 실행됩니다. 진행 상황과 상태는
+작업 디렉터리의 <id>.json에, 결과는 <id>.result.json에(큰 결과는 항목마다 나눠서) 저장되어 서버가 재시작되어도 조회할 수 있으며,
+끝난 지 TTL이 지난 작업은 주기적으로 삭제됩니다.
+"""
+
+import json
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, BinaryIO, Callable, Dict, List, Optional
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+FINISHED_STATUSES = (DONE, FAILED, CANCELLED)
+
+# 진행 상황을 파일에 기록하는 최소 간격 (초) - 메모리의 진행 상황은 항상 최신
+PROGRESS_WRITE_INTERVAL = 1.0
+
+# 만료된 작업을 정리하는 주기 (초)
+CLEANUP_INTERVAL = 600
+
+
+class JobCancelled(Exception):
+    """
+    실행 중인 작업이 취소 요청을 확인했을 때 발생하는 예외 (작업 함수에서 잡지 않고 그대로 전파)
+    """
+
+
+class JobContext:
+    """
+    작업 함수에 전달되는 진행 상황 보고/취소 확인 객체
+    """
+
+    def __init__(self, manager: "JobManager", job_id: str):
+        self._manager = manager
+        self.job_id = job_id
+        self._cancel = threading.Event()
+        self._result_file = None
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    def check_cancelled(self):
+        """
+        취소 요청이 있으면 JobCancelled 발생
+        """
+        if self._cancel.is_set():
+            raise JobCancelled()
+
+    def set_total(self, total: int):
+        self._manager._update_progress(self.job_id, total=total)
+
+    def advance(self, count: int = 1):
+        """
+        처리한 항목 수 증가 (취소 요청이 있으면 JobCancelled)
+        """
+        self._manager._update_progress(self.job_id, advance=count)
+        self.check_cancelled()
+
+    def open_result(self) -> BinaryIO:
+        """
+        결과 JSON을 나눠서 직접 기록할 파일 열기 - 큰 결과를 메모리에 모으지 않고 항목마다 바로 기록
+
+        작업이 성공하면 결과 파일로 교체되고, 실패/취소되면 삭제됩니다 (이 경우 작업 함수의 반환값은 무시).
+        """
+        self._result_file = open(f"{self._manager._path(self.job_id, 'result')}.tmp", "wb")
+        return self._result_file
+
+
+class JobManager:
+    """
+    작업 제출, 상태/결과 조회, 취소, 만료 작업 정리
+    """
+
+    def __init__(self, directory: str = "data/jobs", max_workers: int = 2, ttl: float = 24 * 60 * 60,
+                 max_pending: int = 100):
+        """
+        Args:
+            directory (str): 작업 상태와 결과를 저장할 디렉터리
+            max_workers (int): 동시에 실행할 작업 수
+            ttl (float): 끝난 작업을 보관하는 시간 (초)
+            max_pending (int): 대기 + 실행 중인 작업의 최대 수 (넘으면 제출 거절)
+        """
+        self.directory = directory
+        self.ttl = ttl
+        self.max_pending = max_pending
+        self._handlers: Dict[str, Callable[[JobContext, Dict[str, Any]], Any]] = {}
+        self._validators: Dict[str, Callable[[Dict[str, Any]], Dict[str, Any]]] = {}
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._contexts: Dict[str, JobContext] = {}
+        self._futures = {}
+        self._last_written: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+        self._cleaner = None
+
+        os.makedirs(directory, exist_ok=True)
+        self._recover()
+
+    def register(self, kind: str, handler: Callable[[JobContext, Dict[str, Any]], Any],
+                 validate: Callable[[Dict[str, Any]], Dict[str, Any]] = None):
+        """
+        작업 종류 등록
+
+        Args:
+            kind (str): 작업 종류 이름 (예: "batch")
+            handler (Callable): handler(context, params) → JSON으로 저장할 결과
+            validate (Callable): 제출 시 파라미터를 검증/정규화하는 함수 (잘못되면 ValueError)
+        """
+        self._handlers[kind] = handler
+        if validate is not None:
+            self._validators[kind] = validate
+
+    @property
+    def kinds(self) -> List[str]:
+        return list(self._handlers)
+
+    def submit(self, kind: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        작업 제출 (잘못된 종류/파라미터는 ValueError, 대기 작업이 너무 많으면 RuntimeError)
+
+        Returns:
+            Dict[str, Any]: 제출된 작업 상태
+        """
+        if kind not in self._handlers:
+            raise ValueError(f"kind는 {', '.join(self._handlers)} 중 하나여야 합니다.")
+        if kind in self._validators:
+            params = self._validators[kind](params)
+
+        with self._lock:
+            pending = sum(1 for job in self._jobs.values() if job["status"] not in FINISHED_STATUSES)
+            if pending >= self.max_pending:
+                raise RuntimeError(f"대기 중인 작업이 너무 많습니다 (최대 {self.max_pending}개). 잠시 후 다시 시도해주세요.")
+            job_id = uuid.uuid4().hex
+            job = {
+                "id": job_id,
+                "kind": kind,
+                "params": params,
+                "status": QUEUED,
+                "progress": {"done": 0, "total": None},
+                "created": time.time(),
+                "started": None,
+                "finished": None,
+                "error": None
+            }
+            self._jobs[job_id] = job
+            self._contexts[job_id] = JobContext(self, job_id)
+            self._write_job(job)
+            self._futures[job_id] = self._executor.submit(self._run, job_id)
+
+        self._start_cleaner()
+        print(f"📋 작업 제출 ({kind}, id={job_id})")
+        return self.get(job_id)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        작업 상태 조회 (메모리에 없으면 파일에서 읽음, 없는 id면 None)
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                return json.loads(json.dumps(job))
+        if not self._valid_id(job_id):
+            return None
+        try:
+            with open(self._path(job_id), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def list_jobs(self) -> List[Dict[str, Any]]:
+        """
+        메모리에 있는 작업 목록 (최근 제출 순, 파라미터 제외)
+        """
+        with self._lock:
+            jobs = [{key: value for key, value in job.items() if key != "params"} for job in self._jobs.values()]
+        return sorted(jobs, key=lambda job: job["created"], reverse=True)
+
+    def read_result(self, job_id: str) -> Optional[bytes]:
+        """
+        완료된 작업의 결과 JSON (직렬화된 바이트 그대로, 없으면 None)
+        """
+        if not self._valid_id(job_id):
+            return None
+        try:
+            with open(self._path(job_id, "result"), "rb") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def cancel(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        작업 취소 - 대기 중이면 바로 취소되고, 실행 중이면 작업이 다음 진행 보고 시점에 멈춤
+
+        Returns:
+            Optional[Dict[str, Any]]: 취소 요청 후 작업 상태 (없는 id면 None)
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            if job["status"] not in FINISHED_STATUSES:
+                self._contexts[job_id]._cancel.set()
+                job["cancel_requested"] = True
+                if self._futures[job_id].cancel():
+                    self._finish(job, CANCELLED)
+                else:
+                    self._write_job(job)
+        return self.get(job_id)
+
+    def cleanup(self) -> int:
+        """
+        끝난 지 TTL이 지난 작업의 상태/결과 파일 삭제
+
+        Returns:
+            int: 삭제한 작업 수
+        """
+        expires_before = time.time() - self.ttl
+        removed = 0
+        for filename in os.listdir(self.directory):
+            if not filename.endswith(".json") or filename.endswith(".result.json"):
+                continue
+            job_id = filename[:-len(".json")]
+            job = self.get(job_id)
+            if job is None or job["status"] not in FINISHED_STATUSES or job["finished"] > expires_before:
+                continue
+            with self._lock:
+                self._jobs.pop(job_id, None)
+                self._contexts.pop(job_id, None)
+                self._futures.pop(job_id, None)
+                self._last_written.pop(job_id, None)
+            for path in (self._path(job_id), self._path(job_id, "result")):
+                if os.path.exists(path):
+                    os.remove(path)
+            removed += 1
+        if removed:
+            print(f"🧹 만료된 작업 {removed}개 삭제")
+        return removed
+
+    def shutdown(self):
+        """
+        대기 중인 작업을 취소하고 실행 중인 작업이 끝날 때까지 대기
+        """
+        for job_id in list(self._jobs):
+            self.cancel(job_id)
+        self._executor.shutdown(wait=True)
+
+    def _run(self, job_id: str):
+        with self._lock:
+            job = self._jobs[job_id]
+            if job["status"] != QUEUED:
+                return
+            job["status"] = RUNNING
+            job["started"] = time.time()
+            self._write_job(job)
+        context = self._contexts[job_id]
+
+        try:
+            context.check_cancelled()
+            result = self._handlers[job["kind"]](context, job["params"])
+            if context._result_file is not None:
+                context._result_file.close()
+                os.replace(context._result_file.name, self._path(job_id, "result"))
+            else:
+                self._write_atomic(self._path(job_id, "result"),
+                                   json.dumps(result, ensure_ascii=False, default=str).encode("utf-8"))
+            status, error = DONE, None
+        except JobCancelled:
+            status, error = CANCELLED, None
+        except Exception as e:
+            status, error = FAILED, str(e)
+            print(f"❌ 작업 실패 ({job['kind']}, id={job_id}): {error}")
+
+        if status != DONE and context._result_file is not None:
+            # 기록 도중 멈춘 결과 파일 삭제
+            context._result_file.close()
+            if os.path.exists(context._result_file.name):
+                os.remove(context._result_file.name)
+
+        with self._lock:
+            self._finish(job, status, error)
+        print(f"📋 작업 종료 ({job['kind']}, id={job_id}, {status})")
+
+    def _finish(self, job: Dict[str, Any], status: str, error: str = None):
+        job["status"] = status
+        job["error"] = error
+        job["finished"] = time.time()
+        self._write_job(job)
+
+    def _update_progress(self, job_id: str, total: int = None, advance: int = 0):
+        with self._lock:
+            job = self._jobs[job_id]
+            if total is not None:
+                job["progress"]["total"] = total
+            job["progress"]["done"] += advance
+            if time.monotonic() - self._last_written.get(job_id, 0) >= PROGRESS_WRITE_INTERVAL:
+                self._write_job(job)
+
+    def _recover(self):
+        """
+        서버 재시작 전에 끝나지 않은 작업은 실패로 기록 (작업 함수 상태는 복구할 수 없음)
+        """
+        for filename in os.listdir(self.directory):
+            if filename.endswith(".tmp"):
+                # 기록 도중 중단된 결과/상태 파일
+                os.remove(os.path.join(self.directory, filename))
+                continue
+            if not filename.endswith(".json") or filename.endswith(".result.json"):
+                continue
+            job = self.get(filename[:-len(".json")])
+            if job is not None and job["status"] not in FINISHED_STATUSES:
+                job.update(status=FAILED, error="서버 재시작으로 작업이 중단되었습니다.", finished=time.time())
+                self._write_job(job)
+
+    def _start_cleaner(self):
+        with self._lock:
+            if self._cleaner is not None:
+                return
+            self._cleaner = threading.Thread(target=self._cleanup_loop, name="job-cleanup", daemon=True)
+        self._cleaner.start()
+
+    def _cleanup_loop(self):
+        while True:
+            time.sleep(CLEANUP_INTERVAL)
+            try:
+                self.cleanup()
+            except Exception as e:
+                print(f"⚠️ 작업 정리 실패: {str(e)}")
+
+    @staticmethod
+    def _valid_id(job_id: str) -> bool:
+        return len(job_id) == 32 and all(c in "0123456789abcdef" for c in job_id)
+
+    def _path(self, job_id: str, suffix: str = None) -> str:
+        return os.path.join(self.directory, f"{job_id}.{suffix}.json" if suffix else f"{job_id}.json")
+
+    def _write_job(self, job: Dict[str, Any]):
+        self._last_written[job["id"]] = time.monotonic()
+        self._write_atomic(self._path(job["id"]), json.dumps(job, ensure_ascii=False, default=str).encode("utf-8"))
+
+    @staticmethod
+    def _write_atomic(path: str, payload: bytes):
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(payload)
+        os.replace(tmp_path, path)
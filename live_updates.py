@@ -0,0 +1,202 @@
+import json
+import queue
+import threading
+import time
+from typing import Callable, Dict, Any, List, Optional
+
+# 구독 상태로 관리하는 분석 결과 필드
+STATE_FIELDS = ("signals", "scores", "total_score", "recommendation", "latest_price", "latest_date")
+
+# 연결이 끊겼을 때 브라우저 EventSource가 다시 연결하기까지 기다리는 시간
+RECONNECT_DELAY_MS = 3000
+
+
+class Subscription:
+    """
+    클라이언트 연결 하나의 구독 종목과 전송 대기열
+    """
+
+    def __init__(self, symbols: List[str], max_queue: int):
+        self.symbols = symbols
+        self.queue: "queue.Queue[tuple]" = queue.Queue(maxsize=max_queue)
+
+    def push(self, event_type: str, payload: Dict[str, Any]):
+        """
+        이벤트 추가 (대기열이 가득 차면 가장 오래된 이벤트를 버림 - 느린 클라이언트가 서버를 막지 않도록)
+        """
+        while True:
+            try:
+                self.queue.put_nowait((event_type, payload))
+                return
+            except queue.Full:
+                try:
+                    self.queue.get_nowait()
+                except queue.Empty:
+                    pass
+
+
+class LiveUpdateHub:
+    """
+    종목별 분석 결과 변경분을 구독 중인 모든 클라이언트에 Server-Sent Events로 전달하는 클래스
+
+    구독 중인 종목은 refresh_interval마다 한 번씩만 다시 분석하고, 결과는 모든 구독자에게 나눠 보냅니다.
+    다른 요청(/analyze 등)으로 만들어진 결과도 같은 방식으로 전달됩니다.
+    """
+
+    def __init__(self, refresh: Callable[[str], None], refresh_interval: float = 60.0,
+                 heartbeat_interval: float = 15.0, max_queue: int = 100):
+        """
+        Args:
+            refresh (Callable): 종목 하나를 다시 분석해 publish까지 수행하는 함수
+            refresh_interval (float): 구독 종목을 다시 분석하는 주기 (초)
+            heartbeat_interval (float): 이벤트가 없을 때 연결 유지용 주석을 보내는 주기 (초)
+            max_queue (int): 구독자별 최대 대기 이벤트 수
+        """
+        self.refresh = refresh
+        self.refresh_interval = refresh_interval
+        self.heartbeat_interval = heartbeat_interval
+        self.max_queue = max_queue
+        self._subscribers: Dict[str, List[Subscription]] = {}
+        self._states: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._refresher: Optional[threading.Thread] = None
+
+    def subscribe(self, symbols: List[str]) -> Subscription:
+        """
+        종목 구독 등록 (첫 구독 시 주기적 갱신 스레드 시작)
+
+        이미 분석 결과가 있는 종목은 현재 상태를 바로 보내고, 없는 종목은 백그라운드에서 바로 분석합니다.
+        """
+        subscription = Subscription(symbols, self.max_queue)
+        missing = []
+        with self._lock:
+            for symbol in symbols:
+                first_subscriber = symbol not in self._subscribers
+                self._subscribers.setdefault(symbol, []).append(subscription)
+                state = self._states.get(symbol)
+                if state is not None:
+                    subscription.push("snapshot", {"symbol": symbol, **state})
+                elif first_subscriber:
+                    missing.append(symbol)
+            if self._refresher is None:
+                self._refresher = threading.Thread(target=self._refresh_loop, name="live-refresh", daemon=True)
+                self._refresher.start()
+        if missing:
+            threading.Thread(target=self._refresh_symbols, args=(missing,), name="live-initial", daemon=True).start()
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            for symbol in subscription.symbols:
+                subscribers = self._subscribers.get(symbol, [])
+                if subscription in subscribers:
+                    subscribers.remove(subscription)
+                if not subscribers:
+                    self._subscribers.pop(symbol, None)
+
+    def subscribed_symbols(self) -> List[str]:
+        with self._lock:
+            return list(self._subscribers)
+
+    def changed(self, result: Dict[str, Any]) -> bool:
+        """
+        결과의 최신 봉 날짜, 총점, 신호 중 하나라도 마지막으로 전달한 상태와 다른지 (상태가 없으면 True)
+        """
+        with self._lock:
+            previous = self._states.get(result["symbol"])
+        if previous is None:
+            return True
+        return (result.get("stock_info", {}).get("latest_date") != previous["latest_date"]
+                or result["total_score"] != previous["total_score"]
+                or result["signals"] != previous["signals"])
+
+    def publish(self, result: Dict[str, Any]):
+        """
+        새 분석 결과를 직전 상태와 비교해 바뀐 필드만 구독자에게 전달
+
+        같은 종목의 더 이전 날짜 결과(as_of 분석 등)는 무시합니다.
+        """
+        symbol = result["symbol"]
+        stock_info = result.get("stock_info", {})
+        state = {
+            "signals": result["signals"],
+            "scores": result["scores"],
+            "total_score": result["total_score"],
+            "recommendation": result["recommendation"],
+            "latest_price": stock_info.get("latest_price"),
+            "latest_date": stock_info.get("latest_date")
+        }
+
+        with self._lock:
+            previous = self._states.get(symbol)
+            if previous is not None and (state["latest_date"] or "") < (previous["latest_date"] or ""):
+                return
+            self._states[symbol] = state
+            subscribers = list(self._subscribers.get(symbol, []))
+
+        if previous is None:
+            event_type, payload = "snapshot", {"symbol": symbol, **state}
+        else:
+            changes = self.diff(previous, state)
+            if not changes:
+                return
+            event_type, payload = "update", {"symbol": symbol, "changes": changes}
+
+        for subscription in subscribers:
+            subscription.push(event_type, payload)
+
+    def publish_summary(self, symbol: str, summary_id: str, summary: str):
+        """
+        백그라운드에서 완료된 ChatGPT 요약 전달
+        """
+        with self._lock:
+            subscribers = list(self._subscribers.get(symbol, []))
+        for subscription in subscribers:
+            subscription.push("summary", {"symbol": symbol, "summary_id": summary_id, "expert_summary": summary})
+
+    @staticmethod
+    def diff(previous: Dict[str, Any], current: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        두 상태의 차이 (signals/scores는 바뀐 지표만 포함)
+        """
+        changes = {}
+        for field in STATE_FIELDS:
+            old_value, new_value = previous.get(field), current.get(field)
+            if isinstance(new_value, dict):
+                changed = {key: value for key, value in new_value.items() if (old_value or {}).get(key) != value}
+                if changed:
+                    changes[field] = changed
+            elif old_value != new_value:
+                changes[field] = new_value
+        return changes
+
+    def stream(self, subscription: Subscription):
+        """
+        구독 대기열을 Server-Sent Events 형식으로 내보내는 제너레이터 (연결이 끊기면 구독 해제)
+        """
+        try:
+            yield f"retry: {RECONNECT_DELAY_MS}\n\n"
+            while True:
+                try:
+                    event_type, payload = subscription.queue.get(timeout=self.heartbeat_interval)
+                except queue.Empty:
+                    yield ": keepalive\n\n"
+                    continue
+                yield f"event: {event_type}\ndata: {json.dumps(payload, ensure_ascii=False)}\n\n"
+        finally:
+            self.unsubscribe(subscription)
+
+    def _refresh_loop(self):
+        """
+        구독 중인 종목을 주기적으로 한 번씩 다시 분석
+        """
+        while True:
+            time.sleep(self.refresh_interval)
+            self._refresh_symbols(self.subscribed_symbols())
+
+    def _refresh_symbols(self, symbols: List[str]):
+        for symbol in symbols:
+            try:
+                self.refresh(symbol)
+            except Exception as e:
+                print(f"⚠️ {symbol} 실시간 갱신 실패: {str(e)}")
@@ -0,0 +1,49 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Optional
+
+
+class LRUCache:
+    """
+    최근에 사용한 항목을 우선 보관하는 스레드 안전 캐시
+    """
+
+    def __init__(self, max_entries: int = 256):
+        """
+        Args:
+            max_entries (int): 보관할 최대 항목 수
+        """
+        self.max_entries = max_entries
+        self._data: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        항목 조회 (없으면 None)
+        """
+        with self._lock:
+            if key not in self._data:
+                return None
+            self._data.move_to_end(key)
+            return self._data[key]
+
+    def set(self, key: str, value: Any):
+        """
+        항목 저장 (한도를 넘으면 가장 오래 사용하지 않은 항목부터 제거)
+        """
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete(self, key: str):
+        """
+        항목 삭제 (없으면 무시)
+        """
+        with self._lock:
+            self._data.pop(key, None)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
@@ -0,0 +1,69 @@
+from datetime import datetime, time, timedelta
+from zoneinfo import ZoneInfo
+
+# 미국 정규장 기준 (FMP 일봉 데이터 기준 시장)
+MARKET_TIMEZONE = ZoneInfo("America/New_York")
+MARKET_CLOSE_TIME = time(16, 0)
+
+# 장 마감 후 일봉 데이터가 FMP에 반영될 때까지의 여유 시간
+DATA_PUBLISH_DELAY = timedelta(minutes=15)
+
+
+def next_market_close(now: datetime = None) -> datetime:
+    """
+    다음 장 마감 시각(데이터 반영 여유 시간 포함) 계산
+
+    주말은 건너뛰며, 공휴일은 고려하지 않습니다 (공휴일에는 캐시가 하루 일찍 만료될 뿐입니다).
+
+    Args:
+        now (datetime): 기준 시각 (없으면 현재 시각, timezone 없는 값은 UTC로 간주)
+
+    Returns:
+        datetime: 다음 장 마감 시각 (UTC)
+    """
+    if now is None:
+        now = datetime.now(tz=ZoneInfo("UTC"))
+    elif now.tzinfo is None:
+        now = now.replace(tzinfo=ZoneInfo("UTC"))
+
+    local_now = now.astimezone(MARKET_TIMEZONE)
+    candidate = datetime.combine(local_now.date(), MARKET_CLOSE_TIME, tzinfo=MARKET_TIMEZONE) + DATA_PUBLISH_DELAY
+
+    while candidate <= local_now or candidate.weekday() >= 5:
+        candidate = datetime.combine(candidate.date() + timedelta(days=1), MARKET_CLOSE_TIME,
+                                     tzinfo=MARKET_TIMEZONE) + DATA_PUBLISH_DELAY
+
+    return candidate.astimezone(ZoneInfo("UTC"))
+
+
+def seconds_until_next_close(now: datetime = None) -> int:
+    """
+    다음 장 마감까지 남은 시간 (초) - Cache-Control max-age 계산용
+    """
+    if now is None:
+        now = datetime.now(tz=ZoneInfo("UTC"))
+    elif now.tzinfo is None:
+        now = now.replace(tzinfo=ZoneInfo("UTC"))
+    return max(int((next_market_close(now) - now).total_seconds()), 0)
+
+
+def last_completed_session(now: datetime = None):
+    """
+    일봉이 확정된 가장 최근 거래일 (주말 제외, 공휴일은 고려하지 않음)
+
+    Returns:
+        date: 미국 동부 시간 기준 거래일
+    """
+    if now is None:
+        now = datetime.now(tz=ZoneInfo("UTC"))
+    elif now.tzinfo is None:
+        now = now.replace(tzinfo=ZoneInfo("UTC"))
+
+    local_now = now.astimezone(MARKET_TIMEZONE)
+    session = local_now.date()
+    close = datetime.combine(session, MARKET_CLOSE_TIME, tzinfo=MARKET_TIMEZONE) + DATA_PUBLISH_DELAY
+    if local_now < close:
+        session -= timedelta(days=1)
+    while session.weekday() >= 5:
+        session -= timedelta(days=1)
+    return session
@@ -0,0 +1,245 @@
+"""
+프로세스 안의 모든 캐시(일봉 DataFrame, 분석 응답 JSON, ChatGPT 요약 등)가 쓰는 메모리를 합산해
+VM 메모리 예산 안으로 유지하는 메모리 관리자
+
+캐시마다 항목 수 대신 항목별 대략적인 바이트 크기를 기록하고, 합계가 예산을 넘으면 모든 캐시의 항목 중
+"다시 만드는 비용 / 크기"가 가장 낮고 오래 사용하지 않은 항목부터 제거합니다 (GreedyDual-Size 방식).
+"""
+
+import heapq
+import itertools
+import os
+import sys
+import threading
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from lru_cache import LRUCache
+
+# 캐시 항목 하나의 관리 비용 (OrderedDict 노드, 키 문자열, 크기 기록) 근사값 (바이트)
+ENTRY_OVERHEAD = 200
+
+# 예산을 넘으면 이 비율까지 줄임 (매 저장마다 제거가 일어나지 않도록)
+LOW_WATERMARK = 0.9
+
+# MEMORY_BUDGET_MB가 없을 때 VM 메모리 중 캐시에 쓰는 비율과, VM 메모리를 알 수 없을 때의 예산 (MB)
+VM_MEMORY_FRACTION = 0.25
+DEFAULT_BUDGET_MB = 128
+
+
+def estimate_size(value: Any) -> int:
+    """
+    값이 차지하는 메모리의 대략적인 바이트 수 (DataFrame/배열은 버퍼 크기, 컨테이너는 재귀 합산)
+    """
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(index=True, deep=True))
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_size(k) + estimate_size(v) for k, v in value.items())
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return sys.getsizeof(value) + sum(estimate_size(item) for item in value)
+    return sys.getsizeof(value)
+
+
+def process_rss_bytes() -> Optional[int]:
+    """
+    현재 프로세스의 상주 메모리 (Linux /proc 기준, 알 수 없으면 None)
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def vm_memory_bytes() -> Optional[int]:
+    """
+    VM/컨테이너 메모리 한도 (Fly의 FLY_VM_MEMORY_MB 또는 cgroup memory.max, 알 수 없으면 None)
+    """
+    if os.environ.get("FLY_VM_MEMORY_MB"):
+        return int(os.environ["FLY_VM_MEMORY_MB"]) * 1024 * 1024
+    for path in ("/sys/fs/cgroup/memory.max", "/sys/fs/cgroup/memory/memory.limit_in_bytes"):
+        try:
+            with open(path) as f:
+                limit = int(f.read().strip())
+        except (OSError, ValueError):
+            continue
+        # cgroup v1은 제한이 없으면 매우 큰 값을 기록
+        if limit < 1 << 50:
+            return limit
+    return None
+
+
+def default_budget_bytes() -> int:
+    """
+    캐시 메모리 예산 (MEMORY_BUDGET_MB, 없으면 VM 메모리의 VM_MEMORY_FRACTION)
+    """
+    if os.environ.get("MEMORY_BUDGET_MB"):
+        return int(float(os.environ["MEMORY_BUDGET_MB"]) * 1024 * 1024)
+    vm_memory = vm_memory_bytes()
+    if vm_memory is None:
+        return DEFAULT_BUDGET_MB * 1024 * 1024
+    return int(vm_memory * VM_MEMORY_FRACTION)
+
+
+class GovernedCache(LRUCache):
+    """
+    저장/조회/삭제를 MemoryGovernor에 알리는 LRUCache (MemoryGovernor.cache로 생성)
+    """
+
+    def __init__(self, governor: "MemoryGovernor", name: str, cost: float, max_entries: Optional[int] = None):
+        super().__init__(max_entries=max_entries or sys.maxsize)
+        self.governor = governor
+        self.name = name
+        self.cost = cost
+
+    def get(self, key: str) -> Optional[Any]:
+        value = super().get(key)
+        if value is not None:
+            self.governor._touch(self, key)
+        return value
+
+    def set(self, key: str, value: Any):
+        size = estimate_size(value) + ENTRY_OVERHEAD
+        evicted = []
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                evicted.append(self._data.popitem(last=False)[0])
+        for evicted_key in evicted:
+            self.governor._release(self, evicted_key)
+        # 캐시 잠금을 놓은 뒤 알려야 다른 캐시의 항목 제거와 잠금 순서가 엇갈리지 않음
+        self.governor._charge(self, key, size)
+
+    def delete(self, key: str):
+        if self._discard(key):
+            self.governor._release(self, key)
+
+    def _discard(self, key: str) -> bool:
+        with self._lock:
+            return self._data.pop(key, None) is not None
+
+
+class MemoryGovernor:
+    """
+    등록된 캐시 전체의 메모리 사용량을 예산 안으로 유지하는 관리자
+    """
+
+    def __init__(self, budget_bytes: int):
+        """
+        Args:
+            budget_bytes (int): 모든 캐시가 함께 쓸 수 있는 최대 바이트 수
+        """
+        self.budget_bytes = budget_bytes
+        self.used_bytes = 0
+        self._caches: Dict[str, GovernedCache] = {}
+        self._stats: Dict[str, Dict[str, int]] = {}
+        # (캐시 이름, 키) → (크기, 우선순위, 순번)
+        self._entries: Dict[tuple, tuple] = {}
+        self._heap = []
+        self._sequence = itertools.count()
+        # GreedyDual-Size의 기준값 L - 마지막으로 제거한 항목의 우선순위 (오래된 항목이 상대적으로 낮아짐)
+        self._inflation = 0.0
+        self._lock = threading.Lock()
+
+    def cache(self, name: str, cost: float, max_entries: Optional[int] = None) -> GovernedCache:
+        """
+        관리 대상 캐시 생성 (같은 이름이면 기존 캐시 반환)
+
+        Args:
+            name (str): 캐시 이름 (/memory 응답에 표시)
+            cost (float): 항목을 다시 만드는 상대 비용 (클수록 오래 보관, 예: 디스크 재로드 1, ChatGPT 재요청 50)
+            max_entries (int): 항목 수 상한 (없으면 메모리 예산만 적용)
+        """
+        with self._lock:
+            if name not in self._caches:
+                self._caches[name] = GovernedCache(self, name, cost, max_entries)
+                self._stats[name] = {"bytes": 0, "entries": 0, "evictions": 0}
+            return self._caches[name]
+
+    def _priority(self, cache: GovernedCache, size: int) -> float:
+        return self._inflation + cache.cost / size
+
+    def _push(self, cache: GovernedCache, key: str, size: int):
+        priority = self._priority(cache, size)
+        sequence = next(self._sequence)
+        self._entries[(cache.name, key)] = (size, priority, sequence)
+        heapq.heappush(self._heap, (priority, sequence, cache.name, key))
+        # 조회할 때마다 새 우선순위를 넣으므로 오래된 값이 쌓이면 다시 구성
+        if len(self._heap) > 2 * len(self._entries) + 64:
+            self._heap = [(priority, sequence, name, key)
+                          for (name, key), (_, priority, sequence) in self._entries.items()]
+            heapq.heapify(self._heap)
+
+    def _charge(self, cache: GovernedCache, key: str, size: int):
+        with self._lock:
+            stats = self._stats[cache.name]
+            previous = self._entries.get((cache.name, key))
+            if previous is not None:
+                self.used_bytes -= previous[0]
+                stats["bytes"] -= previous[0]
+            else:
+                stats["entries"] += 1
+            self.used_bytes += size
+            stats["bytes"] += size
+            self._push(cache, key, size)
+            victims = self._select_victims() if self.used_bytes > self.budget_bytes else []
+
+        for victim_cache, victim_key in victims:
+            victim_cache._discard(victim_key)
+
+    def _select_victims(self):
+        """
+        사용량이 LOW_WATERMARK 아래로 내려갈 때까지 우선순위가 가장 낮은 항목 선택 (잠금을 잡은 상태에서 호출)
+        """
+        victims = []
+        target = self.budget_bytes * LOW_WATERMARK
+        while self.used_bytes > target and self._heap:
+            priority, sequence, name, key = heapq.heappop(self._heap)
+            entry = self._entries.get((name, key))
+            if entry is None or entry[2] != sequence:
+                continue
+            self._inflation = priority
+            self._remove(name, key, entry[0])
+            self._stats[name]["evictions"] += 1
+            victims.append((self._caches[name], key))
+        return victims
+
+    def _remove(self, name: str, key: str, size: int):
+        del self._entries[(name, key)]
+        self.used_bytes -= size
+        self._stats[name]["bytes"] -= size
+        self._stats[name]["entries"] -= 1
+
+    def _touch(self, cache: GovernedCache, key: str):
+        with self._lock:
+            entry = self._entries.get((cache.name, key))
+            if entry is not None:
+                self._push(cache, key, entry[0])
+
+    def _release(self, cache: GovernedCache, key: str):
+        with self._lock:
+            entry = self._entries.get((cache.name, key))
+            if entry is not None:
+                self._remove(cache.name, key, entry[0])
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        예산, 캐시 전체/캐시별 사용량(바이트, 항목 수, 제거 수), 프로세스 상주 메모리
+        """
+        with self._lock:
+            caches = {name: dict(stats, cost=self._caches[name].cost) for name, stats in self._stats.items()}
+            used = self.used_bytes
+        return {
+            "budget_bytes": self.budget_bytes,
+            "used_bytes": used,
+            "process_rss_bytes": process_rss_bytes(),
+            "vm_memory_bytes": vm_memory_bytes(),
+            "caches": caches
+        }
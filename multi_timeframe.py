@@ -0,0 +1,155 @@
+"""
+한 번 가져온 일봉을 주봉/월봉으로 리샘플링해 같은 지표 세트를 시간 프레임별로 계산하는 모듈
+
+주봉 MACD가 일봉 MACD와 같은 방향인지 같은 질문에 답하기 위해 더 긴 기간을 다시 조회하지 않고,
+이미 가진 일봉만으로 상위 시간 프레임의 봉을 만듭니다.
+"""
+
+from typing import Dict, Any, Tuple
+
+import numpy as np
+import pandas as pd
+
+from stock_data_fetcher import StockDataFetcher
+from stock_trading_analyzer import recommend, RECOMMENDATION_CUTOFFS
+from vectorized_signals import INDICATORS, SIGNAL_NAMES, compute_raw_indicators, indicator_scores
+
+# 시간 프레임별 pandas 리샘플링 규칙 (주봉은 금요일 마감, 월봉은 월말 마감)
+TIMEFRAME_RULES = {
+    "daily": None,
+    "weekly": "W-FRI",
+    "monthly": "M"
+}
+
+OHLCV_AGGREGATION = {
+    "Open": "first",
+    "High": "max",
+    "Low": "min",
+    "Close": "last",
+    "Volume": "sum"
+}
+
+
+def parse_timeframes(value) -> Tuple[str, ...]:
+    """
+    "daily,weekly" 형식 문자열이나 목록을 시간 프레임 튜플로 변환 (일봉은 항상 포함, 잘못된 값은 ValueError)
+    """
+    if isinstance(value, str):
+        value = value.split(",")
+    timeframes = [t.strip().lower() for t in value if t and t.strip()]
+    unknown = [t for t in timeframes if t not in TIMEFRAME_RULES]
+    if unknown:
+        raise ValueError(f"지원하지 않는 시간 프레임입니다: {', '.join(unknown)} ({', '.join(TIMEFRAME_RULES)} 중 선택)")
+    return tuple(t for t in TIMEFRAME_RULES if t == "daily" or t in timeframes)
+
+
+def resample_bars(data: pd.DataFrame, timeframe: str) -> pd.DataFrame:
+    """
+    일봉을 주봉/월봉으로 변환 (마지막 봉은 아직 끝나지 않은 주/월일 수 있음)
+
+    Returns:
+        pd.DataFrame: 시간 프레임 봉 (인덱스는 각 구간의 마지막 거래일)
+    """
+    rule = TIMEFRAME_RULES[timeframe]
+    if rule is None:
+        return data
+
+    columns = {column: how for column, how in OHLCV_AGGREGATION.items() if column in data.columns}
+    grouped = data[list(columns)].resample(rule)
+    bars = grouped.agg(columns)
+    # 구간 끝 날짜(금요일/월말) 대신 실제 마지막 거래일을 인덱스로 사용
+    bars.index = data.index.to_series().resample(rule).last()
+    return bars.dropna(subset=["Close"])
+
+
+def timeframe_signals(fetcher: StockDataFetcher, bars: pd.DataFrame) -> Dict[str, Any]:
+    """
+    시간 프레임 봉의 마지막 봉 기준 지표 신호/점수
+
+    generate_signals와 같은 규칙이지만, 봉이 50개 미만이어도 계산 가능한 지표는 계산합니다
+    (월봉처럼 봉 수가 적은 시간 프레임에서도 RSI, ATR 등은 확인할 수 있도록).
+    하나라도 계산하지 못한 지표가 있으면 insufficient_data로 표시하고 일치도 평가(confluence)에서 제외합니다.
+    """
+    raw = compute_raw_indicators(fetcher, bars)
+    scores_by_key = indicator_scores(raw)
+
+    signals, scores, insufficient = {}, {}, {}
+    for key in INDICATORS:
+        if len(bars) < StockDataFetcher.REQUIRED_DATA_WINDOW[key]:
+            signals[key], scores[key], insufficient[key] = "INSUFFICIENT_DATA", 0, True
+            continue
+        score = int(scores_by_key[key][-1])
+        signals[key], scores[key], insufficient[key] = SIGNAL_NAMES[key][score], score, False
+
+    total_score = sum(scores.values())
+    return {
+        "bars": len(bars),
+        "latest_date": bars.index[-1].strftime('%Y-%m-%d'),
+        "signals": signals,
+        "scores": scores,
+        "insufficient": insufficient,
+        "insufficient_data": any(insufficient.values()),
+        "total_score": total_score,
+        "recommendation": recommend(total_score),
+        "bias": _bias(total_score)
+    }
+
+
+def analyze_timeframes(fetcher: StockDataFetcher, data: pd.DataFrame, timeframes=("daily", "weekly", "monthly")) -> Dict[str, Any]:
+    """
+    일봉 하나로 여러 시간 프레임의 신호를 계산하고 일봉과의 일치도를 평가 (네트워크 호출 없음)
+
+    Returns:
+        Dict[str, Any]: timeframes - 시간 프레임별 신호/점수/추천과 일봉 대비 지표 일치도(agreement),
+                        confluence - 모든 지표를 계산한 시간 프레임(timeframes)의 방향(bias) 합계와 같은 방향인지 여부
+    """
+    results = {}
+    for timeframe in timeframes:
+        bars = resample_bars(data, timeframe)
+        if bars.empty:
+            continue
+        results[timeframe] = timeframe_signals(fetcher, bars)
+
+    daily = results.get("daily")
+    for timeframe, result in results.items():
+        if daily is not None and timeframe != "daily":
+            result["agreement"] = _agreement(daily, result)
+
+    # 봉이 부족한 시간 프레임(예: 1년 데이터의 월봉)은 일부 지표만으로 방향이 정해지므로 제외
+    included = [timeframe for timeframe, result in results.items() if not result["insufficient_data"]]
+    biases = [results[timeframe]["bias"] for timeframe in included]
+    directional = [bias for bias in biases if bias != 0]
+    aligned = bool(directional) and len(directional) == len(biases) and len(set(directional)) == 1
+    return {
+        "timeframes": results,
+        "confluence": {
+            "timeframes": included,
+            "score": int(np.sum(biases)),
+            "aligned": aligned,
+            "direction": {1: "BULLISH", -1: "BEARISH"}.get(directional[0], "NEUTRAL") if aligned else "MIXED"
+        }
+    }
+
+
+def _bias(total_score: int) -> int:
+    """
+    종합 점수의 방향 (BUY 이상 +1, SELL 이하 -1, 그 외 0)
+    """
+    if total_score >= RECOMMENDATION_CUTOFFS["BUY"]:
+        return 1
+    if total_score <= RECOMMENDATION_CUTOFFS["SELL"]:
+        return -1
+    return 0
+
+
+def _agreement(daily: Dict[str, Any], other: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    두 시간 프레임에서 모두 계산된 지표 중 점수 방향(부호)이 같은 지표의 비율
+    """
+    compared = [key for key in INDICATORS if not daily["insufficient"][key] and not other["insufficient"][key]]
+    matching = [key for key in compared if np.sign(daily["scores"][key]) == np.sign(other["scores"][key])]
+    return {
+        "ratio": round(len(matching) / len(compared), 4) if compared else None,
+        "matching": matching,
+        "compared": len(compared)
+    }
@@ -0,0 +1,287 @@
+"""
+여러 종목을 하나의 (날짜 × 종목) 행렬로 정렬해 지표와 횡단면 신호를 한 번에 계산하는 패널 엔진
+
+generate_signals는 종목 하나의 DataFrame만 보므로 "유니버스 내 RSI 백분위", "섹터 대비 모멘텀",
+"60일 이동평균 위에 있는 종목 비율" 같은 상대 지표를 만들 수 없습니다. 이 모듈은 모든 종목의 일봉을
+공통 거래일 달력에 맞춘 2차원 배열로 만든 뒤, 기존 지표를 행렬 연산으로 한 번에 계산하고
+그 위에 횡단면 순위와 시장 폭(breadth) 지표를 추가합니다.
+"""
+
+from typing import Dict, Any, List, Optional
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from stock_data_fetcher import StockDataFetcher
+from stock_trading_analyzer import recommend_array, RECOMMENDATION_CUTOFFS
+from vectorized_signals import (INDICATORS, SIGNAL_NAMES, MIN_SIGNAL_BARS,
+                                macd_window_kernel, indicator_scores)
+
+PRICE_FIELDS = ("High", "Low", "Close", "Volume")
+
+# 모멘텀(수익률) 측정 기간과 시장 폭 계산에 쓰는 이동평균 기간 (거래일)
+MOMENTUM_WINDOW = 20
+BREADTH_MA_WINDOW = 60
+
+# 모멘텀 백분위 → 상대 강도 신호 (백분위 하한, 신호, 점수)
+RELATIVE_STRENGTH_LEVELS = (
+    (0.8, "STRONG_LEADER", 2),
+    (0.6, "LEADER", 1),
+    (0.4, "NEUTRAL", 0),
+    (0.2, "LAGGARD", -1),
+    (0.0, "STRONG_LAGGARD", -2)
+)
+
+
+def align_histories(histories: Dict[str, pd.DataFrame]) -> Dict[str, pd.DataFrame]:
+    """
+    종목별 일봉을 공통 거래일 달력(모든 종목 날짜의 합집합)에 맞춘 (날짜 × 종목) 행렬로 변환
+
+    상장 이후 중간에 빠진 날짜(거래 정지 등)는 직전 가격으로 채우고 거래량은 0으로 둡니다.
+    첫 봉 이전 구간은 NaN으로 남습니다.
+
+    Returns:
+        Dict[str, pd.DataFrame]: "High", "Low", "Close", "Volume" 행렬과 원래 봉 존재 여부 "Observed"
+    """
+    histories = {symbol: data for symbol, data in histories.items() if not data.empty}
+    if not histories:
+        raise ValueError("정렬할 데이터가 없습니다.")
+
+    panel = {}
+    for field in PRICE_FIELDS:
+        panel[field] = pd.DataFrame({symbol: data[field] for symbol, data in histories.items()}).sort_index()
+
+    panel["Observed"] = panel["Close"].notna()
+    for field in ("High", "Low", "Close"):
+        panel[field] = panel[field].ffill()
+    panel["Volume"] = panel["Volume"].where(panel["Observed"], 0.0).where(panel["Close"].notna())
+    return panel
+
+
+def compute_panel_raw(panel: Dict[str, pd.DataFrame]) -> Dict[str, np.ndarray]:
+    """
+    (날짜 × 종목) 행렬 전체에 대해 vectorized_signals.compute_raw_indicators와 같은 원시값 계산
+
+    Returns:
+        Dict[str, np.ndarray]: 지표별 (날짜 수 × 종목 수) 원시값 배열
+    """
+    high, low, close, volume = (panel[field] for field in PRICE_FIELDS)
+    close_values = close.to_numpy(dtype=float)
+    raw = {}
+
+    # RSI (StockDataFetcher.calculate_rsi와 같은 단순 이동평균 방식)
+    delta = close.diff()
+    gain = delta.where(delta > 0, 0).rolling(window=14).mean()
+    loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
+    raw["RSI"] = (100 - (100 / (1 + gain / loss))).to_numpy(dtype=float)
+
+    # MACD - generate_signals의 최근 50봉 윈도우 EWM과 같은 값 (가중치 벡터와의 내적)
+    window = StockDataFetcher.REQUIRED_DATA_WINDOW["MACD"]
+    macd_diff = np.full(close_values.shape, np.nan)
+    if len(close_values) >= window:
+        windows = sliding_window_view(close_values, window, axis=0)
+        macd_diff[window - 1:] = windows @ macd_window_kernel(window)
+    raw["MACD"] = macd_diff / close_values * 100
+
+    short_ma = close.rolling(window=20).mean()
+    long_ma = close.rolling(window=60).mean()
+    raw["MA_CROSSOVER"] = ((short_ma - long_ma) / long_ma * 100).to_numpy(dtype=float)
+
+    # True Range - 전일 종가가 없으면 고가-저가만 사용 (pandas max(axis=1)의 NaN 무시와 동일)
+    previous_close = close.shift()
+    true_range = np.fmax(np.fmax((high - low).to_numpy(dtype=float),
+                                 (high - previous_close).abs().to_numpy(dtype=float)),
+                         (low - previous_close).abs().to_numpy(dtype=float))
+    atr = pd.DataFrame(true_range, index=close.index).rolling(window=14).mean().to_numpy()
+    price_change = close.diff().abs().rolling(window=14).mean().to_numpy(dtype=float)
+    raw["ADX"] = np.nan_to_num(price_change / atr * 100, nan=0.0)
+    raw["ATR"] = atr / close_values * 100
+
+    typical_price = ((high + low + close) / 3).to_numpy(dtype=float)
+    volume_values = volume.to_numpy(dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        vwap = typical_price * volume_values / volume_values
+    raw["VWAP"] = (close_values - vwap) / vwap * 100
+
+    recent_high = high.rolling(window=20).max().to_numpy(dtype=float)
+    recent_low = low.rolling(window=20).min().to_numpy(dtype=float)
+    raw["BREAKOUT"] = (close_values - recent_high) / recent_high * 100
+    raw["BREAKDOWN"] = (recent_low - close_values) / recent_low * 100
+    return raw
+
+
+class PanelEngine:
+    """
+    여러 종목의 지표 점수, 횡단면 순위, 시장 폭 지표를 한 번에 계산하는 클래스
+    """
+
+    def __init__(self, histories: Dict[str, pd.DataFrame], sectors: Dict[str, str] = None):
+        """
+        Args:
+            histories (Dict[str, pd.DataFrame]): 종목별 일봉 데이터
+            sectors (Dict[str, str]): 종목별 섹터 (있으면 섹터 대비 모멘텀 계산)
+        """
+        self.panel = align_histories(histories)
+        close = self.panel["Close"]
+        self.dates = close.index
+        self.symbols = list(close.columns)
+        self.sectors = {symbol: (sectors or {}).get(symbol) for symbol in self.symbols}
+
+        # 종목별로 그 날짜까지 실제로 가진 봉 수 (generate_signals의 데이터 부족 판단 기준)
+        self.bars_available = self.panel["Observed"].cumsum().to_numpy()
+        self.raw = compute_panel_raw(self.panel)
+        self._compute_scores()
+        self._compute_cross_section()
+
+    def _compute_scores(self):
+        """
+        지표별 점수 행렬과 총점, 추천 등급 계산 (데이터가 부족한 지표는 0점)
+        """
+        scores = indicator_scores(self.raw)
+        self.scores = {}
+        self.insufficient = {}
+        for key in INDICATORS:
+            insufficient = self.bars_available < StockDataFetcher.REQUIRED_DATA_WINDOW[key]
+            self.insufficient[key] = insufficient
+            self.scores[key] = np.where(insufficient, 0, scores[key]).astype(np.int8)
+        self.total_score = sum(self.scores[key].astype(np.int16) for key in INDICATORS)
+        self.recommendation = recommend_array(self.total_score)
+        self.has_signal = self.bars_available >= MIN_SIGNAL_BARS
+
+    def _compute_cross_section(self):
+        """
+        날짜별 횡단면 순위(RSI 백분위, 모멘텀 백분위, 섹터 대비 모멘텀)와 상대 강도 신호 계산
+        """
+        close = self.panel["Close"]
+        rsi = pd.DataFrame(self.raw["RSI"], index=self.dates, columns=self.symbols)
+        rsi = rsi.where(~self.insufficient["RSI"])
+        self.rsi_percentile = rsi.rank(axis=1, pct=True)
+
+        self.momentum = close / close.shift(MOMENTUM_WINDOW) - 1
+        self.momentum_percentile = self.momentum.rank(axis=1, pct=True)
+
+        if any(self.sectors.values()):
+            sector_keys = pd.Series({symbol: sector or "UNKNOWN" for symbol, sector in self.sectors.items()})
+            sector_median = self.momentum.T.groupby(sector_keys).transform("median").T
+            self.sector_relative_momentum = self.momentum - sector_median
+        else:
+            self.sector_relative_momentum = None
+
+        percentile = self.momentum_percentile.to_numpy()
+        self.relative_strength_score = np.select(
+            [percentile >= lower for lower, _, _ in RELATIVE_STRENGTH_LEVELS],
+            [score for _, _, score in RELATIVE_STRENGTH_LEVELS],
+            default=0
+        ).astype(np.int8)
+
+    def breadth(self) -> pd.DataFrame:
+        """
+        날짜별 시장 폭 지표 (신호를 만들 수 있는 종목 기준 비율)
+
+        Returns:
+            pd.DataFrame: pct_above_ma60, pct_rsi_above_50, pct_bullish(BUY 이상), pct_bearish(SELL 이하),
+                          advancers_ratio, symbols(계산 대상 종목 수)
+        """
+        close = self.panel["Close"]
+        ma = close.rolling(window=BREADTH_MA_WINDOW).mean()
+        valid = pd.DataFrame(self.has_signal, index=self.dates, columns=self.symbols)
+        counts = valid.sum(axis=1)
+
+        def ratio(condition) -> pd.Series:
+            return (condition & valid).sum(axis=1) / counts.where(counts > 0)
+
+        rsi = pd.DataFrame(self.raw["RSI"], index=self.dates, columns=self.symbols)
+        total = pd.DataFrame(self.total_score, index=self.dates, columns=self.symbols)
+        return pd.DataFrame({
+            "pct_above_ma60": ratio((close > ma) & ma.notna()),
+            "pct_rsi_above_50": ratio(rsi > 50),
+            "pct_bullish": ratio(total >= RECOMMENDATION_CUTOFFS["BUY"]),
+            "pct_bearish": ratio(total <= RECOMMENDATION_CUTOFFS["SELL"]),
+            "advancers_ratio": ratio(close.diff() > 0),
+            "symbols": counts
+        })
+
+    def snapshot(self, as_of=None, history_days: int = 20) -> Dict[str, Any]:
+        """
+        기준일의 종목별 신호/점수/횡단면 순위와 시장 폭 지표
+
+        Args:
+            as_of (str | date): 기준일 (없으면 마지막 거래일, 거래일이 아니면 그 이전 마지막 거래일)
+            history_days (int): 함께 반환할 시장 폭 지표 기간 (거래일)
+
+        Returns:
+            Dict[str, Any]: date, breadth, breadth_history, symbols(종목별 결과), insufficient_symbols
+        """
+        row = len(self.dates) - 1
+        if as_of is not None:
+            row = int(self.dates.searchsorted(pd.Timestamp(as_of), side="right")) - 1
+            if row < 0:
+                raise ValueError(f"{as_of} 이전의 데이터가 없습니다.")
+
+        breadth = self.breadth().iloc[:row + 1]
+        latest_breadth = breadth.iloc[-1]
+
+        symbols = {}
+        insufficient_symbols = []
+        for column, symbol in enumerate(self.symbols):
+            if not self.has_signal[row, column]:
+                insufficient_symbols.append(symbol)
+                continue
+            symbols[symbol] = self._symbol_result(row, column)
+
+        return {
+            "date": self.dates[row].strftime('%Y-%m-%d'),
+            "breadth": self._breadth_dict(latest_breadth),
+            "breadth_history": [
+                {"date": date.strftime('%Y-%m-%d'), **self._breadth_dict(values)}
+                for date, values in breadth.tail(history_days).iterrows()
+            ],
+            "symbols": symbols,
+            "insufficient_symbols": insufficient_symbols
+        }
+
+    def _symbol_result(self, row: int, column: int) -> Dict[str, Any]:
+        signals = {}
+        scores = {}
+        for key in INDICATORS:
+            score = int(self.scores[key][row, column])
+            scores[key] = score
+            signals[key] = "INSUFFICIENT_DATA" if self.insufficient[key][row, column] else SIGNAL_NAMES[key][score]
+
+        momentum_percentile = self.momentum_percentile.iat[row, column]
+        relative_strength = None
+        if not np.isnan(momentum_percentile):
+            score = int(self.relative_strength_score[row, column])
+            relative_strength = next(name for _, name, level in RELATIVE_STRENGTH_LEVELS if level == score)
+
+        result = {
+            "price": float(self.panel["Close"].iat[row, column]),
+            "signals": signals,
+            "scores": scores,
+            "total_score": int(self.total_score[row, column]),
+            "recommendation": str(self.recommendation[row, column]),
+            "rsi_percentile": optional_float(self.rsi_percentile.iat[row, column]),
+            "momentum": optional_float(self.momentum.iat[row, column]),
+            "momentum_percentile": optional_float(momentum_percentile),
+            "relative_strength": relative_strength
+        }
+        if self.sector_relative_momentum is not None:
+            result["sector"] = self.sectors[self.symbols[column]]
+            result["sector_relative_momentum"] = optional_float(self.sector_relative_momentum.iat[row, column])
+        return result
+
+    @staticmethod
+    def _breadth_dict(values: pd.Series) -> Dict[str, Optional[float]]:
+        result = {key: optional_float(value) for key, value in values.items() if key != "symbols"}
+        result["symbols"] = int(values["symbols"])
+        return result
+
+
+def optional_float(value) -> Optional[float]:
+    """
+    NaN은 None으로, 나머지는 소수점 4자리 float로 변환 (JSON 응답용)
+    """
+    if value is None or pd.isna(value):
+        return None
+    return round(float(value), 4)
@@ -0,0 +1,180 @@
+"""
+포트폴리오 단위 분석 - 보유 종목별 신호를 비중으로 가중 합산하고 변동성/상관관계를 계산
+"""
+
+from typing import Dict, Any, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from panel_engine import PanelEngine, optional_float
+from stock_trading_analyzer import recommend
+from vectorized_signals import INDICATORS
+
+# 상관관계/포트폴리오 변동성 계산에 사용하는 최근 수익률 개수 (약 1년)
+CORRELATION_WINDOW = 252
+
+# 연율화에 사용하는 연간 거래일 수
+TRADING_DAYS_PER_YEAR = 252
+
+
+def normalize_weights(holdings: List[Dict[str, Any]]) -> Dict[str, float]:
+    """
+    보유 종목 목록을 합이 1인 비중으로 변환 (비중이 없으면 동일 비중, 잘못된 값은 ValueError)
+
+    Args:
+        holdings (List[Dict]): [{"symbol": "AAPL", "weight": 0.3}, ...] (같은 종목은 비중 합산)
+
+    Returns:
+        Dict[str, float]: 종목별 비중
+    """
+    if not isinstance(holdings, list):
+        raise ValueError('holdings는 [{"symbol": "AAPL", "weight": 0.3}, ...] 형식의 목록이어야 합니다.')
+    weights: Dict[str, float] = {}
+    for holding in holdings:
+        if not isinstance(holding, dict):
+            raise ValueError('holdings의 각 항목은 {"symbol": "AAPL", "weight": 0.3} 형식이어야 합니다.')
+        symbol = holding.get("symbol", "")
+        if not isinstance(symbol, str) or not symbol.strip():
+            raise ValueError("보유 종목의 symbol을 입력해주세요.")
+        symbol = symbol.strip().upper()
+        weight = holding.get("weight", 1.0)
+        try:
+            weight = float(weight)
+        except (TypeError, ValueError):
+            raise ValueError(f"{symbol}의 weight는 숫자여야 합니다.")
+        if weight <= 0 or np.isnan(weight):
+            raise ValueError(f"{symbol}의 weight는 0보다 커야 합니다.")
+        weights[symbol] = weights.get(symbol, 0.0) + weight
+
+    if not weights:
+        raise ValueError("보유 종목(holdings)을 입력해주세요.")
+    total = sum(weights.values())
+    return {symbol: weight / total for symbol, weight in weights.items()}
+
+
+def analyze_portfolio(histories: Dict[str, pd.DataFrame], weights: Dict[str, float],
+                      as_of=None) -> Dict[str, Any]:
+    """
+    보유 종목 전체를 패널 엔진으로 한 번에 분석하고 포트폴리오 지표 계산
+
+    신호를 만들 수 없는 종목(데이터 부족)은 제외하고 나머지 종목의 비중을 다시 1로 맞춥니다.
+
+    Args:
+        histories (Dict[str, pd.DataFrame]): 종목별 일봉
+        weights (Dict[str, float]): 종목별 비중 (normalize_weights 결과)
+        as_of (str): 기준일 (없으면 마지막 거래일)
+
+    Returns:
+        Dict[str, Any]: date, aggregate(가중 점수/추천), holdings(종목별 결과),
+                        volatility(ATR 기반 변동성 프로필), correlation(수익률 상관행렬), excluded
+    """
+    engine = PanelEngine(histories)
+    snapshot = engine.snapshot(as_of=as_of, history_days=0)
+    row = int(engine.dates.get_loc(pd.Timestamp(snapshot["date"])))
+
+    included = [symbol for symbol in weights if symbol in snapshot["symbols"]]
+    excluded = [symbol for symbol in weights if symbol not in snapshot["symbols"]]
+    if not included:
+        raise ValueError("신호를 계산할 수 있는 보유 종목이 없습니다.")
+    included_total = sum(weights[symbol] for symbol in included)
+    effective = {symbol: weights[symbol] / included_total for symbol in included}
+
+    columns = [engine.symbols.index(symbol) for symbol in included]
+    weight_vector = np.array([effective[symbol] for symbol in included])
+    atr_pct = engine.raw["ATR"][row, columns]
+
+    holdings = {}
+    for symbol, column, atr in zip(included, columns, atr_pct):
+        result = snapshot["symbols"][symbol]
+        holdings[symbol] = {
+            "weight": round(effective[symbol], 4),
+            "price": result["price"],
+            "signals": result["signals"],
+            "scores": result["scores"],
+            "total_score": result["total_score"],
+            "recommendation": result["recommendation"],
+            "atr_pct": optional_float(atr),
+            "score_contribution": round(effective[symbol] * result["total_score"], 4)
+        }
+
+    # 가중 점수 - 지표별 점수 행렬(종목 × 지표)과 비중 벡터의 곱
+    score_matrix = np.array([[holdings[symbol]["scores"][key] for key in INDICATORS] for symbol in included])
+    weighted_scores = weight_vector @ score_matrix
+    weighted_total = float(weighted_scores.sum())
+
+    return {
+        "date": snapshot["date"],
+        "aggregate": {
+            "weighted_total_score": round(weighted_total, 4),
+            "weighted_scores": {key: round(float(value), 4) for key, value in zip(INDICATORS, weighted_scores)},
+            "recommendation": recommend(weighted_total),
+            "recommendation_weights": _weight_by(holdings, "recommendation")
+        },
+        "holdings": holdings,
+        "volatility": _volatility_profile(engine, row, included, weight_vector, atr_pct, holdings),
+        "correlation": _correlation(engine, row, included),
+        "excluded": excluded
+    }
+
+
+def _weight_by(holdings: Dict[str, Dict[str, Any]], field: str) -> Dict[str, float]:
+    """
+    필드 값(추천 등급 등)별 비중 합계
+    """
+    totals: Dict[str, float] = {}
+    for holding in holdings.values():
+        totals[holding[field]] = totals.get(holding[field], 0.0) + holding["weight"]
+    return {key: round(value, 4) for key, value in totals.items()}
+
+
+def _returns(engine: PanelEngine, row: int, symbols: List[str]) -> pd.DataFrame:
+    """
+    기준일까지 최근 CORRELATION_WINDOW개 일간 수익률 (실제 거래가 없던 날은 제외)
+    """
+    close = engine.panel["Close"][symbols].iloc[:row + 1]
+    observed = engine.panel["Observed"][symbols].iloc[:row + 1]
+    returns = close.pct_change().where(observed)
+    return returns.iloc[1:].tail(CORRELATION_WINDOW)
+
+
+def _volatility_profile(engine: PanelEngine, row: int, symbols: List[str], weight_vector: np.ndarray,
+                        atr_pct: np.ndarray, holdings: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    ATR 기반 변동성 프로필과 수익률 공분산 기반 연율화 변동성
+    """
+    atr_weights = weight_vector[~np.isnan(atr_pct)]
+    weighted_atr = (float(np.dot(atr_weights, atr_pct[~np.isnan(atr_pct)]) / atr_weights.sum())
+                    if atr_weights.size else None)
+
+    returns = _returns(engine, row, symbols)
+    covariance = returns.cov(min_periods=20).to_numpy()
+    annualized = None
+    if not np.isnan(covariance).any():
+        annualized = float(np.sqrt(weight_vector @ covariance @ weight_vector * TRADING_DAYS_PER_YEAR))
+
+    signal_weights: Dict[str, float] = {}
+    for holding in holdings.values():
+        signal = holding["signals"]["ATR"]
+        signal_weights[signal] = round(signal_weights.get(signal, 0.0) + holding["weight"], 4)
+
+    return {
+        "weighted_atr_pct": optional_float(weighted_atr),
+        "annualized_volatility": optional_float(annualized),
+        "atr_signal_weights": signal_weights,
+        "highest_atr": max(holdings, key=lambda s: holdings[s]["atr_pct"] if holdings[s]["atr_pct"] is not None else -1)
+    }
+
+
+def _correlation(engine: PanelEngine, row: int, symbols: List[str]) -> Dict[str, Any]:
+    """
+    보유 종목 간 일간 수익률 상관행렬과 평균 상관계수
+    """
+    matrix = _returns(engine, row, symbols).corr(min_periods=20).to_numpy()
+    upper = matrix[np.triu_indices(len(symbols), k=1)]
+    upper = upper[~np.isnan(upper)]
+    return {
+        "symbols": symbols,
+        "matrix": [[optional_float(value) for value in matrix_row] for matrix_row in matrix],
+        "average": optional_float(upper.mean()) if upper.size else None
+    }
@@ -0,0 +1,243 @@
+"""
+운영 중인 요청을 필요할 때만 프로파일링하는 도구 - 요청 단위 cProfile/샘플링과 프로세스 전체 시간 제한 샘플링
+
+PROFILING_TOKEN이 설정된 경우에만 init_profiling이 요청 훅을 등록하므로, 꺼져 있을 때는 요청 처리에 추가 비용이 없습니다.
+샘플링 결과는 flamegraph.pl, speedscope 등에서 바로 읽을 수 있는 collapsed stack 형식("a;b;c 횟수")입니다.
+"""
+
+import cProfile
+import hmac
+import io
+import marshal
+import os
+import pstats
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+from flask import Flask, g, request, Response
+
+from lru_cache import LRUCache
+from memory_governor import MemoryGovernor
+
+PROFILE_MODES = ("cprofile", "sample")
+
+# 샘플링 간격 기본값 (초)과 프로세스 전체 샘플링 최대 시간 (초)
+DEFAULT_SAMPLE_INTERVAL = 0.005
+MAX_SAMPLE_SECONDS = 60
+
+# 요청 단위 프로파일을 지원하는 엔드포인트 (POST /analyze, GET /analyze/<symbol>)
+PROFILED_ENDPOINTS = ("analyze", "analyze_cacheable")
+
+# cProfile 텍스트 결과에 포함할 함수 수 (누적 시간 순)
+PSTATS_LIMIT = 40
+
+# 메모리 관리자에서 보관 프로파일의 상대 비용 (다시 만들 수 없지만 필요할 때 다시 실행하면 됨)
+PROFILE_CACHE_COST = 0.5
+
+
+def frame_label(frame) -> str:
+    """
+    flamegraph 한 칸의 이름 - 함수 이름 (파일:시작 줄)
+    """
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})".replace(";", ":")
+
+
+def frame_stack(frame) -> List[str]:
+    """
+    프레임에서 바깥쪽 호출까지 거슬러 올라간 호출 스택 (바깥쪽이 먼저)
+    """
+    stack = []
+    while frame is not None:
+        stack.append(frame_label(frame))
+        frame = frame.f_back
+    stack.reverse()
+    return stack
+
+
+def collapse_stacks(counts: Counter) -> str:
+    """
+    스택별 샘플 수를 collapsed stack 형식 텍스트로 변환 (많이 잡힌 스택부터)
+    """
+    return "".join(f"{stack} {count}\n" for stack, count in counts.most_common())
+
+
+class StackSampler:
+    """
+    sys._current_frames()로 일정 간격마다 스레드 스택을 기록하는 샘플링 프로파일러
+
+    프로파일 대상 코드에 훅을 걸지 않으므로 대상 스레드의 속도에 거의 영향을 주지 않습니다.
+    """
+
+    def __init__(self, interval: float = DEFAULT_SAMPLE_INTERVAL, thread_id: Optional[int] = None):
+        """
+        Args:
+            interval (float): 샘플링 간격 (초)
+            thread_id (int): 기록할 스레드 (없으면 샘플러를 제외한 모든 스레드, 스택 맨 앞에 스레드 이름 추가)
+        """
+        self.interval = interval
+        self.thread_id = thread_id
+        self.counts: Counter = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> Counter:
+        self._stop.set()
+        self._thread.join()
+        return self.counts
+
+    def _run(self):
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()} if self.thread_id is None else {}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id or (self.thread_id is not None and thread_id != self.thread_id):
+                    continue
+                stack = frame_stack(frame)
+                if self.thread_id is None:
+                    stack.insert(0, names.get(thread_id, str(thread_id)).replace(";", ":").replace(" ", "_"))
+                self.counts[";".join(stack)] += 1
+            self.samples += 1
+
+
+class Profiler:
+    """
+    요청 단위 프로파일 실행/보관과 프로세스 전체 샘플링
+    """
+
+    def __init__(self, token: str, max_entries: int = 50, governor: Optional[MemoryGovernor] = None):
+        """
+        Args:
+            token (str): 프로파일 요청에 필요한 토큰 (X-Profile-Token 헤더)
+            max_entries (int): 보관할 요청 프로파일 수
+            governor (MemoryGovernor): 보관 프로파일의 바이트 크기를 관리할 메모리 관리자
+        """
+        self.token = token
+        if governor is not None:
+            self._profiles = governor.cache("profiles", PROFILE_CACHE_COST, max_entries=max_entries)
+        else:
+            self._profiles = LRUCache(max_entries=max_entries)
+        self._sampling = threading.Lock()
+
+    def authorized(self) -> bool:
+        return hmac.compare_digest(request.headers.get("X-Profile-Token", ""), self.token)
+
+    def requested_mode(self) -> Optional[str]:
+        """
+        현재 요청이 요청한 프로파일 방식 (?profile= 또는 X-Profile 헤더, 토큰이 맞지 않으면 None)
+        """
+        mode = request.args.get("profile") or request.headers.get("X-Profile")
+        if not mode:
+            return None
+        mode = "cprofile" if mode == "1" else mode
+        if mode not in PROFILE_MODES or not self.authorized():
+            return None
+        return mode
+
+    def start_request(self, mode: str):
+        if mode == "cprofile":
+            profile = cProfile.Profile()
+            profile.enable()
+        else:
+            profile = StackSampler(thread_id=threading.get_ident())
+            profile.start()
+        return {"mode": mode, "profile": profile, "started": time.perf_counter()}
+
+    def finish_request(self, handle: Dict[str, Any]) -> str:
+        """
+        요청 프로파일을 끝내고 보관 (프로파일 id 반환)
+        """
+        duration = time.perf_counter() - handle["started"]
+        profile = handle["profile"]
+        entry = {"mode": handle["mode"], "path": request.full_path.rstrip("?"),
+                 "duration_seconds": round(duration, 4), "created": time.time()}
+        if handle["mode"] == "cprofile":
+            profile.disable()
+            output = io.StringIO()
+            stats = pstats.Stats(profile, stream=output)
+            stats.sort_stats("cumulative").print_stats(PSTATS_LIMIT)
+            entry["text"] = output.getvalue()
+            entry["pstats"] = marshal.dumps(stats.stats)
+        else:
+            entry["collapsed"] = collapse_stacks(profile.stop())
+            entry["samples"] = profile.samples
+
+        profile_id = uuid.uuid4().hex
+        self._profiles.set(profile_id, entry)
+        print(f"🔬 {entry['path']} 프로파일 저장 ({entry['mode']}, {duration:.3f}초, id={profile_id})")
+        return profile_id
+
+    def get(self, profile_id: str) -> Optional[Dict[str, Any]]:
+        return self._profiles.get(profile_id)
+
+    def sample_process(self, seconds: float, interval: float = DEFAULT_SAMPLE_INTERVAL) -> Optional[Counter]:
+        """
+        프로세스 전체 스레드를 seconds 동안 샘플링 (이미 진행 중이면 None)
+        """
+        if not self._sampling.acquire(blocking=False):
+            return None
+        try:
+            print(f"🔬 프로세스 전체 샘플링 시작 ({seconds}초, {interval * 1000:.0f}ms 간격)")
+            sampler = StackSampler(interval=interval)
+            sampler.start()
+            time.sleep(seconds)
+            return sampler.stop()
+        finally:
+            self._sampling.release()
+
+
+def profile_response(entry: Dict[str, Any], output_format: str = None) -> Response:
+    """
+    보관된 요청 프로파일 응답 (format: text - cProfile 표, pstats - pstats 바이너리, collapsed - 샘플링 스택)
+    """
+    output_format = output_format or ("text" if entry["mode"] == "cprofile" else "collapsed")
+    if output_format == "pstats" and "pstats" in entry:
+        return Response(entry["pstats"], mimetype="application/octet-stream",
+                        headers={"Content-Disposition": "attachment; filename=profile.pstats"})
+    if output_format in entry:
+        return Response(entry[output_format], mimetype="text/plain")
+    return None
+
+
+def init_profiling(app: Flask, profiler: Optional[Profiler]):
+    """
+    요청 단위 프로파일 훅 등록 (profiler가 없으면 아무것도 등록하지 않음)
+    """
+    if profiler is None:
+        return
+
+    @app.before_request
+    def start_request_profile():
+        if request.endpoint not in PROFILED_ENDPOINTS:
+            return
+        mode = profiler.requested_mode()
+        if mode:
+            g.profile = profiler.start_request(mode)
+
+    @app.after_request
+    def finish_request_profile(response: Response) -> Response:
+        handle = g.pop("profile", None)
+        if handle is not None:
+            profile_id = profiler.finish_request(handle)
+            response.headers["X-Profile-Id"] = profile_id
+            response.headers["X-Profile-Url"] = f"/profiles/{profile_id}"
+        return response
+
+    @app.teardown_request
+    def stop_request_profile(error=None):
+        # 처리되지 않은 예외로 after_request가 건너뛰어진 경우에도 프로파일러를 멈춤
+        handle = g.pop("profile", None)
+        if handle is not None:
+            if handle["mode"] == "cprofile":
+                handle["profile"].disable()
+            else:
+                handle["profile"].stop()
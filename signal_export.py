@@ -0,0 +1,176 @@
+"""
+저장된 분석 결과(analysis_history)를 종목 전체의 열 지향 테이블로 내보내는 도구 - Arrow IPC 스트림 / Parquet / CSV
+
+분석 이력을 chunk_rows행씩 읽어 한 묶음(Arrow record batch, Parquet row group)씩 직렬화해 바로 내보내므로,
+종목과 기간이 아무리 많아도 메모리 사용량은 묶음 크기로 일정합니다. Arrow/Parquet 출력에는 pyarrow가 필요합니다.
+"""
+
+import csv
+import io
+from typing import Any, Dict, Iterator, List
+
+from analysis_history import AnalysisHistory
+from vectorized_signals import INDICATORS
+
+# 내보내는 테이블 컬럼 (지표별 원시값/신호/점수 포함)
+EXPORT_COLUMNS = (
+    ["symbol", "date", "analyzed_at", "price"]
+    + [f"{key}_{field}" for key in INDICATORS for field in ("value", "signal", "score")]
+    + ["total_score", "recommendation", "version"]
+)
+
+# 형식별 (MIME 타입, 파일 확장자)
+EXPORT_FORMATS = {
+    "arrow": ("application/vnd.apache.arrow.stream", "arrow"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+    "csv": ("text/csv", "csv")
+}
+
+# 한 번에 읽어 직렬화하는 행 수 (Arrow record batch / Parquet row group 크기)
+EXPORT_CHUNK_ROWS = 5000
+
+
+def export_row(entry: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    AnalysisHistory.iter_daily_results의 한 행을 내보내기 테이블의 한 행으로 변환
+    """
+    row = {column: entry.get(column) for column in ("symbol", "date", "analyzed_at", "price",
+                                                    "total_score", "recommendation", "version")}
+    for key in INDICATORS:
+        row[f"{key}_value"] = entry["raw_values"].get(key)
+        row[f"{key}_signal"] = entry["signals"].get(key)
+        row[f"{key}_score"] = entry["scores"].get(key)
+    return row
+
+
+class ChunkSink:
+    """
+    pyarrow 기록기가 쓴 바이트를 모았다가 drain()으로 꺼내는 출력 스트림
+
+    Parquet 기록기는 tell()로 파일 내 위치를 계산하므로, 꺼낸 뒤에도 누적 위치를 유지합니다.
+    """
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def writable(self) -> bool:
+        return True
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+class ArrowExportWriter:
+    """
+    행 묶음을 Arrow IPC 스트림의 record batch로 직렬화하는 기록기
+    """
+
+    def __init__(self):
+        try:
+            import pyarrow
+            import pyarrow.ipc
+        except ImportError:
+            raise RuntimeError("Arrow/Parquet 출력에는 pyarrow가 필요합니다 (pip install pyarrow).")
+        self._pa = pyarrow
+        self._sink = ChunkSink()
+        self.schema = self._schema()
+        self._writer = self._open()
+
+    def _open(self):
+        return self._pa.ipc.new_stream(self._sink, self.schema)
+
+    def _schema(self):
+        pa = self._pa
+        types = {"price": pa.float64(), "total_score": pa.int64()}
+        types.update({f"{key}_value": pa.float64() for key in INDICATORS})
+        types.update({f"{key}_score": pa.int64() for key in INDICATORS})
+        return pa.schema([(column, types.get(column, pa.string())) for column in EXPORT_COLUMNS])
+
+    def write(self, rows: List[Dict[str, Any]]) -> bytes:
+        self._writer.write_table(self._pa.Table.from_pylist(rows, schema=self.schema))
+        return self._sink.drain()
+
+    def close(self) -> bytes:
+        self._writer.close()
+        return self._sink.drain()
+
+
+class ParquetExportWriter(ArrowExportWriter):
+    """
+    행 묶음을 Parquet row group으로 직렬화하는 기록기 (파일 메타데이터는 close()에서 마지막에 기록)
+    """
+
+    def _open(self):
+        import pyarrow.parquet
+        return pyarrow.parquet.ParquetWriter(self._sink, self.schema)
+
+
+class CsvExportWriter:
+    """
+    행 묶음을 CSV로 직렬화하는 기록기 (pyarrow 없이 사용 가능)
+    """
+
+    def __init__(self):
+        self._buffer = io.StringIO()
+        self._writer = csv.DictWriter(self._buffer, fieldnames=EXPORT_COLUMNS)
+        self._writer.writeheader()
+
+    def _drain(self) -> bytes:
+        data = self._buffer.getvalue().encode("utf-8")
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        return data
+
+    def write(self, rows: List[Dict[str, Any]]) -> bytes:
+        self._writer.writerows(rows)
+        return self._drain()
+
+    def close(self) -> bytes:
+        return self._drain()
+
+
+def create_export_writer(output_format: str):
+    """
+    형식별 기록기 생성 (지원하지 않는 형식은 ValueError, pyarrow가 없으면 RuntimeError)
+    """
+    if output_format == "arrow":
+        return ArrowExportWriter()
+    if output_format == "parquet":
+        return ParquetExportWriter()
+    if output_format == "csv":
+        return CsvExportWriter()
+    raise ValueError(f"format은 {', '.join(EXPORT_FORMATS)} 중 하나여야 합니다.")
+
+
+def stream_export(history: AnalysisHistory, writer, start: str = None, end: str = None,
+                  symbols: List[str] = None, chunk_rows: int = EXPORT_CHUNK_ROWS) -> Iterator[bytes]:
+    """
+    분석 이력을 chunk_rows행씩 읽어 기록기로 직렬화한 바이트를 차례로 반환 (응답 본문으로 바로 스트리밍)
+    """
+    rows = 0
+    for chunk in history.iter_daily_results(start, end, symbols, chunk_rows):
+        rows += len(chunk)
+        data = writer.write([export_row(entry) for entry in chunk])
+        if data:
+            yield data
+    yield writer.close()
+    print(f"📤 분석 결과 {rows}행 내보내기 완료")
@@ -1,9 +1,12 @@
-import requests
 import pandas as pd
 import os
-from datetime import datetime, timedelta
-from typing import Tuple, Dict, Any
+import math
+import re
+from datetime import datetime, timedelta, date
+from typing import Tuple, Dict, Any, Union
 import logging
+from market_calendar import last_completed_session
+from data_providers import create_provider, ProviderError
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
@@ -25,67 +28,168 @@ class StockDataFetcher:
         "VWAP": 1                # Volume Weighted Average Price (daily)
     }
     
-    def __init__(self):
+    # 최소 윈도우 외에 여유로 더 가져오는 봉 수 (지표 초기값 안정화)
+    INDICATOR_WARMUP_BARS = 5
+    
+    # 지표 계산에 필요한 봉만 가져오는 기간 값
+    MINIMAL_PERIOD = "min"
+    
+    # 기간 문자열 단위별 일수 (예: "10d", "2wk", "6mo", "5y")
+    PERIOD_UNITS = {"d": 1, "wk": 7, "mo": 365 / 12, "y": 365}
+    
+    def __init__(self, bar_store=None, provider=None):
         """
         API 키를 초기화합니다.
+        
+        Args:
+            bar_store (BarStore): 로컬 일봉 저장소 (있으면 가지고 있는 구간은 네트워크 없이 사용)
+            provider (DataProvider): 일봉 공급자 (없으면 DATA_PROVIDERS 환경변수 설정으로 생성)
         """
         self.api_key = os.environ.get('FMP_API_KEY')
-        if not self.api_key:
-            raise ValueError("FMP_API_KEY 환경변수가 설정되지 않았습니다.")
-        pass
+        if provider is None:
+            provider = create_provider(self.api_key)
+        self.provider = provider
+        self.bar_store = bar_store
     
-    def fetch_stock_data(self, symbol: str, period: str = "1y", interval: str = "1d") -> pd.DataFrame:
+    @classmethod
+    def minimal_window_bars(cls) -> int:
         """
-        Financial Modeling Prep API를 사용하여 주식 데이터를 가져옵니다.
+        모든 지표를 계산하는 데 필요한 최소 봉 수 (REQUIRED_DATA_WINDOW 최댓값 + 여유분)
         """
-        try:
-            # 기간 계산 (FMP는 날짜 기반 from/to를 사용)
-            end_date = datetime.now()
-            if period == "1y":
-                start_date = end_date - timedelta(days=365)
-            elif period == "2y":
-                start_date = end_date - timedelta(days=730)
-            elif period == "6mo":
-                start_date = end_date - timedelta(days=182)
-            else: # 3mo or 1mo
-                start_date = end_date - timedelta(days=90)
-            
-            start_date_str = start_date.strftime('%Y-%m-%d')
-            end_date_str = end_date.strftime('%Y-%m-%d')
-            
-            # FMP API URL 구성
-            url = f"https://financialmodelingprep.com/api/v3/historical-price-full/{symbol}?from={start_date_str}&to={end_date_str}&apikey={self.api_key}"
-            
-            response = requests.get(url)
-            response.raise_for_status() # 오류 발생 시 예외 처리
-            
-            data = response.json()
-            
-            if not data or 'historical' not in data:
-                print(f"❌ {symbol} 데이터를 가져오는데 실패했습니다. API 응답이 비어있습니다.")
-                return pd.DataFrame()
-
-            # Pandas DataFrame으로 변환
-            df = pd.DataFrame(data['historical'])
-            if df.empty:
-                print(f"❌ {symbol} 데이터가 비어 있습니다.")
-                return pd.DataFrame()
-
-            # FMP 데이터 형식에 맞게 컬럼 이름 변경 및 형식 변환
-            df = df.rename(columns={'date': 'Date', 'adjClose': 'Adj Close', 'open': 'Open', 'high': 'High', 'low': 'Low', 'close': 'Close', 'volume': 'Volume'})
-            df['Date'] = pd.to_datetime(df['Date'])
-            df = df.set_index('Date')
-            df = df.sort_index() # 날짜 오름차순으로 정렬
-            
-            print(f"✅ {symbol} FMP API 데이터 가져오기 완료 ({len(df)}일치 데이터)")
-            return df
+        return max(cls.REQUIRED_DATA_WINDOW.values()) + cls.INDICATOR_WARMUP_BARS
+    
+    @classmethod
+    def minimal_window_days(cls) -> int:
+        """
+        최소 봉 수를 확보하기 위한 달력 일수 (주 5거래일 기준, 공휴일 여유 7일)
+        """
+        return math.ceil(cls.minimal_window_bars() * 7 / 5) + 7
+    
+    @classmethod
+    def parse_period(cls, period: str) -> timedelta:
+        """
+        기간 문자열을 timedelta로 변환
+        
+        Args:
+            period (str): "1y", "6mo", "2wk", "90d" 형식의 기간
             
-        except requests.exceptions.HTTPError as http_err:
-            print(f"❌ HTTP 오류 발생: {http_err} - API 키가 유효한지, 요청 제한을 초과하지 않았는지 확인하세요.")
+        Returns:
+            timedelta: 기간
+        """
+        match = re.fullmatch(r"(\d+)(d|wk|mo|y)", period or "")
+        if not match:
+            raise ValueError(f"지원하지 않는 기간 형식입니다: {period} (예: 90d, 2wk, 6mo, 1y, {cls.MINIMAL_PERIOD})")
+        return timedelta(days=round(int(match.group(1)) * cls.PERIOD_UNITS[match.group(2)]))
+    
+    @staticmethod
+    def _to_date(value: Union[str, date, datetime, None]):
+        """
+        "YYYY-MM-DD" 문자열, date, datetime을 date로 변환
+        """
+        if value is None or value == "":
+            return None
+        if isinstance(value, datetime):
+            return value.date()
+        if isinstance(value, date):
+            return value
+        return datetime.strptime(value, '%Y-%m-%d').date()
+    
+    def resolve_date_range(self, period: str = "1y", start=None, end=None, as_of=None) -> Tuple[date, date]:
+        """
+        기간/시작일/종료일/기준일을 실제로 가져올 날짜 구간으로 변환
+        
+        as_of가 있으면 그 날짜를 종료일로 사용합니다. 요청 구간이 지표 계산에 필요한 최소 구간보다
+        짧으면 시작일을 앞당겨서 최소 구간을 확보합니다.
+        
+        Returns:
+            Tuple[date, date]: (시작일, 종료일)
+        """
+        end_date = self._to_date(as_of) or self._to_date(end) or datetime.now().date()
+        start_date = self._to_date(start)
+        if start_date is None:
+            if period == self.MINIMAL_PERIOD:
+                start_date = end_date - timedelta(days=self.minimal_window_days())
+            else:
+                start_date = end_date - self.parse_period(period)
+        
+        if start_date > end_date:
+            raise ValueError(f"시작일({start_date})이 종료일({end_date})보다 늦습니다.")
+        
+        # 지표 계산에 필요한 최소 구간 확보
+        start_date = min(start_date, end_date - timedelta(days=self.minimal_window_days()))
+        return start_date, end_date
+    
+    def fetch_stock_data(self, symbol: str, period: str = "1y", interval: str = "1d",
+                         start=None, end=None, as_of=None) -> pd.DataFrame:
+        """
+        데이터 공급자(기본: FMP, 늦으면 보조 공급자에 헤지 요청)를 사용하여 주식 데이터를 가져옵니다.
+        
+        모든 공급자가 실패하면 로컬 저장소의 이전 일봉으로 대체하고 attrs["stale"]을 True로 표시합니다.
+        
+        Args:
+            symbol (str): 주식 심볼
+            period (str): 데이터 기간 ("1y", "6mo", "90d" 등, "min"이면 지표 계산에 필요한 최소 구간)
+            interval (str): 데이터 간격
+            start (str | date): 시작일 (있으면 period 대신 사용)
+            end (str | date): 종료일 (없으면 오늘)
+            as_of (str | date): 분석 기준일 - 이 날짜까지의 데이터만 사용
+        """
+        try:
+            start_date, end_date = self.resolve_date_range(period, start, end, as_of)
+        except ValueError as e:
+            print(f"❌ {symbol} 데이터 구간 오류: {str(e)}")
             return pd.DataFrame()
+        
+        # 로컬 저장소에 요청 구간이 모두 있으면 네트워크 없이 사용
+        if self.bar_store is not None:
+            today = datetime.now().date()
+            latest_required = last_completed_session() if end_date >= today else None
+            local_data = self.bar_store.get_range(symbol, start_date, end_date, latest_required)
+            if local_data is not None:
+                print(f"✅ {symbol} 로컬 일봉 데이터 사용 ({len(local_data)}일치 데이터)")
+                local_data.attrs.update(source="local", stale=False)
+                return local_data
+        
+        try:
+            df = self.provider.fetch(symbol, start_date, end_date)
+        except ProviderError as e:
+            print(f"❌ {symbol} 데이터를 가져오는데 실패했습니다: {str(e)}")
+            return self._stale_bars(symbol, start_date, end_date)
         except Exception as e:
-            print(f"❌ {symbol} FMP API 데이터 가져오기 실패: {str(e)}")
+            print(f"❌ {symbol} 데이터 가져오기 실패: {str(e)}")
+            return self._stale_bars(symbol, start_date, end_date)
+        
+        source = df.attrs.get("source", self.provider.name)
+        if self.bar_store is not None and source != self.provider.primary_name:
+            # 보조 공급자는 수정주가 기준이 달라 저장된 일봉과 섞으면 지표가 틀어지므로 응답에만 사용
+            print(f"ℹ️ {symbol} 보조 공급자({source}) 일봉은 로컬 저장소에 기록하지 않습니다.")
+        elif self.bar_store is not None:
+            # 진행 중인 세션의 미완성 봉은 저장하지 않음 (저장하면 장 마감 후에도 확정 봉처럼 사용됨)
+            completed = df.loc[:pd.Timestamp(last_completed_session())]
+            if not completed.empty:
+                completed.attrs["source"] = source
+                self.bar_store.save(symbol, completed)
+        
+        df.attrs.update(source=source, stale=False)
+        print(f"✅ {symbol} {source} 데이터 가져오기 완료 ({len(df)}일치 데이터)")
+        return df
+    
+    def _stale_bars(self, symbol: str, start_date: date, end_date: date) -> pd.DataFrame:
+        """
+        모든 공급자가 실패했을 때 로컬 저장소에 남아 있는 구간 일봉 (최신이 아닐 수 있어 stale로 표시)
+        """
+        if self.bar_store is None:
+            return pd.DataFrame()
+        data = self.bar_store.load(symbol)
+        if data.empty:
             return pd.DataFrame()
+        data = data.loc[pd.Timestamp(start_date):pd.Timestamp(end_date)].copy()
+        if data.empty:
+            return pd.DataFrame()
+        
+        data.attrs.update(source="local", stale=True)
+        print(f"⚠️ {symbol} 로컬 저장소의 이전 일봉으로 대체 ({data.index[-1].strftime('%Y-%m-%d')}까지, {len(data)}일치 데이터)")
+        return data
     
     def get_indicator_data(self, data: pd.DataFrame, indicator: str) -> pd.DataFrame:
         """
@@ -242,7 +346,7 @@ class StockDataFetcher:
             data (pd.DataFrame): 주식 데이터
             
         Returns:
-            Dict[str, Any]: 기술적 지표별 신호, 점수, 부족한 데이터 정보
+            Dict[str, Any]: 기술적 지표별 신호, 점수, 부족한 데이터 정보, 원시값(계산한 지표만)
         """
         if len(data) < 50:
             print("❌ 신호 생성을 위한 충분한 데이터가 없습니다 (최소 50일 필요)")
@@ -251,6 +355,7 @@ class StockDataFetcher:
         signals = {}
         scores = {}
         insufficient = {}
+        values = {}
         latest_close = data['Close'].iloc[-1]
         
         print(f"\n📊 기술적 지표 계산 중...")
@@ -283,6 +388,7 @@ class StockDataFetcher:
                 signals["RSI"] = "STRONG_OVERSOLD"
                 scores["RSI"] = 2
             
+            values["RSI"] = float(latest_rsi)
             print(f"   RSI raw={latest_rsi:.2f} → {signals['RSI']}, score={scores['RSI']} using last {len(rsi_data)} days ({rsi_data.index[0].strftime('%Y-%m-%d')} ~ {rsi_data.index[-1].strftime('%Y-%m-%d')})")
         
         # 2. MACD 신호 (중기 추세 - 최근 50일)
@@ -318,6 +424,7 @@ class StockDataFetcher:
                 scores["MACD"] = 0
                 macd_diff_pct = 0
             
+            values["MACD"] = float(macd_diff_pct)
             print(f"   MACD raw={macd_diff_pct:.3f}% → {signals['MACD']}, score={scores['MACD']} using last {len(macd_data)} days ({macd_data.index[0].strftime('%Y-%m-%d')} ~ {macd_data.index[-1].strftime('%Y-%m-%d')})")
         
         # 3. 이동평균 크로스오버 (중기 추세 - 최근 60일)
@@ -353,6 +460,7 @@ class StockDataFetcher:
                 scores["MA_CROSSOVER"] = 0
                 ma_diff_pct = 0
             
+            values["MA_CROSSOVER"] = float(ma_diff_pct)
             print(f"   MA_CROSSOVER raw={ma_diff_pct:.2f}% → {signals['MA_CROSSOVER']}, score={scores['MA_CROSSOVER']} using last {len(ma_data)} days ({ma_data.index[0].strftime('%Y-%m-%d')} ~ {ma_data.index[-1].strftime('%Y-%m-%d')})")
         
         # 4. ADX (단기 추세 강도 - 최근 20일)
@@ -383,6 +491,7 @@ class StockDataFetcher:
                 signals["ADX"] = "STRONG_RANGE"
                 scores["ADX"] = -2
             
+            values["ADX"] = float(latest_adx)
             print(f"   ADX raw={latest_adx:.2f} → {signals['ADX']}, score={scores['ADX']} using last {len(adx_data)} days ({adx_data.index[0].strftime('%Y-%m-%d')} ~ {adx_data.index[-1].strftime('%Y-%m-%d')})")
         
         # 5. Breakout Signal (단기 돌파 - 최근 40일)
@@ -418,6 +527,7 @@ class StockDataFetcher:
                 signals["BREAKOUT"] = "STRONG_BREAKDOWN"
                 scores["BREAKOUT"] = -2
             
+            values["BREAKOUT"] = float(breakout_pct)
             print(f"   BREAKOUT raw={breakout_pct:.2f}% → {signals['BREAKOUT']}, score={scores['BREAKOUT']} using last {len(breakout_data)} days ({breakout_data.index[0].strftime('%Y-%m-%d')} ~ {breakout_data.index[-1].strftime('%Y-%m-%d')})")
         
         # 6. ATR (변동성 - 최근 20일)
@@ -449,6 +559,7 @@ class StockDataFetcher:
                 signals["ATR"] = "STRONG_STABILITY"
                 scores["ATR"] = -2
             
+            values["ATR"] = float(atr_pct)
             print(f"   ATR raw={atr_pct:.2f}% → {signals['ATR']}, score={scores['ATR']} using last {len(atr_data)} days ({atr_data.index[0].strftime('%Y-%m-%d')} ~ {atr_data.index[-1].strftime('%Y-%m-%d')})")
         
         # 7. VWAP (거래량 가중 평균가 - 최근 1일)
@@ -480,6 +591,7 @@ class StockDataFetcher:
                 signals["VWAP"] = "STRONG_OVER"
                 scores["VWAP"] = -2
             
+            values["VWAP"] = float(vwap_diff_pct)
             print(f"   VWAP raw={vwap_diff_pct:.2f}% → {signals['VWAP']}, score={scores['VWAP']} using last {len(vwap_data)} days ({vwap_data.index[0].strftime('%Y-%m-%d')} ~ {vwap_data.index[-1].strftime('%Y-%m-%d')})")
         
         # 부족한 데이터 경고
@@ -491,7 +603,10 @@ class StockDataFetcher:
         
         print(f"✅ 총 {len(signals)}개 지표 신호 생성 완료\n")
         
-        return {"signals": signals, "scores": scores, "insufficient": insufficient}
+        # 거래량 0인 마지막 봉(VWAP 0/0), 가격 변화 없는 구간(RSI 0/0) 등은 NaN이 되므로 JSON에 쓸 수 있게 None으로 변환
+        values = {key: value if math.isfinite(value) else None for key, value in values.items()}
+        
+        return {"signals": signals, "scores": scores, "insufficient": insufficient, "values": values}
 
 
 def test_apple_stock():
@@ -1,6 +1,50 @@
 import json
+from datetime import timedelta
 from typing import Dict, Any
+import numpy as np
 from stock_data_fetcher import StockDataFetcher
+from vectorized_signals import compute_signal_history, INDICATORS
+
+# 신호/점수 계산 방식이 바뀌면 올려서 이전 분석 결과 캐시(ETag)를 무효화
+ANALYSIS_VERSION = "1"
+
+# 종합 점수별 추천 기준 (STRONG_BUY/BUY는 이상, SELL/STRONG_SELL은 이하)
+RECOMMENDATION_CUTOFFS = {
+    "STRONG_BUY": 8,
+    "BUY": 3,
+    "SELL": -2,
+    "STRONG_SELL": -7
+}
+
+
+def recommend(total_score) -> str:
+    """
+    종합 점수로 추천 등급 결정
+    """
+    if total_score >= RECOMMENDATION_CUTOFFS["STRONG_BUY"]:
+        return "STRONG_BUY"
+    elif total_score >= RECOMMENDATION_CUTOFFS["BUY"]:
+        return "BUY"
+    elif total_score <= RECOMMENDATION_CUTOFFS["STRONG_SELL"]:
+        return "STRONG_SELL"
+    elif total_score <= RECOMMENDATION_CUTOFFS["SELL"]:
+        return "SELL"
+    return "HOLD"
+
+
+def recommend_array(total_scores: np.ndarray) -> np.ndarray:
+    """
+    recommend()와 같은 규칙을 점수 배열 전체에 적용
+    """
+    return np.select(
+        [total_scores >= RECOMMENDATION_CUTOFFS["STRONG_BUY"],
+         total_scores >= RECOMMENDATION_CUTOFFS["BUY"],
+         total_scores <= RECOMMENDATION_CUTOFFS["STRONG_SELL"],
+         total_scores <= RECOMMENDATION_CUTOFFS["SELL"]],
+        ["STRONG_BUY", "BUY", "STRONG_SELL", "SELL"],
+        default="HOLD"
+    )
+
 
 class StockTradingAnalyzer:
     """
@@ -108,13 +152,16 @@ class StockTradingAnalyzer:
             }
         }
     
-    def analyze_stock(self, symbol: str, period: str = "1y") -> Dict[str, Any]:
+    def analyze_stock(self, symbol: str, period: str = "1y", start=None, end=None, as_of=None) -> Dict[str, Any]:
         """
         주식 심볼로부터 데이터를 가져와서 분석하는 메인 함수
         
         Args:
             symbol (str): 주식 심볼 (예: "AAPL")
-            period (str): 데이터 기간
+            period (str): 데이터 기간 ("min"이면 지표 계산에 필요한 최소 구간)
+            start (str): 시작일 (YYYY-MM-DD, 있으면 period 대신 사용)
+            end (str): 종료일 (YYYY-MM-DD)
+            as_of (str): 분석 기준일 (YYYY-MM-DD) - 이 날짜까지의 데이터로 분석
             
         Returns:
             Dict[str, Any]: 분석 결과
@@ -122,7 +169,7 @@ class StockTradingAnalyzer:
         print(f"🔍 {symbol} 주식 분석 시작...")
         
         # 1. 주식 데이터 가져오기
-        stock_data = self.data_fetcher.fetch_stock_data(symbol, period)
+        stock_data = self.data_fetcher.fetch_stock_data(symbol, period, start=start, end=end, as_of=as_of)
         
         if stock_data.empty:
             return {"error": f"{symbol} 주식 데이터를 가져올 수 없습니다."}
@@ -143,9 +190,12 @@ class StockTradingAnalyzer:
         result["stock_info"] = {
             "symbol": symbol,
             "period": period,
+            "as_of": as_of,
             "data_points": len(stock_data),
             "latest_price": float(stock_data['Close'].iloc[-1]),
-            "latest_date": stock_data.index[-1].strftime('%Y-%m-%d')
+            "latest_date": stock_data.index[-1].strftime('%Y-%m-%d'),
+            "data_source": stock_data.attrs.get("source"),
+            "stale": bool(stock_data.attrs.get("stale", False))
         }
         
         return result
@@ -202,16 +252,7 @@ class StockTradingAnalyzer:
                 print()
         
         # 종합 추천
-        if total_score >= 8:
-            overall = "STRONG_BUY"
-        elif total_score >= 3:
-            overall = "BUY"
-        elif total_score <= -7:
-            overall = "STRONG_SELL"
-        elif total_score <= -2:
-            overall = "SELL"
-        else:
-            overall = "HOLD"
+        overall = recommend(total_score)
 
         return {
             "signals": signals,
@@ -222,6 +263,45 @@ class StockTradingAnalyzer:
             "insufficient": insufficient
         }
 
+    def replay_signals(self, stock_data, start=None, end=None) -> list:
+        """
+        기간 내 모든 거래일에 대해 "그 날짜 기준으로 analyze_stock을 실행했을 때"의 신호/점수/추천을 계산
+        
+        날짜마다 generate_signals를 다시 호출하지 않고 vectorized_signals로 전체 구간을 한 번에 계산합니다.
+        stock_data에는 start 이전의 지표 계산용 데이터가 포함되어 있어야 합니다.
+        
+        Args:
+            stock_data (pd.DataFrame): 주식 데이터 (start 이전 최소 구간 포함)
+            start (date): 리플레이 시작일 (없으면 신호를 만들 수 있는 첫 거래일)
+            end (date): 리플레이 종료일 (없으면 마지막 거래일)
+            
+        Returns:
+            list: 거래일별 {date, close, signals, scores, raw, total_score, recommendation}
+        """
+        history = compute_signal_history(self.data_fetcher, stock_data)
+        if start is not None:
+            history = history[history.index >= str(start)]
+        if end is not None:
+            history = history[history.index < str(end + timedelta(days=1))]
+        
+        recommendations = recommend_array(history["total_score"].to_numpy())
+        rows = []
+        for (date, row), recommendation in zip(history.iterrows(), recommendations):
+            raw = {}
+            for key in INDICATORS:
+                value = row[f"{key}_raw"]
+                raw[key] = None if np.isnan(value) else round(float(value), 4)
+            rows.append({
+                "date": date.strftime('%Y-%m-%d'),
+                "close": float(row["close"]),
+                "signals": {key: row[f"{key}_signal"] for key in INDICATORS},
+                "scores": {key: int(row[f"{key}_score"]) for key in INDICATORS},
+                "raw": raw,
+                "total_score": int(row["total_score"]),
+                "recommendation": str(recommendation)
+            })
+        return rows
+
 
 # 사용 예시 함수
 def analyze_apple_stock():
@@ -0,0 +1,290 @@
+import hashlib
+import json
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Callable, ContextManager, Dict, Any, List, Optional
+
+from admission import Overloaded
+from cache_backend import CacheBackend
+from chatgpt_analyzer import ChatGPTAnalyzer
+from template_summary import TemplateSummaryGenerator
+
+SUMMARY_MODES = ("llm", "fast")
+
+# 캐시된 ChatGPT 요약 보관 시간 (초) - 같은 날짜, 같은 신호의 요약은 다시 요청하지 않음
+SUMMARY_CACHE_TTL = 24 * 60 * 60
+
+
+class SummaryService:
+    """
+    ChatGPT 요약을 마감 시간 안에서만 기다리고, 늦거나 실패하면 템플릿 요약으로 대신 응답하는 클래스
+
+    템플릿으로 응답한 경우에도 ChatGPT 요청은 백그라운드에서 계속 진행되며,
+    완료된 텍스트는 summary_id로 나중에 조회할 수 있습니다.
+    cache가 있으면 같은 입력(종목, 날짜, 신호, 응답 길이)의 ChatGPT 요약을 재사용하고,
+    공유 캐시라면 다른 인스턴스가 받은 요약과 summary_id도 함께 사용합니다.
+    """
+
+    def __init__(self, chatgpt_analyzer: ChatGPTAnalyzer, template_generator: TemplateSummaryGenerator,
+                 deadline: float = 8.0, max_workers: int = 4, max_entries: int = 500,
+                 cache: Optional[CacheBackend] = None):
+        """
+        Args:
+            chatgpt_analyzer (ChatGPTAnalyzer): ChatGPT 분석기
+            template_generator (TemplateSummaryGenerator): 템플릿 요약 생성기
+            deadline (float): ChatGPT 응답을 기다리는 최대 시간 (초)
+            max_workers (int): 동시에 진행할 ChatGPT 요청 수
+            max_entries (int): 보관할 백그라운드 요약 결과 수
+            cache (CacheBackend): 완료된 ChatGPT 요약을 저장할 캐시 (없으면 캐시하지 않음)
+        """
+        self.chatgpt_analyzer = chatgpt_analyzer
+        self.template_generator = template_generator
+        self.deadline = deadline
+        self.max_entries = max_entries
+        self.cache = cache
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="summary")
+        self._pending: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._listeners: List[Callable[[str, str, str], None]] = []
+
+    def add_listener(self, callback: Callable[[str, str, str], None]):
+        """
+        백그라운드 ChatGPT 요약이 완료될 때 호출할 함수 등록
+
+        Args:
+            callback (Callable): callback(symbol, summary_id, expert_summary)
+        """
+        self._listeners.append(callback)
+
+    def summarize(self, stock_data: Dict[str, Any], mode: str = "llm", length_tier: str = None,
+                  slot: Optional[Callable[[], ContextManager]] = None) -> Dict[str, Any]:
+        """
+        요약 생성
+
+        Args:
+            stock_data (Dict): 주식 분석 데이터 (ChatGPTAnalyzer.generate_expert_summary 입력과 동일)
+            mode (str): "llm" - 마감 시간까지 ChatGPT를 기다림, "fast" - 템플릿으로 즉시 응답
+            length_tier (str): ChatGPT 응답 길이 단계 (없으면 기본값 사용)
+            slot (Callable): ChatGPT 호출 동안 잡고 있을 동시 실행 슬롯을 만드는 함수
+                             (백그라운드에서 계속되는 호출도 끝날 때까지 슬롯을 잡음)
+
+        Returns:
+            Dict[str, Any]: expert_summary, summary_source ("llm" 또는 "template"),
+                            summary_usage (ChatGPT 토큰 사용량, ChatGPT로 응답한 경우에만),
+                            summary_id (ChatGPT 결과가 나중에 도착하는 경우에만),
+                            summary_cached (캐시된 ChatGPT 요약으로 응답한 경우 True)
+        """
+        cache_key = self._cache_key(stock_data, length_tier)
+        cached = self._cached(cache_key)
+        if cached is not None:
+            return cached
+
+        future = self._executor.submit(self._request, stock_data, length_tier, slot)
+        if self.cache is not None:
+            future.add_done_callback(lambda done: self._store(cache_key, done))
+
+        if mode != "fast":
+            try:
+                summary, usage = future.result(timeout=self.deadline)
+                return {"expert_summary": summary, "summary_source": "llm", "summary_usage": usage}
+            except FutureTimeoutError:
+                print(f"⏱️ {stock_data['symbol']} ChatGPT 응답이 {self.deadline}초를 넘어 템플릿 요약으로 응답합니다.")
+            except Overloaded:
+                print(f"🚦 {stock_data['symbol']} ChatGPT 요청 혼잡 - 템플릿 요약으로 응답")
+                return {"expert_summary": self.template_generator.generate_summary(stock_data),
+                        "summary_source": "template"}
+            except Exception as e:
+                # 요청 자체가 실패하면 나중에 받을 텍스트도 없으므로 템플릿만 반환
+                print(f"❌ {stock_data['symbol']} ChatGPT 요약 실패, 템플릿 요약으로 대체: {str(e)}")
+                return {"expert_summary": self.template_generator.generate_summary(stock_data),
+                        "summary_source": "template"}
+
+        summary_id = uuid.uuid4().hex
+        self._track(summary_id, stock_data['symbol'], future)
+        return {
+            "expert_summary": self.template_generator.generate_summary(stock_data),
+            "summary_source": "template",
+            "summary_id": summary_id
+        }
+
+    def summarize_batch(self, stock_data_list: List[Dict[str, Any]], mode: str = "llm", length_tier: str = None,
+                        slot: Optional[Callable[[], ContextManager]] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        여러 종목 요약을 ChatGPT 묶음 요청(generate_batch_summaries)으로 생성
+
+        마감 시간, 슬롯, 템플릿 대체는 summarize와 같습니다. 캐시에 있는 종목은 요청에서 빼고,
+        mode가 "fast"이면 ChatGPT를 호출하지 않습니다. 마감 시간을 넘기면 남은 종목은 템플릿으로 응답하고
+        묶음 요청이 끝난 뒤 종목별 summary_id로 조회할 수 있습니다.
+        (묶음 응답은 실패한 종목도 오류 문구로 채워지므로 캐시에 저장하지 않습니다.)
+
+        Returns:
+            Dict[str, Dict[str, Any]]: 심볼별 요약 (summarize 반환값과 같은 형식, 묶음 요청은 summary_usage 없음)
+        """
+        results, missing = {}, []
+        for stock_data in stock_data_list:
+            cached = self._cached(self._cache_key(stock_data, length_tier))
+            if cached is not None:
+                results[stock_data["symbol"]] = cached
+            else:
+                missing.append(stock_data)
+        if not missing:
+            return results
+        if mode == "fast":
+            results.update({d["symbol"]: self._template(d) for d in missing})
+            return results
+
+        future = self._executor.submit(self._request_batch, missing, length_tier, slot)
+        symbols = ", ".join(d["symbol"] for d in missing)
+        try:
+            summaries = future.result(timeout=self.deadline)
+            for stock_data in missing:
+                summary = summaries.get(stock_data["symbol"])
+                results[stock_data["symbol"]] = ({"expert_summary": summary, "summary_source": "llm"} if summary
+                                                 else self._template(stock_data))
+            return results
+        except FutureTimeoutError:
+            print(f"⏱️ 배치({symbols}) ChatGPT 응답이 {self.deadline}초를 넘어 템플릿 요약으로 응답합니다.")
+        except Overloaded:
+            print(f"🚦 배치({symbols}) ChatGPT 요청 혼잡 - 템플릿 요약으로 응답")
+            results.update({d["symbol"]: self._template(d) for d in missing})
+            return results
+        except Exception as e:
+            print(f"❌ 배치({symbols}) ChatGPT 요약 실패, 템플릿 요약으로 대체: {str(e)}")
+            results.update({d["symbol"]: self._template(d) for d in missing})
+            return results
+
+        for stock_data in missing:
+            summary_id = uuid.uuid4().hex
+            self._track(summary_id, stock_data["symbol"], self._symbol_future(future, stock_data["symbol"]))
+            results[stock_data["symbol"]] = dict(self._template(stock_data), summary_id=summary_id)
+        return results
+
+    def _request(self, stock_data: Dict[str, Any], length_tier: str = None,
+                 slot: Optional[Callable[[], ContextManager]] = None):
+        """
+        요약 작업 스레드에서 실행하는 ChatGPT 호출 (slot이 있으면 호출이 끝날 때까지 슬롯을 잡음)
+        """
+        if slot is None:
+            return self.chatgpt_analyzer.request_expert_summary(stock_data, length_tier)
+        with slot():
+            return self.chatgpt_analyzer.request_expert_summary(stock_data, length_tier)
+
+    def _request_batch(self, stock_data_list: List[Dict[str, Any]], length_tier: str = None,
+                       slot: Optional[Callable[[], ContextManager]] = None) -> Dict[str, str]:
+        """
+        요약 작업 스레드에서 실행하는 ChatGPT 묶음 호출 (slot이 있으면 호출이 끝날 때까지 슬롯을 잡음)
+        """
+        if slot is None:
+            return self.chatgpt_analyzer.generate_batch_summaries(stock_data_list, length_tier=length_tier)
+        with slot():
+            return self.chatgpt_analyzer.generate_batch_summaries(stock_data_list, length_tier=length_tier)
+
+    def _symbol_future(self, batch_future, symbol: str) -> Future:
+        """
+        묶음 요청 결과에서 한 종목의 (요약, 사용량)만 꺼내는 Future (get_summary 조회용)
+        """
+        future = Future()
+
+        def resolve(done):
+            if done.exception() is not None:
+                future.set_exception(done.exception())
+            elif done.result().get(symbol):
+                future.set_result((done.result()[symbol], None))
+            else:
+                future.set_exception(LookupError(f"{symbol} 요약이 묶음 응답에 없습니다."))
+
+        batch_future.add_done_callback(resolve)
+        return future
+
+    def _template(self, stock_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        템플릿 요약 응답
+        """
+        return {"expert_summary": self.template_generator.generate_summary(stock_data), "summary_source": "template"}
+
+    def _cached(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """
+        캐시된 ChatGPT 요약 응답 (캐시가 없거나 미스면 None)
+        """
+        if self.cache is None:
+            return None
+        cached = self.cache.get_json(cache_key)
+        if cached is None:
+            return None
+        return {"expert_summary": cached["expert_summary"], "summary_source": "llm",
+                "summary_usage": cached["summary_usage"], "summary_cached": True}
+
+    def get_summary(self, summary_id: str) -> Optional[Dict[str, Any]]:
+        """
+        백그라운드 ChatGPT 요약 상태 조회
+
+        Returns:
+            Optional[Dict[str, Any]]: status ("pending", "ready", "failed")와 expert_summary, 없는 id면 None
+        """
+        with self._lock:
+            entry = self._pending.get(summary_id)
+        if entry is None:
+            # 다른 인스턴스가 시작한 요청이면 공유 캐시에 저장된 결과로 응답
+            cached = self.cache.get_json(f"summary:id:{summary_id}") if self.cache is not None else None
+            if cached is None:
+                return None
+            return {"status": "ready", "symbol": cached["symbol"], "expert_summary": cached["expert_summary"],
+                    "summary_usage": cached["summary_usage"]}
+
+        future = entry["future"]
+        if not future.done():
+            return {"status": "pending", "symbol": entry["symbol"]}
+        if future.exception() is not None:
+            return {"status": "failed", "symbol": entry["symbol"], "error": str(future.exception())}
+        summary, usage = future.result()
+        return {"status": "ready", "symbol": entry["symbol"], "expert_summary": summary, "summary_usage": usage}
+
+    def _cache_key(self, stock_data: Dict[str, Any], length_tier: str = None) -> str:
+        """
+        요약 입력 내용으로 만든 캐시 키 (프롬프트 형식과 응답 길이도 포함)
+        """
+        content = dict(stock_data, current_price=round(float(stock_data["current_price"]), 4))
+        key = json.dumps({
+            "data": content,
+            "length_tier": length_tier or self.chatgpt_analyzer.length_tier,
+            "prompt_format": self.chatgpt_analyzer.prompt_format
+        }, sort_keys=True, ensure_ascii=False, default=str)
+        return "summary:" + hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+    def _store(self, cache_key: str, future):
+        """
+        완료된 ChatGPT 요약을 캐시에 저장 (실패한 요청은 저장하지 않음)
+        """
+        if future.exception() is not None:
+            return
+        summary, usage = future.result()
+        self.cache.set_json(cache_key, {"expert_summary": summary, "summary_usage": usage}, SUMMARY_CACHE_TTL)
+
+    def _track(self, summary_id: str, symbol: str, future):
+        """
+        백그라운드 요청을 등록하고 오래된 항목은 제거
+        """
+        with self._lock:
+            self._pending[summary_id] = {"symbol": symbol, "future": future}
+            while len(self._pending) > self.max_entries:
+                self._pending.popitem(last=False)
+        future.add_done_callback(lambda done: self._notify(summary_id, symbol, done))
+
+    def _notify(self, summary_id: str, symbol: str, future):
+        """
+        완료된 백그라운드 요약을 등록된 함수에 전달 (실패한 요청은 전달하지 않음)
+        """
+        if future.exception() is not None:
+            return
+        summary, usage = future.result()
+        if self.cache is not None:
+            self.cache.set_json(f"summary:id:{summary_id}",
+                                {"symbol": symbol, "expert_summary": summary, "summary_usage": usage},
+                                SUMMARY_CACHE_TTL)
+        for callback in self._listeners:
+            try:
+                callback(symbol, summary_id, summary)
+            except Exception as e:
+                print(f"⚠️ {symbol} 요약 완료 알림 실패: {str(e)}")
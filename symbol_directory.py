@@ -0,0 +1,218 @@
+"""
+로컬 종목 디렉터리 - 종목 코드/이름 접두사 색인으로 자동 완성과 종목 코드 사전 검증을 제공
+
+사용자가 입력한 종목 코드를 FMP에 보내기 전에 메모리 색인에서 확인해, 오타가 네트워크 왕복과
+API 호출 한도를 쓰지 않도록 합니다. 목록은 디스크에 저장해 두고 주기적으로 새로 받습니다.
+"""
+
+import json
+import os
+import threading
+import time
+from array import array
+from bisect import bisect_left
+from typing import Callable, Dict, List, Optional
+
+import requests
+
+# 자동 완성 응답의 기본/최대 항목 수
+DEFAULT_SEARCH_LIMIT = 10
+MAX_SEARCH_LIMIT = 50
+
+# 목록 갱신에 실패했을 때 다시 시도하기까지 기다리는 시간 (초)
+REFRESH_RETRY_SECONDS = 600
+
+# 접두사 범위의 끝을 나타내는 문자 (모든 종목 코드/이름 문자보다 뒤에 정렬)
+PREFIX_END = "\uffff"
+
+
+def fetch_fmp_symbols(api_key: str, timeout: float = 30.0) -> List[Dict[str, str]]:
+    """
+    FMP 전체 종목 목록 조회
+
+    Returns:
+        List[Dict[str, str]]: [{"symbol": "AAPL", "name": "Apple Inc.", "exchange": "NASDAQ"}, ...]
+    """
+    url = f"https://financialmodelingprep.com/api/v3/stock/list?apikey={api_key}"
+    response = requests.get(url, timeout=timeout)
+    response.raise_for_status()
+    return [
+        {
+            "symbol": item["symbol"],
+            "name": item.get("name") or "",
+            "exchange": item.get("exchangeShortName") or item.get("exchange") or ""
+        }
+        for item in response.json() if item.get("symbol")
+    ]
+
+
+class SymbolIndex:
+    """
+    종목 목록의 읽기 전용 접두사 색인
+
+    종목 코드와 이름 단어를 정렬된 배열로 보관하고 이진 탐색으로 접두사 범위를 찾습니다
+    (노드마다 객체를 만드는 트라이보다 메모리를 적게 쓰고 조회 속도는 비슷합니다).
+    """
+
+    def __init__(self, entries: List[Dict[str, str]]):
+        """
+        Args:
+            entries (List[Dict[str, str]]): symbol, name, exchange 목록
+        """
+        by_symbol = {}
+        for entry in entries:
+            symbol = str(entry["symbol"]).strip().upper()
+            if symbol:
+                by_symbol[symbol] = (symbol, entry.get("name") or "", entry.get("exchange") or "")
+
+        self.symbols = sorted(by_symbol)
+        self.entries = [by_symbol[symbol] for symbol in self.symbols]
+        self._positions = {symbol: i for i, symbol in enumerate(self.symbols)}
+
+        # 이름의 각 단어를 (단어, 종목 위치) 쌍으로 정렬해 두 배열에 나눠 보관
+        words = sorted(
+            (word, i)
+            for i, (_, name, _) in enumerate(self.entries)
+            for word in set(name.lower().split())
+        )
+        self._name_words = [word for word, _ in words]
+        self._name_positions = array("I", (i for _, i in words))
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._positions
+
+    def search(self, query: str, limit: int = DEFAULT_SEARCH_LIMIT) -> List[Dict[str, str]]:
+        """
+        종목 코드 접두사 일치(정확히 일치하는 종목 우선) 다음에 이름 단어 접두사 일치 순서로 검색
+        """
+        query = query.strip()
+        if not query or limit <= 0:
+            return []
+
+        positions = []
+        symbol_prefix = query.upper()
+        exact = self._positions.get(symbol_prefix)
+        if exact is not None:
+            positions.append(exact)
+        start = bisect_left(self.symbols, symbol_prefix)
+        end = bisect_left(self.symbols, symbol_prefix + PREFIX_END, lo=start)
+        positions.extend(i for i in range(start, min(end, start + limit + 1)) if i != exact)
+
+        if len(positions) < limit:
+            seen = set(positions)
+            word_prefix = query.lower().split()[0]
+            start = bisect_left(self._name_words, word_prefix)
+            end = bisect_left(self._name_words, word_prefix + PREFIX_END, lo=start)
+            for k in range(start, end):
+                position = self._name_positions[k]
+                if position not in seen:
+                    seen.add(position)
+                    positions.append(position)
+                    if len(positions) >= limit:
+                        break
+
+        return [
+            {"symbol": symbol, "name": name, "exchange": exchange}
+            for symbol, name, exchange in (self.entries[i] for i in positions[:limit])
+        ]
+
+
+class SymbolDirectory:
+    """
+    디스크에 저장된 종목 목록을 색인으로 올리고 백그라운드에서 주기적으로 새로 받는 디렉터리
+
+    목록을 아직 받지 못했으면(처음 실행, 공급자 장애) 모든 종목 코드를 허용해 분석을 막지 않습니다.
+    """
+
+    def __init__(self, path: str = "data/symbols.json", loader: Optional[Callable[[], List[Dict[str, str]]]] = None,
+                 refresh_interval: float = 86400.0):
+        """
+        Args:
+            path (str): 종목 목록 JSON 파일 경로
+            loader (Callable): 최신 종목 목록을 가져오는 함수 (없으면 파일만 사용)
+            refresh_interval (float): 목록을 새로 받는 주기 (초, 0이면 새로 받지 않음)
+        """
+        self.path = path
+        self.loader = loader
+        self.refresh_interval = refresh_interval
+        self.index = SymbolIndex([])
+        self.updated_at: Optional[float] = None
+        self._lock = threading.Lock()
+        self._refresher: Optional[threading.Thread] = None
+
+        if os.path.exists(path):
+            try:
+                with open(path, encoding="utf-8") as f:
+                    self.index = SymbolIndex(json.load(f))
+                self.updated_at = os.path.getmtime(path)
+            except (OSError, ValueError, KeyError) as e:
+                print(f"⚠️ 종목 목록 파일을 읽을 수 없습니다: {str(e)}")
+
+    @property
+    def loaded(self) -> bool:
+        return len(self.index) > 0
+
+    def is_known(self, symbol: str) -> bool:
+        """
+        종목 코드가 목록에 있는지 확인 (목록이 없으면 항상 True)
+        """
+        self.start()
+        return not self.loaded or symbol.upper() in self.index
+
+    def search(self, query: str, limit: int = DEFAULT_SEARCH_LIMIT) -> List[Dict[str, str]]:
+        """
+        종목 코드/이름 접두사 자동 완성
+        """
+        self.start()
+        return self.index.search(query, min(limit, MAX_SEARCH_LIMIT))
+
+    def refresh(self) -> bool:
+        """
+        loader로 최신 목록을 받아 색인을 교체하고 파일에 저장 (실패하면 기존 색인 유지)
+        """
+        if self.loader is None:
+            return False
+        try:
+            entries = self.loader()
+        except Exception as e:
+            print(f"⚠️ 종목 목록을 새로 받지 못했습니다: {str(e)}")
+            return False
+        if not entries:
+            return False
+
+        # 새 색인을 다 만든 뒤 한 번에 교체 (조회 중인 요청은 이전 색인을 그대로 사용)
+        self.index = SymbolIndex(entries)
+        self.updated_at = time.time()
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entries, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+        print(f"✅ 종목 목록 갱신 완료 ({len(self.index)}개 종목)")
+        return True
+
+    def start(self):
+        """
+        주기적 갱신 스레드 시작 (처음 조회할 때 한 번만)
+        """
+        if self._refresher is not None or self.loader is None or self.refresh_interval <= 0:
+            return
+        with self._lock:
+            if self._refresher is None:
+                self._refresher = threading.Thread(target=self._refresh_loop, name="symbol-refresh", daemon=True)
+                self._refresher.start()
+
+    def _refresh_loop(self):
+        while True:
+            age = time.time() - self.updated_at if self.updated_at else self.refresh_interval
+            if age >= self.refresh_interval:
+                if not self.refresh():
+                    time.sleep(REFRESH_RETRY_SECONDS)
+                    continue
+                age = 0
+            time.sleep(self.refresh_interval - age)
@@ -0,0 +1,108 @@
+from typing import Dict, Any, List
+
+# 추천 등급별 종합 의견 문구
+RECOMMENDATION_TEXT = {
+    "STRONG_BUY": "여러 지표가 한 방향으로 강하게 상승 쪽을 가리키고 있어 적극적인 매수 관점이 유효한 구간입니다.",
+    "BUY": "상승 쪽 신호가 우세해 매수 관점에서 접근해볼 만한 구간입니다.",
+    "HOLD": "상승과 하락 신호가 엇갈려 뚜렷한 방향성이 없는 관망 구간입니다.",
+    "SELL": "하락 쪽 신호가 우세해 보수적으로 대응하는 것이 좋은 구간입니다.",
+    "STRONG_SELL": "여러 지표가 동시에 약세를 가리키고 있어 위험 관리가 최우선인 구간입니다."
+}
+
+# 추천 등급별 투자자 전략 (미보유자, 보유자)
+STRATEGY_TEXT = {
+    "STRONG_BUY": (
+        "분할 매수로 진입을 시작하되, 단기 과열 여부를 확인하며 한 번에 모든 자금을 투입하지 않는 것이 좋습니다.",
+        "보유를 유지하면서 추세가 이어지는지 확인하고, 목표가 부근에서는 일부 차익 실현을 고려해보세요."
+    ),
+    "BUY": (
+        "눌림목이나 지지선 부근에서 소량씩 분할 매수하는 전략이 적절합니다.",
+        "보유를 유지하되, 추세가 꺾이는 신호가 나오면 비중을 조절할 준비를 해두세요."
+    ),
+    "HOLD": (
+        "방향이 확인될 때까지 서두르지 말고, 주요 지지선이나 저항선 돌파를 확인한 뒤 진입하세요.",
+        "현재 비중을 유지하면서 손절 기준을 미리 정해두고 다음 신호를 기다리세요."
+    ),
+    "SELL": (
+        "신규 매수는 미루고 하락이 멈추는 신호가 나올 때까지 지켜보는 것이 좋습니다.",
+        "반등 시 비중을 줄이는 방향을 고려하고, 손절 기준을 엄격하게 지키세요."
+    ),
+    "STRONG_SELL": (
+        "지금은 매수를 피하고 추세 전환이 확인될 때까지 기다리는 것이 안전합니다.",
+        "손실 확대를 막기 위해 비중 축소나 손절을 적극적으로 검토하세요."
+    )
+}
+
+
+class TemplateSummaryGenerator:
+    """
+    ChatGPT 없이 신호와 점수만으로 전문가 요약과 같은 형식의 텍스트를 즉시 생성하는 클래스
+    """
+
+    def __init__(self, indicator_descriptions: Dict[str, Dict[str, Any]] = None):
+        """
+        Args:
+            indicator_descriptions (Dict): StockTradingAnalyzer.indicator_descriptions (지표 설명 문구)
+        """
+        self.indicator_descriptions = indicator_descriptions or {}
+
+    def generate_summary(self, stock_data: Dict[str, Any]) -> str:
+        """
+        ChatGPTAnalyzer.generate_expert_summary와 같은 입력으로 템플릿 기반 요약 생성
+
+        Args:
+            stock_data (Dict): 주식 분석 데이터 (symbol, current_price, interpreted_signals, total_score, recommendation)
+
+        Returns:
+            str: "전문가 종합평가 / 투자자별 전략 제안" 형식의 요약
+        """
+        recommendation = stock_data.get('recommendation', 'HOLD')
+        non_holder, holder = STRATEGY_TEXT.get(recommendation, STRATEGY_TEXT["HOLD"])
+
+        return (
+            "🧠 전문가 종합평가:\n\n"
+            f"{self._overview(stock_data)}\n\n"
+            "📈 투자자별 전략 제안:\n\n"
+            "👤 주식 미보유자:\n"
+            f"{non_holder}\n\n"
+            "💼 주식 보유자:\n"
+            f"{holder}"
+        )
+
+    def _overview(self, stock_data: Dict[str, Any]) -> str:
+        """
+        종합평가 문단 생성
+        """
+        positives: List[str] = []
+        negatives: List[str] = []
+        for indicator, data in stock_data['interpreted_signals'].items():
+            score = data.get('score') or 0
+            phrase = f"{data['indicator_name']} - {data['description']}"
+            if score > 0:
+                positives.append(phrase)
+            elif score < 0:
+                negatives.append(phrase)
+
+        sentences = [
+            f"{stock_data['symbol']}의 현재가는 ${stock_data['current_price']:.2f}이며, "
+            f"기술적 지표 종합 점수는 {stock_data['total_score']}점입니다."
+        ]
+        if positives:
+            sentences.append(f"긍정적인 신호로는 {', '.join(positives)}이(가) 보입니다.")
+        if negatives:
+            sentences.append(f"반면 {', '.join(negatives)}은(는) 부담 요인입니다.")
+        if not positives and not negatives:
+            sentences.append("대부분의 지표가 중립 상태로, 뚜렷한 방향성이 나타나지 않고 있습니다.")
+
+        # 지표 설명 문구로 가장 강한 신호의 의미를 덧붙임
+        strongest = max(
+            stock_data['interpreted_signals'].items(),
+            key=lambda item: abs(item[1].get('score') or 0),
+            default=None
+        )
+        if strongest and (strongest[1].get('score') or 0) != 0 and strongest[0] in self.indicator_descriptions:
+            info = self.indicator_descriptions[strongest[0]]
+            sentences.append(f"특히 {info['name']}({info['type']}: {info['description']})에서 현재 가장 뚜렷한 신호가 나타나고 있습니다.")
+
+        sentences.append(RECOMMENDATION_TEXT.get(stock_data.get('recommendation'), RECOMMENDATION_TEXT["HOLD"]))
+        return " ".join(sentences)
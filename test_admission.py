@@ -0,0 +1,134 @@
+import io
+import threading
+import time
+import unittest
+from contextlib import redirect_stdout
+
+from admission import AdmissionController, Overloaded, StageLimiter, Ticket, INTERACTIVE, BATCH
+from chatgpt_analyzer import ChatGPTAnalyzer
+from summary_service import SummaryService
+from template_summary import TemplateSummaryGenerator
+
+class TestAdmission(unittest.TestCase):
+    """
+    admission 모듈의 단위 테스트
+    """
+
+    def test_priority_order(self):
+        """
+        슬롯이 비면 먼저 기다린 배치 요청보다 대화형 요청이 먼저 슬롯을 받는지 확인
+        """
+        limiter = StageLimiter('compute', 1)
+        limiter.acquire(Ticket(INTERACTIVE, 5))
+        order = []
+
+        def worker(priority, name):
+            limiter.acquire(Ticket(priority, 5))
+            order.append(name)
+            limiter.release(0.01)
+
+        threads = [threading.Thread(target=worker, args=(BATCH, 'batch'))]
+        threads[0].start()
+        time.sleep(0.05)
+        threads.append(threading.Thread(target=worker, args=(INTERACTIVE, 'interactive')))
+        threads[1].start()
+        time.sleep(0.05)
+
+        limiter.release(0.01)
+        for thread in threads:
+            thread.join(2)
+        self.assertEqual(order, ['interactive', 'batch'])
+        self.assertEqual(limiter.stats()['active'], 0)
+
+    def test_early_rejection(self):
+        """
+        예상 대기 시간이 마감 시간을 넘으면 기다리지 않고 바로 거절하고, 대기 중 마감되면 Retry-After와 함께 거절하는지 확인
+        """
+        controller = AdmissionController({'fmp': 1}, {INTERACTIVE: 0.2, BATCH: 10})
+        limiter = controller.stages['fmp']
+        limiter.service_time = 2.0
+
+        with controller.stage('fmp', controller.ticket(INTERACTIVE)):
+            started = time.monotonic()
+            with self.assertRaises(Overloaded) as context:
+                limiter.acquire(controller.ticket(INTERACTIVE))
+            self.assertLess(time.monotonic() - started, 0.05)
+            self.assertEqual(context.exception.retry_after, 2)
+
+            # 예상 대기 시간 안에 들어오지만 실제로는 슬롯이 비지 않는 경우
+            limiter.service_time = 0.1
+            with self.assertRaises(Overloaded):
+                limiter.acquire(controller.ticket(INTERACTIVE))
+
+        self.assertEqual(limiter.stats()['rejected'], 2)
+        self.assertEqual(limiter.stats()['waiting'], 0)
+        with controller.stage('fmp', controller.ticket(BATCH)):
+            self.assertEqual(limiter.stats()['active'], 1)
+
+    def test_llm_slot_held_until_summary_done(self):
+        """
+        템플릿으로 먼저 응답해도 백그라운드 ChatGPT 호출이 끝날 때까지 llm 슬롯을 잡고,
+        그동안 슬롯을 얻지 못한 요청은 ChatGPT를 호출하지 않고 템플릿으로 응답하는지 확인
+        """
+        controller = AdmissionController({'llm': 1}, {INTERACTIVE: 0.2, BATCH: 10})
+        release = threading.Event()
+        calls = []
+        analyzer = ChatGPTAnalyzer('test')
+        def request_expert_summary(stock_data, length_tier=None):
+            calls.append(stock_data['symbol'])
+            release.wait(5)
+            return '전문가 요약', {'total_tokens': 10}
+        analyzer.request_expert_summary = request_expert_summary
+
+        service = SummaryService(analyzer, TemplateSummaryGenerator({}), deadline=0.05)
+        stock_data = {'symbol': 'AAPL', 'current_price': 190.0, 'analysis_date': '2025-06-30',
+                      'interpreted_signals': {}, 'total_score': 3, 'recommendation': 'BUY'}
+        slot = lambda: controller.stage('llm', controller.ticket(INTERACTIVE))
+        with redirect_stdout(io.StringIO()):
+            first = service.summarize(stock_data, slot=slot)
+            self.assertEqual(first['summary_source'], 'template')
+            self.assertEqual(controller.stages['llm'].stats()['active'], 1)
+
+            second = service.summarize(dict(stock_data, symbol='MSFT'), slot=slot)
+            self.assertEqual(second, {'expert_summary': second['expert_summary'], 'summary_source': 'template'})
+            self.assertEqual(calls, ['AAPL'])
+
+            release.set()
+            service._executor.shutdown(wait=True)
+        self.assertEqual(controller.stages['llm'].stats()['active'], 0)
+        self.assertEqual(service.get_summary(first['summary_id'])['status'], 'ready')
+
+    def test_llm_slot_for_batch_summary(self):
+        """
+        묶음 요약도 마감 시간이 지나면 템플릿으로 응답하되 묶음 호출이 끝날 때까지 llm 슬롯을 잡는지 확인
+        """
+        controller = AdmissionController({'llm': 1}, {INTERACTIVE: 0.2, BATCH: 10})
+        release = threading.Event()
+        calls = []
+        analyzer = ChatGPTAnalyzer('test')
+        def generate_batch_summaries(stock_data_list, length_tier=None):
+            calls.append([d['symbol'] for d in stock_data_list])
+            release.wait(5)
+            return {d['symbol']: f"{d['symbol']} 요약" for d in stock_data_list}
+        analyzer.generate_batch_summaries = generate_batch_summaries
+
+        service = SummaryService(analyzer, TemplateSummaryGenerator({}), deadline=0.05)
+        batch = [{'symbol': symbol, 'current_price': 190.0, 'analysis_date': '2025-06-30',
+                  'interpreted_signals': {}, 'total_score': 3, 'recommendation': 'BUY'} for symbol in ('AAPL', 'MSFT')]
+        slot = lambda: controller.stage('llm', controller.ticket(INTERACTIVE))
+        with redirect_stdout(io.StringIO()):
+            first = service.summarize_batch(batch, slot=slot)
+            self.assertEqual({r['summary_source'] for r in first.values()}, {'template'})
+            self.assertEqual(controller.stages['llm'].stats()['active'], 1)
+
+            second = service.summarize_batch(batch[:1], slot=slot)
+            self.assertNotIn('summary_id', second['AAPL'])
+            self.assertEqual(calls, [['AAPL', 'MSFT']])
+
+            release.set()
+            service._executor.shutdown(wait=True)
+        self.assertEqual(controller.stages['llm'].stats()['active'], 0)
+        self.assertEqual(service.get_summary(first['MSFT']['summary_id'])['expert_summary'], 'MSFT 요약')
+
+if __name__ == '__main__':
+    unittest.main()
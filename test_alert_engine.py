@@ -0,0 +1,87 @@
+import io
+import unittest
+from contextlib import redirect_stdout
+
+from alert_engine import AlertEngine, LocalNotifier, WebhookNotifier, validate_webhook_url
+
+def make_result(symbol: str, latest_date: str, rsi: str, recommendation: str, total_score: int) -> dict:
+    """
+    테스트용 분석 결과 생성 (build_analysis 결과 형식)
+    """
+    return {
+        'symbol': symbol,
+        'stock_info': {'latest_date': latest_date, 'latest_price': 100.0},
+        'signals': {'RSI': rsi, 'MACD': 'NEUTRAL'},
+        'recommendation': recommendation,
+        'total_score': total_score
+    }
+
+class TestAlertEngine(unittest.TestCase):
+    """
+    AlertEngine 클래스의 단위 테스트
+    """
+
+    def setUp(self):
+        """
+        테스트 설정
+        """
+        self.notifier = LocalNotifier()
+        self.engine = AlertEngine(self.notifier)
+
+    def test_signal_transition_rules(self):
+        """
+        (지표, 신호) 규칙이 신호가 바뀔 때만, from_signal/symbols 조건에 맞을 때만 실행되는지 확인
+        """
+        buy = self.engine.add_rule({'indicator': 'RECOMMENDATION', 'from_signal': 'HOLD', 'signal': 'BUY'})
+        oversold = self.engine.add_rule({'indicator': 'RSI', 'signal': 'STRONG_OVERSOLD', 'symbols': ['msft']})
+
+        self.engine.update(make_result('AAPL', '2025-06-26', 'NEUTRAL', 'HOLD', 1))
+        self.engine.update(make_result('MSFT', '2025-06-26', 'NEUTRAL', 'SELL', -3))
+        self.assertEqual(self.notifier.events, [])
+
+        self.engine.update(make_result('AAPL', '2025-06-27', 'STRONG_OVERSOLD', 'BUY', 4))
+        self.engine.update(make_result('MSFT', '2025-06-27', 'STRONG_OVERSOLD', 'BUY', 4))
+        self.engine.update(make_result('MSFT', '2025-06-27', 'STRONG_OVERSOLD', 'BUY', 4))
+
+        fired = [(e['rule_id'], e['symbol']) for e in self.notifier.events]
+        self.assertEqual(fired, [(buy['id'], 'AAPL'), (oversold['id'], 'MSFT')])
+
+    def test_score_crossing_and_stale_results(self):
+        """
+        총점 규칙은 기준선을 넘을 때만 실행되고, 이전 날짜 결과는 무시되는지 확인
+        """
+        rule = self.engine.add_rule({'indicator': 'TOTAL_SCORE', 'score_above': 8})
+        self.engine.update(make_result('AAPL', '2025-06-26', 'NEUTRAL', 'BUY', 5))
+        self.engine.update(make_result('AAPL', '2025-06-27', 'NEUTRAL', 'STRONG_BUY', 9))
+        self.engine.update(make_result('AAPL', '2025-06-20', 'NEUTRAL', 'HOLD', 0))
+        self.engine.update(make_result('AAPL', '2025-06-30', 'NEUTRAL', 'STRONG_BUY', 10))
+        self.assertEqual([e['rule_id'] for e in self.notifier.events], [rule['id']])
+
+        self.assertTrue(self.engine.remove_rule(rule['id']))
+        self.assertFalse(self.engine.remove_rule(rule['id']))
+        with self.assertRaises(ValueError):
+            self.engine.add_rule({'indicator': 'TOTAL_SCORE'})
+
+    def test_webhook_url_validation(self):
+        """
+        https가 아니거나 내부 주소(루프백, 사설망, 링크 로컬 메타데이터 등)로 향하는 웹훅은 거절되는지 확인
+        """
+        for url in ('http://8.8.8.8/hook', 'ftp://8.8.8.8/', 'https:///hook', 'https://127.0.0.1/hook',
+                    'https://10.0.0.5/hook', 'https://169.254.169.254/latest/meta-data', 'https://[::1]/hook',
+                    'https://[fdaa::3]/hook', 'https://[::ffff:192.168.0.1]/hook', 'https://0.0.0.0/', 12345):
+            self.assertIsNotNone(validate_webhook_url(url), url)
+            with self.assertRaises(ValueError):
+                self.engine.add_rule({'indicator': 'RSI', 'signal': 'STRONG_OVERSOLD', 'webhook_url': url})
+        self.assertIsNone(validate_webhook_url('https://8.8.8.8/hook'))
+        self.assertEqual(self.engine.list_rules(), [])
+
+    def test_webhook_revalidated_before_post(self):
+        """
+        전송 시점에 내부 주소로 향하는 웹훅은 보내지 않는지 확인 (등록 후 DNS 변경 대비)
+        """
+        with redirect_stdout(io.StringIO()) as output:
+            WebhookNotifier()._post({'id': 'r1', 'webhook_url': 'https://127.0.0.1/hook'}, {'symbol': 'AAPL'})
+        self.assertIn('전송 거부', output.getvalue())
+
+if __name__ == '__main__':
+    unittest.main()
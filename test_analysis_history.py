@@ -0,0 +1,73 @@
+import os
+import tempfile
+import unittest
+from datetime import date
+
+from analysis_history import AnalysisHistory
+
+def make_result(symbol: str, latest_date: str, total_score: int, recommendation: str) -> dict:
+    """
+    테스트용 분석 결과 생성 (build_analysis 결과 형식)
+    """
+    return {
+        'symbol': symbol,
+        'stock_info': {'latest_date': latest_date, 'latest_price': 100.0},
+        'signals': {'RSI': 'NEUTRAL'},
+        'scores': {'RSI': 0},
+        'values': {'RSI': 50.0},
+        'total_score': total_score,
+        'recommendation': recommendation,
+        'expert_summary': '요약',
+        'summary_source': 'template'
+    }
+
+class TestAnalysisHistory(unittest.TestCase):
+    """
+    AnalysisHistory 클래스의 단위 테스트
+    """
+
+    def setUp(self):
+        """
+        테스트 설정
+        """
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.history = AnalysisHistory(os.path.join(self.tmpdir.name, 'history.db'), flush_interval=0.01)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_score_history_keeps_last_analysis_per_day(self):
+        """
+        같은 날짜에 여러 번 분석하면 마지막 결과만 이력에 나오는지 확인
+        """
+        self.history.record(make_result('AAPL', '2025-06-26', 1, 'HOLD'))
+        self.history.record(make_result('AAPL', '2025-06-27', 2, 'HOLD'))
+        self.history.record(make_result('AAPL', '2025-06-27', 4, 'BUY'))
+        self.history.record(make_result('MSFT', '2025-06-27', -3, 'SELL'))
+        self.history.flush()
+
+        rows = self.history.score_history('aapl', days=30, today=date(2025, 6, 30))
+        self.assertEqual([r['date'] for r in rows], ['2025-06-26', '2025-06-27'])
+        self.assertEqual(rows[-1]['total_score'], 4)
+        self.assertEqual(rows[-1]['raw_values'], {'RSI': 50.0})
+        self.assertEqual(self.history.score_history('AAPL', days=1, today=date(2025, 6, 28))[0]['date'], '2025-06-27')
+
+    def test_recommendation_changes(self):
+        """
+        직전 기록 날짜와 추천이 달라진 종목만 반환하는지 확인
+        """
+        self.history.record(make_result('AAPL', '2025-06-26', 1, 'HOLD'))
+        self.history.record(make_result('MSFT', '2025-06-26', 4, 'BUY'))
+        self.history.record(make_result('AAPL', '2025-06-27', 4, 'BUY'))
+        self.history.record(make_result('MSFT', '2025-06-27', 5, 'BUY'))
+        self.history.record(make_result('NVDA', '2025-06-27', 9, 'STRONG_BUY'))
+        self.history.flush()
+
+        result = self.history.recommendation_changes()
+        self.assertEqual(result['date'], '2025-06-27')
+        self.assertEqual([c['symbol'] for c in result['changes']], ['AAPL'])
+        self.assertEqual(result['changes'][0]['previous_recommendation'], 'HOLD')
+        self.assertEqual(self.history.recommendation_changes('2025-06-26')['changes'], [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+import csv
+import io
+import os
+import shutil
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+import pandas as pd
+
+os.environ.setdefault('FMP_API_KEY', 'test')
+
+from batch_runner import CsvResultWriter, ParquetResultWriter, read_symbols, run_batch
+from data_providers import ReplayProvider
+from stock_data_fetcher import StockDataFetcher
+from stock_trading_analyzer import StockTradingAnalyzer
+from test_helpers import make_history
+
+class TestBatchRunner(unittest.TestCase):
+    """
+    batch_runner 모듈의 단위 테스트 (재생 공급자로 네트워크 없이 실행)
+    """
+
+    def setUp(self):
+        """
+        테스트 설정 (종목 파일, 재생 데이터, 분석기)
+        """
+        self.directory = tempfile.mkdtemp()
+        replay_dir = os.path.join(self.directory, 'replay')
+        os.makedirs(replay_dir)
+        self.symbols = [f'S{i}' for i in range(6)]
+        for i, symbol in enumerate(self.symbols):
+            make_history(300, seed=i).to_csv(os.path.join(replay_dir, f'{symbol}.csv'))
+
+        self.symbols_file = os.path.join(self.directory, 'symbols.txt')
+        with open(self.symbols_file, 'w') as f:
+            f.write('# 관심 종목\n' + '\n'.join(self.symbols) + '\nmissing\n\nS0\n')
+
+        self.analyzer = StockTradingAnalyzer()
+        self.analyzer.data_fetcher = StockDataFetcher(provider=ReplayProvider(replay_dir))
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def run_batch(self, writer, resume=False):
+        with redirect_stdout(io.StringIO()):
+            return run_batch(read_symbols(self.symbols_file), writer, self.analyzer,
+                             as_of='2025-06-30', workers=2, resume=resume)
+
+    def test_csv_resume(self):
+        """
+        중단된 CSV(잘린 마지막 줄 포함)를 이어서 분석하면 모든 종목이 한 번씩만 기록되는지 확인
+        """
+        output = os.path.join(self.directory, 'results.csv')
+        counts = self.run_batch(CsvResultWriter(output))
+        # 종목 파일에 두 번 나온 S0는 한 번만 분석
+        self.assertEqual(counts, {'analyzed': 6, 'failed': 1, 'skipped': 1})
+
+        with open(output, encoding='utf-8') as f:
+            rows = list(csv.DictReader(f))
+        by_symbol = {row['symbol']: row for row in rows}
+        self.assertEqual(by_symbol['S0']['date'], '2025-06-30')
+        self.assertEqual(by_symbol['S0']['data_source'], 'replay')
+        self.assertTrue(by_symbol['MISSING']['error'])
+
+        # 세 번째 행을 쓰는 도중 중단된 상태 재현
+        with open(output, encoding='utf-8') as f:
+            lines = f.readlines()
+        with open(output, 'w', encoding='utf-8') as f:
+            f.writelines(lines[:3])
+            f.write(lines[3][:20])
+
+        # 남은 두 행 중 성공한 종목과 중복된 S0만 건너뛰고 실패한 종목은 다시 분석
+        kept = sum(1 for row in csv.DictReader(io.StringIO(''.join(lines[:3]))) if not row['error'])
+        counts = self.run_batch(CsvResultWriter(output), resume=True)
+        self.assertEqual(counts['skipped'], kept + 1)
+        self.assertEqual(counts['analyzed'] + counts['failed'], 7 - kept)
+        with open(output, encoding='utf-8') as f:
+            resumed = list(csv.DictReader(f))
+        self.assertEqual(sorted(row['symbol'] for row in resumed), sorted(by_symbol))
+        self.assertEqual({row['symbol']: row for row in resumed}, by_symbol)
+
+    def test_resume_retries_failed(self):
+        """
+        이어서 분석할 때 실패 행은 지우고 다시 분석하는지 확인
+        """
+        output = os.path.join(self.directory, 'results.csv')
+        self.run_batch(CsvResultWriter(output))
+        counts = self.run_batch(CsvResultWriter(output), resume=True)
+        self.assertEqual(counts, {'analyzed': 0, 'failed': 1, 'skipped': 7})
+        with open(output, encoding='utf-8') as f:
+            symbols = [row['symbol'] for row in csv.DictReader(f)]
+        self.assertEqual(len(symbols), 7)
+        self.assertEqual(symbols.count('MISSING'), 1)
+
+    def test_parquet_parts(self):
+        """
+        Parquet 파트 파일로 나눠 기록하고 이어서 분석할 때 성공한 종목만 건너뛰는지 확인
+        """
+        output = os.path.join(self.directory, 'results.parquet')
+        self.run_batch(ParquetResultWriter(output, rows_per_part=3))
+        self.assertEqual(len(os.listdir(output)), 3)
+        self.assertEqual(len(pd.read_parquet(output)), 7)
+
+        counts = self.run_batch(ParquetResultWriter(output, rows_per_part=3), resume=True)
+        self.assertEqual(counts, {'analyzed': 0, 'failed': 1, 'skipped': 7})
+        table = pd.read_parquet(output)
+        self.assertEqual(len(table), 7)
+        self.assertEqual(sorted(table['symbol']), sorted(self.symbols + ['MISSING']))
+
+if __name__ == '__main__':
+    unittest.main()
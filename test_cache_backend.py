@@ -0,0 +1,196 @@
+import io
+import os
+import shutil
+import socketserver
+import tempfile
+import threading
+import time
+import unittest
+from contextlib import redirect_stdout
+from datetime import date
+
+import pandas as pd
+
+os.environ.setdefault('FMP_API_KEY', 'test')
+
+from bar_store import BarStore
+from cache_backend import MemoryBackend, RedisBackend, encode_bars, decode_bars
+from chatgpt_analyzer import ChatGPTAnalyzer
+from summary_service import SummaryService
+from template_summary import TemplateSummaryGenerator
+from test_helpers import make_history
+
+class FakeRedisHandler(socketserver.StreamRequestHandler):
+    """
+    GET/SET(PX, EX)/DEL/PING/AUTH/SELECT만 처리하는 테스트용 Redis 서버
+    """
+
+    def read_command(self):
+        line = self.rfile.readline()
+        if not line:
+            return None
+        args = []
+        for _ in range(int(line[1:-2])):
+            size = int(self.rfile.readline()[1:-2])
+            args.append(self.rfile.read(size + 2)[:-2])
+        return args
+
+    def handle(self):
+        store = self.server.store
+        while True:
+            args = self.read_command()
+            if args is None:
+                return
+            name = args[0].upper()
+            if name in (b'PING', b'AUTH', b'SELECT'):
+                reply = b'+OK\r\n' if name != b'PING' else b'+PONG\r\n'
+            elif name == b'GET':
+                value, expires_at = store.get(args[1], (None, None))
+                if value is None or (expires_at is not None and expires_at <= time.monotonic()):
+                    reply = b'$-1\r\n'
+                else:
+                    reply = b'$%d\r\n%s\r\n' % (len(value), value)
+            elif name == b'SET':
+                expires_at = None
+                if len(args) == 5:
+                    unit = 1000 if args[3].upper() == b'PX' else 1
+                    expires_at = time.monotonic() + int(args[4]) / unit
+                store[args[1]] = (args[2], expires_at)
+                reply = b'+OK\r\n'
+            elif name == b'DEL':
+                reply = b':%d\r\n' % (store.pop(args[1], None) is not None)
+            else:
+                reply = b'-ERR unknown command\r\n'
+            self.wfile.write(reply)
+
+class FakeRedisServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), FakeRedisHandler)
+        self.store = {}
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+
+    @property
+    def url(self):
+        return f'redis://:secret@127.0.0.1:{self.server_address[1]}/1'
+
+class TestCacheBackend(unittest.TestCase):
+    """
+    cache_backend 모듈과 공유 캐시를 사용하는 BarStore, SummaryService의 단위 테스트
+    """
+
+    def setUp(self):
+        """
+        테스트 설정 (가짜 Redis 서버, 임시 디렉터리)
+        """
+        self.server = FakeRedisServer()
+        self.backend = RedisBackend(self.server.url)
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.directory)
+
+    def test_redis_roundtrip(self):
+        """
+        bytes/JSON 값 저장, 만료 시간, 삭제 확인
+        """
+        self.backend.set('key', b'\x00value\r\n')
+        self.assertEqual(self.backend.get('key'), b'\x00value\r\n')
+        self.backend.set_json('json', {'가격': 1.5})
+        self.assertEqual(self.backend.get_json('json'), {'가격': 1.5})
+
+        self.backend.set('short', b'x', ttl=0.05)
+        time.sleep(0.1)
+        self.assertIsNone(self.backend.get('short'))
+
+        self.backend.delete('key')
+        self.assertIsNone(self.backend.get('key'))
+
+        memory = MemoryBackend(max_entries=2)
+        memory.set('a', b'1')
+        memory.set('b', b'2', ttl=0.05)
+        time.sleep(0.1)
+        self.assertEqual(memory.get('a'), b'1')
+        self.assertIsNone(memory.get('b'))
+
+    def test_encode_bars(self):
+        """
+        일봉 바이너리 변환 후 값, 날짜, 공급자가 그대로 복원되는지 확인
+        """
+        data = make_history(300, seed=1)
+        payload = encode_bars(data)
+        self.assertLess(len(payload), len(data.to_csv()))
+        pd.testing.assert_frame_equal(decode_bars(payload), data, check_freq=False)
+        data.attrs['source'] = 'fmp'
+        self.assertEqual(decode_bars(encode_bars(data)).attrs['source'], 'fmp')
+        with self.assertRaises(ValueError):
+            decode_bars(b'not bars')
+
+    def test_bar_store_shared(self):
+        """
+        한 인스턴스가 저장한 일봉을 다른 인스턴스가 로컬 파일 없이 공유 캐시에서 가져오는지 확인
+        """
+        data = make_history(300, seed=2)
+        first = BarStore(os.path.join(self.directory, 'a'), shared=self.backend)
+        second = BarStore(os.path.join(self.directory, 'b'), shared=self.backend)
+        first.save('AAPL', data)
+
+        sliced = second.get_range('AAPL', date(2025, 1, 2), date(2025, 6, 30))
+        self.assertIsNotNone(sliced)
+        self.assertEqual(sliced.index[-1], pd.Timestamp('2025-06-30'))
+        self.assertTrue(os.path.exists(os.path.join(self.directory, 'b', 'AAPL.pkl')))
+        self.assertIsNone(second.get_range('MSFT', date(2025, 1, 2), date(2025, 6, 30)))
+
+    def test_summary_cache_shared(self):
+        """
+        다른 SummaryService 인스턴스가 같은 입력의 ChatGPT 요약을 다시 요청하지 않는지 확인
+        """
+        calls = []
+        analyzer = ChatGPTAnalyzer('test')
+        def request_expert_summary(stock_data, length_tier=None):
+            calls.append(stock_data['symbol'])
+            return '전문가 요약', {'total_tokens': 10}
+        analyzer.request_expert_summary = request_expert_summary
+
+        template = TemplateSummaryGenerator({})
+        stock_data = {'symbol': 'AAPL', 'current_price': 190.123456, 'analysis_date': '2025-06-30',
+                      'interpreted_signals': {}, 'total_score': 3, 'recommendation': 'BUY'}
+        first = SummaryService(analyzer, template, cache=self.backend)
+        second = SummaryService(analyzer, template, cache=self.backend)
+
+        result = first.summarize(stock_data)
+        self.assertEqual(result['summary_source'], 'llm')
+        # 완료 콜백이 캐시에 저장할 때까지 대기
+        first._executor.shutdown(wait=True)
+
+        result = second.summarize(dict(stock_data, current_price=190.12346))
+        self.assertEqual(result, {'expert_summary': '전문가 요약', 'summary_source': 'llm',
+                                  'summary_usage': {'total_tokens': 10}, 'summary_cached': True})
+        self.assertEqual(calls, ['AAPL'])
+
+        # 응답 길이가 다르면 다시 요청
+        second.summarize(stock_data, length_tier='short')
+        self.assertEqual(calls, ['AAPL', 'AAPL'])
+
+    def test_redis_unavailable(self):
+        """
+        Redis에 연결할 수 없으면 오류 없이 캐시 미스로 처리되는지 확인
+        """
+        self.server.shutdown()
+        self.server.server_close()
+        backend = RedisBackend(self.server.url, timeout=0.2)
+        with redirect_stdout(io.StringIO()) as output:
+            self.assertIsNone(backend.get('key'))
+            backend.set('key', b'value')
+            store = BarStore(os.path.join(self.directory, 'c'), shared=backend)
+            store.save('AAPL', make_history(50, seed=3))
+            self.assertIsNotNone(store.get_range('AAPL', date(2025, 5, 1), date(2025, 6, 30)))
+        # 오류 로그는 한 번만 출력
+        self.assertEqual(output.getvalue().count('Redis'), 1)
+
+if __name__ == '__main__':
+    unittest.main()
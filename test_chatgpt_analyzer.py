@@ -0,0 +1,200 @@
+import io
+import threading
+import unittest
+from contextlib import redirect_stdout
+from types import SimpleNamespace
+
+from chatgpt_analyzer import ChatGPTAnalyzer, OUTPUT_LENGTH_TIERS
+
+def make_stock_data(symbol: str, total_score: int = 3) -> dict:
+    """
+    테스트용 요약 입력 데이터 생성 (build_analysis의 ChatGPT 요약용 데이터 형식)
+    """
+    return {
+        'symbol': symbol,
+        'current_price': 190.5,
+        'analysis_date': '2025-06-30',
+        'interpreted_signals': {
+            'RSI': {'indicator_name': 'RSI', 'signal': 'WEAK_OVERSOLD', 'score': 1, 'description': '과매도 근처'},
+            'MACD': {'indicator_name': 'MACD', 'signal': 'NEUTRAL', 'score': 0, 'description': '중립'}
+        },
+        'total_score': total_score,
+        'recommendation': 'BUY'
+    }
+
+class StubClient:
+    """
+    chat.completions.create 호출을 기록하고 미리 정한 응답을 돌려주는 OpenAI 클라이언트 대역
+    """
+
+    def __init__(self, reply):
+        self.reply = reply
+        self.calls = []
+        self._lock = threading.Lock()
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, **kwargs):
+        with self._lock:
+            self.calls.append(kwargs)
+        content, prompt_tokens, completion_tokens = self.reply(kwargs['messages'][1]['content'])
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=content))],
+            usage=SimpleNamespace(prompt_tokens=prompt_tokens, completion_tokens=completion_tokens)
+        )
+
+class TestBatchSummaries(unittest.TestCase):
+    """
+    ChatGPTAnalyzer 배치 요약(프롬프트 생성, 응답 분리, 빠진 종목 보완)의 단위 테스트
+    """
+
+    def setUp(self):
+        self.analyzer = ChatGPTAnalyzer('test')
+
+    def test_parse_sections(self):
+        """
+        순서가 바뀌거나 소문자/공백이 섞인 헤더도 심볼별로 나뉘고, 빈 섹션은 빠지는지 확인
+        """
+        content = (
+            '앞부분 설명\n'
+            '=== MSFT ===\n🧠 전문가 종합평가:\nMSFT 요약\n\n'
+            '===aapl===\nAAPL 요약\n'
+            '=== BRK.B ===\nBRK 요약\n'
+            '=== TSLA ===\n\n'
+        )
+        sections = self.analyzer._parse_batch_response(content)
+        self.assertEqual(sections, {
+            'MSFT': '🧠 전문가 종합평가:\nMSFT 요약',
+            'AAPL': 'AAPL 요약',
+            'BRK.B': 'BRK 요약'
+        })
+        self.assertEqual(self.analyzer._parse_batch_response('헤더 없는 응답'), {})
+
+    def test_parse_duplicated_section(self):
+        """
+        같은 심볼 헤더가 두 번 나오면 나중 섹션이, 나중 섹션이 비어 있으면 앞 섹션이 남는지 확인
+        """
+        sections = self.analyzer._parse_batch_response('=== AAPL ===\n첫 번째\n=== AAPL ===\n두 번째\n')
+        self.assertEqual(sections, {'AAPL': '두 번째'})
+        sections = self.analyzer._parse_batch_response('=== AAPL ===\n첫 번째\n=== AAPL ===\n')
+        self.assertEqual(sections, {'AAPL': '첫 번째'})
+
+    def test_batch_prompt(self):
+        """
+        배치 프롬프트에 모든 종목과 섹션 헤더 지시가 들어가는지 확인 (compact/full 형식)
+        """
+        batch = [make_stock_data('AAPL'), make_stock_data('MSFT', -2)]
+        prompt = self.analyzer._create_batch_prompt(batch)
+        self.assertIn('[AAPL] $190.50 2025-06-30 총점=3 추천=BUY\nRSI=WEAK_OVERSOLD(+1) MACD=NEUTRAL(0)', prompt)
+        self.assertIn('[MSFT]', prompt)
+        self.assertIn('=== 심볼 ===', prompt)
+
+        full = ChatGPTAnalyzer('test', prompt_format='full')._create_batch_prompt(batch)
+        self.assertIn('[MSFT] 현재가: $190.5 / 분석일: 2025-06-30', full)
+        self.assertIn('- RSI: WEAK_OVERSOLD (과매도 근처)', full)
+        self.assertIn('=== AAPL ===', full)
+
+    def test_missing_symbols_fall_back(self):
+        """
+        응답에서 빠진 종목만 단일 요청으로 다시 생성하고, 요청하지 않은 심볼 섹션은 무시하는지 확인
+        """
+        def reply(prompt):
+            if '=== 심볼 ===' in prompt:
+                return '=== msft ===\nMSFT 배치 요약\n=== NVDA ===\n요청하지 않은 종목\n=== AAPL ===\nAAPL 배치 요약', 100, 50
+            return f'{prompt[1:prompt.index("]")]} 단일 요약', 40, 20
+
+        self.analyzer.client = StubClient(reply)
+        batch = [make_stock_data(symbol) for symbol in ('AAPL', 'MSFT', 'TSLA')]
+        with redirect_stdout(io.StringIO()):
+            summaries = self.analyzer.generate_batch_summaries(batch, batch_size=3)
+
+        self.assertEqual(summaries, {'AAPL': 'AAPL 배치 요약', 'MSFT': 'MSFT 배치 요약', 'TSLA': 'TSLA 단일 요약'})
+        self.assertEqual(len(self.analyzer.client.calls), 2)
+        self.assertTrue(self.analyzer.client.calls[1]['messages'][1]['content'].startswith('[TSLA]'))
+
+    def test_failed_batch_falls_back(self):
+        """
+        배치 요청 자체가 실패하면 모든 종목을 단일 요청으로 다시 생성하는지 확인
+        """
+        def reply(prompt):
+            if '=== 심볼 ===' in prompt:
+                raise RuntimeError('timeout')
+            return f'{prompt[1:prompt.index("]")]} 단일 요약', 40, 20
+
+        self.analyzer.client = StubClient(reply)
+        batch = [make_stock_data('AAPL'), make_stock_data('MSFT')]
+        with redirect_stdout(io.StringIO()):
+            summaries = self.analyzer.generate_batch_summaries(batch, batch_size=2)
+        self.assertEqual(summaries, {'AAPL': 'AAPL 단일 요약', 'MSFT': 'MSFT 단일 요약'})
+        self.assertEqual(len(self.analyzer.client.calls), 3)
+
+class TestLengthTiersAndUsage(unittest.TestCase):
+    """
+    응답 길이 단계별 max_tokens와 토큰 사용량 누적의 단위 테스트
+    """
+
+    def setUp(self):
+        self.analyzer = ChatGPTAnalyzer('test', length_tier='short')
+        self.analyzer.client = StubClient(lambda prompt: ('요약', 120, 80))
+
+    def test_tier_sets_max_tokens(self):
+        """
+        기본 단계와 요청별 단계가 max_tokens에 반영되고, 배치는 종목 수만큼 늘어나되 4096을 넘지 않는지 확인
+        """
+        with redirect_stdout(io.StringIO()):
+            self.analyzer.request_expert_summary(make_stock_data('AAPL'))
+            self.analyzer.request_expert_summary(make_stock_data('AAPL'), 'detailed')
+            self.analyzer._summarize_batch([make_stock_data('AAPL'), make_stock_data('MSFT')], 'standard')
+            self.analyzer._summarize_batch([make_stock_data(f'S{i}') for i in range(5)], 'detailed')
+        calls = self.analyzer.client.calls
+        self.assertEqual([call['max_tokens'] for call in calls[:2]],
+                         [OUTPUT_LENGTH_TIERS['short'], OUTPUT_LENGTH_TIERS['detailed']])
+        batch_calls = [call for call in calls if '=== 심볼 ===' in call['messages'][1]['content']]
+        self.assertEqual([call['max_tokens'] for call in batch_calls], [2 * OUTPUT_LENGTH_TIERS['standard'], 4096])
+        # 배치 응답에 섹션이 없어 단일 요청으로 보완할 때도 요청한 단계를 사용
+        fallback_calls = [call for call in calls[2:] if call not in batch_calls]
+        self.assertEqual([call['max_tokens'] for call in fallback_calls],
+                         [OUTPUT_LENGTH_TIERS['standard']] * 2 + [OUTPUT_LENGTH_TIERS['detailed']] * 5)
+
+        with self.assertRaises(ValueError):
+            self.analyzer.request_expert_summary(make_stock_data('AAPL'), 'huge')
+        with self.assertRaises(ValueError):
+            ChatGPTAnalyzer('test', length_tier='huge')
+
+    def test_usage_totals(self):
+        """
+        요청별 사용량이 반환되고 누적 사용량이 단일/배치/동시 요청을 합한 값과 같은지 확인
+        """
+        with redirect_stdout(io.StringIO()):
+            summary, usage = self.analyzer.request_expert_summary(make_stock_data('AAPL'))
+            threads = [threading.Thread(target=self.analyzer.request_expert_summary, args=(make_stock_data('MSFT'),))
+                       for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            self.analyzer._summarize_batch([make_stock_data('AAPL'), make_stock_data('MSFT')])
+
+        self.assertEqual(usage, {'prompt_tokens': 120, 'completion_tokens': 80, 'total_tokens': 200})
+        # 배치 응답에 섹션이 없으므로 배치 1건 + 단일 보완 2건
+        requests = 1 + 8 + 3
+        self.assertEqual(self.analyzer.get_usage_totals(), {
+            'requests': requests,
+            'prompt_tokens': 120 * requests,
+            'completion_tokens': 80 * requests,
+            'total_tokens': 200 * requests
+        })
+
+    def test_missing_usage(self):
+        """
+        응답에 usage가 없으면 0으로 기록되는지 확인
+        """
+        def create(**kwargs):
+            return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=' 요약 '))], usage=None)
+        self.analyzer.client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+        with redirect_stdout(io.StringIO()):
+            self.assertEqual(self.analyzer.request_expert_summary(make_stock_data('AAPL')),
+                             ('요약', {'prompt_tokens': 0, 'completion_tokens': 0, 'total_tokens': 0}))
+        self.assertEqual(self.analyzer.get_usage_totals()['requests'], 1)
+
+if __name__ == '__main__':
+    unittest.main()
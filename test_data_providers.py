@@ -0,0 +1,181 @@
+import io
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from contextlib import redirect_stdout
+from datetime import date, datetime
+
+import numpy as np
+import pandas as pd
+
+os.environ.setdefault('FMP_API_KEY', 'test')
+
+from bar_store import BarStore
+from data_providers import DataProvider, HedgedProvider, ProviderError, ReplayProvider
+from stock_data_fetcher import StockDataFetcher
+from market_calendar import last_completed_session
+from test_helpers import make_history
+
+class FailingProvider(DataProvider):
+    """
+    항상 실패하는 공급자
+    """
+
+    name = "failing"
+
+    def fetch(self, symbol, start, end):
+        raise ProviderError("연결 실패")
+
+class TestDataProviders(unittest.TestCase):
+    """
+    data_providers 모듈과 StockDataFetcher 대체 경로의 단위 테스트
+    """
+
+    def setUp(self):
+        """
+        테스트 설정 (재생 데이터 CSV 파일 생성)
+        """
+        self.directory = tempfile.mkdtemp()
+        self.data = make_history(300, seed=1)
+        self.data.to_csv(os.path.join(self.directory, 'AAPL.csv'))
+        self.start, self.end = date(2025, 1, 2), date(2025, 6, 30)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_replay_provider(self):
+        """
+        재생 공급자가 요청 구간만 돌려주고, 파일이 없으면 ProviderError인지 확인
+        """
+        provider = ReplayProvider(self.directory)
+        bars = provider.fetch('aapl', self.start, self.end)
+        self.assertEqual(bars.index[0], pd.Timestamp('2025-01-02'))
+        self.assertEqual(bars.index[-1], pd.Timestamp('2025-06-30'))
+        np.testing.assert_allclose(bars['Close'], self.data.loc['2025-01-02':, 'Close'])
+
+        with self.assertRaises(ProviderError):
+            provider.fetch('MSFT', self.start, self.end)
+
+    def test_hedged_provider(self):
+        """
+        주 공급자가 늦으면 hedge_delay 후 보조 공급자 결과를 사용하고, 실패하면 바로 다음 공급자로 넘어가는지 확인
+        """
+        slow = ReplayProvider(self.directory, delay=2.0)
+        fast = ReplayProvider(self.directory)
+        fast.name = 'secondary'
+        hedged = HedgedProvider([slow, fast], hedge_delay=0.05, deadline=5)
+
+        started = time.monotonic()
+        bars = hedged.fetch('AAPL', self.start, self.end)
+        self.assertLess(time.monotonic() - started, 1.0)
+        self.assertEqual(bars.attrs['source'], 'secondary')
+
+        started = time.monotonic()
+        bars = HedgedProvider([FailingProvider(), fast], hedge_delay=1.0).fetch('AAPL', self.start, self.end)
+        self.assertLess(time.monotonic() - started, 0.5)
+        self.assertEqual(bars.attrs['source'], 'secondary')
+
+        with self.assertRaises(ProviderError):
+            HedgedProvider([FailingProvider(), slow], hedge_delay=0.01, deadline=0.2).fetch('AAPL', self.start, self.end)
+
+    def test_stale_fallback(self):
+        """
+        모든 공급자가 실패하면 로컬 저장소의 이전 일봉을 stale로 표시해 돌려주는지 확인
+        """
+        store = BarStore(os.path.join(self.directory, 'bars'))
+        store.save('AAPL', self.data.loc[:'2025-06-20'])
+        fetcher = StockDataFetcher(bar_store=store, provider=FailingProvider())
+
+        bars = fetcher.fetch_stock_data('AAPL', end='2025-06-30')
+        self.assertFalse(bars.empty)
+        self.assertTrue(bars.attrs['stale'])
+        self.assertEqual(bars.attrs['source'], 'local')
+        self.assertEqual(bars.index[-1], pd.Timestamp('2025-06-20'))
+
+        self.assertTrue(fetcher.fetch_stock_data('MSFT', end='2025-06-30').empty)
+
+        fresh = StockDataFetcher(provider=ReplayProvider(self.directory)).fetch_stock_data('AAPL', end='2025-06-30')
+        self.assertFalse(fresh.attrs['stale'])
+        self.assertEqual(fresh.attrs['source'], 'replay')
+
+    def test_unfinished_session_not_stored(self):
+        """
+        공급자가 돌려준 오늘(아직 확정되지 않은 세션) 봉은 응답에는 포함되지만 저장소에는 기록되지 않는지 확인
+        """
+        # 장 마감 후에 실행하면 오늘 세션은 이미 확정이므로 다음 거래일 봉을 미완성 봉으로 사용
+        today = max(pd.Timestamp(datetime.now().date()), pd.Timestamp(last_completed_session()) + pd.offsets.BDay(1))
+        data = make_history(300, seed=2)
+        data.index = pd.bdate_range(end=last_completed_session(), periods=300, name='Date')
+        partial = data.iloc[[-1]].copy()
+        partial.index = pd.DatetimeIndex([today], name='Date')
+        pd.concat([data, partial]).to_csv(os.path.join(self.directory, 'MSFT.csv'))
+
+        store = BarStore(os.path.join(self.directory, 'bars'))
+        fetcher = StockDataFetcher(bar_store=store, provider=ReplayProvider(self.directory))
+        bars = fetcher.fetch_stock_data('MSFT', end=today.date())
+        self.assertEqual(bars.index[-1], today)
+        self.assertEqual(store.load('MSFT').index[-1], pd.Timestamp(last_completed_session()))
+
+    def test_secondary_provider_bars_not_stored(self):
+        """
+        헤지 요청에서 보조 공급자 응답은 source를 표시해 돌려주기만 하고, 주 공급자 일봉만 공급자와 함께 저장되는지 확인
+        """
+        slow = ReplayProvider(self.directory, delay=1.0)
+        fast = ReplayProvider(self.directory)
+        fast.name = 'secondary'
+        store = BarStore(os.path.join(self.directory, 'bars'))
+
+        fetcher = StockDataFetcher(bar_store=store, provider=HedgedProvider([slow, fast], hedge_delay=0.05))
+        bars = fetcher.fetch_stock_data('AAPL', end='2025-06-30')
+        self.assertEqual(bars.attrs['source'], 'secondary')
+        self.assertTrue(store.load('AAPL').empty)
+
+        fetcher = StockDataFetcher(bar_store=store, provider=HedgedProvider([fast, slow], hedge_delay=0.5))
+        fetcher.fetch_stock_data('AAPL', end='2025-06-30')
+        self.assertEqual(store.load('AAPL').attrs['source'], 'secondary')
+        self.assertEqual(BarStore(store.directory).load('AAPL').attrs['source'], 'secondary')
+
+    def test_bar_store_does_not_splice_providers(self):
+        """
+        저장된 일봉과 공급자가 다른 일봉은 병합하지 않고 교체하는지 확인
+        """
+        store = BarStore(os.path.join(self.directory, 'bars'))
+        first = self.data.loc[:'2025-03-31'].copy()
+        first.attrs['source'] = 'fmp'
+        store.save('AAPL', first)
+        second = self.data.loc['2025-03-01':].copy()
+        second.attrs['source'] = 'fmp'
+        store.save('AAPL', second)
+        self.assertEqual(len(store.load('AAPL')), len(self.data))
+
+        other = self.data.loc['2025-06-01':].copy() * 1.01
+        other.attrs['source'] = 'stooq'
+        store.save('AAPL', other)
+        stored = store.load('AAPL')
+        self.assertEqual(stored.index[0], pd.Timestamp('2025-06-02'))
+        self.assertEqual(stored.attrs['source'], 'stooq')
+
+    def test_bar_store_gap_not_served(self):
+        """
+        떨어진 두 구간을 저장하면 중간이 빈 구간은 반환하지 않고(다시 조회), 구멍 없는 구간과 공휴일 하루는 허용하는지 확인
+        """
+        store = BarStore(os.path.join(self.directory, 'bars'))
+        data = make_history(400, seed=3)
+        with redirect_stdout(io.StringIO()):
+            store.save('AAPL', data.iloc[:150])
+            store.save('AAPL', data.iloc[-60:])
+        first, last = data.index[0].date(), data.index[-1].date()
+        self.assertIsNone(store.get_range('AAPL', first, last))
+        self.assertEqual(len(store.get_range('AAPL', data.index[-60].date(), last)), 60)
+        self.assertEqual(len(store.get_range('AAPL', first, data.index[149].date())), 150)
+
+        # 평일 하루가 빠진 것은 공휴일로 보고 허용
+        holiday = data.drop(data.index[200])
+        with redirect_stdout(io.StringIO()):
+            store.save('MSFT', holiday)
+        self.assertEqual(len(store.get_range('MSFT', first, last)), 399)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,29 @@
+"""
+여러 테스트 모듈이 함께 쓰는 테스트 데이터 생성 함수
+
+지표 경계 사례(가격 변화 없는 구간, 거래량 0인 날 등)가 필요하면 indicator_benchmark.make_synthetic을 사용합니다.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def make_history(days: int, seed: int = 0, volatility: float = 0.015) -> pd.DataFrame:
+    """
+    테스트용 일봉 데이터 생성 (2025-06-30에 끝나는 영업일 랜덤 워크, 같은 시드면 같은 데이터)
+
+    Args:
+        days (int): 봉 수
+        seed (int): 난수 시드
+        volatility (float): 일간 변동성
+    """
+    rng = np.random.default_rng(seed)
+    index = pd.bdate_range(end='2025-06-30', periods=days, name='Date')
+    close = 100 * np.exp(np.cumsum(rng.normal(0, volatility, days)))
+    return pd.DataFrame({
+        'Open': close * (1 + rng.normal(0, 0.004, days)),
+        'High': close * (1 + rng.uniform(0, 0.02, days)),
+        'Low': close * (1 - rng.uniform(0, 0.02, days)),
+        'Close': close,
+        'Volume': rng.integers(1_000_000, 5_000_000, days).astype(float)
+    }, index=index)
@@ -0,0 +1,117 @@
+import io
+import json
+import os
+import unittest
+from contextlib import redirect_stdout
+
+import numpy as np
+
+from indicator_benchmark import (INDICATORS, GOLDEN_PATH, BASELINE_PATH, DEFAULT_TOLERANCE,
+                                 indicator_fetcher, make_synthetic, load_fixtures, summarize_series, run_benchmark, find_regressions)
+
+# 정답값 비교 허용 오차 (계산 순서가 바뀌어 생기는 부동소수점 오차만 허용)
+RTOL = 1e-8
+ATOL = 1e-10
+
+class TestIndicatorGoldenValues(unittest.TestCase):
+    """
+    저장된 일봉 픽스처로 계산한 지표 값이 기록된 정답값(fixtures/indicator_golden.json)과 같은지 확인
+
+    계산 방식을 의도적으로 바꾼 경우 `python indicator_benchmark.py record`로 정답값을 다시 기록합니다.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.fixtures = load_fixtures()
+        with open(GOLDEN_PATH, encoding='utf-8') as f:
+            cls.golden = json.load(f)
+        cls.fetcher = indicator_fetcher()
+
+    def assert_series_matches(self, actual, expected, label):
+        self.assertEqual(actual['nan'], expected['nan'], f'{label} NaN 개수')
+        np.testing.assert_allclose(actual['sum'], expected['sum'], rtol=RTOL, atol=ATOL, err_msg=f'{label} 합계')
+        for (position, value), (_, expected_value) in zip(actual['samples'], expected['samples']):
+            if expected_value is None:
+                self.assertIsNone(value, f'{label}[{position}]')
+            else:
+                self.assertIsNotNone(value, f'{label}[{position}]')
+                np.testing.assert_allclose(value, expected_value, rtol=RTOL, atol=ATOL, err_msg=f'{label}[{position}]')
+
+    def test_fixtures_cover_history_lengths(self):
+        """
+        60봉부터 20년(약 5000봉)까지의 픽스처가 모두 정답값을 가지고 있는지 확인
+        """
+        lengths = [len(data) for data in self.fixtures.values()]
+        self.assertLessEqual(min(lengths), 60)
+        self.assertGreaterEqual(max(lengths), 5000)
+        self.assertEqual(sorted(self.fixtures), sorted(self.golden))
+
+    def test_indicator_values(self):
+        """
+        지표별 출력 시계열의 NaN 개수, 합계, 표본 위치 값 비교
+        """
+        for name, data in self.fixtures.items():
+            for indicator, calculate in INDICATORS.items():
+                for output, series in calculate(self.fetcher, data).items():
+                    self.assertEqual(len(series), len(data))
+                    self.assert_series_matches(summarize_series(series), self.golden[name][indicator][output],
+                                               f'{name}/{indicator}/{output}')
+
+    def test_generate_signals(self):
+        """
+        generate_signals의 신호, 점수, 원시값 비교
+        """
+        for name, data in self.fixtures.items():
+            with redirect_stdout(io.StringIO()):
+                result = self.fetcher.generate_signals(data)
+            expected = self.golden[name]['generate_signals']
+            self.assertEqual(result['signals'], expected['signals'], name)
+            self.assertEqual(result['scores'], expected['scores'], name)
+            self.assertEqual(sorted(result['values']), sorted(expected['values']), name)
+            for key, value in expected['values'].items():
+                np.testing.assert_allclose(result['values'][key], value, rtol=RTOL, atol=ATOL, err_msg=f'{name}/{key}')
+
+    def test_non_finite_values_become_none(self):
+        """
+        거래량 0인 마지막 봉(VWAP)과 가격 변화 없는 마지막 30봉(RSI)의 원시값이 NaN 대신 None이고 JSON으로 직렬화되는지 확인
+        """
+        zero_volume = make_synthetic(250, 1)
+        zero_volume.iloc[-1, zero_volume.columns.get_loc('Volume')] = 0
+        flat = make_synthetic(250, 1)
+        for column in ('Open', 'High', 'Low', 'Close'):
+            flat.iloc[-40:, flat.columns.get_loc(column)] = 100.0
+
+        for data, key in ((zero_volume, 'VWAP'), (flat, 'RSI')):
+            with redirect_stdout(io.StringIO()):
+                result = self.fetcher.generate_signals(data)
+            self.assertIn(key, result['values'])
+            self.assertIsNone(result['values'][key])
+            json.dumps(result['values'], allow_nan=False)
+
+@unittest.skipIf(os.environ.get('SKIP_BENCHMARKS'), 'SKIP_BENCHMARKS가 설정되어 있습니다.')
+class TestIndicatorBenchmark(unittest.TestCase):
+    """
+    지표 계산과 generate_signals 실행 시간이 기준값(fixtures/indicator_baseline.json) 대비 허용 배수 안에 있는지 확인
+    """
+
+    def test_no_performance_regression(self):
+        """
+        기준 작업 대비 실행 시간 배수가 기준값의 INDICATOR_BENCHMARK_TOLERANCE배를 넘지 않는지 확인
+        """
+        with open(BASELINE_PATH, encoding='utf-8') as f:
+            baseline = json.load(f)
+        tolerance = float(os.environ.get('INDICATOR_BENCHMARK_TOLERANCE', DEFAULT_TOLERANCE))
+        regressions = find_regressions(run_benchmark(load_fixtures()), baseline, tolerance)
+        self.assertEqual(regressions, [])
+
+    def test_find_regressions(self):
+        """
+        기준값보다 허용 배수 이상 느린 항목만 보고되는지 확인
+        """
+        results = {'A': {'rsi': {'seconds': 0.001, 'relative': 3.0}, 'adx': {'seconds': 0.001, 'relative': 9.0}}}
+        regressions = find_regressions(results, {'A': {'rsi': 2.0, 'adx': 2.0}}, tolerance=2.5)
+        self.assertEqual(len(regressions), 1)
+        self.assertTrue(regressions[0].startswith('A/adx'))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,157 @@
+import io
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from contextlib import redirect_stdout
+
+from jobs import JobManager, QUEUED, RUNNING, DONE, FAILED, CANCELLED
+
+def wait_for(manager, job_id, statuses, timeout=5.0):
+    """
+    작업이 지정한 상태가 될 때까지 대기
+    """
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = manager.get(job_id)
+        if job['status'] in statuses:
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f'{job_id} 작업이 {statuses} 상태가 되지 않았습니다: {manager.get(job_id)}')
+
+class TestJobManager(unittest.TestCase):
+    """
+    JobManager 클래스의 단위 테스트
+    """
+
+    def setUp(self):
+        """
+        테스트 설정 (작업 하나씩 실행하는 관리자와 작업 종류)
+        """
+        self.directory = tempfile.mkdtemp()
+        self.release = threading.Event()
+        self.output = io.StringIO()
+        self.stdout = redirect_stdout(self.output)
+        self.stdout.__enter__()
+        self.manager = self.make_manager()
+
+    def tearDown(self):
+        self.release.set()
+        self.manager.shutdown()
+        self.stdout.__exit__(None, None, None)
+        shutil.rmtree(self.directory)
+
+    def make_manager(self, **kwargs):
+        manager = JobManager(self.directory, max_workers=1, **kwargs)
+
+        def count(context, params):
+            context.set_total(len(params['symbols']))
+            for _ in params['symbols']:
+                context.advance()
+            return {'symbols': params['symbols']}
+
+        def blocking(context, params):
+            context.set_total(10)
+            while True:
+                self.release.wait(0.01)
+                context.advance()
+
+        def failing(context, params):
+            raise ValueError('데이터 없음')
+
+        def streamed(context, params):
+            output = context.open_result()
+            output.write(b'{"symbols": [')
+            for i, symbol in enumerate(params['symbols']):
+                if symbol == 'FAIL':
+                    raise ValueError('기록 중 실패')
+                output.write((', ' if i else '').encode('utf-8') + json.dumps(symbol).encode('utf-8'))
+            output.write(b']}')
+
+        def validate(params):
+            if not params.get('symbols'):
+                raise ValueError('symbols가 필요합니다.')
+            return {'symbols': [s.upper() for s in params['symbols']]}
+
+        manager.register('count', count, validate)
+        manager.register('blocking', blocking)
+        manager.register('failing', failing)
+        manager.register('streamed', streamed)
+        return manager
+
+    def test_result_and_progress(self):
+        """
+        작업 결과가 디스크에 저장되고 진행 상황이 total/done으로 보고되는지 확인
+        """
+        job = self.manager.submit('count', {'symbols': ['aapl', 'msft']})
+        self.assertIn(job['status'], (QUEUED, RUNNING, DONE))
+        job = wait_for(self.manager, job['id'], (DONE,))
+        self.assertEqual(job['progress'], {'done': 2, 'total': 2})
+        self.assertEqual(json.loads(self.manager.read_result(job['id'])), {'symbols': ['AAPL', 'MSFT']})
+
+        # 메모리 상태가 없는 새 관리자(서버 재시작)에서도 조회 가능
+        reloaded = JobManager(self.directory)
+        self.assertEqual(reloaded.get(job['id'])['status'], DONE)
+        self.assertIsNotNone(reloaded.read_result(job['id']))
+
+    def test_validation_and_failure(self):
+        """
+        잘못된 종류/파라미터는 제출 시 ValueError, 작업 함수 예외는 failed 상태로 기록되는지 확인
+        """
+        with self.assertRaises(ValueError):
+            self.manager.submit('unknown', {})
+        with self.assertRaises(ValueError):
+            self.manager.submit('count', {})
+        job = wait_for(self.manager, self.manager.submit('failing', {})['id'], (FAILED,))
+        self.assertEqual(job['error'], '데이터 없음')
+        self.assertIsNone(self.manager.read_result(job['id']))
+        self.assertIsNone(self.manager.get('../../etc/passwd'))
+
+    def test_streamed_result(self):
+        """
+        작업 함수가 나눠서 기록한 결과가 결과 파일이 되고, 실패하면 기록 중이던 파일이 남지 않는지 확인
+        """
+        job = wait_for(self.manager, self.manager.submit('streamed', {'symbols': ['A', 'B']})['id'], (DONE,))
+        self.assertEqual(json.loads(self.manager.read_result(job['id'])), {'symbols': ['A', 'B']})
+
+        job = wait_for(self.manager, self.manager.submit('streamed', {'symbols': ['A', 'FAIL']})['id'], (FAILED,))
+        self.assertIsNone(self.manager.read_result(job['id']))
+        self.assertEqual([name for name in os.listdir(self.directory) if name.endswith('.tmp')], [])
+
+    def test_cancel(self):
+        """
+        실행 중인 작업은 다음 진행 보고 시점에, 대기 중인 작업은 바로 취소되는지 확인
+        """
+        running = self.manager.submit('blocking', {})
+        wait_for(self.manager, running['id'], (RUNNING,))
+        queued = self.manager.submit('count', {'symbols': ['A']})
+
+        self.assertEqual(self.manager.cancel(queued['id'])['status'], CANCELLED)
+        self.assertTrue(self.manager.cancel(running['id'])['cancel_requested'])
+        job = wait_for(self.manager, running['id'], (CANCELLED,))
+        self.assertGreater(job['progress']['done'], 0)
+        self.assertIsNone(self.manager.cancel('0' * 32))
+
+    def test_cleanup_and_recovery(self):
+        """
+        TTL이 지난 작업은 삭제되고, 재시작 전에 끝나지 않은 작업은 실패로 기록되는지 확인
+        """
+        manager = self.make_manager(ttl=0)
+        done = wait_for(manager, manager.submit('count', {'symbols': ['A']})['id'], (DONE,))
+        running = manager.submit('blocking', {})
+        wait_for(manager, running['id'], (RUNNING,))
+
+        self.assertEqual(manager.cleanup(), 1)
+        self.assertIsNone(manager.get(done['id']))
+        self.assertFalse(os.path.exists(os.path.join(self.directory, f"{done['id']}.result.json")))
+
+        recovered = JobManager(self.directory)
+        self.assertEqual(recovered.get(running['id'])['status'], FAILED)
+        manager.cancel(running['id'])
+        manager.shutdown()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+import json
+import time
+import unittest
+
+from live_updates import LiveUpdateHub
+
+def make_result(symbol: str, latest_date: str, rsi: str, total_score: int) -> dict:
+    """
+    테스트용 분석 결과 생성 (build_analysis 결과 형식)
+    """
+    return {
+        'symbol': symbol,
+        'stock_info': {'latest_date': latest_date, 'latest_price': 100.0},
+        'signals': {'RSI': rsi, 'MACD': 'NEUTRAL'},
+        'scores': {'RSI': 0, 'MACD': 0},
+        'recommendation': 'HOLD',
+        'total_score': total_score
+    }
+
+def drain(subscription) -> list:
+    events = []
+    while not subscription.queue.empty():
+        events.append(subscription.queue.get())
+    return events
+
+class TestLiveUpdateHub(unittest.TestCase):
+    """
+    LiveUpdateHub 클래스의 단위 테스트
+    """
+
+    def setUp(self):
+        """
+        테스트 설정 (주기적 갱신은 테스트 중에 실행되지 않도록 긴 주기 사용)
+        """
+        self.refreshed = []
+        self.hub = LiveUpdateHub(self.refreshed.append, refresh_interval=3600)
+
+    def test_one_result_fans_out_as_diff(self):
+        """
+        결과 하나가 모든 구독자에게 바뀐 필드만 전달되는지 확인
+        """
+        first = self.hub.subscribe(['AAPL'])
+        second = self.hub.subscribe(['AAPL', 'MSFT'])
+
+        self.hub.publish(make_result('AAPL', '2025-06-26', 'NEUTRAL', 1))
+        self.hub.publish(make_result('AAPL', '2025-06-27', 'STRONG_OVERSOLD', 3))
+        self.hub.publish(make_result('AAPL', '2025-06-27', 'STRONG_OVERSOLD', 3))
+
+        for subscription in (first, second):
+            events = drain(subscription)
+            self.assertEqual([e[0] for e in events], ['snapshot', 'update'])
+            self.assertEqual(events[1][1]['changes'], {
+                'signals': {'RSI': 'STRONG_OVERSOLD'},
+                'total_score': 3,
+                'latest_date': '2025-06-27'
+            })
+
+        third = self.hub.subscribe(['AAPL'])
+        self.assertEqual(drain(third)[0][1]['signals']['RSI'], 'STRONG_OVERSOLD')
+        # 상태가 없는 종목은 첫 구독 때 한 번만 바로 분석을 요청 (백그라운드 스레드)
+        deadline = time.time() + 2
+        while len(self.refreshed) < 2 and time.time() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(sorted(self.refreshed), ['AAPL', 'MSFT'])
+
+    def test_stream_format_and_unsubscribe(self):
+        """
+        SSE 형식으로 이벤트를 내보내고, 스트림이 닫히면 구독이 해제되는지 확인
+        """
+        subscription = self.hub.subscribe(['AAPL'])
+        stream = self.hub.stream(subscription)
+        next(stream)
+
+        self.hub.publish_summary('AAPL', 'abc', '요약')
+        chunk = next(stream)
+        self.assertTrue(chunk.startswith('event: summary\ndata: '))
+        self.assertEqual(json.loads(chunk.split('data: ', 1)[1])['expert_summary'], '요약')
+
+        stream.close()
+        self.assertEqual(self.hub.subscribed_symbols(), [])
+
+    def test_changed(self):
+        """
+        최신 봉 날짜, 총점, 신호 중 하나가 바뀐 경우에만 changed가 True인지 확인 (가격만 바뀌면 False)
+        """
+        result = make_result('AAPL', '2025-06-27', 'NEUTRAL', 1)
+        self.assertTrue(self.hub.changed(result))
+        self.hub.publish(result)
+
+        same = make_result('AAPL', '2025-06-27', 'NEUTRAL', 1)
+        same['stock_info']['latest_price'] = 101.0
+        self.assertFalse(self.hub.changed(same))
+        self.assertTrue(self.hub.changed(make_result('AAPL', '2025-06-30', 'NEUTRAL', 1)))
+        self.assertTrue(self.hub.changed(make_result('AAPL', '2025-06-27', 'NEUTRAL', 2)))
+        self.assertTrue(self.hub.changed(make_result('AAPL', '2025-06-27', 'STRONG_OVERSOLD', 1)))
+
+if __name__ == '__main__':
+    unittest.main()
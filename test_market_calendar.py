@@ -0,0 +1,51 @@
+import unittest
+from datetime import date, datetime
+from zoneinfo import ZoneInfo
+
+from market_calendar import next_market_close, seconds_until_next_close, last_completed_session
+
+UTC = ZoneInfo("UTC")
+
+class TestMarketCalendar(unittest.TestCase):
+    """
+    장 마감 시각 / 캐시 만료 / 확정 거래일 계산의 단위 테스트 (2025-06-27은 금요일)
+    """
+
+    def test_next_close_same_day(self):
+        """
+        마감 전이면 당일 16:15 ET (서머타임 20:15 UTC, 표준시 21:15 UTC)를 돌려주는지 확인
+        """
+        self.assertEqual(next_market_close(datetime(2025, 6, 27, 14, 0, tzinfo=UTC)),
+                         datetime(2025, 6, 27, 20, 15, tzinfo=UTC))
+        self.assertEqual(next_market_close(datetime(2025, 1, 6, 14, 0, tzinfo=UTC)),
+                         datetime(2025, 1, 6, 21, 15, tzinfo=UTC))
+        # timezone 없는 값은 UTC로 간주
+        self.assertEqual(next_market_close(datetime(2025, 6, 27, 14, 0)), datetime(2025, 6, 27, 20, 15, tzinfo=UTC))
+
+    def test_next_close_skips_weekend(self):
+        """
+        금요일 마감 후와 주말에는 월요일 마감을 돌려주는지 확인
+        """
+        monday_close = datetime(2025, 6, 30, 20, 15, tzinfo=UTC)
+        self.assertEqual(next_market_close(datetime(2025, 6, 27, 20, 15, tzinfo=UTC)), monday_close)
+        self.assertEqual(next_market_close(datetime(2025, 6, 28, 12, 0, tzinfo=UTC)), monday_close)
+        self.assertEqual(next_market_close(datetime(2025, 6, 29, 23, 0, tzinfo=UTC)), monday_close)
+
+    def test_seconds_until_next_close(self):
+        """
+        Cache-Control max-age로 쓰는 남은 시간(초) 확인
+        """
+        self.assertEqual(seconds_until_next_close(datetime(2025, 6, 27, 20, 0, tzinfo=UTC)), 15 * 60)
+        self.assertEqual(seconds_until_next_close(datetime(2025, 6, 27, 20, 15, tzinfo=UTC)), 3 * 86400)
+
+    def test_last_completed_session(self):
+        """
+        데이터 반영 시각 전에는 전 거래일, 주말에는 금요일을 돌려주는지 확인
+        """
+        self.assertEqual(last_completed_session(datetime(2025, 6, 27, 20, 14, tzinfo=UTC)), date(2025, 6, 26))
+        self.assertEqual(last_completed_session(datetime(2025, 6, 27, 20, 15, tzinfo=UTC)), date(2025, 6, 27))
+        self.assertEqual(last_completed_session(datetime(2025, 6, 29, 12, 0, tzinfo=UTC)), date(2025, 6, 27))
+        self.assertEqual(last_completed_session(datetime(2025, 6, 30, 10, 0, tzinfo=UTC)), date(2025, 6, 27))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,141 @@
+import io
+import os
+import shutil
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+os.environ.setdefault('FMP_API_KEY', 'test')
+
+from memory_governor import MemoryGovernor, estimate_size, ENTRY_OVERHEAD
+from cache_backend import MemoryBackend
+from bar_store import BarStore
+from test_helpers import make_history
+
+class TestMemoryGovernor(unittest.TestCase):
+    """
+    MemoryGovernor 클래스의 단위 테스트
+    """
+
+    def test_estimate_size(self):
+        """
+        DataFrame은 버퍼 크기, 컨테이너는 내용물 크기를 합산하는지 확인
+        """
+        small, large = make_history(10), make_history(1000)
+        self.assertGreater(estimate_size(large), 50 * estimate_size(small) // 2)
+        self.assertGreaterEqual(estimate_size(large), large['Close'].nbytes * 5)
+        self.assertGreater(estimate_size((None, b'x' * 10000)), 10000)
+        self.assertGreater(estimate_size({'a': 'x' * 5000}), 5000)
+
+    def test_accounting(self):
+        """
+        저장/덮어쓰기/삭제 시 캐시별 바이트와 항목 수가 맞게 기록되는지 확인
+        """
+        governor = MemoryGovernor(10 * 1024 * 1024)
+        cache = governor.cache('bars', 1.0)
+        self.assertIs(governor.cache('bars', 1.0), cache)
+
+        cache.set('A', b'x' * 1000)
+        cache.set('B', b'x' * 2000)
+        cache.set('A', b'x' * 3000)
+        stats = governor.stats()
+        self.assertEqual(stats['caches']['bars']['entries'], 2)
+        self.assertEqual(stats['used_bytes'], estimate_size(b'x' * 2000) + estimate_size(b'x' * 3000) + 2 * ENTRY_OVERHEAD)
+
+        cache.delete('A')
+        cache.delete('A')
+        self.assertEqual(governor.stats()['caches']['bars']['entries'], 1)
+        self.assertEqual(governor.used_bytes, estimate_size(b'x' * 2000) + ENTRY_OVERHEAD)
+
+    def test_evicts_cheapest_across_caches(self):
+        """
+        예산을 넘으면 다른 캐시의 항목이라도 재생성 비용/크기가 낮은 항목부터 제거되는지 확인
+        """
+        governor = MemoryGovernor(100 * 1024)
+        bars = governor.cache('bars', 1.0)
+        summaries = governor.cache('summary', 50.0)
+
+        for i in range(5):
+            summaries.set(f'S{i}', b's' * 2000)
+        for i in range(10):
+            bars.set(f'B{i}', b'b' * 20000)
+
+        self.assertLessEqual(governor.used_bytes, governor.budget_bytes)
+        self.assertTrue(all(summaries.get(f'S{i}') is not None for i in range(5)))
+        self.assertIsNotNone(bars.get('B9'))
+        self.assertIsNone(bars.get('B0'))
+        stats = governor.stats()['caches']
+        self.assertGreater(stats['bars']['evictions'], 0)
+        self.assertEqual(stats['summary']['evictions'], 0)
+        self.assertEqual(stats['bars']['entries'], len(bars))
+
+    def test_recently_used_survives(self):
+        """
+        같은 비용/크기면 최근 조회한 항목이 남는지 확인
+        """
+        governor = MemoryGovernor(50 * 1024)
+        cache = governor.cache('analysis', 5.0)
+        for i in range(4):
+            cache.set(f'K{i}', b'x' * 10000)
+        cache.get('K0')
+        cache.set('K4', b'x' * 10000)
+        cache.set('K5', b'x' * 10000)
+        self.assertIsNotNone(cache.get('K0'))
+        self.assertIsNone(cache.get('K1'))
+
+    def test_max_entries(self):
+        """
+        항목 수 상한으로 밀려난 항목도 사용량에서 빠지는지 확인
+        """
+        governor = MemoryGovernor(10 * 1024 * 1024)
+        cache = governor.cache('profiles', 0.5, max_entries=2)
+        for key in ('A', 'B', 'C'):
+            cache.set(key, b'x' * 100)
+        self.assertIsNone(cache.get('A'))
+        self.assertEqual(governor.stats()['caches']['profiles']['entries'], 2)
+
+class TestGovernedCaches(unittest.TestCase):
+    """
+    BarStore/MemoryBackend가 메모리 관리자에 캐시를 등록하는지 확인
+    """
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_bar_store_reloads_evicted_symbols(self):
+        """
+        메모리에서 밀려난 종목은 디스크에서 다시 읽히는지 확인
+        """
+        data = make_history(500)
+        governor = MemoryGovernor(estimate_size(data) * 3)
+        store = BarStore(self.directory, memory_entries=None, governor=governor)
+        with redirect_stdout(io.StringIO()):
+            for i in range(6):
+                store.save(f'SYM{i}', data)
+            start, end = data.index[0].date(), data.index[-1].date()
+            self.assertEqual(len(store.get_range('SYM0', start, end)), len(data))
+
+        stats = governor.stats()
+        self.assertLessEqual(stats['used_bytes'], governor.budget_bytes)
+        self.assertGreater(stats['caches']['bars']['evictions'], 0)
+
+    def test_memory_backend_prefix_caches(self):
+        """
+        MemoryBackend가 키 접두사별로 다른 비용의 캐시를 쓰는지 확인
+        """
+        governor = MemoryGovernor(10 * 1024 * 1024)
+        backend = MemoryBackend(None, governor)
+        backend.set_json('analysis:abc', {'symbol': 'AAPL'}, ttl=60)
+        backend.set_json('summary:def', {'summary': '요약'})
+        self.assertEqual(backend.get_json('analysis:abc'), {'symbol': 'AAPL'})
+        caches = governor.stats()['caches']
+        self.assertEqual(caches['analysis']['entries'], 1)
+        self.assertGreater(caches['summary']['cost'], caches['analysis']['cost'])
+        backend.delete('summary:def')
+        self.assertEqual(governor.stats()['caches']['summary']['entries'], 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+import io
+import os
+import unittest
+from contextlib import redirect_stdout
+
+os.environ.setdefault('FMP_API_KEY', 'test')
+
+from stock_data_fetcher import StockDataFetcher
+from multi_timeframe import resample_bars, analyze_timeframes, parse_timeframes
+from test_helpers import make_history
+
+class TestMultiTimeframe(unittest.TestCase):
+    """
+    multi_timeframe 모듈의 단위 테스트
+    """
+
+    def setUp(self):
+        """
+        테스트 설정 (약 3년치 일봉)
+        """
+        self.fetcher = StockDataFetcher()
+        self.data = make_history(780, seed=5)
+
+    def test_resample_weekly(self):
+        """
+        주봉이 주 단위 시가/고가/저가/종가/거래량으로 만들어지고 인덱스가 실제 마지막 거래일인지 확인
+        """
+        weekly = resample_bars(self.data, 'weekly')
+        first_week = self.data.loc[:weekly.index[0]]
+        self.assertEqual(weekly['Open'].iloc[0], first_week['Open'].iloc[0])
+        self.assertEqual(weekly['High'].iloc[0], first_week['High'].max())
+        self.assertEqual(weekly['Close'].iloc[0], first_week['Close'].iloc[-1])
+        self.assertEqual(weekly['Volume'].iloc[0], first_week['Volume'].sum())
+        self.assertEqual(weekly.index[-1], self.data.index[-1])
+        self.assertTrue(weekly.index.isin(self.data.index).all())
+
+    def test_analyze_timeframes(self):
+        """
+        일봉 결과는 generate_signals와 같고, 봉이 부족한 월봉 지표는 INSUFFICIENT_DATA로 표시되는지 확인
+        """
+        result = analyze_timeframes(self.fetcher, self.data, parse_timeframes('monthly,weekly'))
+        self.assertEqual(list(result['timeframes']), ['daily', 'weekly', 'monthly'])
+
+        with redirect_stdout(io.StringIO()):
+            expected = self.fetcher.generate_signals(self.data)
+        self.assertEqual(result['timeframes']['daily']['signals'], expected['signals'])
+
+        monthly = result['timeframes']['monthly']
+        self.assertEqual(monthly['bars'], 36)
+        self.assertTrue(monthly['insufficient']['MACD'])
+        self.assertFalse(monthly['insufficient']['RSI'])
+        self.assertTrue(monthly['insufficient_data'])
+        self.assertFalse(result['timeframes']['weekly']['insufficient_data'])
+        self.assertEqual(result['confluence']['timeframes'], ['daily', 'weekly'])
+        biases = [result['timeframes'][t]['bias'] for t in ('daily', 'weekly')]
+        self.assertEqual(result['confluence']['score'], sum(biases))
+        self.assertIn('ratio', result['timeframes']['weekly']['agreement'])
+        self.assertIn(result['confluence']['direction'], ('BULLISH', 'BEARISH', 'NEUTRAL', 'MIXED'))
+
+        with self.assertRaises(ValueError):
+            parse_timeframes('hourly')
+
+    def test_short_history_confluence(self):
+        """
+        1년 일봉이면 주봉(MA 60주 부족)과 월봉이 일치도 평가에서 빠지고 일봉만 반영되는지 확인
+        """
+        result = analyze_timeframes(self.fetcher, self.data.iloc[-252:], parse_timeframes('weekly,monthly'))
+        timeframes = result['timeframes']
+        self.assertTrue(timeframes['weekly']['insufficient']['MA_CROSSOVER'])
+        self.assertTrue(timeframes['weekly']['insufficient_data'])
+        self.assertTrue(timeframes['monthly']['insufficient_data'])
+        self.assertFalse(timeframes['daily']['insufficient_data'])
+
+        confluence = result['confluence']
+        self.assertEqual(confluence['timeframes'], ['daily'])
+        self.assertEqual(confluence['score'], timeframes['daily']['bias'])
+        self.assertEqual(confluence['aligned'], timeframes['daily']['bias'] != 0)
+
+        # 모든 시간 프레임이 부족하면 방향 없음
+        result = analyze_timeframes(self.fetcher, self.data.iloc[-30:], parse_timeframes('weekly'))
+        self.assertEqual(result['confluence'], {'timeframes': [], 'score': 0, 'aligned': False, 'direction': 'MIXED'})
+
+if __name__ == '__main__':
+    unittest.main()
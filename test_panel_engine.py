@@ -0,0 +1,60 @@
+import os
+import unittest
+
+os.environ.setdefault('FMP_API_KEY', 'test')
+
+from stock_data_fetcher import StockDataFetcher
+from vectorized_signals import compute_signal_history, INDICATORS
+from panel_engine import PanelEngine
+from test_helpers import make_history
+
+class TestPanelEngine(unittest.TestCase):
+    """
+    PanelEngine 클래스의 단위 테스트
+    """
+
+    def setUp(self):
+        """
+        테스트 설정 (상장 기간이 짧은 종목 하나 포함)
+        """
+        self.histories = {f'S{i}': make_history(200, seed=i) for i in range(6)}
+        self.histories['NEW'] = make_history(55, seed=99)
+        self.sectors = {'S0': 'A', 'S1': 'A', 'S2': 'A', 'S3': 'B', 'S4': 'B', 'S5': 'B'}
+        self.engine = PanelEngine(self.histories, sectors=self.sectors)
+
+    def test_matches_per_symbol_signals(self):
+        """
+        행렬 계산 결과가 종목별 계산(generate_signals와 동일한 규칙)과 같은지 확인
+        """
+        fetcher = StockDataFetcher()
+        snapshot = self.engine.snapshot()
+        for symbol, data in self.histories.items():
+            expected = compute_signal_history(fetcher, data).iloc[-1]
+            result = snapshot['symbols'][symbol]
+            self.assertEqual(result['total_score'], expected['total_score'], symbol)
+            for key in INDICATORS:
+                self.assertEqual(result['signals'][key], expected[f'{key}_signal'], f'{symbol} {key}')
+
+    def test_cross_section_and_breadth(self):
+        """
+        횡단면 백분위, 섹터 대비 모멘텀, 시장 폭 지표 범위 확인
+        """
+        snapshot = self.engine.snapshot(as_of='2025-06-01', history_days=5)
+        self.assertEqual(snapshot['date'], '2025-05-30')
+        self.assertEqual(len(snapshot['breadth_history']), 5)
+        # NEW는 기준일에 봉이 50개 미만이라 제외
+        self.assertEqual(snapshot['insufficient_symbols'], ['NEW'])
+
+        percentiles = [r['momentum_percentile'] for r in snapshot['symbols'].values()]
+        self.assertEqual(max(percentiles), 1.0)
+        self.assertTrue(all(0 < p <= 1 for p in percentiles))
+        sector_a = [snapshot['symbols'][s]['sector_relative_momentum'] for s in ('S0', 'S1', 'S2')]
+        self.assertAlmostEqual(sorted(sector_a)[1], 0.0, places=4)
+
+        breadth = snapshot['breadth']
+        self.assertEqual(breadth['symbols'], 6)
+        for key in ('pct_above_ma60', 'pct_rsi_above_50', 'pct_bullish', 'advancers_ratio'):
+            self.assertTrue(0 <= breadth[key] <= 1, key)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import os
+import unittest
+
+os.environ.setdefault('FMP_API_KEY', 'test')
+
+from vectorized_signals import INDICATORS
+from portfolio import normalize_weights, analyze_portfolio
+from test_helpers import make_history
+
+class TestPortfolio(unittest.TestCase):
+    """
+    portfolio 모듈의 단위 테스트
+    """
+
+    def setUp(self):
+        """
+        테스트 설정 (데이터가 부족한 종목 하나 포함)
+        """
+        self.histories = {f'S{i}': make_history(300, seed=i) for i in range(4)}
+        self.histories['TINY'] = make_history(20, seed=42)
+
+    def test_normalize_weights(self):
+        """
+        비중 정규화, 같은 종목 합산, 잘못된 입력 처리 확인
+        """
+        weights = normalize_weights([
+            {'symbol': 'aapl', 'weight': 2},
+            {'symbol': 'MSFT', 'weight': 1},
+            {'symbol': 'AAPL', 'weight': 1}
+        ])
+        self.assertAlmostEqual(weights['AAPL'], 0.75)
+        self.assertAlmostEqual(sum(weights.values()), 1.0)
+        self.assertEqual(normalize_weights([{'symbol': 'A'}, {'symbol': 'B'}]), {'A': 0.5, 'B': 0.5})
+
+        for holdings in ([], [{'symbol': 'A', 'weight': -1}], [{'symbol': 'A', 'weight': 'x'}], [{'weight': 1}],
+                         {'symbol': 'A'}, 'AAPL', ['AAPL'], [None], [{'symbol': 1}], [{'symbol': ' '}]):
+            with self.assertRaises(ValueError):
+                normalize_weights(holdings)
+
+    def test_analyze_portfolio(self):
+        """
+        가중 점수가 종목별 점수의 비중 합과 같고, 부족한 종목은 제외 후 비중이 재조정되는지 확인
+        """
+        weights = normalize_weights([{'symbol': s, 'weight': w} for s, w in
+                                     zip(self.histories, (0.4, 0.3, 0.2, 0.05, 0.05))])
+        result = analyze_portfolio(self.histories, weights)
+
+        self.assertEqual(result['excluded'], ['TINY'])
+        holdings = result['holdings']
+        self.assertAlmostEqual(sum(h['weight'] for h in holdings.values()), 1.0, places=3)
+
+        expected = sum(h['weight'] * h['total_score'] for h in holdings.values())
+        self.assertAlmostEqual(result['aggregate']['weighted_total_score'], expected, places=3)
+        self.assertEqual(tuple(result['aggregate']['weighted_scores']), tuple(INDICATORS))
+
+        correlation = result['correlation']
+        self.assertEqual(correlation['symbols'], ['S0', 'S1', 'S2', 'S3'])
+        for i in range(4):
+            self.assertAlmostEqual(correlation['matrix'][i][i], 1.0, places=4)
+        self.assertGreater(result['volatility']['annualized_volatility'], 0)
+
+        with self.assertRaises(ValueError):
+            analyze_portfolio(self.histories, {'TINY': 1.0})
+
+if __name__ == '__main__':
+    unittest.main()
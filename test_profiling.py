@@ -0,0 +1,114 @@
+import io
+import marshal
+import threading
+import time
+import unittest
+from contextlib import redirect_stdout
+
+from flask import Flask, jsonify
+
+from profiling import Profiler, init_profiling, profile_response, collapse_stacks
+
+def busy_indicator_work(seconds: float):
+    """
+    프로파일에 잡힐 만큼 CPU를 사용하는 테스트용 함수
+    """
+    deadline = time.perf_counter() + seconds
+    total = 0
+    while time.perf_counter() < deadline:
+        total += sum(range(200))
+    return total
+
+def make_app(profiler):
+    app = Flask(__name__)
+    init_profiling(app, profiler)
+
+    @app.route('/analyze', methods=['POST'])
+    def analyze():
+        busy_indicator_work(0.1)
+        return jsonify({'ok': True})
+
+    @app.route('/other')
+    def other():
+        return jsonify({'ok': True})
+
+    return app
+
+class TestProfiling(unittest.TestCase):
+    """
+    profiling 모듈의 단위 테스트
+    """
+
+    def setUp(self):
+        """
+        테스트 설정
+        """
+        self.profiler = Profiler('secret')
+        self.client = make_app(self.profiler).test_client()
+
+    def test_disabled_registers_nothing(self):
+        """
+        프로파일러가 없으면 요청 훅을 등록하지 않는지 확인
+        """
+        app = make_app(None)
+        self.assertEqual(dict(app.before_request_funcs), {})
+        self.assertEqual(dict(app.after_request_funcs), {})
+
+    def test_cprofile_request(self):
+        """
+        ?profile=cprofile 요청의 프로파일이 보관되고 텍스트/pstats로 조회되는지 확인
+        """
+        with redirect_stdout(io.StringIO()):
+            response = self.client.post('/analyze?profile=cprofile', headers={'X-Profile-Token': 'secret'})
+        self.assertEqual(response.get_json(), {'ok': True})
+        entry = self.profiler.get(response.headers['X-Profile-Id'])
+        self.assertEqual(entry['mode'], 'cprofile')
+        self.assertIn('busy_indicator_work', profile_response(entry).get_data(as_text=True))
+        stats = marshal.loads(profile_response(entry, 'pstats').get_data())
+        self.assertTrue(any(key[2] == 'busy_indicator_work' for key in stats))
+        self.assertIsNone(profile_response(entry, 'collapsed'))
+
+    def test_sample_request(self):
+        """
+        X-Profile: sample 요청의 샘플링 스택에 요청 처리 함수가 포함되는지 확인
+        """
+        with redirect_stdout(io.StringIO()):
+            response = self.client.post('/analyze', headers={'X-Profile': 'sample', 'X-Profile-Token': 'secret'})
+        entry = self.profiler.get(response.headers['X-Profile-Id'])
+        self.assertGreater(entry['samples'], 0)
+        self.assertIn('busy_indicator_work', entry['collapsed'])
+        for line in entry['collapsed'].splitlines():
+            stack, count = line.rsplit(' ', 1)
+            self.assertTrue(int(count) > 0 and stack)
+
+    def test_unauthorized_or_other_endpoint(self):
+        """
+        토큰이 틀리거나 지원하지 않는 엔드포인트면 프로파일 없이 처리되는지 확인
+        """
+        response = self.client.post('/analyze?profile=cprofile', headers={'X-Profile-Token': 'wrong'})
+        self.assertNotIn('X-Profile-Id', response.headers)
+        response = self.client.get('/other?profile=cprofile', headers={'X-Profile-Token': 'secret'})
+        self.assertNotIn('X-Profile-Id', response.headers)
+
+    def test_sample_process(self):
+        """
+        프로세스 전체 샘플링에 다른 스레드의 스택이 스레드 이름과 함께 기록되고, 동시에 두 번 실행되지 않는지 확인
+        """
+        worker = threading.Thread(target=busy_indicator_work, args=(0.5,), name='busy worker')
+        worker.start()
+        results = []
+        with redirect_stdout(io.StringIO()):
+            second = threading.Thread(target=lambda: results.append(self.profiler.sample_process(0.1)))
+            second.start()
+            counts = self.profiler.sample_process(0.2, interval=0.002)
+            second.join()
+        worker.join()
+
+        self.assertIn(None, results + [counts])
+        counts = counts or results[0]
+        collapsed = collapse_stacks(counts)
+        self.assertTrue(any(line.startswith('busy_worker;') and 'busy_indicator_work' in line
+                            for line in collapsed.splitlines()))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+import io
+import os
+import unittest
+from contextlib import redirect_stdout
+
+os.environ.setdefault('FMP_API_KEY', 'test')
+
+from stock_trading_analyzer import StockTradingAnalyzer, recommend
+from test_helpers import make_history
+
+class TestReplaySignals(unittest.TestCase):
+    """
+    StockTradingAnalyzer.replay_signals의 단위 테스트
+    """
+
+    def setUp(self):
+        """
+        테스트 설정
+        """
+        self.analyzer = StockTradingAnalyzer()
+        self.data = make_history(160, seed=11)
+
+    def test_replay_matches_point_in_time_analysis(self):
+        """
+        리플레이의 각 날짜 결과가 그 날짜까지의 데이터로 generate_signals를 호출한 결과와 같은지 확인
+        """
+        start = self.data.index[60].date()
+        end = self.data.index[-1].date()
+        rows = self.analyzer.replay_signals(self.data, start, end)
+
+        self.assertEqual(len(rows), len(self.data) - 60)
+        self.assertEqual(rows[0]['date'], start.isoformat())
+
+        for offset, row in enumerate(rows):
+            with redirect_stdout(io.StringIO()):
+                expected = self.analyzer.data_fetcher.generate_signals(self.data.iloc[:61 + offset])
+            self.assertEqual(row['signals'], expected['signals'], row['date'])
+            self.assertEqual(row['scores'], expected['scores'], row['date'])
+            self.assertEqual(row['recommendation'], recommend(sum(expected['scores'].values())))
+
+    def test_replay_skips_days_before_minimum_window(self):
+        """
+        신호를 만들 수 없는 초기 구간은 결과에서 제외되는지 확인
+        """
+        rows = self.analyzer.replay_signals(self.data)
+        self.assertEqual(rows[0]['date'], self.data.index[49].strftime('%Y-%m-%d'))
+
+if __name__ == '__main__':
+    unittest.main()
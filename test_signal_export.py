@@ -0,0 +1,117 @@
+import csv
+import io
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+from analysis_history import AnalysisHistory
+from signal_export import create_export_writer, stream_export, EXPORT_COLUMNS
+
+import pyarrow
+import pyarrow.ipc
+import pyarrow.parquet
+
+def make_result(symbol: str, latest_date: str, total_score: int) -> dict:
+    """
+    테스트용 분석 결과 생성 (build_analysis 결과 형식)
+    """
+    return {
+        'symbol': symbol,
+        'stock_info': {'latest_date': latest_date, 'latest_price': 100.0 + total_score},
+        'signals': {'RSI': 'NEUTRAL', 'ADX': 'STRONG_TREND'},
+        'scores': {'RSI': 0, 'ADX': 2},
+        'values': {'RSI': 50.5, 'ADX': 41.2},
+        'total_score': total_score,
+        'recommendation': 'HOLD'
+    }
+
+class TestSignalExport(unittest.TestCase):
+    """
+    signal_export 모듈의 단위 테스트
+    """
+
+    def setUp(self):
+        """
+        테스트 설정 (종목 3개 x 10일, 마지막 날짜는 두 번 분석)
+        """
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.history = AnalysisHistory(os.path.join(self.tmpdir.name, 'history.db'), flush_interval=0.01)
+        for day in range(1, 11):
+            for symbol in ('AAPL', 'MSFT', 'NVDA'):
+                self.history.record(make_result(symbol, f'2025-06-{day:02d}', day % 5), 'v1')
+        self.history.record(make_result('AAPL', '2025-06-10', 9), 'v2')
+        self.history.flush()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def export(self, output_format, **kwargs):
+        with redirect_stdout(io.StringIO()):
+            return list(stream_export(self.history, create_export_writer(output_format), chunk_rows=4, **kwargs))
+
+    def test_daily_results_in_chunks(self):
+        """
+        종목/날짜별 마지막 분석만 chunk_rows행씩 종목, 날짜 순으로 반환되는지 확인
+        """
+        chunks = list(self.history.iter_daily_results(start='2025-06-05', symbols=['aapl', 'nvda'], chunk_rows=4))
+        rows = [row for chunk in chunks for row in chunk]
+        self.assertEqual([len(chunk) for chunk in chunks], [4, 4, 4])
+        self.assertEqual([(r['symbol'], r['date']) for r in rows][:2], [('AAPL', '2025-06-05'), ('AAPL', '2025-06-06')])
+        self.assertEqual({r['symbol'] for r in rows}, {'AAPL', 'NVDA'})
+        self.assertEqual((rows[5]['total_score'], rows[5]['version']), (9, 'v2'))
+        self.assertEqual(rows[0]['raw_values'], {'RSI': 50.5, 'ADX': 41.2})
+
+    def test_csv(self):
+        """
+        CSV 내보내기가 묶음마다 바이트를 내보내고 모든 컬럼을 포함하는지 확인
+        """
+        parts = self.export('csv', end='2025-06-03')
+        self.assertGreater(len(parts), 2)
+        rows = list(csv.DictReader(io.StringIO(b''.join(parts).decode('utf-8'))))
+        self.assertEqual(len(rows), 9)
+        self.assertEqual(list(rows[0]), EXPORT_COLUMNS)
+        self.assertEqual((rows[0]['RSI_value'], rows[0]['ADX_signal'], rows[0]['ADX_score']), ('50.5', 'STRONG_TREND', '2'))
+        self.assertEqual(rows[0]['MACD_value'], '')
+
+    def test_invalid_format(self):
+        """
+        지원하지 않는 형식은 ValueError
+        """
+        with self.assertRaises(ValueError):
+            create_export_writer('xlsx')
+
+    def test_arrow_stream(self):
+        """
+        Arrow IPC 스트림이 묶음마다 record batch로 나뉘고 지표 원시값이 숫자 컬럼으로 읽히는지 확인
+        """
+        reader = pyarrow.ipc.open_stream(b''.join(self.export('arrow')))
+        batches = list(reader)
+        self.assertEqual(len(batches), 8)
+        table = pyarrow.Table.from_batches(batches)
+        self.assertEqual(table.num_rows, 30)
+        self.assertEqual(table.schema.field('ADX_value').type, pyarrow.float64())
+        self.assertEqual(table.column('ADX_value')[0].as_py(), 41.2)
+        self.assertIsNone(table.column('MACD_score')[0].as_py())
+
+    def test_parquet(self):
+        """
+        Parquet 파일이 묶음마다 row group으로 기록되고 완전한 파일로 읽히는지 확인
+        """
+        data = b''.join(self.export('parquet', symbols=['MSFT']))
+        parquet_file = pyarrow.parquet.ParquetFile(io.BytesIO(data))
+        self.assertEqual(parquet_file.num_row_groups, 3)
+        table = parquet_file.read()
+        self.assertEqual(table.column('symbol').to_pylist(), ['MSFT'] * 10)
+        self.assertEqual(table.column_names, EXPORT_COLUMNS)
+
+    def test_empty_export(self):
+        """
+        결과가 없어도 스키마만 있는 유효한 테이블이 나오는지 확인
+        """
+        table = pyarrow.ipc.open_stream(b''.join(self.export('arrow', start='2030-01-01'))).read_all()
+        self.assertEqual(table.num_rows, 0)
+        self.assertEqual(table.column_names, EXPORT_COLUMNS)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from symbol_directory import SymbolDirectory, SymbolIndex
+
+ENTRIES = [
+    {'symbol': 'AAPL', 'name': 'Apple Inc.', 'exchange': 'NASDAQ'},
+    {'symbol': 'AAP', 'name': 'Advance Auto Parts, Inc.', 'exchange': 'NYSE'},
+    {'symbol': 'AA', 'name': 'Alcoa Corporation', 'exchange': 'NYSE'},
+    {'symbol': 'AMD', 'name': 'Advanced Micro Devices, Inc.', 'exchange': 'NASDAQ'},
+    {'symbol': 'MSFT', 'name': 'Microsoft Corporation', 'exchange': 'NASDAQ'},
+    {'symbol': 'brk-b', 'name': 'Berkshire Hathaway Inc.', 'exchange': 'NYSE'}
+]
+
+class TestSymbolDirectory(unittest.TestCase):
+    """
+    SymbolIndex, SymbolDirectory 클래스의 단위 테스트
+    """
+
+    def setUp(self):
+        """
+        테스트 설정
+        """
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'symbols.json')
+        self.index = SymbolIndex(ENTRIES)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_search(self):
+        """
+        정확히 일치하는 종목 코드가 먼저 오고, 종목 코드 접두사 다음에 이름 단어 접두사가 오는지 확인
+        """
+        symbols = [entry['symbol'] for entry in self.index.search('aap')]
+        self.assertEqual(symbols, ['AAP', 'AAPL'])
+
+        symbols = [entry['symbol'] for entry in self.index.search('a', limit=3)]
+        self.assertEqual(symbols, ['AA', 'AAP', 'AAPL'])
+
+        # 종목 코드에는 없고 이름 단어("Micro", "Microsoft")로 찾는 경우
+        symbols = [entry['symbol'] for entry in self.index.search('micro')]
+        self.assertEqual(sorted(symbols), ['AMD', 'MSFT'])
+
+        self.assertEqual(self.index.search('BRK')[0], {'symbol': 'BRK-B', 'name': 'Berkshire Hathaway Inc.', 'exchange': 'NYSE'})
+        self.assertEqual(self.index.search('zzz'), [])
+        self.assertEqual(self.index.search(''), [])
+
+    def test_directory_validation_and_refresh(self):
+        """
+        목록이 없으면 모든 종목을 허용하고, 갱신 후에는 파일에 저장되어 다음 실행에서도 검증하는지 확인
+        """
+        directory = SymbolDirectory(self.path, loader=lambda: ENTRIES, refresh_interval=0)
+        self.assertFalse(directory.loaded)
+        self.assertTrue(directory.is_known('TYPO'))
+
+        self.assertTrue(directory.refresh())
+        self.assertTrue(directory.is_known('aapl'))
+        self.assertFalse(directory.is_known('AAPLL'))
+        with open(self.path, encoding='utf-8') as f:
+            self.assertEqual(len(json.load(f)), len(ENTRIES))
+
+        reloaded = SymbolDirectory(self.path)
+        self.assertTrue(reloaded.loaded)
+        self.assertFalse(reloaded.is_known('TYPO'))
+
+        # 갱신에 실패하면 기존 색인 유지
+        def failing_loader():
+            raise ConnectionError('연결 실패')
+        reloaded.loader = failing_loader
+        self.assertFalse(reloaded.refresh())
+        self.assertTrue(reloaded.is_known('MSFT'))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+import unittest
+from template_summary import TemplateSummaryGenerator
+
+class TestTemplateSummaryGenerator(unittest.TestCase):
+    """
+    TemplateSummaryGenerator 클래스의 단위 테스트
+    """
+    
+    def setUp(self):
+        """
+        테스트 설정
+        """
+        self.generator = TemplateSummaryGenerator()
+        self.stock_data = {
+            'symbol': 'AAPL',
+            'current_price': 190.5,
+            'analysis_date': '2025-06-30',
+            'interpreted_signals': {
+                'RSI': {'indicator_name': 'RSI (상대강도지수)', 'signal': 'STRONG_OVERSOLD', 'description': '강한 과매도 (RSI < 30)', 'score': 2},
+                'MACD': {'indicator_name': 'MACD', 'signal': 'WEAK_BEARISH', 'description': '약한 하락 신호 (MACD < Signal 0.2-1%)', 'score': -1}
+            },
+            'total_score': 1,
+            'recommendation': 'HOLD'
+        }
+    
+    def test_summary_sections(self):
+        """
+        ChatGPT 요약과 같은 섹션 구조로 생성되는지 확인
+        """
+        summary = self.generator.generate_summary(self.stock_data)
+        
+        self.assertTrue(summary.startswith('🧠 전문가 종합평가:'))
+        self.assertIn('📈 투자자별 전략 제안:', summary)
+        self.assertIn('👤 주식 미보유자:\n', summary)
+        self.assertIn('💼 주식 보유자:\n', summary)
+        self.assertIn('AAPL', summary)
+        self.assertIn('강한 과매도', summary)
+        self.assertNotIn('"', summary)
+    
+    def test_summary_is_deterministic(self):
+        """
+        같은 입력이면 항상 같은 요약이 생성되는지 확인
+        """
+        self.assertEqual(self.generator.generate_summary(self.stock_data),
+                         self.generator.generate_summary(self.stock_data))
+
+if __name__ == '__main__':
+    unittest.main()
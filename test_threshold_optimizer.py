@@ -0,0 +1,76 @@
+import io
+import os
+import unittest
+from contextlib import redirect_stdout
+
+os.environ.setdefault('FMP_API_KEY', 'test')
+
+from stock_data_fetcher import StockDataFetcher
+import threshold_optimizer as optimizer
+from test_helpers import make_history
+
+class TestThresholdOptimizer(unittest.TestCase):
+    """
+    threshold_optimizer 모듈의 단위 테스트
+    """
+    
+    def setUp(self):
+        """
+        테스트 설정
+        """
+        self.fetcher = StockDataFetcher()
+        self.data = make_history(400, seed=7, volatility=0.012)
+    
+    def test_default_thresholds_match_generate_signals(self):
+        """
+        벡터화된 원시값과 기본 임계값 점수가 generate_signals와 같은지 확인
+        """
+        raw = optimizer.compute_raw_indicators(self.fetcher, self.data)
+        for end in (120, 250, 399):
+            with redirect_stdout(io.StringIO()):
+                expected = self.fetcher.generate_signals(self.data.iloc[:end + 1])['scores']
+            for key in optimizer.OPTIMIZED_INDICATORS:
+                score = optimizer.threshold_scores(raw[key][end:end + 1], optimizer.DEFAULT_THRESHOLDS[key],
+                                                   optimizer.SCORE_DIRECTION[key],
+                                                   two_sided=key in optimizer.TWO_SIDED_INDICATORS,
+                                                   nan_score=optimizer.NAN_SCORES.get(key))[0]
+                self.assertEqual(score, expected[key], f"{key} @ {end}")
+            breakout = optimizer.breakout_scores(raw['BREAKOUT'][end:end + 1], raw['BREAKDOWN'][end:end + 1])[0]
+            self.assertEqual(breakout, expected['BREAKOUT'])
+    
+    def test_optimize_reports_walk_forward(self):
+        """
+        최적화 결과에 기본 설정, 상위 설정, walk-forward 결과가 포함되는지 확인
+        """
+        histories = {'AAA': self.data, 'BBB': make_history(400, seed=8, volatility=0.012)}
+        sweep = optimizer.ThresholdOptimizer(histories, fetcher=self.fetcher)
+        with redirect_stdout(io.StringIO()):
+            result = sweep.optimize(n_folds=3, top_n=5, workers=1)
+        
+        self.assertEqual(result['candidates'], len(sweep.candidate_indices()))
+        self.assertEqual(len(result['top']), 5)
+        self.assertEqual(len(result['walk_forward']), 3)
+        self.assertIsNotNone(result['baseline'])
+        self.assertGreaterEqual(result['top'][0]['sharpe'], result['baseline']['sharpe'])
+
+    def test_chunks_follow_memory_budget(self):
+        """
+        묶음 크기가 메모리 예산과 전체 봉 수로 정해지고, 묶음마다 on_chunk가 호출되며 예외를 던지면 중단되는지 확인
+        """
+        sweep = optimizer.ThresholdOptimizer({'AAA': self.data}, fetcher=self.fetcher)
+        bars = len(sweep.dates)
+        calls = []
+        with redirect_stdout(io.StringIO()):
+            expected = sweep.optimize(n_folds=2, top_n=3, workers=1, chunk_size=1024)
+            result = sweep.optimize(n_folds=2, top_n=3, workers=1, memory_budget=bars * optimizer.BYTES_PER_CELL * 2000,
+                                    on_chunk=lambda: calls.append(1))
+        self.assertEqual(len(calls), -(-result['candidates'] // 2000))
+        self.assertEqual(result['top'], expected['top'])
+
+        def cancel():
+            raise RuntimeError('취소')
+        with redirect_stdout(io.StringIO()), self.assertRaises(RuntimeError):
+            sweep.optimize(n_folds=2, workers=1, memory_budget=1, on_chunk=cancel)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,354 @@
+import gzip
+import hashlib
+import io
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from contextlib import redirect_stdout
+
+# web_app은 가져올 때 저장소/캐시를 만들므로 임시 디렉터리를 먼저 지정
+DATA_DIR = tempfile.mkdtemp()
+os.environ.update(
+    FMP_API_KEY='test',
+    CHATGPT_API_KEY='test',
+    CACHE_BACKEND='memory',
+    BAR_STORE_DIR=os.path.join(DATA_DIR, 'bars'),
+    HISTORY_DB_PATH=os.path.join(DATA_DIR, 'history.db'),
+    ALERT_RULES_PATH=os.path.join(DATA_DIR, 'alert_rules.json'),
+    SYMBOL_DIRECTORY_PATH=os.path.join(DATA_DIR, 'symbols.json'),
+    SYMBOL_REFRESH_HOURS='0',
+    JOB_DIR=os.path.join(DATA_DIR, 'jobs')
+)
+
+with redirect_stdout(io.StringIO()):
+    import web_app
+from compression import MIN_COMPRESS_BYTES
+from market_calendar import seconds_until_next_close
+from symbol_directory import SymbolIndex
+from test_helpers import make_history
+
+SYMBOLS = ['AAPL', 'MSFT', 'NVDA']
+
+def tearDownModule():
+    shutil.rmtree(DATA_DIR, ignore_errors=True)
+
+class WebAppTestCase(unittest.TestCase):
+    """
+    네트워크 없이 web_app 라우트를 호출하는 테스트의 공통 설정 (일봉 조회와 ChatGPT 요약은 대역으로 교체)
+    """
+
+    def setUp(self):
+        self.fetch_calls = []
+        self.client = web_app.app.test_client()
+        self.output = io.StringIO()
+        self.stdout = redirect_stdout(self.output)
+        self.stdout.__enter__()
+
+        def fetch_stock_data(symbol, period='1y', interval='1d', start=None, end=None, as_of=None):
+            self.fetch_calls.append(symbol)
+            data = make_history(300, seed=SYMBOLS.index(symbol) if symbol in SYMBOLS else 99)
+            data.attrs['source'] = 'fmp'
+            return data
+
+        self.saved = {
+            'fetch': web_app.stock_fetcher.fetch_stock_data,
+            'summary': web_app.chatgpt_analyzer.request_expert_summary,
+            'batch_summary': web_app.chatgpt_analyzer.generate_batch_summaries,
+            'index': web_app.symbol_directory.index
+        }
+        web_app.stock_fetcher.fetch_stock_data = fetch_stock_data
+        web_app.chatgpt_analyzer.request_expert_summary = lambda stock_data, length_tier=None: (
+            f"{stock_data['symbol']} 요약", {'prompt_tokens': 1, 'completion_tokens': 1, 'total_tokens': 2})
+        web_app.chatgpt_analyzer.generate_batch_summaries = lambda stock_data_list, length_tier=None: {
+            stock_data['symbol']: f"{stock_data['symbol']} 배치 요약" for stock_data in stock_data_list}
+        web_app.symbol_directory.index = SymbolIndex([{'symbol': symbol, 'name': symbol} for symbol in SYMBOLS])
+
+    def tearDown(self):
+        web_app.stock_fetcher.fetch_stock_data = self.saved['fetch']
+        web_app.chatgpt_analyzer.request_expert_summary = self.saved['summary']
+        web_app.chatgpt_analyzer.generate_batch_summaries = self.saved['batch_summary']
+        web_app.symbol_directory.index = self.saved['index']
+        self.stdout.__exit__(None, None, None)
+
+class TestCacheableAnalyze(WebAppTestCase):
+    """
+    GET /analyze/<symbol>의 ETag / If-None-Match / Cache-Control 처리
+    """
+
+    def test_etag_covers_body(self):
+        """
+        ETag가 응답 본문의 해시이고 max-age가 다음 장 마감까지의 시간인지 확인
+        """
+        response = self.client.get('/analyze/AAPL?period=6mo')
+        self.assertEqual(response.status_code, 200)
+        etag, weak = response.get_etag()
+        self.assertFalse(weak)
+        self.assertEqual(etag, hashlib.sha1(response.get_data()).hexdigest())
+        self.assertTrue(response.cache_control.public)
+        self.assertAlmostEqual(response.cache_control.max_age, seconds_until_next_close(), delta=2)
+        self.assertIsNotNone(response.last_modified)
+
+        # 같은 요청은 캐시된 본문을 그대로 돌려준다
+        again = self.client.get('/analyze/AAPL?period=6mo')
+        self.assertEqual(again.get_data(), response.get_data())
+        self.assertEqual(again.get_etag(), (etag, False))
+
+    def test_if_none_match(self):
+        """
+        If-None-Match가 일치하면 본문 없이 304, 다르면 200으로 응답하는지 확인
+        """
+        etag = self.client.get('/analyze/MSFT?period=6mo').get_etag()[0]
+
+        response = self.client.get('/analyze/MSFT?period=6mo', headers={'If-None-Match': f'"{etag}"'})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.get_data(), b'')
+        self.assertEqual(response.get_etag(), (etag, False))
+        self.assertAlmostEqual(response.cache_control.max_age, seconds_until_next_close(), delta=2)
+        # 압축 응답에서 받은 접미사 붙은 태그도 일치로 본다
+        response = self.client.get('/analyze/MSFT?period=6mo', headers={'If-None-Match': f'"{etag}-gzip"'})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.get_etag(), (f'{etag}-gzip', False))
+
+        response = self.client.get('/analyze/MSFT?period=6mo', headers={'If-None-Match': '"other"'})
+        self.assertEqual(response.status_code, 200)
+        # 스키마가 다르면 본문도 ETag도 다르다
+        compact = self.client.get('/analyze/MSFT?period=6mo&schema=compact')
+        self.assertNotEqual(compact.get_etag()[0], etag)
+
+    def test_template_summary_not_cached(self):
+        """
+        ChatGPT 요약 실패로 템플릿 요약을 돌려주면 no-store로 응답하고 ETag를 붙이지 않는지 확인
+        """
+        def failing_summary(stock_data, length_tier=None):
+            raise RuntimeError('timeout')
+        web_app.chatgpt_analyzer.request_expert_summary = failing_summary
+
+        response = self.client.get('/analyze/NVDA?period=6mo')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()['summary_source'], 'template')
+        self.assertEqual(response.headers['Cache-Control'], 'no-store')
+        self.assertEqual(response.get_etag(), (None, None))
+
+class TestCompression(WebAppTestCase):
+    """
+    응답 압축 협상 (Accept-Encoding, Vary, 압축 본문의 ETag 접미사)
+    """
+
+    def test_gzip_when_accepted(self):
+        """
+        gzip을 지원하는 클라이언트에는 압축 본문과 "-gzip" 접미사 ETag를 보내는지 확인
+        """
+        response = self.client.get('/indicators', headers={'Accept-Encoding': 'gzip'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response.vary)
+        self.assertEqual(gzip.decompress(response.get_data()).decode('utf-8'), web_app.INDICATORS_BODY)
+        self.assertEqual(response.get_etag(), (f'{web_app.INDICATORS_ETAG}-gzip', False))
+
+        # 압축 응답에서 받은 태그로 재검증하면 같은 태그로 304
+        revalidated = self.client.get('/indicators', headers={'Accept-Encoding': 'gzip',
+                                                              'If-None-Match': f'"{web_app.INDICATORS_ETAG}-gzip"'})
+        self.assertEqual(revalidated.status_code, 304)
+        self.assertNotIn('Content-Encoding', revalidated.headers)
+        self.assertEqual(revalidated.get_etag(), (f'{web_app.INDICATORS_ETAG}-gzip', False))
+
+    def test_identity_without_accept_encoding(self):
+        """
+        Accept-Encoding이 없으면 압축하지 않지만 Vary는 붙이는지 확인
+        """
+        response = self.client.get('/indicators')
+        self.assertNotIn('Content-Encoding', response.headers)
+        self.assertIn('Accept-Encoding', response.vary)
+        self.assertEqual(response.get_data(as_text=True), web_app.INDICATORS_BODY)
+        self.assertEqual(response.get_etag(), (web_app.INDICATORS_ETAG, False))
+
+    def test_small_body_not_compressed(self):
+        """
+        MIN_COMPRESS_BYTES보다 작은 응답은 gzip을 지원해도 그대로 보내는지 확인
+        """
+        response = self.client.get('/analyze/ZZZZQ', headers={'Accept-Encoding': 'gzip'})
+        self.assertEqual(response.status_code, 400)
+        self.assertLess(len(response.get_data()), MIN_COMPRESS_BYTES)
+        self.assertNotIn('Content-Encoding', response.headers)
+        self.assertIn('Accept-Encoding', response.vary)
+        self.assertIn('ZZZZQ', response.get_json()['error'])
+
+    def test_compressed_analysis_etag(self):
+        """
+        압축된 분석 응답의 ETag는 원래 본문 해시에 접미사를 붙인 값인지 확인
+        """
+        plain = self.client.get('/analyze/AAPL?period=3mo')
+        compressed = self.client.get('/analyze/AAPL?period=3mo', headers={'Accept-Encoding': 'gzip'})
+        self.assertEqual(compressed.headers['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(compressed.get_data()), plain.get_data())
+        self.assertEqual(compressed.get_etag(), (f'{plain.get_etag()[0]}-gzip', False))
+
+class TestResponseSchema(WebAppTestCase):
+    """
+    /indicators 메타데이터와 compact 응답 형식
+    """
+
+    def test_indicators(self):
+        """
+        /indicators가 분석 버전과 지표별 이름/유형/설명/신호 해석을 하루 캐시로 돌려주는지 확인
+        """
+        response = self.client.get('/indicators')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.cache_control.max_age, 86400)
+        self.assertTrue(response.cache_control.public)
+        body = response.get_json()
+        self.assertEqual(body['version'], web_app.ANALYSIS_VERSION)
+        self.assertIn('RSI', body['indicators'])
+        for meta in body['indicators'].values():
+            self.assertEqual(set(meta), {'name', 'type', 'description', 'signals'})
+            self.assertIn('INSUFFICIENT_DATA', meta['signals'])
+
+    def test_compact_schema(self):
+        """
+        compact 응답은 interpreted_signals만 빠지고, 신호는 /indicators 메타데이터로 해석할 수 있는지 확인
+        """
+        full = self.client.post('/analyze', json={'symbol': 'MSFT', 'period': '1y'}).get_json()
+        compact = self.client.post('/analyze', json={'symbol': 'MSFT', 'period': '1y', 'schema': 'compact'}).get_json()
+
+        self.assertIn('interpreted_signals', full)
+        self.assertNotIn('schema', full)
+        self.assertEqual(compact['schema'], 'compact')
+        self.assertEqual(set(compact), set(full) - {'interpreted_signals'} | {'schema'})
+        for key in ('signals', 'scores', 'insufficient', 'total_score', 'recommendation'):
+            self.assertEqual(compact[key], full[key])
+
+        indicators = self.client.get('/indicators').get_json()['indicators']
+        for name, signal in compact['signals'].items():
+            self.assertIn(signal, indicators[name]['signals'])
+
+        response = self.client.post('/analyze', json={'symbol': 'MSFT', 'schema': 'tiny'})
+        self.assertEqual(response.status_code, 400)
+
+class TestAnalyzeBatch(WebAppTestCase):
+    """
+    /analyze/batch 입력 검증과 묶음 요약의 마감 시간 처리
+    """
+
+    def test_invalid_symbols(self):
+        """
+        symbols가 문자열 목록이 아니면 분석 없이 400으로 응답하는지 확인
+        """
+        for body in ({'symbols': ['AAPL', 1]}, {'symbols': [None]}, {'symbols': 'AAPL'}, ['AAPL']):
+            response = self.client.post('/analyze/batch', json=body)
+            self.assertEqual(response.status_code, 400, body)
+            self.assertIn('error', response.get_json())
+        self.assertEqual(self.fetch_calls, [])
+
+    def test_batch_summaries(self):
+        """
+        묶음 요청으로 만든 요약이 종목별로 붙고, fast 모드는 ChatGPT 없이 템플릿으로 응답하는지 확인
+        (다른 테스트의 요약 캐시와 겹치지 않도록 응답 길이를 바꿔 요청)
+        """
+        body = self.client.post('/analyze/batch', json={'symbols': ['aapl', 'MSFT', 'ZZZZQ'],
+                                                        'summary_length': 'detailed'}).get_json()
+        self.assertEqual(set(body['results']), {'AAPL', 'MSFT'})
+        self.assertIn('ZZZZQ', body['errors'])
+        self.assertEqual(body['results']['MSFT']['expert_summary'], 'MSFT 배치 요약')
+        self.assertEqual(body['results']['MSFT']['summary_source'], 'llm')
+
+        body = self.client.post('/analyze/batch', json={'symbols': ['AAPL'], 'summary_length': 'detailed',
+                                                        'summary_mode': 'fast'}).get_json()
+        self.assertEqual(body['results']['AAPL']['summary_source'], 'template')
+        self.assertNotIn('summary_id', body['results']['AAPL'])
+
+    def test_slow_batch_falls_back(self):
+        """
+        묶음 ChatGPT 요청이 마감 시간을 넘기면 템플릿 요약과 summary_id로 먼저 응답하는지 확인
+        """
+        release = threading.Event()
+        def slow_batch(stock_data_list, length_tier=None):
+            release.wait(5)
+            return {stock_data['symbol']: '늦은 요약' for stock_data in stock_data_list}
+        web_app.chatgpt_analyzer.generate_batch_summaries = slow_batch
+        deadline, web_app.summary_service.deadline = web_app.summary_service.deadline, 0.05
+        try:
+            body = self.client.post('/analyze/batch', json={'symbols': ['AAPL', 'NVDA'],
+                                                            'summary_length': 'short'}).get_json()
+        finally:
+            web_app.summary_service.deadline = deadline
+            release.set()
+
+        result = body['results']['NVDA']
+        self.assertEqual(result['summary_source'], 'template')
+        summary_id = result['summary_id']
+        for _ in range(100):
+            status = web_app.summary_service.get_summary(summary_id)
+            if status['status'] != 'pending':
+                break
+            time.sleep(0.01)
+        self.assertEqual(status['status'], 'ready')
+        self.assertEqual(status['expert_summary'], '늦은 요약')
+
+class TestPanelAndPortfolio(WebAppTestCase):
+    """
+    /panel, /portfolio 입력 검증 (잘못된 형식은 조회 없이 400)
+    """
+
+    def test_panel_invalid_params(self):
+        """
+        history_days가 정수가 아니거나 sectors/symbols 형식이 잘못되면 400으로 응답하는지 확인
+        """
+        base = {'symbols': ['AAPL', 'MSFT']}
+        for extra in ({'history_days': None}, {'history_days': [5]}, {'history_days': 'abc'}, {'history_days': 0},
+                      {'sectors': ['Tech']}, {'sectors': {'AAPL': 1}}, {'symbols': ['AAPL', 2]}, {'symbols': 'AAPL'}):
+            response = self.client.post('/panel', json=dict(base, **extra))
+            self.assertEqual(response.status_code, 400, extra)
+            self.assertIn('error', response.get_json())
+        self.assertEqual(self.client.post('/panel', json=['AAPL', 'MSFT']).status_code, 400)
+        self.assertEqual(self.fetch_calls, [])
+
+    def test_panel(self):
+        """
+        올바른 요청은 문자열 history_days와 소문자 섹터 키도 받아 분석하는지 확인
+        """
+        response = self.client.post('/panel', json={'symbols': ['AAPL', 'msft', 'ZZZZQ'], 'history_days': '5',
+                                                    'sectors': {'aapl': 'Tech'}})
+        self.assertEqual(response.status_code, 200)
+        body = response.get_json()
+        self.assertEqual(sorted(self.fetch_calls), ['AAPL', 'MSFT'])
+        self.assertIn('ZZZZQ', body['errors'])
+        self.assertEqual(len(body['breadth_history']), 5)
+
+    def test_portfolio_invalid_holdings(self):
+        """
+        holdings가 목록이 아니거나 항목이 객체가 아니면 조회 없이 400으로 응답하는지 확인
+        """
+        for holdings in ({'symbol': 'AAPL'}, 'AAPL', ['AAPL'], [{'symbol': 'AAPL'}, None], [{'symbol': ['AAPL']}]):
+            response = self.client.post('/portfolio', json={'holdings': holdings})
+            self.assertEqual(response.status_code, 400, holdings)
+            self.assertIn('error', response.get_json())
+        self.assertEqual(self.client.post('/portfolio', json=[{'symbol': 'AAPL'}]).status_code, 400)
+        self.assertEqual(self.fetch_calls, [])
+
+        response = self.client.post('/portfolio', json={'holdings': [{'symbol': 'AAPL', 'weight': 3},
+                                                                     {'symbol': 'msft', 'weight': 1}]})
+        self.assertEqual(response.status_code, 200)
+        self.assertAlmostEqual(response.get_json()['holdings']['AAPL']['weight'], 0.75, places=3)
+
+class TestStream(WebAppTestCase):
+    """
+    /stream 구독 요청 검증
+    """
+
+    def test_unknown_symbol_rejected(self):
+        """
+        종목 목록에 없는 종목은 구독하지 않고 400으로 응답하는지 확인
+        """
+        response = self.client.get('/stream?symbols=AAPL,ZZZZQ')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('ZZZZQ', response.get_json()['error'])
+        self.assertNotIn('ZZZZQ', web_app.live_hub.subscribed_symbols())
+        self.assertEqual(self.fetch_calls, [])
+
+        self.assertEqual(self.client.get('/stream?symbols=').status_code, 400)
+
+if __name__ == '__main__':
+    unittest.main()
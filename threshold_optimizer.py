@@ -0,0 +1,345 @@
+"""
+지표 임계값 파라미터 스윕 최적화
+
+generate_signals / analyze_signals에 하드코딩된 임계값 조합 수천 개를 여러 해의 일봉 데이터로
+한 번에 백테스트합니다. 지표 원시값은 전체 기간에 대해 한 번만 계산하고, 후보 하나당 비용은
+점수 행렬 합산과 비교 몇 번으로 끝나도록 구성합니다. 후보 묶음은 여러 프로세스에서 병렬로 평가하며,
+결과는 확장 윈도우 방식의 walk-forward 검증과 함께 반환합니다.
+"""
+
+import argparse
+import itertools
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Any, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from stock_data_fetcher import StockDataFetcher
+from stock_trading_analyzer import RECOMMENDATION_CUTOFFS
+from vectorized_signals import (DEFAULT_THRESHOLDS, SCORE_DIRECTION, TWO_SIDED_INDICATORS, NAN_SCORES,
+                                compute_raw_indicators, breakout_scores, threshold_scores)
+
+# 현재 analyze_signals의 추천 기준 (STRONG_SELL 이하, SELL 이하, BUY 이상, STRONG_BUY 이상)
+DEFAULT_CUTOFFS = (RECOMMENDATION_CUTOFFS["STRONG_SELL"], RECOMMENDATION_CUTOFFS["SELL"],
+                   RECOMMENDATION_CUTOFFS["BUY"], RECOMMENDATION_CUTOFFS["STRONG_BUY"])
+
+OPTIMIZED_INDICATORS = tuple(DEFAULT_THRESHOLDS)
+
+# 기본 탐색 공간 (지표별 임계값 후보, 추천 기준 후보) - 약 1만 5천 개 조합
+DEFAULT_SEARCH_SPACE = {
+    "RSI": [(30, 40, 60, 70), (25, 35, 65, 75), (20, 30, 70, 80), (35, 45, 55, 65)],
+    "MACD": [(-1.0, -0.2, 0.2, 1.0), (-0.5, -0.1, 0.1, 0.5), (-2.0, -0.5, 0.5, 2.0), (-1.5, -0.3, 0.3, 1.5)],
+    "MA_CROSSOVER": [(-1.0, -0.2, 0.2, 1.0), (-0.5, -0.1, 0.1, 0.5), (-2.0, -0.5, 0.5, 2.0), (-3.0, -1.0, 1.0, 3.0)],
+    "ADX": [(15, 20, 25, 40), (10, 15, 20, 30), (20, 25, 30, 50)],
+    "ATR": [(0.2, 0.5, 1.0, 2.0), (0.5, 1.0, 2.0, 3.0), (0.1, 0.3, 0.7, 1.5)],
+    "VWAP": [(-1.0, -0.2, 0.2, 1.0), (-0.5, -0.1, 0.1, 0.5), (-2.0, -0.5, 0.5, 2.0)],
+    "CUTOFFS": [(-7, -2, 3, 8), (-6, -1, 2, 7), (-8, -3, 4, 9),
+                (-7, -3, 3, 8), (-7, -1, 3, 8), (-6, -2, 2, 8),
+                (-8, -2, 4, 8), (-5, -2, 3, 6), (-9, -2, 3, 10)]
+}
+
+# 추천 등급별 포지션 (STRONG_BUY=1, BUY=0.5, HOLD=0, SELL=-0.5, STRONG_SELL=-1)
+POSITION_STEP = 0.5
+
+# 후보 묶음 하나를 평가할 때 쓰는 메모리 예산 (바이트) - 묶음 크기를 전체 봉 수에 맞춰 이 안으로 제한
+CHUNK_MEMORY_BYTES = 256 * 1024 * 1024
+
+# _evaluate_chunk가 (후보 × 봉) 한 칸마다 동시에 잡는 대략적인 바이트 수
+# (int16 total + 비교 마스크 + float32 position/pnl/pnl²)
+BYTES_PER_CELL = 16
+
+# 지표 계산에 필요한 최소 봉 수 (generate_signals의 최대 윈도우)
+WARMUP_BARS = max(StockDataFetcher.REQUIRED_DATA_WINDOW.values())
+
+
+class ThresholdOptimizer:
+    """
+    지표 임계값과 추천 기준 조합을 벡터화된 백테스트로 평가하는 클래스
+    """
+
+    def __init__(self, histories: Dict[str, pd.DataFrame], fetcher: StockDataFetcher = None,
+                 horizon: int = 5, search_space: Dict[str, List[Tuple]] = None):
+        """
+        Args:
+            histories (Dict[str, pd.DataFrame]): 심볼별 일봉 데이터 (여러 해 분량 권장)
+            fetcher (StockDataFetcher): 지표 계산에 사용할 fetcher (없으면 새로 생성)
+            horizon (int): 신호 이후 수익률을 측정할 기간 (거래일)
+            search_space (Dict): 지표별 임계값 후보와 "CUTOFFS" 후보 (없으면 DEFAULT_SEARCH_SPACE)
+        """
+        self.fetcher = fetcher or StockDataFetcher()
+        self.horizon = horizon
+        self.search_space = search_space or DEFAULT_SEARCH_SPACE
+        self.dimensions = list(OPTIMIZED_INDICATORS) + ["CUTOFFS"]
+        self._prepare(histories)
+
+    def _prepare(self, histories: Dict[str, pd.DataFrame]):
+        """
+        심볼별 원시값과 미래 수익률을 계산해 날짜순으로 이어 붙이고, 지표별 후보 점수 행렬을 미리 계산
+        """
+        raw_parts = {key: [] for key in OPTIMIZED_INDICATORS}
+        breakout_parts, returns_parts, valid_parts, date_parts = [], [], [], []
+
+        for symbol, data in histories.items():
+            if len(data) <= WARMUP_BARS + self.horizon:
+                print(f"⚠️ {symbol}: 데이터가 부족해 최적화에서 제외합니다 ({len(data)}일)")
+                continue
+
+            raw = compute_raw_indicators(self.fetcher, data)
+            close = data['Close'].to_numpy(dtype=float)
+
+            forward_return = np.zeros(len(close))
+            forward_return[:-self.horizon] = close[self.horizon:] / close[:-self.horizon] - 1
+
+            valid = np.zeros(len(close), dtype=bool)
+            valid[WARMUP_BARS - 1:-self.horizon] = True
+
+            for key in OPTIMIZED_INDICATORS:
+                raw_parts[key].append(raw[key])
+            breakout_parts.append(breakout_scores(raw["BREAKOUT"], raw["BREAKDOWN"]))
+            returns_parts.append(np.where(valid, forward_return, 0.0))
+            valid_parts.append(valid)
+            date_parts.append(data.index.to_numpy())
+
+        if not date_parts:
+            raise ValueError("최적화에 사용할 수 있는 데이터가 없습니다.")
+
+        # 날짜순으로 정렬해 walk-forward 구간이 연속된 열 범위가 되도록 한다
+        dates = np.concatenate(date_parts)
+        order = np.argsort(dates, kind="stable")
+        self.dates = dates[order]
+        self.forward_returns = np.concatenate(returns_parts)[order]
+        self.valid = np.concatenate(valid_parts)[order]
+        self.fixed_scores = np.concatenate(breakout_parts)[order]
+
+        # 지표별 후보 점수 행렬 (후보 수 × 전체 봉 수, int8)
+        self.score_tables = {}
+        for key in OPTIMIZED_INDICATORS:
+            values = np.concatenate(raw_parts[key])[order]
+            self.score_tables[key] = np.stack([
+                threshold_scores(values, thresholds, SCORE_DIRECTION[key],
+                                 two_sided=key in TWO_SIDED_INDICATORS, nan_score=NAN_SCORES.get(key))
+                for thresholds in self.search_space[key]
+            ])
+        self.cutoff_table = np.array(self.search_space["CUTOFFS"], dtype=np.int16)
+
+    def candidate_indices(self) -> np.ndarray:
+        """
+        모든 후보 조합의 차원별 인덱스 (후보 수 × 차원 수)
+        """
+        sizes = [len(self.search_space[dimension]) for dimension in self.dimensions]
+        return np.array(list(itertools.product(*[range(size) for size in sizes])), dtype=np.int16)
+
+    def describe(self, index_row: np.ndarray) -> Dict[str, Any]:
+        """
+        인덱스 행을 사람이 읽을 수 있는 임계값 설정으로 변환
+        """
+        config = {dimension: list(self.search_space[dimension][i]) for dimension, i in zip(self.dimensions, index_row)}
+        strong_sell, sell, buy, strong_buy = config.pop("CUTOFFS")
+        config["RECOMMENDATION"] = {"STRONG_SELL": strong_sell, "SELL": sell, "BUY": buy, "STRONG_BUY": strong_buy}
+        return config
+
+    def optimize(self, n_folds: int = 4, top_n: int = 10, workers: int = None, chunk_size: int = None,
+                 memory_budget: int = CHUNK_MEMORY_BYTES,
+                 on_chunk: Optional[Callable[[], None]] = None) -> Dict[str, Any]:
+        """
+        전체 후보를 평가하고 walk-forward 검증 결과와 상위 설정을 반환
+
+        전체 기간을 n_folds + 1개 구간으로 나눈 뒤, k번째 검증에서는 처음부터 k번째 구간까지로 최적 후보를 고르고
+        바로 다음 구간에서 성과를 확인합니다 (확장 윈도우).
+
+        Args:
+            n_folds (int): walk-forward 검증 횟수
+            top_n (int): 반환할 상위 설정 수
+            workers (int): 병렬 프로세스 수 (없으면 CPU 코어 수)
+            chunk_size (int): 프로세스 하나가 한 번에 평가할 후보 수 (없으면 memory_budget과 전체 봉 수로 계산)
+            memory_budget (int): 후보 묶음 하나를 평가할 때 쓰는 메모리 예산 (바이트, 프로세스당)
+            on_chunk (Callable): 후보 묶음 하나를 평가할 때마다 호출할 함수 (예외를 던지면 최적화 중단)
+
+        Returns:
+            Dict[str, Any]: 후보 수, 기본 설정 성과, 상위 설정, walk-forward 결과
+        """
+        candidates = self.candidate_indices()
+        segment_starts = self._segment_starts(n_folds + 1)
+        counts = np.add.reduceat(self.valid.astype(np.int64), segment_starts)
+
+        if chunk_size is None:
+            # 묶음 평가의 (후보 × 봉) 행렬들이 메모리 예산을 넘지 않도록 묶음 크기 결정
+            chunk_size = max(1, memory_budget // (len(self.dates) * BYTES_PER_CELL))
+        chunks = [candidates[i:i + chunk_size] for i in range(0, len(candidates), chunk_size)]
+        workers = workers or os.cpu_count() or 1
+        print(f"🔧 {len(candidates)}개 후보 평가 시작 ({len(self.dates)}개 봉, 묶음당 {chunk_size}개 후보, {workers}개 프로세스)")
+
+        init_args = (self.score_tables, self.fixed_scores, self.cutoff_table,
+                     self.forward_returns, segment_starts, self.dimensions)
+        results = []
+        if workers > 1 and len(chunks) > 1:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=init_args) as executor:
+                for result in executor.map(_evaluate_chunk, chunks):
+                    results.append(result)
+                    if on_chunk is not None:
+                        on_chunk()
+        else:
+            _init_worker(*init_args)
+            for chunk in chunks:
+                results.append(_evaluate_chunk(chunk))
+                if on_chunk is not None:
+                    on_chunk()
+
+        sums = np.concatenate([r[0] for r in results])
+        squares = np.concatenate([r[1] for r in results])
+
+        # 전체 기간 성과 (표본 내)
+        full_sharpe = _sharpe(sums.sum(axis=1), squares.sum(axis=1), counts.sum(), self.horizon)
+
+        # walk-forward: 확장 윈도우 학습 → 다음 구간 검증
+        walk_forward = []
+        cum_sums, cum_squares, cum_counts = np.cumsum(sums, axis=1), np.cumsum(squares, axis=1), np.cumsum(counts)
+        oos_sharpe = np.zeros((len(candidates), n_folds))
+        for fold in range(n_folds):
+            train = _sharpe(cum_sums[:, fold], cum_squares[:, fold], cum_counts[fold], self.horizon)
+            test = _sharpe(sums[:, fold + 1], squares[:, fold + 1], counts[fold + 1], self.horizon)
+            oos_sharpe[:, fold] = test
+            best = int(np.nanargmax(train))
+            walk_forward.append({
+                "fold": fold + 1,
+                "train_end": str(pd.Timestamp(self.dates[segment_starts[fold + 1] - 1]).date()),
+                "test_start": str(pd.Timestamp(self.dates[segment_starts[fold + 1]]).date()),
+                "test_end": str(pd.Timestamp(self.dates[segment_starts[fold + 2] - 1] if fold + 2 < len(segment_starts) else self.dates[-1]).date()),
+                "config": self.describe(candidates[best]),
+                "train_sharpe": round(float(train[best]), 4),
+                "test_sharpe": round(float(test[best]), 4)
+            })
+
+        ranked = np.argsort(np.nan_to_num(full_sharpe, nan=-np.inf))[::-1][:top_n]
+        top = [{
+            "config": self.describe(candidates[i]),
+            "sharpe": round(float(full_sharpe[i]), 4),
+            "walk_forward_mean_sharpe": round(float(np.nanmean(oos_sharpe[i])), 4)
+        } for i in ranked]
+
+        baseline = self._baseline_index(candidates)
+        return {
+            "candidates": len(candidates),
+            "bars": int(self.valid.sum()),
+            "horizon": self.horizon,
+            "baseline": None if baseline is None else {
+                "config": self.describe(candidates[baseline]),
+                "sharpe": round(float(full_sharpe[baseline]), 4),
+                "walk_forward_mean_sharpe": round(float(np.nanmean(oos_sharpe[baseline])), 4)
+            },
+            "top": top,
+            "walk_forward": walk_forward,
+            "walk_forward_oos_sharpe": round(float(np.nanmean([f["test_sharpe"] for f in walk_forward])), 4)
+        }
+
+    def _segment_starts(self, n_segments: int) -> np.ndarray:
+        """
+        고유 날짜를 n_segments개 구간으로 나눈 각 구간의 시작 열 인덱스
+        """
+        unique_dates = np.unique(self.dates)
+        if len(unique_dates) < n_segments:
+            raise ValueError("walk-forward 구간 수보다 거래일 수가 적습니다.")
+        boundaries = unique_dates[np.linspace(0, len(unique_dates), n_segments + 1, dtype=int)[:-1]]
+        return np.searchsorted(self.dates, boundaries, side="left")
+
+    def _baseline_index(self, candidates: np.ndarray):
+        """
+        현재 하드코딩된 설정에 해당하는 후보 인덱스 (탐색 공간에 없으면 None)
+        """
+        try:
+            row = [self.search_space[key].index(DEFAULT_THRESHOLDS[key]) for key in OPTIMIZED_INDICATORS]
+            row.append(self.search_space["CUTOFFS"].index(DEFAULT_CUTOFFS))
+        except ValueError:
+            return None
+        matches = np.where((candidates == np.array(row)).all(axis=1))[0]
+        return int(matches[0]) if len(matches) else None
+
+
+# 병렬 프로세스에서 공유하는 사전 계산 배열
+_WORKER_STATE = {}
+
+
+def _init_worker(score_tables, fixed_scores, cutoff_table, forward_returns, segment_starts, dimensions):
+    """
+    프로세스마다 한 번만 사전 계산 배열을 받아 둔다
+    """
+    _WORKER_STATE.update(
+        score_tables=score_tables, fixed_scores=fixed_scores, cutoff_table=cutoff_table,
+        forward_returns=forward_returns, segment_starts=segment_starts, dimensions=dimensions
+    )
+
+
+def _evaluate_chunk(chunk: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    후보 묶음의 구간별 수익 합과 제곱합 계산
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (후보 수 × 구간 수) 수익 합, 제곱합
+    """
+    state = _WORKER_STATE
+    total = state["fixed_scores"].astype(np.int16)[np.newaxis, :].repeat(len(chunk), axis=0)
+    for column, key in enumerate(state["dimensions"][:-1]):
+        total += state["score_tables"][key][chunk[:, column]]
+
+    cutoffs = state["cutoff_table"][chunk[:, -1]]
+    position = POSITION_STEP * (
+        (total >= cutoffs[:, 3:4]).astype(np.float32) + (total >= cutoffs[:, 2:3])
+        - (total <= cutoffs[:, 1:2]) - (total <= cutoffs[:, 0:1])
+    )
+
+    pnl = position * state["forward_returns"].astype(np.float32)
+    return (np.add.reduceat(pnl, state["segment_starts"], axis=1, dtype=np.float64),
+            np.add.reduceat(pnl * pnl, state["segment_starts"], axis=1, dtype=np.float64))
+
+
+def _sharpe(sums: np.ndarray, squares: np.ndarray, count, horizon: int) -> np.ndarray:
+    """
+    수익 합/제곱합으로 연율화 샤프 비율 계산 (변동이 없으면 NaN)
+    """
+    if count <= 1:
+        return np.full(np.shape(sums), np.nan)
+    mean = sums / count
+    variance = squares / count - mean ** 2
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sharpe = mean / np.sqrt(variance) * np.sqrt(252 / horizon)
+    return np.where(variance > 1e-12, sharpe, np.nan)
+
+
+def main():
+    """
+    명령행 실행: 지정한 종목의 여러 해 데이터를 가져와 임계값 최적화 결과를 JSON으로 출력
+    """
+    parser = argparse.ArgumentParser(description="기술적 지표 임계값 파라미터 스윕 최적화")
+    parser.add_argument("symbols", nargs="+", help="최적화에 사용할 종목 심볼")
+    parser.add_argument("--period", default="2y", help="데이터 기간 (기본값 2y)")
+    parser.add_argument("--horizon", type=int, default=5, help="수익률 측정 기간 (거래일, 기본값 5)")
+    parser.add_argument("--folds", type=int, default=4, help="walk-forward 검증 횟수 (기본값 4)")
+    parser.add_argument("--top", type=int, default=10, help="출력할 상위 설정 수 (기본값 10)")
+    parser.add_argument("--workers", type=int, default=None, help="병렬 프로세스 수 (기본값 CPU 코어 수)")
+    parser.add_argument("--output", default=None, help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    fetcher = StockDataFetcher()
+    histories = {}
+    for symbol in args.symbols:
+        data = fetcher.fetch_stock_data(symbol.upper(), args.period)
+        if not data.empty:
+            histories[symbol.upper()] = data
+
+    optimizer = ThresholdOptimizer(histories, fetcher=fetcher, horizon=args.horizon)
+    result = optimizer.optimize(n_folds=args.folds, top_n=args.top, workers=args.workers)
+
+    output = json.dumps(result, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+        print(f"✅ 최적화 결과 저장: {args.output}")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
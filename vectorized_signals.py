@@ -0,0 +1,197 @@
+"""
+generate_signals와 같은 지표 신호를 모든 시점에 대해 한 번에 계산하는 벡터화 구현
+
+generate_signals는 마지막 봉 하나의 신호만 계산하므로, 과거 여러 날짜의 신호가 필요할 때
+(기간 리플레이, 임계값 최적화) 날짜마다 반복 호출하는 대신 이 모듈의 배열 연산을 사용합니다.
+"""
+
+from typing import Dict, Tuple
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from stock_data_fetcher import StockDataFetcher
+
+# 현재 generate_signals에 하드코딩된 임계값 (낮은 값 → 높은 값 순서)
+DEFAULT_THRESHOLDS = {
+    "RSI": (30, 40, 60, 70),
+    "MACD": (-1.0, -0.2, 0.2, 1.0),
+    "MA_CROSSOVER": (-1.0, -0.2, 0.2, 1.0),
+    "ADX": (15, 20, 25, 40),
+    "ATR": (0.2, 0.5, 1.0, 2.0),
+    "VWAP": (-1.0, -0.2, 0.2, 1.0)
+}
+
+# +1: 값이 클수록 점수가 높아짐, -1: 값이 작을수록 점수가 높아짐
+SCORE_DIRECTION = {
+    "RSI": -1,
+    "MACD": 1,
+    "MA_CROSSOVER": 1,
+    "ADX": 1,
+    "ATR": 1,
+    "VWAP": -1
+}
+
+# 중립 구간을 기준으로 위쪽은 ">=", 아래쪽은 "<="로 비교하는 지표 (generate_signals의 경계 처리와 동일)
+TWO_SIDED_INDICATORS = ("MACD", "MA_CROSSOVER", "VWAP")
+
+# 원시값이 NaN일 때 generate_signals가 주는 점수 (명시하지 않은 지표는 비교 결과를 그대로 따름)
+NAN_SCORES = {
+    "MACD": 0,
+    "MA_CROSSOVER": 0,
+    "VWAP": -2
+}
+
+# 점수 → 신호 이름
+SIGNAL_NAMES = {
+    "RSI": {2: "STRONG_OVERSOLD", 1: "WEAK_OVERSOLD", 0: "NEUTRAL", -1: "WEAK_OVERBOUGHT", -2: "STRONG_OVERBOUGHT"},
+    "MACD": {2: "STRONG_BULLISH", 1: "WEAK_BULLISH", 0: "NEUTRAL", -1: "WEAK_BEARISH", -2: "STRONG_BEARISH"},
+    "MA_CROSSOVER": {2: "STRONG_GOLDEN", 1: "WEAK_GOLDEN", 0: "NEUTRAL", -1: "WEAK_DEAD", -2: "STRONG_DEAD"},
+    "ADX": {2: "STRONG_TREND", 1: "WEAK_TREND", 0: "NEUTRAL", -1: "WEAK_RANGE", -2: "STRONG_RANGE"},
+    "BREAKOUT": {2: "STRONG_BREAKOUT", 1: "WEAK_BREAKOUT", 0: "NEUTRAL", -1: "WEAK_BREAKDOWN", -2: "STRONG_BREAKDOWN"},
+    "ATR": {2: "STRONG_VOLATILITY", 1: "WEAK_VOLATILITY", 0: "NEUTRAL", -1: "WEAK_STABILITY", -2: "STRONG_STABILITY"},
+    "VWAP": {2: "STRONG_UNDER", 1: "WEAK_UNDER", 0: "NEUTRAL", -1: "WEAK_OVER", -2: "STRONG_OVER"}
+}
+
+# generate_signals의 지표 순서
+INDICATORS = ("RSI", "MACD", "MA_CROSSOVER", "ADX", "BREAKOUT", "ATR", "VWAP")
+
+# generate_signals가 신호를 만들기 위해 필요한 최소 봉 수
+MIN_SIGNAL_BARS = 50
+
+
+def macd_window_kernel(window: int = 50, fast: int = 12, slow: int = 26, signal: int = 9) -> np.ndarray:
+    """
+    최근 window개 종가에 곱하면 generate_signals의 (MACD - Signal) 값이 되는 가중치 벡터
+
+    generate_signals는 최근 50일만 잘라서 EWM을 다시 시작하므로 전체 기간 EWM과 값이 다릅니다.
+    MACD와 시그널 라인은 모두 종가에 대한 선형 연산이므로, 단위 벡터에 같은 계산을 적용해 얻은
+    가중치로 모든 시점의 값을 슬라이딩 윈도우 내적 한 번에 구할 수 있습니다.
+    """
+    basis = pd.DataFrame(np.eye(window))
+    ema_fast = basis.ewm(span=fast).mean()
+    ema_slow = basis.ewm(span=slow).mean()
+    macd_line = ema_fast - ema_slow
+    signal_line = macd_line.ewm(span=signal).mean()
+    return (macd_line - signal_line).iloc[-1].to_numpy()
+
+
+def compute_raw_indicators(fetcher: StockDataFetcher, data: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """
+    모든 시점에 대해 generate_signals와 같은 지표 원시값을 한 번에 계산
+
+    Returns:
+        Dict[str, np.ndarray]: 지표별 원시값 배열 (길이 = len(data), 계산 불가 구간은 NaN)
+    """
+    close = data['Close'].to_numpy(dtype=float)
+    raw = {}
+
+    raw["RSI"] = fetcher.calculate_rsi(data).to_numpy(dtype=float)
+
+    macd_diff = np.full(len(close), np.nan)
+    window = StockDataFetcher.REQUIRED_DATA_WINDOW["MACD"]
+    if len(close) >= window:
+        macd_diff[window - 1:] = sliding_window_view(close, window) @ macd_window_kernel(window)
+    raw["MACD"] = macd_diff / close * 100
+
+    short_ma, long_ma = fetcher.calculate_moving_averages(data)
+    raw["MA_CROSSOVER"] = ((short_ma - long_ma) / long_ma * 100).to_numpy(dtype=float)
+
+    raw["ADX"] = fetcher.calculate_adx(data).to_numpy(dtype=float)
+    raw["ATR"] = (fetcher.calculate_atr(data) / data['Close'] * 100).to_numpy(dtype=float)
+
+    typical_price = ((data['High'] + data['Low'] + data['Close']) / 3).to_numpy(dtype=float)
+    volume = data['Volume'].to_numpy(dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        vwap = typical_price * volume / volume
+    raw["VWAP"] = (close - vwap) / vwap * 100
+
+    recent_high = data['High'].rolling(window=20).max().to_numpy(dtype=float)
+    recent_low = data['Low'].rolling(window=20).min().to_numpy(dtype=float)
+    raw["BREAKOUT"] = (close - recent_high) / recent_high * 100
+    raw["BREAKDOWN"] = (recent_low - close) / recent_low * 100
+
+    return raw
+
+
+def breakout_scores(breakout_pct: np.ndarray, breakdown_pct: np.ndarray) -> np.ndarray:
+    """
+    generate_signals의 BREAKOUT 점수 규칙을 배열 전체에 적용 (최적화 대상이 아닌 고정 규칙)
+    """
+    scores = np.select(
+        [breakout_pct >= 2.0,
+         breakout_pct >= 0.5,
+         (breakout_pct > -0.5) & (breakdown_pct < 0.5),
+         (breakdown_pct >= 0.5) & (breakdown_pct < 2.0)],
+        [2, 1, 0, -1],
+        default=-2
+    )
+    return scores.astype(np.int8)
+
+
+def threshold_scores(values: np.ndarray, thresholds: Tuple[float, ...], direction: int,
+                     two_sided: bool = False, nan_score: int = None) -> np.ndarray:
+    """
+    원시값 배열을 임계값 4개로 5단계 점수(-2 ~ +2)로 변환
+
+    Args:
+        values (np.ndarray): 지표 원시값
+        thresholds (Tuple): 낮은 값부터 정렬된 임계값 4개
+        direction (int): +1이면 값이 클수록, -1이면 값이 작을수록 높은 점수
+        two_sided (bool): True면 아래쪽 두 임계값은 "<=", 위쪽 두 임계값은 ">="로 비교
+        nan_score (int): NaN에 줄 점수 (없으면 비교 결과를 그대로 따름)
+    """
+    if two_sided:
+        lower, upper = thresholds[:2], thresholds[2:]
+        scores = (sum((values >= t).astype(np.int8) for t in upper)
+                  - sum((values <= t).astype(np.int8) for t in lower))
+        scores = scores * direction
+    else:
+        above = sum((values >= t).astype(np.int8) for t in thresholds)
+        scores = above - 2 if direction > 0 else 2 - above
+    if nan_score is not None:
+        scores = np.where(np.isnan(values), nan_score, scores)
+    return np.asarray(scores).astype(np.int8)
+
+
+def indicator_scores(raw: Dict[str, np.ndarray], thresholds: Dict[str, Tuple[float, ...]] = None) -> Dict[str, np.ndarray]:
+    """
+    원시값으로 generate_signals와 같은 규칙의 지표별 점수 배열 계산
+    """
+    thresholds = thresholds or DEFAULT_THRESHOLDS
+    scores = {
+        key: threshold_scores(raw[key], thresholds[key], SCORE_DIRECTION[key],
+                              two_sided=key in TWO_SIDED_INDICATORS, nan_score=NAN_SCORES.get(key))
+        for key in DEFAULT_THRESHOLDS
+    }
+    scores["BREAKOUT"] = breakout_scores(raw["BREAKOUT"], raw["BREAKDOWN"])
+    return scores
+
+
+def compute_signal_history(fetcher: StockDataFetcher, data: pd.DataFrame) -> pd.DataFrame:
+    """
+    모든 봉에 대해 "그 날짜까지의 데이터로 generate_signals를 호출했을 때"의 신호와 점수를 계산
+
+    Returns:
+        pd.DataFrame: 날짜 인덱스, 지표별 "<지표>_raw", "<지표>_signal", "<지표>_score" 컬럼과 total_score
+                      (신호를 만들 수 없는 초기 봉 MIN_SIGNAL_BARS개 미만 구간은 제외)
+    """
+    raw = compute_raw_indicators(fetcher, data)
+    scores = indicator_scores(raw)
+    bars_available = np.arange(1, len(data) + 1)
+
+    columns = {"close": data['Close'].to_numpy(dtype=float)}
+    total = np.zeros(len(data), dtype=np.int16)
+    for key in INDICATORS:
+        insufficient = bars_available < StockDataFetcher.REQUIRED_DATA_WINDOW[key]
+        score = np.where(insufficient, 0, scores[key]).astype(np.int8)
+        names = np.array([SIGNAL_NAMES[key][s] for s in range(-2, 3)], dtype=object)[score + 2]
+        columns[f"{key}_raw"] = raw[key]
+        columns[f"{key}_signal"] = np.where(insufficient, "INSUFFICIENT_DATA", names)
+        columns[f"{key}_score"] = score
+        total += score
+    columns["total_score"] = total
+
+    history = pd.DataFrame(columns, index=data.index)
+    return history.iloc[MIN_SIGNAL_BARS - 1:]
@@ -1,43 +1,224 @@
 import os
-from flask import Flask, render_template, request, jsonify
+import hashlib
+import hmac
+import json
+import threading
+from flask import Flask, render_template, request, jsonify, Response, g, has_request_context
 from stock_data_fetcher import StockDataFetcher
-from stock_trading_analyzer import StockTradingAnalyzer
-from chatgpt_analyzer import ChatGPTAnalyzer
-from datetime import datetime
+from stock_trading_analyzer import StockTradingAnalyzer, ANALYSIS_VERSION
+from chatgpt_analyzer import ChatGPTAnalyzer, OUTPUT_LENGTH_TIERS
+from template_summary import TemplateSummaryGenerator
+from summary_service import SummaryService, SUMMARY_MODES
+from cache_backend import create_cache_backend
+from memory_governor import MemoryGovernor, default_budget_bytes
+from bar_store import BarStore
+from analysis_history import AnalysisHistory
+from signal_export import create_export_writer, stream_export, EXPORT_FORMATS
+from live_updates import LiveUpdateHub
+from panel_engine import PanelEngine
+from portfolio import analyze_portfolio, normalize_weights
+from multi_timeframe import analyze_timeframes, parse_timeframes
+from jobs import JobManager, JobContext, JobCancelled, DONE as JOB_DONE
+from threshold_optimizer import ThresholdOptimizer
+from admission import AdmissionController, Overloaded, INTERACTIVE, BATCH, BACKGROUND
+from symbol_directory import SymbolDirectory, fetch_fmp_symbols, DEFAULT_SEARCH_LIMIT
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED, ALL_COMPLETED
+from alert_engine import AlertEngine, LocalNotifier, WebhookNotifier
+from market_calendar import seconds_until_next_close
+from compression import init_compression, matching_etag
+from profiling import Profiler, init_profiling, profile_response, collapse_stacks, MAX_SAMPLE_SECONDS
+from datetime import datetime, timedelta
 
 app = Flask(__name__)
 app.debug = False
+init_compression(app)
+
+# 프로세스 내 캐시(일봉, 분석 응답, 요약, 프로파일) 전체의 메모리 예산 (MEMORY_BUDGET_MB, 기본값은 VM 메모리의 25%)
+memory_governor = MemoryGovernor(default_budget_bytes())
+
+# 요청 단위/프로세스 전체 프로파일링 (PROFILING_TOKEN을 설정한 경우에만 활성화, 꺼져 있으면 요청 훅도 등록하지 않음)
+PROFILING_TOKEN = os.environ.get('PROFILING_TOKEN')
+profiler = Profiler(PROFILING_TOKEN, governor=memory_governor) if PROFILING_TOKEN else None
+init_profiling(app, profiler)
 
 # 환경변수에서 API 키 가져오기
 CHATGPT_API_KEY = os.environ.get('CHATGPT_API_KEY')
 if not CHATGPT_API_KEY:
     print("⚠️ CHATGPT_API_KEY 환경변수가 설정되지 않았습니다.")
 
+# 일봉/분석 응답/ChatGPT 요약 캐시 (CACHE_BACKEND=redis면 여러 인스턴스가 함께 사용)
+cache_backend = create_cache_backend(memory_governor)
+
 # 분석기 초기화
-stock_fetcher = StockDataFetcher()
+bar_store = BarStore(os.environ.get('BAR_STORE_DIR', 'data/bars'), memory_entries=None,
+                     shared=cache_backend if cache_backend.shared else None, governor=memory_governor)
+stock_fetcher = StockDataFetcher(bar_store=bar_store)
 trading_analyzer = StockTradingAnalyzer()
-chatgpt_analyzer = ChatGPTAnalyzer(CHATGPT_API_KEY)
+chatgpt_analyzer = ChatGPTAnalyzer(
+    CHATGPT_API_KEY,
+    prompt_format=os.environ.get('SUMMARY_PROMPT_FORMAT', 'compact'),
+    length_tier=os.environ.get('SUMMARY_LENGTH', 'standard')
+)
+template_summary_generator = TemplateSummaryGenerator(trading_analyzer.indicator_descriptions)
+
+# ChatGPT 요약 응답 마감 시간 (초) - 넘으면 템플릿 요약으로 먼저 응답
+SUMMARY_DEADLINE_SECONDS = float(os.environ.get('SUMMARY_DEADLINE_SECONDS', 8))
+summary_service = SummaryService(chatgpt_analyzer, template_summary_generator, deadline=SUMMARY_DEADLINE_SECONDS,
+                                 cache=cache_backend)
+
+# 분석 결과 이력 (SQLite, 백그라운드 스레드에서 묶어서 기록)
+analysis_history = AnalysisHistory(os.environ.get('HISTORY_DB_PATH', 'data/history.db'))
+
+# 신호 변경 알림 (ALERT_DELIVERY=local이면 웹훅 대신 메모리에 모아 /alerts/events로 조회)
+ALERT_DELIVERY = os.environ.get('ALERT_DELIVERY', 'webhook')
+alert_engine = AlertEngine(
+    LocalNotifier() if ALERT_DELIVERY == 'local' else WebhookNotifier(),
+    rules_path=os.environ.get('ALERT_RULES_PATH', 'data/alert_rules.json')
+)
+
+# 종목 디렉터리 (자동 완성, 네트워크 호출 전 종목 코드 검증) - SYMBOL_REFRESH_HOURS마다 FMP 목록을 새로 받음
+symbol_directory = SymbolDirectory(
+    os.environ.get('SYMBOL_DIRECTORY_PATH', 'data/symbols.json'),
+    loader=(lambda: fetch_fmp_symbols(stock_fetcher.api_key)) if stock_fetcher.api_key else None,
+    refresh_interval=float(os.environ.get('SYMBOL_REFRESH_HOURS', 24)) * 3600
+)
+
+# 과부하 제어 - 단계별 동시 실행 수와 우선순위별 요청 마감 시간 (마감 안에 처리할 수 없으면 503)
+admission = AdmissionController(
+    {
+        'fmp': int(os.environ.get('FMP_CONCURRENCY', 4)),
+        'compute': int(os.environ.get('COMPUTE_CONCURRENCY', 2)),
+        'llm': int(os.environ.get('LLM_CONCURRENCY', 4))
+    },
+    {
+        INTERACTIVE: float(os.environ.get('INTERACTIVE_DEADLINE_SECONDS', 15)),
+        BATCH: float(os.environ.get('BATCH_DEADLINE_SECONDS', 120)),
+        BACKGROUND: float(os.environ.get('BACKGROUND_DEADLINE_SECONDS', 300))
+    }
+)
+
+# 배치/스캔 작업으로 분류해 대화형 요청보다 나중에 처리하는 엔드포인트
+BATCH_ENDPOINTS = {'analyze_batch', 'analyze_panel', 'analyze_portfolio_endpoint', 'replay'}
+
+# 배치 분석 한 번에 허용하는 최대 종목 수
+MAX_BATCH_SYMBOLS = 50
+
+# 패널(횡단면) 분석 한 번에 허용하는 최대 종목 수와 일봉 조회 동시 실행 수
+MAX_PANEL_SYMBOLS = 500
+PANEL_FETCH_WORKERS = int(os.environ.get('PANEL_FETCH_WORKERS', 8))
+
+# 포트폴리오 분석 한 번에 허용하는 최대 보유 종목 수
+MAX_PORTFOLIO_HOLDINGS = 100
+
+# 응답 형식: full - 지표 이름/설명 포함, compact - 신호/점수만 (지표 설명은 /indicators에서 한 번만 조회)
+RESPONSE_SCHEMAS = ("full", "compact")
+
+# /indicators 응답 (서버 실행 중에는 바뀌지 않으므로 미리 직렬화)
+INDICATORS_BODY = json.dumps(
+    {'version': ANALYSIS_VERSION, 'indicators': trading_analyzer.indicator_descriptions},
+    ensure_ascii=False
+)
+INDICATORS_ETAG = hashlib.sha1(INDICATORS_BODY.encode('utf-8')).hexdigest()
+
+@app.before_request
+def assign_ticket():
+    """
+    요청 우선순위(대화형/배치)와 마감 시각을 정해 단계별 슬롯 대기에 사용
+    """
+    g.ticket = admission.ticket(BATCH if request.endpoint in BATCH_ENDPOINTS else INTERACTIVE)
+
+def current_ticket():
+    """
+    현재 요청의 티켓 (요청 밖의 백그라운드 작업이면 None - 백그라운드 우선순위)
+    """
+    return g.ticket if has_request_context() else None
+
+def overloaded_response(error: Overloaded):
+    """
+    마감 시간 안에 처리할 수 없는 요청에 대한 빠른 503 응답
+    """
+    print(f"🚦 {request.path} 요청 거절 ({error.stage} 혼잡, {error.retry_after}초 후 재시도)")
+    response = jsonify({'error': str(error)})
+    response.status_code = 503
+    response.headers['Retry-After'] = str(error.retry_after)
+    return response
+
+def summarize(stock_data_for_chatgpt: dict, summary_mode: str = 'llm', summary_length: str = None) -> dict:
+    """
+    ChatGPT 요약 단계 - llm 슬롯은 요약 작업 스레드에서 ChatGPT 호출이 끝날 때까지 잡고,
+    마감 안에 슬롯을 얻지 못하면 ChatGPT를 호출하지 않고 템플릿 요약으로 응답
+    """
+    ticket = current_ticket()
+    return summary_service.summarize(stock_data_for_chatgpt, summary_mode, summary_length,
+                                     slot=lambda: admission.stage('llm', ticket))
+
+def summarize_batch(chatgpt_inputs: list, summary_mode: str = 'llm', summary_length: str = None) -> dict:
+    """
+    여러 종목 요약 단계 - 묶음 ChatGPT 요청도 마감 시간까지만 기다리고, 늦거나 llm 슬롯이 혼잡하면 템플릿 요약으로 응답
+    """
+    ticket = current_ticket()
+    return summary_service.summarize_batch(chatgpt_inputs, summary_mode, summary_length,
+                                           slot=lambda: admission.stage('llm', ticket))
 
 @app.route('/')
 def index():
     return render_template('index.html')
 
-@app.route('/analyze', methods=['POST'])
-def analyze():
-    try:
-        data = request.get_json()
-        symbol = data.get('symbol', 'AAPL').upper()
-        period = data.get('period', '1y') # 'period'도 받아오도록 수정
+def parse_data_range(params) -> dict:
+    """
+    요청의 period/start/end/as_of를 읽고 형식을 검증 (잘못되면 ValueError)
+    """
+    data_range = {
+        'period': params.get('period', '1y'),
+        'start': params.get('start') or None,
+        'end': params.get('end') or None,
+        'as_of': params.get('as_of') or None
+    }
+    stock_fetcher.resolve_date_range(**data_range)
+    return data_range
 
-        print(f"🔍 {symbol} 주식 분석 시작 (기간: {period})...")
+def unknown_symbol_error(symbol: str):
+    """
+    종목 디렉터리에 없는 종목 코드면 오류 메시지 반환 (비슷한 종목 코드 제안 포함), 있으면 None
+    """
+    if symbol_directory.is_known(symbol):
+        return None
+    suggestions = [entry['symbol'] for entry in symbol_directory.search(symbol[:-1] or symbol, 5)]
+    message = f'{symbol}은(는) 종목 목록에 없는 종목 코드입니다.'
+    if suggestions:
+        message += f' (비슷한 종목: {", ".join(suggestions)})'
+    return message
 
-        # 주식 데이터 가져오기
-        stock_data = stock_fetcher.fetch_stock_data(symbol, period)
-        if stock_data.empty:
-            return jsonify({'error': f'{symbol} 주식 데이터를 가져올 수 없습니다.'}), 400
+def build_analysis(symbol: str, period: str, stock_data=None, start=None, end=None, as_of=None, timeframes=None):
+    """
+    한 종목의 데이터 조회, 신호 생성, 신호 해석을 수행 (ChatGPT 요약 제외)
+
+    Args:
+        symbol (str): 주식 심볼
+        period (str): 데이터 기간
+        stock_data (pd.DataFrame): 이미 가져온 주식 데이터 (없으면 새로 조회)
+        start (str): 시작일 (YYYY-MM-DD)
+        end (str): 종료일 (YYYY-MM-DD)
+        as_of (str): 분석 기준일 (YYYY-MM-DD)
+        timeframes (Tuple[str]): 함께 분석할 시간 프레임 (예: ("daily", "weekly"), 같은 일봉을 리샘플링)
 
+    Returns:
+        Tuple[Dict, Dict]: (응답용 분석 결과, ChatGPT 요약용 데이터) - 데이터가 없으면 (None, None)
+    """
+    ticket = current_ticket()
+
+    # 주식 데이터 가져오기
+    if stock_data is None:
+        with admission.stage('fmp', ticket):
+            stock_data = stock_fetcher.fetch_stock_data(symbol, period, start=start, end=end, as_of=as_of)
+    if stock_data.empty:
+        return None, None
+
+    with admission.stage('compute', ticket):
         # 신호 생성
         signal_result = stock_fetcher.generate_signals(stock_data)
+        if not signal_result:
+            return None, None
         if any(signal_result['insufficient'].values()):
             # 데이터 부족에 대한 경고를 좀 더 유연하게 처리 (오류 대신)
             print(f"⚠️ {symbol} 분석에 일부 데이터가 부족합니다.")
@@ -49,42 +230,136 @@ def analyze():
             signal_result['insufficient']
         )
 
-        # 주식 정보 생성
-        stock_info = {
-            "symbol": symbol,
-            "period": period,
-            "latest_price": float(stock_data['Close'].iloc[-1]),
-            "latest_date": stock_data.index[-1].strftime('%Y-%m-%d')
-        }
-
-        # ChatGPT 전문가 요약 생성을 위한 데이터 준비
-        stock_data_for_chatgpt = {
-            'symbol': stock_info['symbol'],
-            'current_price': stock_info['latest_price'],
-            'analysis_date': stock_info['latest_date'],
-            'interpreted_signals': analysis_result['interpreted_signals'],
-            'total_score': analysis_result['total_score'],
-            'recommendation': analysis_result['recommendation']
-        }
-
-        expert_summary = chatgpt_analyzer.generate_expert_summary(stock_data_for_chatgpt)
+    # 주식 정보 생성
+    stock_info = {
+        "symbol": symbol,
+        "period": period,
+        "start": start,
+        "end": end,
+        "as_of": as_of,
+        "latest_price": float(stock_data['Close'].iloc[-1]),
+        "latest_date": stock_data.index[-1].strftime('%Y-%m-%d'),
+        "data_source": stock_data.attrs.get("source"),
+        "stale": bool(stock_data.attrs.get("stale", False))
+    }
+
+    # ChatGPT 전문가 요약 생성을 위한 데이터 준비
+    stock_data_for_chatgpt = {
+        'symbol': stock_info['symbol'],
+        'current_price': stock_info['latest_price'],
+        'analysis_date': stock_info['latest_date'],
+        'interpreted_signals': analysis_result['interpreted_signals'],
+        'total_score': analysis_result['total_score'],
+        'recommendation': analysis_result['recommendation']
+    }
+
+    result = {
+        'symbol': symbol,
+        'stock_info': stock_info, # stock_info 추가
+        'signals': signal_result['signals'],
+        'scores': signal_result['scores'],
+        'total_score': analysis_result['total_score'],
+        'recommendation': analysis_result['recommendation'],
+        'interpreted_signals': analysis_result['interpreted_signals'],
+        'insufficient': analysis_result['insufficient'],
+        'values': signal_result.get('values', {}),
+        'analysis_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S') # 분석 시간 추가
+    }
+
+    # 상위 시간 프레임 분석 (추가 조회 없이 같은 일봉을 주봉/월봉으로 리샘플링)
+    if timeframes:
+        with admission.stage('compute', ticket):
+            result.update(analyze_timeframes(stock_fetcher, stock_data, timeframes))
+
+    return result, stock_data_for_chatgpt
+
+def publish_result(result: dict):
+    """
+    새 분석 결과를 이력 저장소, 알림 엔진, 실시간 구독자에게 전달 (모두 요청 스레드에서 오래 걸리지 않음)
+    """
+    analysis_history.record(result, ANALYSIS_VERSION)
+    alert_engine.update(result)
+    live_hub.publish(result)
+
+def refresh_live_symbol(symbol: str):
+    """
+    실시간 구독 종목을 최소 구간 데이터로 다시 분석 (ChatGPT 요약 없이)
+
+    장중에는 저장된 일봉이 같아 대부분 같은 결과가 나오므로, 이력/알림에는 기록하지 않고
+    최신 봉 날짜, 총점, 신호가 바뀐 경우에만 구독자에게 전달합니다 (이력은 사용자 요청 분석만 기록).
+    """
+    result, _ = build_analysis(symbol, StockDataFetcher.MINIMAL_PERIOD)
+    if result is not None and live_hub.changed(result):
+        live_hub.publish(result)
+
+# 실시간 구독 (SSE) - 구독 종목은 LIVE_REFRESH_SECONDS마다 한 번만 분석해 모든 구독자에게 전달
+live_hub = LiveUpdateHub(refresh_live_symbol, refresh_interval=float(os.environ.get('LIVE_REFRESH_SECONDS', 60)))
+summary_service.add_listener(live_hub.publish_summary)
+
+def apply_schema(result: dict, schema: str) -> dict:
+    """
+    응답 형식 적용 - compact이면 지표 이름/설명이 반복되는 interpreted_signals를 제외
+    (signals, scores, insufficient만으로 /indicators 메타데이터와 조합해 복원 가능)
+    """
+    if schema == 'compact':
+        result = {key: value for key, value in result.items() if key != 'interpreted_signals'}
+        result['schema'] = 'compact'
+    return result
+
+@app.route('/indicators')
+def indicators():
+    """
+    지표 이름, 유형, 설명, 신호별 해석 문구 (compact 응답 해석용 정적 메타데이터)
+    """
+    matched = matching_etag(INDICATORS_ETAG)
+    if matched:
+        response = Response(status=304)
+    else:
+        response = Response(INDICATORS_BODY, mimetype='application/json')
+    response.set_etag(matched or INDICATORS_ETAG)
+    response.cache_control.public = True
+    response.cache_control.max_age = 86400
+    return response
+
+@app.route('/analyze', methods=['POST'])
+def analyze():
+    try:
+        data = request.get_json()
+        symbol = data.get('symbol', 'AAPL').upper()
+        period = data.get('period', '1y') # 'period'도 받아오도록 수정
+        try:
+            data_range = parse_data_range(data)
+            timeframes = parse_timeframes(data['timeframes']) if data.get('timeframes') else None
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        summary_mode = data.get('summary_mode', 'llm')
+        summary_length = data.get('summary_length')
+        schema = data.get('schema', 'full')
+        symbol_error = unknown_symbol_error(symbol)
+        if symbol_error:
+            return jsonify({'error': symbol_error}), 400
+        if schema not in RESPONSE_SCHEMAS:
+            return jsonify({'error': f'schema는 {", ".join(RESPONSE_SCHEMAS)} 중 하나여야 합니다.'}), 400
+        if summary_mode not in SUMMARY_MODES:
+            return jsonify({'error': f'summary_mode는 {", ".join(SUMMARY_MODES)} 중 하나여야 합니다.'}), 400
+        if summary_length is not None and summary_length not in OUTPUT_LENGTH_TIERS:
+            return jsonify({'error': f'summary_length는 {", ".join(OUTPUT_LENGTH_TIERS)} 중 하나여야 합니다.'}), 400
+
+        print(f"🔍 {symbol} 주식 분석 시작 (기간: {period})...")
+
+        result, stock_data_for_chatgpt = build_analysis(symbol, timeframes=timeframes, **data_range)
+        if result is None:
+            return jsonify({'error': f'{symbol} 주식 데이터를 가져올 수 없습니다.'}), 400
 
         # 최종 결과 반환
-        result = {
-            'symbol': symbol,
-            'stock_info': stock_info, # stock_info 추가
-            'signals': signal_result['signals'],
-            'scores': signal_result['scores'],
-            'total_score': analysis_result['total_score'],
-            'recommendation': analysis_result['recommendation'],
-            'interpreted_signals': analysis_result['interpreted_signals'],
-            'expert_summary': expert_summary,
-            'analysis_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S') # 분석 시간 추가
-        }
+        result.update(summarize(stock_data_for_chatgpt, summary_mode, summary_length))
+        publish_result(result)
 
         print(f"✅ {symbol} 분석 완료")
-        return jsonify(result)
+        return jsonify(apply_schema(result, schema))
 
+    except Overloaded as e:
+        return overloaded_response(e)
     except Exception as e:
         # 오류 발생 시 더 자세한 로그를 남기도록 수정
         import traceback
@@ -92,6 +367,812 @@ def analyze():
         traceback.print_exc()
         return jsonify({'error': f'분석 중 오류 발생: {str(e)}'}), 500
 
+def analysis_cache_key(symbol: str, data_range: dict, latest_date: str, schema: str = 'full', timeframes=None) -> str:
+    """
+    최신 봉 날짜와 분석 버전으로 분석 결과 캐시 키 생성 (같은 키의 본문은 다음 장 마감까지 재사용)
+    """
+    range_key = "|".join(str(data_range.get(k)) for k in ('period', 'start', 'end', 'as_of'))
+    key = f"{symbol}|{range_key}|{latest_date}|{ANALYSIS_VERSION}|{schema}|{','.join(timeframes or ())}"
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+def body_etag(body: str) -> str:
+    """
+    응답 본문(요약, 데이터 출처, 분석 시각 포함)의 해시로 만든 강한 ETag
+    """
+    return hashlib.sha1(body.encode('utf-8')).hexdigest()
+
+def cacheable_response(response: Response, etag: str, last_modified: datetime) -> Response:
+    """
+    ETag, Last-Modified, 다음 장 마감까지의 Cache-Control 헤더 설정
+    """
+    response.set_etag(etag)
+    response.last_modified = last_modified
+    response.cache_control.public = True
+    response.cache_control.max_age = seconds_until_next_close()
+    return response
+
+@app.route('/analyze/<symbol>', methods=['GET'])
+def analyze_cacheable(symbol):
+    """
+    브라우저/엣지 캐시가 재사용할 수 있는 GET 분석 API
+
+    ETag는 응답 본문의 해시이며, 캐시된 본문의 ETag와 If-None-Match가 일치하면 분석 없이 304로 응답합니다.
+    """
+    try:
+        symbol = symbol.upper()
+        period = request.args.get('period', '1y')
+        schema = request.args.get('schema', 'full')
+        if schema not in RESPONSE_SCHEMAS:
+            return jsonify({'error': f'schema는 {", ".join(RESPONSE_SCHEMAS)} 중 하나여야 합니다.'}), 400
+        try:
+            data_range = parse_data_range(request.args)
+            timeframes = parse_timeframes(request.args['timeframes']) if request.args.get('timeframes') else None
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        symbol_error = unknown_symbol_error(symbol)
+        if symbol_error:
+            return jsonify({'error': symbol_error}), 400
+
+        with admission.stage('fmp', g.ticket):
+            stock_data = stock_fetcher.fetch_stock_data(symbol, period, start=data_range['start'],
+                                                        end=data_range['end'], as_of=data_range['as_of'])
+        if stock_data.empty:
+            return jsonify({'error': f'{symbol} 주식 데이터를 가져올 수 없습니다.'}), 400
+
+        latest_date = stock_data.index[-1]
+        cache_key = analysis_cache_key(symbol, data_range, latest_date.strftime('%Y-%m-%d'), schema, timeframes)
+
+        # GET /analyze/<symbol> 응답 본문 캐시 (캐시 키 → 본문과 본문 ETag)
+        cached = cache_backend.get_json(f'analysis:{cache_key}')
+        if cached is None:
+            print(f"🔍 {symbol} 주식 분석 시작 (기간: {period}, GET)...")
+            result, stock_data_for_chatgpt = build_analysis(symbol, stock_data=stock_data, timeframes=timeframes,
+                                                            **data_range)
+            if result is None:
+                return jsonify({'error': f'{symbol} 주식 데이터를 가져올 수 없습니다.'}), 400
+            result.update(summarize(stock_data_for_chatgpt))
+            publish_result(result)
+
+            body = json.dumps(apply_schema(result, schema), ensure_ascii=False)
+            if result['summary_source'] != 'llm' or result['stock_info']['stale']:
+                # 템플릿 요약은 나중에 ChatGPT 요약으로, 이전 일봉(stale) 결과는 최신 데이터 결과로 바뀌므로 캐시하지 않는다
+                return Response(body, mimetype='application/json', headers={'Cache-Control': 'no-store'})
+
+            cached = {'body': body, 'etag': body_etag(body),
+                      'last_modified': datetime.utcnow().replace(microsecond=0).isoformat()}
+            cache_backend.set_json(f'analysis:{cache_key}', cached, max(seconds_until_next_close(), 1))
+            print(f"✅ {symbol} 분석 완료")
+
+        last_modified = datetime.fromisoformat(cached['last_modified'])
+        matched = matching_etag(cached['etag'])
+        if matched:
+            return cacheable_response(Response(status=304), matched, last_modified)
+
+        response = Response(cached['body'], mimetype='application/json')
+        return cacheable_response(response, cached['etag'], last_modified)
+
+    except Overloaded as e:
+        return overloaded_response(e)
+    except Exception as e:
+        import traceback
+        print(f"❌ 분석 중 오류 발생: {str(e)}")
+        traceback.print_exc()
+        return jsonify({'error': f'분석 중 오류 발생: {str(e)}'}), 500
+
+@app.route('/analyze/batch', methods=['POST'])
+def analyze_batch():
+    """
+    여러 종목(관심 종목 목록)을 한 번에 분석하고 ChatGPT 요약은 묶음 요청으로 생성
+    """
+    try:
+        data = request.get_json()
+        if not isinstance(data, dict):
+            return jsonify({'error': '요청 본문은 JSON 객체여야 합니다.'}), 400
+        symbols = data.get('symbols', [])
+        if not isinstance(symbols, list) or not all(isinstance(s, str) for s in symbols):
+            return jsonify({'error': 'symbols는 종목 코드 문자열의 목록이어야 합니다.'}), 400
+        symbols = [s.strip().upper() for s in symbols if s.strip()]
+        period = data.get('period', '1y')
+        try:
+            data_range = parse_data_range(data)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        summary_mode = data.get('summary_mode', 'llm')
+        summary_length = data.get('summary_length')
+        schema = data.get('schema', 'full')
+        if summary_mode not in SUMMARY_MODES:
+            return jsonify({'error': f'summary_mode는 {", ".join(SUMMARY_MODES)} 중 하나여야 합니다.'}), 400
+        if summary_length is not None and summary_length not in OUTPUT_LENGTH_TIERS:
+            return jsonify({'error': f'summary_length는 {", ".join(OUTPUT_LENGTH_TIERS)} 중 하나여야 합니다.'}), 400
+        if schema not in RESPONSE_SCHEMAS:
+            return jsonify({'error': f'schema는 {", ".join(RESPONSE_SCHEMAS)} 중 하나여야 합니다.'}), 400
+        if not symbols:
+            return jsonify({'error': '분석할 종목(symbols)을 입력해주세요.'}), 400
+        if len(symbols) > MAX_BATCH_SYMBOLS:
+            return jsonify({'error': f'한 번에 최대 {MAX_BATCH_SYMBOLS}개 종목까지 분석할 수 있습니다.'}), 400
+
+        print(f"🔍 {len(symbols)}개 종목 배치 분석 시작 (기간: {period})...")
+
+        results = {}
+        errors = {}
+        chatgpt_inputs = []
+        for symbol in dict.fromkeys(symbols):
+            symbol_error = unknown_symbol_error(symbol)
+            if symbol_error:
+                errors[symbol] = symbol_error
+                continue
+            result, stock_data_for_chatgpt = build_analysis(symbol, **data_range)
+            if result is None:
+                errors[symbol] = f'{symbol} 주식 데이터를 가져올 수 없습니다.'
+                continue
+            results[symbol] = result
+            chatgpt_inputs.append(stock_data_for_chatgpt)
+
+        summaries = summarize_batch(chatgpt_inputs, summary_mode, summary_length)
+        for symbol, result in results.items():
+            result.update(summaries[symbol])
+            publish_result(result)
+            results[symbol] = apply_schema(result, schema)
+
+        print(f"✅ 배치 분석 완료 (성공 {len(results)}개, 실패 {len(errors)}개)")
+        return jsonify({'results': results, 'errors': errors})
+
+    except Overloaded as e:
+        return overloaded_response(e)
+    except Exception as e:
+        import traceback
+        print(f"❌ 배치 분석 중 오류 발생: {str(e)}")
+        traceback.print_exc()
+        return jsonify({'error': f'배치 분석 중 오류 발생: {str(e)}'}), 500
+
+def fetch_histories(symbols, data_range: dict, context: JobContext = None):
+    """
+    여러 종목의 일봉을 동시에 조회 (로컬 일봉 저장소에 있으면 네트워크 없이, 종목 목록에 없는 코드는 조회하지 않음)
+
+    Args:
+        context (JobContext): 백그라운드 작업에서 호출한 경우 종목마다 진행 상황을 보고 (취소되면 JobCancelled)
+
+    Returns:
+        Tuple[Dict, Dict]: (종목별 일봉, 조회에 실패한 종목별 오류 메시지)
+    """
+    ticket = current_ticket()
+
+    def fetch(symbol):
+        if context is not None:
+            context.check_cancelled()
+        with admission.stage('fmp', ticket):
+            return stock_fetcher.fetch_stock_data(symbol, data_range['period'], start=data_range['start'],
+                                                  end=data_range['end'], as_of=data_range['as_of'])
+
+    errors = {symbol: unknown_symbol_error(symbol) for symbol in symbols if not symbol_directory.is_known(symbol)}
+    symbols = [symbol for symbol in symbols if symbol not in errors]
+    if context is not None:
+        context.advance(len(errors))
+    histories = {}
+    with ThreadPoolExecutor(max_workers=PANEL_FETCH_WORKERS) as executor:
+        for symbol, history in zip(symbols, executor.map(fetch, symbols)):
+            histories[symbol] = history
+            if context is not None:
+                context.advance()
+    errors.update({symbol: f'{symbol} 주식 데이터를 가져올 수 없습니다.'
+                   for symbol, history in histories.items() if history.empty})
+    histories = {symbol: history for symbol, history in histories.items() if not history.empty}
+    return histories, errors
+
+@app.route('/panel', methods=['POST'])
+def analyze_panel():
+    """
+    여러 종목을 (날짜 × 종목) 행렬로 한 번에 분석하고 횡단면 순위와 시장 폭 지표를 함께 반환
+
+    예: {"symbols": ["AAPL", "MSFT", ...], "period": "1y", "sectors": {"AAPL": "Tech"}, "as_of": "2025-06-27"}
+    """
+    try:
+        data = request.get_json() or {}
+        if not isinstance(data, dict):
+            return jsonify({'error': '요청 본문은 JSON 객체여야 합니다.'}), 400
+        symbols = data.get('symbols', [])
+        if not isinstance(symbols, list) or not all(isinstance(s, str) for s in symbols):
+            return jsonify({'error': 'symbols는 종목 코드 문자열의 목록이어야 합니다.'}), 400
+        symbols = list(dict.fromkeys(s.strip().upper() for s in symbols if s.strip()))
+        try:
+            sectors = parse_sectors(data)
+            data_range = parse_data_range(data)
+            history_days = job_int(data, 'history_days', 20)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        if len(symbols) < 2:
+            return jsonify({'error': '패널 분석에는 2개 이상의 종목(symbols)이 필요합니다.'}), 400
+        if len(symbols) > MAX_PANEL_SYMBOLS:
+            return jsonify({'error': f'한 번에 최대 {MAX_PANEL_SYMBOLS}개 종목까지 분석할 수 있습니다.'}), 400
+
+        print(f"🔍 {len(symbols)}개 종목 패널 분석 시작 (기간: {data_range['period']})...")
+
+        histories, errors = fetch_histories(symbols, data_range)
+        if not histories:
+            return jsonify({'error': '분석할 수 있는 종목 데이터가 없습니다.', 'errors': errors}), 400
+
+        with admission.stage('compute', g.ticket):
+            engine = PanelEngine(histories, sectors=sectors)
+            result = engine.snapshot(as_of=data_range['as_of'], history_days=history_days)
+        result['errors'] = errors
+
+        print(f"✅ 패널 분석 완료 ({len(result['symbols'])}개 종목)")
+        return jsonify(result)
+
+    except Overloaded as e:
+        return overloaded_response(e)
+    except Exception as e:
+        import traceback
+        print(f"❌ 패널 분석 중 오류 발생: {str(e)}")
+        traceback.print_exc()
+        return jsonify({'error': f'패널 분석 중 오류 발생: {str(e)}'}), 500
+
+@app.route('/portfolio', methods=['POST'])
+def analyze_portfolio_endpoint():
+    """
+    포트폴리오 분석 - 보유 종목을 동시에 조회해 한 번에 분석하고 가중 점수, 변동성, 상관관계를 반환
+
+    예: {"holdings": [{"symbol": "AAPL", "weight": 0.6}, {"symbol": "MSFT", "weight": 0.4}], "period": "1y"}
+    """
+    try:
+        data = request.get_json() or {}
+        if not isinstance(data, dict):
+            return jsonify({'error': '요청 본문은 JSON 객체여야 합니다.'}), 400
+        try:
+            weights = normalize_weights(data.get('holdings') or [])
+            data_range = parse_data_range(data)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        if len(weights) > MAX_PORTFOLIO_HOLDINGS:
+            return jsonify({'error': f'포트폴리오는 최대 {MAX_PORTFOLIO_HOLDINGS}개 종목까지 분석할 수 있습니다.'}), 400
+
+        print(f"🔍 포트폴리오 분석 시작 ({len(weights)}개 종목, 기간: {data_range['period']})...")
+        histories, errors = fetch_histories(list(weights), data_range)
+        if not histories:
+            return jsonify({'error': '분석할 수 있는 종목 데이터가 없습니다.', 'errors': errors}), 400
+
+        try:
+            with admission.stage('compute', g.ticket):
+                result = analyze_portfolio(histories, weights, as_of=data_range['as_of'])
+        except ValueError as e:
+            return jsonify({'error': str(e), 'errors': errors}), 400
+        result['errors'] = errors
+
+        print(f"✅ 포트폴리오 분석 완료 (추천: {result['aggregate']['recommendation']})")
+        return jsonify(result)
+
+    except Overloaded as e:
+        return overloaded_response(e)
+    except Exception as e:
+        import traceback
+        print(f"❌ 포트폴리오 분석 중 오류 발생: {str(e)}")
+        traceback.print_exc()
+        return jsonify({'error': f'포트폴리오 분석 중 오류 발생: {str(e)}'}), 500
+
+@app.route('/symbols')
+def search_symbols():
+    """
+    종목 코드/이름 접두사 자동 완성 (로컬 색인 조회, 네트워크 호출 없음)
+    """
+    query = request.args.get('q', '')
+    try:
+        limit = int(request.args.get('limit', DEFAULT_SEARCH_LIMIT))
+    except ValueError:
+        return jsonify({'error': 'limit은 정수여야 합니다.'}), 400
+    return jsonify({
+        'query': query,
+        'loaded': symbol_directory.loaded,
+        'results': symbol_directory.search(query, limit)
+    })
+
+@app.route('/replay/<symbol>', methods=['GET'])
+def replay(symbol):
+    """
+    기간 내 거래일마다 그 날짜 기준(as_of) 분석 결과를 재현하는 감사/리플레이 API
+
+    start 이전 지표 계산용 데이터까지 한 번에 가져오고(로컬 일봉 저장소에 있으면 네트워크 없이),
+    모든 날짜의 신호를 벡터 연산 한 번으로 계산합니다.
+    """
+    try:
+        symbol = symbol.upper()
+        try:
+            end_arg = request.args.get('end')
+            start_arg = request.args.get('start')
+            end_date = datetime.strptime(end_arg, '%Y-%m-%d').date() if end_arg else datetime.now().date()
+            if start_arg:
+                start_date = datetime.strptime(start_arg, '%Y-%m-%d').date()
+            else:
+                start_date = end_date - stock_fetcher.parse_period(request.args.get('period', '3mo'))
+        except ValueError as e:
+            return jsonify({'error': f'잘못된 날짜/기간 형식입니다: {str(e)}'}), 400
+        if start_date > end_date:
+            return jsonify({'error': f'시작일({start_date})이 종료일({end_date})보다 늦습니다.'}), 400
+        symbol_error = unknown_symbol_error(symbol)
+        if symbol_error:
+            return jsonify({'error': symbol_error}), 400
+
+        warmup_start = start_date - timedelta(days=stock_fetcher.minimal_window_days())
+        with admission.stage('fmp', g.ticket):
+            stock_data = stock_fetcher.fetch_stock_data(symbol, start=warmup_start, end=end_date)
+        if stock_data.empty:
+            return jsonify({'error': f'{symbol} 주식 데이터를 가져올 수 없습니다.'}), 400
+
+        print(f"🔁 {symbol} 리플레이 ({start_date} ~ {end_date})...")
+        with admission.stage('compute', g.ticket):
+            rows = trading_analyzer.replay_signals(stock_data, start_date, end_date)
+        return jsonify({
+            'symbol': symbol,
+            'version': ANALYSIS_VERSION,
+            'start': start_date.isoformat(),
+            'end': end_date.isoformat(),
+            'days': rows
+        })
+
+    except Overloaded as e:
+        return overloaded_response(e)
+    except Exception as e:
+        import traceback
+        print(f"❌ 리플레이 중 오류 발생: {str(e)}")
+        traceback.print_exc()
+        return jsonify({'error': f'리플레이 중 오류 발생: {str(e)}'}), 500
+
+@app.route('/history/<symbol>')
+def score_history(symbol):
+    """
+    종목의 최근 N일 점수 이력 (저장된 분석 결과 조회, 재계산 없음)
+    """
+    try:
+        days = int(request.args.get('days', 30))
+    except ValueError:
+        return jsonify({'error': 'days는 정수여야 합니다.'}), 400
+    if days <= 0:
+        return jsonify({'error': 'days는 1 이상이어야 합니다.'}), 400
+    symbol = symbol.upper()
+    return jsonify({'symbol': symbol, 'days': days, 'history': analysis_history.score_history(symbol, days)})
+
+@app.route('/history/changes')
+def recommendation_changes():
+    """
+    기준일(기본: 기록된 가장 최근 날짜)에 추천이 바뀐 종목 목록
+    """
+    on_date = request.args.get('date') or None
+    if on_date:
+        try:
+            datetime.strptime(on_date, '%Y-%m-%d')
+        except ValueError:
+            return jsonify({'error': 'date는 YYYY-MM-DD 형식이어야 합니다.'}), 400
+    return jsonify(analysis_history.recommendation_changes(on_date))
+
+@app.route('/export/signals')
+def export_signals():
+    """
+    저장된 분석 결과(종목/날짜별 마지막 분석)의 지표 원시값/신호/점수를 한 테이블로 스트리밍
+
+    예: /export/signals?format=parquet&start=2025-01-01&symbols=AAPL,MSFT (format: arrow 기본값 / parquet / csv)
+    """
+    output_format = request.args.get('format', 'arrow').lower()
+    start = request.args.get('start') or None
+    end = request.args.get('end') or None
+    for value in (start, end):
+        if value:
+            try:
+                datetime.strptime(value, '%Y-%m-%d')
+            except ValueError:
+                return jsonify({'error': 'start, end는 YYYY-MM-DD 형식이어야 합니다.'}), 400
+    symbols = [s.strip().upper() for s in request.args.get('symbols', '').split(',') if s.strip()]
+
+    try:
+        writer = create_export_writer(output_format)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except RuntimeError as e:
+        return jsonify({'error': str(e)}), 501
+
+    mimetype, extension = EXPORT_FORMATS[output_format]
+    return Response(stream_export(analysis_history, writer, start, end, symbols or None), mimetype=mimetype,
+                    headers={'Content-Disposition': f'attachment; filename=signals.{extension}',
+                             'X-Accel-Buffering': 'no'})
+
+# 관리 API(알림 규칙 등록/삭제/웹훅 주소 조회, 작업 목록/취소) 토큰 - X-Admin-Token 헤더, 없으면 관리 API 비활성화
+ADMIN_TOKEN = os.environ.get('ADMIN_TOKEN')
+
+def admin_authorized() -> bool:
+    return bool(ADMIN_TOKEN) and hmac.compare_digest(request.headers.get('X-Admin-Token', ''), ADMIN_TOKEN)
+
+def admin_error():
+    """
+    관리 API 호출 권한 확인 (문제가 없으면 None, 있으면 오류 응답)
+    """
+    if not ADMIN_TOKEN:
+        return jsonify({'error': '관리 API가 비활성화되어 있습니다 (ADMIN_TOKEN 미설정).'}), 404
+    if not admin_authorized():
+        return jsonify({'error': 'X-Admin-Token이 올바르지 않습니다.'}), 403
+    return None
+
+@app.route('/alerts', methods=['GET'])
+def list_alert_rules():
+    """
+    알림 규칙 목록 (웹훅 주소는 X-Admin-Token이 맞을 때만 포함)
+    """
+    rules = alert_engine.list_rules()
+    if not admin_authorized():
+        rules = [{key: value for key, value in rule.items() if key != 'webhook_url'} for rule in rules]
+    return jsonify({'rules': rules})
+
+@app.route('/alerts', methods=['POST'])
+def add_alert_rule():
+    """
+    알림 규칙 등록 (예: {"indicator": "RECOMMENDATION", "from_signal": "HOLD", "signal": "BUY",
+    "symbols": ["AAPL"], "webhook_url": "https://..."})
+    """
+    error = admin_error()
+    if error:
+        return error
+    rule = request.get_json() or {}
+    if ALERT_DELIVERY != 'local' and not rule.get('webhook_url'):
+        return jsonify({'error': 'webhook_url을 입력해주세요.'}), 400
+    try:
+        return jsonify(alert_engine.add_rule(rule)), 201
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+@app.route('/alerts/<rule_id>', methods=['DELETE'])
+def delete_alert_rule(rule_id):
+    error = admin_error()
+    if error:
+        return error
+    if not alert_engine.remove_rule(rule_id):
+        return jsonify({'error': '존재하지 않는 규칙입니다.'}), 404
+    return jsonify({'deleted': rule_id})
+
+@app.route('/alerts/events')
+def alert_events():
+    """
+    로컬 전달 모드에서 발생한 알림 목록 (웹훅 모드에서는 404)
+    """
+    if not isinstance(alert_engine.notifier, LocalNotifier):
+        return jsonify({'error': '로컬 알림 모드(ALERT_DELIVERY=local)에서만 사용할 수 있습니다.'}), 404
+    return jsonify({'events': alert_engine.notifier.events})
+
+@app.route('/stream')
+def stream():
+    """
+    종목 구독 스트림 (Server-Sent Events)
+
+    예: /stream?symbols=AAPL,MSFT - snapshot(전체 상태), update(바뀐 필드만), summary(ChatGPT 요약 완료) 이벤트
+    """
+    symbols = [s.strip().upper() for s in request.args.get('symbols', '').split(',') if s.strip()]
+    if not symbols:
+        return jsonify({'error': '구독할 종목(symbols)을 입력해주세요.'}), 400
+    if len(symbols) > MAX_BATCH_SYMBOLS:
+        return jsonify({'error': f'한 번에 최대 {MAX_BATCH_SYMBOLS}개 종목까지 구독할 수 있습니다.'}), 400
+    # 없는 종목을 구독하면 연결이 열려 있는 동안 갱신 주기마다 FMP를 조회하므로 구독 전에 거절
+    for symbol in symbols:
+        symbol_error = unknown_symbol_error(symbol)
+        if symbol_error:
+            return jsonify({'error': symbol_error}), 400
+
+    subscription = live_hub.subscribe(list(dict.fromkeys(symbols)))
+    return Response(live_hub.stream(subscription), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@app.route('/summary/<summary_id>')
+def get_summary(summary_id):
+    """
+    템플릿으로 먼저 응답한 분석의 ChatGPT 요약 조회 (도착 전이면 status=pending)
+    """
+    summary = summary_service.get_summary(summary_id)
+    if summary is None:
+        return jsonify({'error': '요약을 찾을 수 없습니다.'}), 404
+    return jsonify(summary)
+
+@app.route('/usage')
+def get_usage():
+    """
+    서버 시작 이후 ChatGPT 누적 토큰 사용량 조회
+    """
+    return jsonify(chatgpt_analyzer.get_usage_totals())
+
+@app.route('/admission')
+def admission_stats():
+    """
+    단계별 동시 실행 수, 대기 요청 수, 평균 처리 시간, 거절 수
+    """
+    return jsonify(admission.stats())
+
+@app.route('/memory')
+def memory_stats():
+    """
+    캐시 메모리 예산과 캐시별 사용량(바이트, 항목 수, 제거 수), 프로세스 상주 메모리
+    """
+    return jsonify(memory_governor.stats())
+
+# 백그라운드 작업 - 요청 시간 제한(Fly 프록시 등)을 넘는 대량 배치/스캔/백테스트
+# JOB_WORKERS개씩 실행하고, 상태와 결과는 JOB_DIR에 끝난 뒤 JOB_TTL_HOURS 동안 보관
+MAX_JOB_SYMBOLS = 5000
+
+# 백테스트는 후보 × 전체 봉 수 행렬로 평가하므로 종목 수와 전체 봉 수를 따로 제한하고,
+# 후보 묶음 하나의 메모리 예산(BACKTEST_MEMORY_MB)으로 묶음 크기를 정한다
+MAX_BACKTEST_SYMBOLS = 50
+MAX_BACKTEST_BARS = 30000
+BACKTEST_MEMORY_BYTES = int(float(os.environ.get('BACKTEST_MEMORY_MB', 64)) * 1024 * 1024)
+job_manager = JobManager(
+    os.environ.get('JOB_DIR', 'data/jobs'),
+    max_workers=int(os.environ.get('JOB_WORKERS', 2)),
+    ttl=float(os.environ.get('JOB_TTL_HOURS', 24)) * 3600
+)
+
+# ThresholdOptimizer는 프로세스 하나로 실행하면 모듈 전역 변수에 평가 테이블을 두므로 한 번에 하나씩 실행
+optimizer_lock = threading.Lock()
+
+def job_params(params: dict, min_symbols: int = 1, default_period: str = '1y',
+               max_symbols: int = MAX_JOB_SYMBOLS) -> dict:
+    """
+    작업 공통 파라미터 검증 - 종목 목록 정규화(중복 제거)와 기간 (잘못되면 ValueError)
+    """
+    symbols = params.get('symbols') or []
+    if not isinstance(symbols, list) or not all(isinstance(s, str) for s in symbols):
+        raise ValueError('symbols는 종목 코드 문자열의 목록이어야 합니다.')
+    for key in ('period', 'start', 'end', 'as_of'):
+        if params.get(key) is not None and not isinstance(params[key], str):
+            raise ValueError(f'{key}는 문자열이어야 합니다.')
+    symbols = list(dict.fromkeys(s.strip().upper() for s in symbols if s.strip()))
+    if len(symbols) < min_symbols:
+        raise ValueError(f'{min_symbols}개 이상의 종목(symbols)이 필요합니다.')
+    if len(symbols) > max_symbols:
+        raise ValueError(f'작업 하나에 최대 {max_symbols}개 종목까지 분석할 수 있습니다.')
+    return {'symbols': symbols, **parse_data_range(dict(params, period=params.get('period', default_period)))}
+
+def job_int(params: dict, key: str, default: int) -> int:
+    """
+    작업의 정수 파라미터 검증 (1 이상의 정수가 아니면 ValueError)
+    """
+    value = params.get(key, default)
+    if isinstance(value, bool) or not isinstance(value, (int, str)):
+        raise ValueError(f'{key}는 1 이상의 정수여야 합니다.')
+    try:
+        value = int(value)
+    except ValueError:
+        raise ValueError(f'{key}는 1 이상의 정수여야 합니다.')
+    if value < 1:
+        raise ValueError(f'{key}는 1 이상의 정수여야 합니다.')
+    return value
+
+def validate_batch_job(params: dict) -> dict:
+    schema = params.get('schema', 'compact')
+    if schema not in RESPONSE_SCHEMAS:
+        raise ValueError(f'schema는 {", ".join(RESPONSE_SCHEMAS)} 중 하나여야 합니다.')
+    return dict(job_params(params), schema=schema)
+
+def parse_sectors(params: dict) -> dict:
+    """
+    종목별 섹터 검증 ({"종목 코드": "섹터"} 형식이 아니면 ValueError)
+    """
+    sectors = params.get('sectors') or {}
+    if not isinstance(sectors, dict) or not all(isinstance(sector, str) for sector in sectors.values()):
+        raise ValueError('sectors는 {"종목 코드": "섹터"} 형식이어야 합니다.')
+    return {symbol.upper(): sector for symbol, sector in sectors.items()}
+
+def validate_scan_job(params: dict) -> dict:
+    return dict(job_params(params, min_symbols=2), sectors=parse_sectors(params),
+                history_days=job_int(params, 'history_days', 20))
+
+def validate_backtest_job(params: dict) -> dict:
+    return dict(job_params(params, default_period='2y', max_symbols=MAX_BACKTEST_SYMBOLS),
+                horizon=job_int(params, 'horizon', 5),
+                folds=job_int(params, 'folds', 4), top=job_int(params, 'top', 10))
+
+def job_data_range(params: dict) -> dict:
+    return {key: params[key] for key in ('period', 'start', 'end', 'as_of')}
+
+def run_batch_job(context: JobContext, params: dict):
+    """
+    종목별 분석 작업 (/analyze/batch와 같은 분석 경로, 요약은 템플릿으로 생성)
+
+    결과는 끝나는 순서대로 결과 파일에 바로 기록하고, 동시에 진행 중인 분석은 PANEL_FETCH_WORKERS의 2배로
+    제한하므로 종목 수와 관계없이 메모리 사용량이 일정합니다.
+    """
+    symbols = params['symbols']
+    data_range = job_data_range(params)
+    context.set_total(len(symbols))
+
+    def analyze(symbol):
+        context.check_cancelled()
+        if not symbol_directory.is_known(symbol):
+            return symbol, None, unknown_symbol_error(symbol)
+        try:
+            result, stock_data_for_chatgpt = build_analysis(symbol, **data_range)
+        except JobCancelled:
+            raise
+        except Exception as e:
+            return symbol, None, f'분석 중 오류 발생: {str(e)}'
+        if result is None:
+            return symbol, None, f'{symbol} 주식 데이터를 가져올 수 없습니다.'
+        result['expert_summary'] = template_summary_generator.generate_summary(stock_data_for_chatgpt)
+        result['summary_source'] = 'template'
+        publish_result(result)
+        return symbol, apply_schema(result, params['schema']), None
+
+    errors = {}
+    written = 0
+    output = context.open_result()
+    output.write(b'{"results": {')
+
+    def collect(futures, return_when):
+        nonlocal written
+        finished, pending = wait(futures, return_when=return_when)
+        for future in finished:
+            symbol, result, error = future.result()
+            if error:
+                errors[symbol] = error
+            else:
+                entry = json.dumps(symbol) + ': ' + json.dumps(result, ensure_ascii=False, default=str)
+                output.write((', ' if written else '').encode('utf-8') + entry.encode('utf-8'))
+                written += 1
+            context.advance()
+        return pending
+
+    with ThreadPoolExecutor(max_workers=PANEL_FETCH_WORKERS) as executor:
+        pending = set()
+        try:
+            for symbol in symbols:
+                pending.add(executor.submit(analyze, symbol))
+                if len(pending) >= PANEL_FETCH_WORKERS * 2:
+                    pending = collect(pending, FIRST_COMPLETED)
+            collect(pending, ALL_COMPLETED)
+        except JobCancelled:
+            for future in pending:
+                future.cancel()
+            raise
+    output.write(b'}, "errors": ' + json.dumps(errors, ensure_ascii=False).encode('utf-8') + b'}')
+
+def run_scan_job(context: JobContext, params: dict) -> dict:
+    """
+    패널(횡단면) 스캔 작업 (/panel과 같은 PanelEngine 경로, 진행 상황은 일봉 조회 종목 수)
+    """
+    context.set_total(len(params['symbols']))
+    histories, errors = fetch_histories(params['symbols'], job_data_range(params), context)
+    if len(histories) < 2:
+        raise ValueError('분석할 수 있는 종목 데이터가 2개 미만입니다.')
+    with admission.stage('compute', None):
+        engine = PanelEngine(histories, sectors=params['sectors'])
+        result = engine.snapshot(as_of=params['as_of'], history_days=params['history_days'])
+    result['errors'] = errors
+    return result
+
+def run_backtest_job(context: JobContext, params: dict) -> dict:
+    """
+    지표 임계값 백테스트 작업 (threshold_optimizer와 같은 평가, 서버 안에서는 프로세스 하나로 실행)
+    """
+    context.set_total(len(params['symbols']))
+    histories, errors = fetch_histories(params['symbols'], job_data_range(params), context)
+    if not histories:
+        raise ValueError('백테스트할 수 있는 종목 데이터가 없습니다.')
+    bars = sum(len(history) for history in histories.values())
+    if bars > MAX_BACKTEST_BARS:
+        raise ValueError(f'백테스트 한 번에 최대 {MAX_BACKTEST_BARS}개 봉까지 평가할 수 있습니다 '
+                         f'({bars}개 봉 - 종목 수나 기간을 줄여주세요).')
+    with optimizer_lock:
+        context.check_cancelled()
+        optimizer = ThresholdOptimizer(histories, fetcher=stock_fetcher, horizon=params['horizon'])
+        # 후보 묶음마다 취소 요청을 확인
+        result = optimizer.optimize(n_folds=params['folds'], top_n=params['top'], workers=1,
+                                    memory_budget=BACKTEST_MEMORY_BYTES, on_chunk=context.check_cancelled)
+    result['errors'] = errors
+    return result
+
+job_manager.register('batch', run_batch_job, validate_batch_job)
+job_manager.register('scan', run_scan_job, validate_scan_job)
+job_manager.register('backtest', run_backtest_job, validate_backtest_job)
+
+@app.route('/jobs', methods=['POST'])
+def submit_job():
+    """
+    백그라운드 작업 제출 - 작업 id를 바로 반환하고 진행 상황/결과는 GET /jobs/<id>로 조회
+
+    예: {"kind": "batch", "symbols": ["AAPL", "MSFT", ...], "period": "1y"}
+    """
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({'error': '요청 본문은 JSON 객체여야 합니다.'}), 400
+    try:
+        job = job_manager.submit(data.get('kind', ''), data)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except RuntimeError as e:
+        response = jsonify({'error': str(e)})
+        response.status_code = 503
+        response.headers['Retry-After'] = '30'
+        return response
+    job['url'] = f"/jobs/{job['id']}"
+    return jsonify(job), 202
+
+@app.route('/jobs', methods=['GET'])
+def list_jobs():
+    """
+    보관 중인 작업 목록 (최근 제출 순, 관리 토큰 필요)
+    """
+    error = admin_error()
+    if error:
+        return error
+    return jsonify({'jobs': job_manager.list_jobs()})
+
+@app.route('/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """
+    작업 상태와 진행 상황 조회 (완료된 작업은 디스크에 저장된 결과를 result로 함께 반환)
+    """
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({'error': '작업을 찾을 수 없습니다.'}), 404
+    body = json.dumps(job, ensure_ascii=False).encode('utf-8')
+    result = job_manager.read_result(job_id) if job['status'] == JOB_DONE else None
+    if result is not None:
+        # 결과 파일은 이미 JSON이므로 다시 파싱하지 않고 그대로 붙인다
+        body = body[:-1] + b', "result": ' + result + b'}'
+    return Response(body, mimetype='application/json')
+
+@app.route('/jobs/<job_id>', methods=['DELETE'])
+def cancel_job(job_id):
+    """
+    작업 취소 (대기 중이면 바로, 실행 중이면 다음 종목을 처리하기 전에 멈춤, 관리 토큰 필요)
+    """
+    error = admin_error()
+    if error:
+        return error
+    job = job_manager.cancel(job_id)
+    if job is None:
+        return jsonify({'error': '작업을 찾을 수 없습니다.'}), 404
+    return jsonify(job), 202
+
+def profiling_error():
+    """
+    프로파일링이 꺼져 있거나(404) 토큰이 맞지 않으면(403) 오류 응답, 사용할 수 있으면 None
+    """
+    if profiler is None:
+        return jsonify({'error': '프로파일링이 비활성화되어 있습니다 (PROFILING_TOKEN 미설정).'}), 404
+    if not profiler.authorized():
+        return jsonify({'error': 'X-Profile-Token이 올바르지 않습니다.'}), 403
+    return None
+
+@app.route('/profiles/<profile_id>')
+def get_profile(profile_id):
+    """
+    ?profile=cprofile|sample로 실행한 분석 요청의 프로파일 조회 (format: text / pstats / collapsed)
+    """
+    error = profiling_error()
+    if error:
+        return error
+    entry = profiler.get(profile_id)
+    if entry is None:
+        return jsonify({'error': '프로파일을 찾을 수 없습니다.'}), 404
+    response = profile_response(entry, request.args.get('format'))
+    if response is None:
+        return jsonify({'error': f'{entry["mode"]} 프로파일에서 지원하지 않는 format입니다.'}), 400
+    response.headers['X-Profile-Duration'] = str(entry['duration_seconds'])
+    return response
+
+@app.route('/profile/sample', methods=['POST'])
+def sample_process():
+    """
+    프로세스 전체 스레드를 seconds 동안 샘플링해 collapsed stack 형식으로 반환 (flamegraph.pl, speedscope 호환)
+    """
+    error = profiling_error()
+    if error:
+        return error
+    try:
+        seconds = float(request.args.get('seconds', 10))
+        interval = float(request.args.get('interval_ms', 5)) / 1000
+    except ValueError:
+        return jsonify({'error': 'seconds, interval_ms는 숫자여야 합니다.'}), 400
+    if not 0 < seconds <= MAX_SAMPLE_SECONDS or not 0.001 <= interval <= 1:
+        return jsonify({'error': f'seconds는 0 ~ {MAX_SAMPLE_SECONDS}, interval_ms는 1 ~ 1000 사이여야 합니다.'}), 400
+
+    counts = profiler.sample_process(seconds, interval)
+    if counts is None:
+        return jsonify({'error': '이미 샘플링이 진행 중입니다.'}), 409
+    return Response(collapse_stacks(counts), mimetype='text/plain')
+
 if __name__ == '__main__':
     port = int(os.environ.get('PORT', 8080))
     app.run(host='0.0.0.0', port=port, debug=False) 
\ No newline at end of file